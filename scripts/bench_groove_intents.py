@@ -0,0 +1,77 @@
+"""
+Compare per-window and batched groove intent requests.
+
+Runs the in-process reference service (groove/reference_service.py) and
+generates one intent per window three ways: generate_intent() with a new
+urllib connection per call, generate_intent() over one keep-alive
+connection, and generate_intents() in batches. --delay-ms adds a fixed
+service time per request, standing in for network/analyzer latency.
+
+    PYTHONPATH=src python scripts/bench_groove_intents.py --windows 500 --delay-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from zt_band.groove import (
+    EvidenceWindow,
+    GrooveServiceConnection,
+    generate_intent,
+    generate_intents,
+)
+from zt_band.groove.reference_service import ReferenceGrooveService
+
+PROFILE = {"schema_id": "groove_profile", "schema_version": "v1", "profile_id": "bench"}
+
+
+def _windows(n: int) -> list[EvidenceWindow]:
+    return [
+        EvidenceWindow(horizon_ms=2000, features={
+            "timing": {"mean_offset_ms": (i % 21) - 10.0, "stddev_ms": 3.0 + i % 7},
+            "events": {"count": i % 16},
+        })
+        for i in range(n)
+    ]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--windows", type=int, default=300, help="Windows to generate intents for (default: 300).")
+    ap.add_argument("--batch-size", type=int, default=64, help="Windows per batch request (default: 64).")
+    ap.add_argument("--delay-ms", type=float, default=0.0, help="Service time per request (default: 0).")
+    args = ap.parse_args()
+
+    windows = _windows(args.windows)
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    nows = [t0 + timedelta(milliseconds=500 * i) for i in range(len(windows))]
+
+    with ReferenceGrooveService(delay_s=args.delay_ms / 1000.0) as svc:
+        conn = GrooveServiceConnection(svc.url)
+        os.environ["SG_GROOVE_SERVICE_URL"] = svc.url
+
+        def per_call() -> list:
+            return [generate_intent(profile=PROFILE, window=w, now_utc=t) for w, t in zip(windows, nows)]
+
+        def keep_alive() -> list:
+            return [generate_intent(profile=PROFILE, window=w, now_utc=t, service=conn) for w, t in zip(windows, nows)]
+
+        def batched() -> list:
+            return generate_intents(profile=PROFILE, windows=windows, now_utc=nows, service=conn, batch_size=args.batch_size)
+
+        print(f"{'client':<12} {'requests':>9} {'total s':>8} {'ms/window':>10} {'ok':>6}")
+        for name, run in (("per-call", per_call), ("keep-alive", keep_alive), ("batched", batched)):
+            before = svc.requests
+            start = time.perf_counter()
+            out = run()
+            wall = time.perf_counter() - start
+            ok = sum(1 for i in out if i is not None)
+            print(f"{name:<12} {svc.requests - before:9d} {wall:8.3f} {wall * 1000.0 / len(windows):10.3f} {ok:6d}")
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+"""
+Compare CPU cost and timing error of the rt_play_cycle schedulers.
+
+Runs the polling loop, the event-driven loop, and the event-driven loop
+feeding a ThreadedSender output stage ("threaded") on the real clock
+against an in-memory sender (no MIDI port needed). Reports CPU seconds per
+minute of playback plus the send-time error relative to each due time.
+
+With --realtime-priority every scheduler is run a second time under
+rt_priority.RealtimeSetup ("+rt" rows) to show the jitter difference;
+--load N adds N busy-looping processes competing for the CPUs.
+
+    PYTHONPATH=src python scripts/bench_rt_scheduler.py --seconds 20
+    sudo PYTHONPATH=src python scripts/bench_rt_scheduler.py --realtime-priority --rt-cpu 2 --load 4
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import statistics
+import time
+
+import mido
+
+from zt_band.clave import ClaveGrid
+from zt_band.realtime import (
+    LateDropPolicy,
+    RtSpec,
+    _build_cycle_timeline,
+    _cycle_time,
+    _make_click_msgs,
+    _run_event_loop,
+    _run_poll_loop,
+    _step_to_t,
+)
+from zt_band.rt_priority import RealtimeSetup
+from zt_band.senders import ThreadedSender
+
+
+class _TimestampSender:
+    def __init__(self) -> None:
+        self.sent: list[tuple[float, object]] = []
+
+    def send(self, msg: mido.Message) -> None:
+        self.sent.append((time.monotonic(), msg))
+
+    def send_raw(self, data: bytes) -> None:
+        self.sent.append((time.monotonic(), data))
+
+
+def _cycle_events(grid: ClaveGrid) -> list[tuple[int, mido.Message]]:
+    """Busy 2-bar cycle: 16th hats, bass on beats, comp stabs."""
+    out = []
+    for s in range(grid.steps_per_cycle()):
+        out.append((s, mido.Message("note_on", channel=9, note=42, velocity=30 if s % 2 else 70)))
+        out.append((s, mido.Message("note_off", channel=9, note=42, velocity=0)))
+        if s % 4 == 0:
+            out.append((s, mido.Message("note_on", channel=1, note=36, velocity=100)))
+            out.append((s + 3, mido.Message("note_off", channel=1, note=36, velocity=0)))
+        if s % 8 == 2:
+            for n in (60, 64, 67):
+                out.append((s, mido.Message("note_on", channel=0, note=n, velocity=80)))
+                out.append((s + 2, mido.Message("note_off", channel=0, note=n, velocity=0)))
+    steps = grid.steps_per_cycle()
+    return sorted(((s % steps, msg) for s, msg in out), key=lambda e: e[0])
+
+
+def _run(mode: str, seconds: float, bpm: float) -> dict[str, float]:
+    spec = RtSpec(midi_out="bench", bpm=bpm, scheduler="poll" if mode == "poll" else "event", bar_cc_enabled=True)
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    cycle_len = _cycle_time(grid)
+    cycles = max(1, round(seconds / cycle_len))
+    events = _cycle_events(grid)
+    clicks = sorted(_make_click_msgs(grid, spec), key=lambda e: e[0])
+    timeline = _build_cycle_timeline(events, clicks, grid, spec)
+    if mode == "poll":
+        offsets = {id(msg): _step_to_t(s, grid) for s, msg in events + clicks}
+    else:
+        # Event modes send the pre-encoded timeline payloads as-is.
+        offsets = {id(payload): off for off, _, payload in timeline}
+
+    sender = _TimestampSender()
+    start: list[float] = []
+
+    def now_fn() -> float:
+        t = time.monotonic()
+        if not start:
+            start.append(t)
+        return t
+
+    kwargs = {"grid": grid, "spec": spec, "max_cycles": cycles, "policy": LateDropPolicy(), "now_fn": now_fn}
+    cpu0 = time.process_time()
+    wall0 = time.monotonic()
+    if mode == "poll":
+        _run_poll_loop(sender, events_sorted=events, click_sorted=clicks, **kwargs)
+    elif mode == "event":
+        _run_event_loop(sender, timeline=timeline, **kwargs)
+    else:
+        stage = ThreadedSender(sender, spin_s=spec.spin_s)
+        _run_event_loop(stage, timeline=timeline, **kwargs)
+        stage.stop()
+    wall = time.monotonic() - wall0
+    cpu = time.process_time() - cpu0
+
+    if mode == "threaded":
+        # The output stage records due and actual send time itself.
+        errors_ms = [r.lateness_s * 1000.0 for r in stage.records]
+    else:
+        t0 = start[0]
+        errors_ms = []
+        for t, msg in sender.sent:
+            off = offsets.get(id(msg))
+            if off is None:
+                continue  # bar CC (built at dispatch time)
+            cycle = round((t - t0 - off) / cycle_len)
+            errors_ms.append((t - (t0 + cycle * cycle_len + off)) * 1000.0)
+    abs_err = sorted(abs(e) for e in errors_ms)
+    return {
+        "wall_s": wall,
+        "cpu_s_per_min": cpu / wall * 60.0,
+        "sent": len(stage.records) if mode == "threaded" else len(sender.sent),
+        "err_mean_ms": statistics.fmean(errors_ms),
+        "abs_p50_ms": abs_err[len(abs_err) // 2],
+        "abs_p99_ms": abs_err[min(len(abs_err) - 1, int(len(abs_err) * 0.99))],
+        "abs_max_ms": abs_err[-1],
+    }
+
+
+def _burn() -> None:
+    while True:
+        pass
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--seconds", type=float, default=20.0, help="Playback length per scheduler (default: 20).")
+    ap.add_argument("--bpm", type=float, default=120.0, help="Tempo (default: 120).")
+    ap.add_argument("--realtime-priority", action="store_true", help="Also run every scheduler under RealtimeSetup.")
+    ap.add_argument("--rt-cpu", type=int, default=None, help="With --realtime-priority: CPU to pin to.")
+    ap.add_argument("--load", type=int, default=0, help="Busy-looping background processes (default: 0).")
+    args = ap.parse_args()
+
+    burners = [multiprocessing.Process(target=_burn, daemon=True) for _ in range(max(0, args.load))]
+    for proc in burners:
+        proc.start()
+
+    runs = [(mode, None) for mode in ("poll", "event", "threaded")]
+    if args.realtime_priority:
+        runs += [(mode, RealtimeSetup(cpu=args.rt_cpu)) for mode in ("poll", "event", "threaded")]
+
+    print(f"{'scheduler':<11} {'wall s':>7} {'CPU s/min':>10} {'sent':>6} {'mean err':>9} {'|err| p50':>10} {'p99':>7} {'max':>7}")
+    for mode, setup in runs:
+        if setup is not None:
+            setup.apply()
+        try:
+            r = _run(mode, args.seconds, args.bpm)
+        finally:
+            if setup is not None:
+                setup.restore()
+        label = mode + ("+rt" if setup is not None else "")
+        print(
+            f"{label:<11} {r['wall_s']:7.2f} {r['cpu_s_per_min']:10.3f} {r['sent']:6d} "
+            f"{r['err_mean_ms']:8.2f}ms {r['abs_p50_ms']:8.2f}ms {r['abs_p99_ms']:5.2f}ms {r['abs_max_ms']:5.2f}ms"
+        )
+    if args.realtime_priority:
+        # Same steps every run; show what the last one got.
+        print()
+        print("Realtime setup:")
+        for line in runs[-1][1].report_lines():
+            print(line)
+
+    for proc in burners:
+        proc.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
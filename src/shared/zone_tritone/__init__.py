@@ -7,6 +7,7 @@ from .backdoor import (
     get_bVII,
     needs_soft_guardrail,
 )
+from .corpus_index import CorpusIndex
 from .dominant import (
     Dominant7,
     build_dominant,
@@ -32,15 +33,24 @@ from .gravity import (
     gravity_chain,
 )
 from .markov import (
+    MarkovModel,
     build_transition_counts,
     normalize_transition_matrix,
     sample_next_root,
 )
+from .ngram import NGramModel
 from .pc import (
     NOTES,
     name_from_pc,
     pc_from_name,
 )
+from .tables import (
+    Transition,
+    classify_transitions,
+    intervals_of,
+    tritone_axes_of,
+    zones_of,
+)
 from .tritones import (
     all_tritone_axes,
     is_tritone_pair,
@@ -101,13 +111,24 @@ __all__ = [
     "tritone_axis",
     "is_tritone_pair",
     "all_tritone_axes",
+    # tables (bulk lookups)
+    "Transition",
+    "classify_transitions",
+    "intervals_of",
+    "tritone_axes_of",
+    "zones_of",
     # gravity
     "dominant_roots_from_tritone",
     "gravity_chain",
     # markov
+    "MarkovModel",
     "build_transition_counts",
     "normalize_transition_matrix",
     "sample_next_root",
+    # ngram
+    "NGramModel",
+    # corpus index
+    "CorpusIndex",
     # dominant
     "Dominant7",
     "build_dominant",
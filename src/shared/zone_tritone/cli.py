@@ -10,20 +10,16 @@ if sys.platform == "win32" and hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
     sys.stderr.reconfigure(encoding="utf-8")
 
-from .corpus import chord_sequence_to_roots
+from .corpus import chord_sequence_to_roots, chord_tokens, iter_corpus_progressions
+from .corpus_index import CorpusIndex
 from .gravity import gravity_chain
 from .markov import build_transition_counts, normalize_transition_matrix
+from .ngram import NGramModel
 from .pc import name_from_pc, pc_from_name
+from .tables import TRANSITION, intervals_of
 from .tritones import tritone_axis
 from .types import PitchClass
-from .zones import (
-    interval,
-    is_half_step,
-    is_same_zone,
-    is_whole_step,
-    is_zone_cross,
-    zone_name,
-)
+from .zones import zone_name
 
 
 def _parse_chord_string(chord_str: str) -> list[str]:
@@ -122,15 +118,22 @@ def cmd_analyze(args: argparse.Namespace) -> int:
     fourths_transitions = 0
     same_root = 0
 
-    prev = roots[0]
-    for r in roots[1:]:
+    for d in intervals_of(roots):
         total_transitions += 1
-        if (r - prev) % 12 == 0:
+        if d == 0:
             same_root += 1
-        if (r - prev) % 12 == 7:  # up a 5th == down a 4th
+        if d == 7:  # up a 5th == down a 4th
             fourths_transitions += 1
-        prev = r
 
+    _print_transition_stats(total_transitions, fourths_transitions, same_root)
+
+    if args.show_matrix:
+        _print_matrix(matrix)
+
+    return 0
+
+
+def _print_transition_stats(total_transitions: int, fourths_transitions: int, same_root: int) -> None:
     print("# Transition statistics:")
     if total_transitions > 0:
         pct_fourths = fourths_transitions / total_transitions * 100.0
@@ -141,15 +144,14 @@ def cmd_analyze(args: argparse.Namespace) -> int:
     print(f"  Same-root transitions  : {same_root}")
     print()
 
-    if args.show_matrix:
-        print("# Transition probability matrix (rows = from, cols = to)")
-        header = "     " + " ".join(f"{i:4d}" for i in range(12))
-        print(header)
-        for i, row in enumerate(matrix):
-            row_str = " ".join(f"{p:4.2f}" for p in row)
-            print(f"{i:2d}: {row_str}")
 
-    return 0
+def _print_matrix(matrix) -> None:
+    print("# Transition probability matrix (rows = from, cols = to)")
+    header = "     " + " ".join(f"{i:4d}" for i in range(12))
+    print(header)
+    for i, row in enumerate(matrix):
+        row_str = " ".join(f"{p:4.2f}" for p in row)
+        print(f"{i:2d}: {row_str}")
 
 
 def _explain_transition(a: PitchClass, b: PitchClass) -> str:
@@ -157,13 +159,13 @@ def _explain_transition(a: PitchClass, b: PitchClass) -> str:
     Return a human-readable explanation of the motion from root a to root b,
     using Zone-Tritone terminology.
     """
-    d = interval(a, b)  # in semitones mod 12
-    same = (d == 0)
-    desc_fourth = (d == 7)  # up a fifth == down a fourth
-    asc_fourth = (d == 5)   # down a fifth == up a fourth
-    hs = is_half_step(a, b)
-    ws = is_whole_step(a, b)
-    cross = is_zone_cross(a, b)
+    t = TRANSITION[a % 12][b % 12]
+    same = (t.interval == 0)
+    desc_fourth = t.desc_fourth  # up a fifth == down a fourth
+    asc_fourth = t.asc_fourth    # down a fifth == up a fourth
+    hs = t.half_step
+    ws = t.whole_step
+    cross = not t.same_zone
 
     if same:
         return "prolongation (same root, same gravity center)"
@@ -230,13 +232,14 @@ def _render_explain_text(chords: list[str], roots: list[PitchClass]) -> str:
     for _idx, cur_root in enumerate(roots[1:], start=1):
         cur_name = name_from_pc(cur_root)
         cur_zone = zone_name(cur_root)
-        d = interval(prev_root, cur_root)
-        cross = is_zone_cross(prev_root, cur_root)
-        same_zone = is_same_zone(prev_root, cur_root)
-        desc_fourth = (d == 7)
-        asc_fourth = (d == 5)
-        hs = is_half_step(prev_root, cur_root)
-        ws = is_whole_step(prev_root, cur_root)
+        t = TRANSITION[prev_root % 12][cur_root % 12]
+        d = t.interval
+        cross = not t.same_zone
+        same_zone = t.same_zone
+        desc_fourth = t.desc_fourth
+        asc_fourth = t.asc_fourth
+        hs = t.half_step
+        ws = t.whole_step
 
         if cross:
             zone_relation = f"{prev_zone} -> {cur_zone} (zone-cross)"
@@ -360,13 +363,14 @@ def _render_explain_html(chords: list[str], roots: list[PitchClass]) -> str:
     for cur_root in roots[1:]:
         cur_name = name_from_pc(cur_root)
         cur_zone = zone_name(cur_root)
-        d = interval(prev_root, cur_root)
-        cross = is_zone_cross(prev_root, cur_root)
-        same_zone = is_same_zone(prev_root, cur_root)
-        desc_fourth = (d == 7)
-        asc_fourth = (d == 5)
-        hs = is_half_step(prev_root, cur_root)
-        ws = is_whole_step(prev_root, cur_root)
+        t = TRANSITION[prev_root % 12][cur_root % 12]
+        d = t.interval
+        cross = not t.same_zone
+        same_zone = t.same_zone
+        desc_fourth = t.desc_fourth
+        asc_fourth = t.asc_fourth
+        hs = t.half_step
+        ws = t.whole_step
 
         if cross:
             zone_relation = f"{prev_zone} -> {cur_zone} (zone-cross)"
@@ -487,13 +491,14 @@ def _render_explain_markdown(chords: list[str], roots: list[PitchClass]) -> str:
     for cur_root in roots[1:]:
         cur_name = name_from_pc(cur_root)
         cur_zone = zone_name(cur_root)
-        d = interval(prev_root, cur_root)
-        cross = is_zone_cross(prev_root, cur_root)
-        same_zone = is_same_zone(prev_root, cur_root)
-        desc_fourth = (d == 7)
-        asc_fourth = (d == 5)
-        hs = is_half_step(prev_root, cur_root)
-        ws = is_whole_step(prev_root, cur_root)
+        t = TRANSITION[prev_root % 12][cur_root % 12]
+        d = t.interval
+        cross = not t.same_zone
+        same_zone = t.same_zone
+        desc_fourth = t.desc_fourth
+        asc_fourth = t.asc_fourth
+        hs = t.half_step
+        ws = t.whole_step
 
         if cross:
             zone_relation = f"{prev_zone} -> {cur_zone} (zone-cross)"
@@ -614,6 +619,110 @@ def cmd_explain(args: argparse.Namespace) -> int:
     return 0
 
 
+def _format_token(tok) -> str:
+    if isinstance(tok, tuple):
+        pc, quality = tok
+        return f"{name_from_pc(pc)}{quality}"
+    return name_from_pc(tok)
+
+
+def cmd_ngram_train(args: argparse.Namespace) -> int:
+    """
+    Handle the 'ngram-train' subcommand.
+
+    Trains an NGramModel over corpus files and writes the binary model.
+    """
+    paths = [Path(p) for p in args.inputs]
+    missing = [p for p in paths if not p.exists()]
+    if missing:
+        print(f"error: file not found: {missing[0]}", file=sys.stderr)
+        return 1
+
+    model = NGramModel(order=args.order)
+    progressions = 0
+    skipped = 0
+    for chords in iter_corpus_progressions(paths):
+        try:
+            tokens = chord_tokens(chords, kind=args.kind)
+        except ValueError:
+            skipped += 1
+            continue
+        model.update(tokens)
+        progressions += 1
+
+    if len(model) == 0:
+        print("error: no chord progressions found in inputs", file=sys.stderr)
+        return 1
+
+    model.save(args.out)
+    print(
+        f"[zt-gravity] trained order-{args.order} {args.kind} model on {progressions} progressions "
+        f"({len(model)} chords, {model.num_contexts()} contexts, {skipped} skipped) -> {args.out}"
+    )
+    return 0
+
+
+def cmd_ngram_sample(args: argparse.Namespace) -> int:
+    """
+    Handle the 'ngram-sample' subcommand.
+
+    Loads a binary model and continues a seed progression.
+    """
+    try:
+        model = NGramModel.load(args.model)
+    except (OSError, ValueError) as e:
+        print(f"error: cannot load model {args.model}: {e}", file=sys.stderr)
+        return 1
+    kind = "root_quality" if model.vocab and isinstance(model.vocab[0], tuple) else "roots"
+    try:
+        start = chord_tokens(_parse_chord_string(args.start), kind=kind) if args.start else []
+    except ValueError as e:
+        print(f"error: bad --start: {e}", file=sys.stderr)
+        return 1
+
+    out = model.generate(start, args.length, seed=args.seed)
+    print(" ".join(_format_token(t) for t in out))
+    return 0
+
+
+def cmd_corpus_index(args: argparse.Namespace) -> int:
+    """
+    Handle the 'corpus-index' subcommand.
+
+    Refreshes the persistent index (only changed files are re-read), then
+    prints aggregate statistics for the files matching --match, computed
+    from the stored counts.
+    """
+    root = Path(args.dir)
+    if not root.is_dir():
+        print(f"error: directory not found: {root}", file=sys.stderr)
+        return 1
+
+    index = CorpusIndex.load(root, args.index)
+    if not args.no_update:
+        report = index.update()
+        index.save()
+        print(
+            f"[zt-gravity] index {index.index_path}: {len(report.added)} added, "
+            f"{len(report.changed)} changed, {len(report.removed)} removed, "
+            f"{report.unchanged} unchanged"
+        )
+
+    summary = index.summary(args.match)
+    scope = ", ".join(args.match) if args.match else "all files"
+    print(f"# Corpus index ({scope})")
+    print(f"  Files                  : {summary['files']} ({summary['errors']} unreadable)")
+    print(f"  Progressions           : {summary['progressions']} ({summary['skipped']} skipped)")
+    print(f"  Chords                 : {summary['chords']}")
+    print()
+    _print_transition_stats(summary["total_transitions"], summary["desc_fourth"], summary["same_root"])
+
+    if args.show_matrix:
+        _print_matrix(index.matrix(args.match, smoothing=args.smoothing))
+
+    return 0
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="zt-gravity",
@@ -702,6 +811,104 @@ def build_arg_parser() -> argparse.ArgumentParser:
     )
     p_ex.set_defaults(func=cmd_explain)
 
+    # ngram-train subcommand
+    p_ngt = subparsers.add_parser(
+        "ngram-train",
+        help="Train a higher-order n-gram model from corpus files and save it (binary).",
+    )
+    p_ngt.add_argument(
+        "inputs",
+        nargs="+",
+        help="Corpus files: .json (any 'chords' lists) or text (one progression per line).",
+    )
+    p_ngt.add_argument(
+        "--order",
+        type=int,
+        default=3,
+        help="n-gram order (2 = first-order Markov; default: 3).",
+    )
+    p_ngt.add_argument(
+        "--kind",
+        choices=["roots", "root_quality"],
+        default="roots",
+        help="Token type: bare roots (default) or (root, quality) pairs.",
+    )
+    p_ngt.add_argument(
+        "--out",
+        required=True,
+        help="Output model file (e.g. corpus.ztng).",
+    )
+    p_ngt.set_defaults(func=cmd_ngram_train)
+
+    # ngram-sample subcommand
+    p_ngs = subparsers.add_parser(
+        "ngram-sample",
+        help="Continue a progression by sampling from a saved n-gram model.",
+    )
+    p_ngs.add_argument(
+        "--model",
+        required=True,
+        help="Model file written by ngram-train.",
+    )
+    p_ngs.add_argument(
+        "--start",
+        type=str,
+        default="",
+        help='Seed chords, e.g. "Dm7 G7" (default: sample the first chord).',
+    )
+    p_ngs.add_argument(
+        "--length",
+        type=int,
+        default=8,
+        help="Total number of chords to output (default: 8).",
+    )
+    p_ngs.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for reproducible output.",
+    )
+    p_ngs.set_defaults(func=cmd_ngram_sample)
+
+    # corpus-index subcommand
+    p_ci = subparsers.add_parser(
+        "corpus-index",
+        help="Incrementally index a directory of progressions and report aggregate statistics.",
+    )
+    p_ci.add_argument(
+        "--dir",
+        default=".",
+        help="Directory of .ztprog / .json / .txt progression files (default: current directory).",
+    )
+    p_ci.add_argument(
+        "--index",
+        default=None,
+        help="Index file (default: <dir>/.zt-gravity-index.json).",
+    )
+    p_ci.add_argument(
+        "--match",
+        action="append",
+        default=[],
+        help="Glob on paths relative to --dir, e.g. '*flamenco*' (repeatable; default: all files).",
+    )
+    p_ci.add_argument(
+        "--no-update",
+        action="store_true",
+        help="Query the existing index without rescanning the directory.",
+    )
+    p_ci.add_argument(
+        "--smoothing",
+        type=float,
+        default=0.1,
+        help="Laplace smoothing value for transition probabilities (default: 0.1).",
+    )
+    p_ci.add_argument(
+        "--show-matrix",
+        action="store_true",
+        help="Print the aggregate 12x12 transition probability matrix.",
+    )
+    p_ci.set_defaults(func=cmd_corpus_index)
+
     return parser
 
 
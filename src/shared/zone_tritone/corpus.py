@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import json
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Literal
 
 from .pc import pc_from_name
 from .types import PitchClass, RootSequence
 
+# n-gram token kinds: bare roots, or (root, quality) pairs
+TokenKind = Literal["roots", "root_quality"]
+RootQuality = tuple[PitchClass, str]
+
+# Roman numerals are read relative to a tonic of C (pc 0).
+_ROMAN_RE = re.compile(r"^([b#]?)(VII|VI|IV|V|III|II|I|vii|vi|iv|v|iii|ii|i)(.*)$")
+_ROMAN_DEGREE = {"I": 0, "II": 2, "III": 4, "IV": 5, "V": 7, "VI": 9, "VII": 11}
+
 
 # Very simple root extraction: read leading letter + optional #/b
 # This is intentionally conservative and can be improved later.
@@ -37,3 +49,103 @@ def chord_sequence_to_roots(chords: Sequence[str]) -> RootSequence:
         symbol = extract_root_symbol(ch)
         roots.append(pc_from_name(symbol))
     return roots
+
+
+def roman_root_and_quality(symbol: str) -> RootQuality:
+    """
+    Parse a Roman-numeral chord (tonic = C) into (root pc, quality suffix).
+
+    Lower-case numerals are minor; the quality gets an 'm' prefix unless the
+    suffix already names a minor/diminished quality.
+
+    Examples:
+        'V7' -> (7, '7')
+        'ii7' -> (2, 'm7')
+        'bVII7' -> (10, '7')
+    """
+    m = _ROMAN_RE.match(symbol.strip())
+    if not m:
+        raise ValueError(f"Unrecognized Roman numeral chord: {symbol!r}")
+    accidental, numeral, suffix = m.groups()
+    pc = _ROMAN_DEGREE[numeral.upper()]
+    if accidental == "b":
+        pc -= 1
+    elif accidental == "#":
+        pc += 1
+    if numeral.islower() and not suffix.startswith(("m", "dim", "o", "\u00f8")):
+        suffix = "m" + suffix
+    return pc % 12, suffix
+
+
+def chord_root_and_quality(symbol: str) -> RootQuality:
+    """
+    (root pc, quality suffix) for a letter-name or Roman-numeral chord symbol.
+
+    Examples:
+        'Dm7' -> (2, 'm7')
+        'Ebmaj7' -> (3, 'maj7')
+        'ii7' -> (2, 'm7')
+    """
+    symbol = symbol.strip()
+    if symbol[:1] in "ABCDEFG":
+        root = extract_root_symbol(symbol)
+        return pc_from_name(root), symbol[len(root):]
+    return roman_root_and_quality(symbol)
+
+
+def chord_tokens(chords: Sequence[str], kind: TokenKind = "roots") -> list[Any]:
+    """Convert chord symbols into n-gram tokens (roots or (root, quality))."""
+    if kind == "roots":
+        return [chord_root_and_quality(ch)[0] for ch in chords]
+    if kind == "root_quality":
+        return [chord_root_and_quality(ch) for ch in chords]
+    raise ValueError(f"Unknown token kind: {kind!r}")
+
+
+def _json_chord_lists(obj: Any) -> Iterator[list[str]]:
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key == "chords" and isinstance(value, str):
+                # .ztprog string form: "Cmaj7 Dm7 G7 Cmaj7" (as in zt_band.config)
+                chords = value.split()
+                if chords:
+                    yield chords
+            elif key == "chords" and isinstance(value, list) and all(isinstance(x, str) for x in value):
+                yield value
+            else:
+                yield from _json_chord_lists(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _json_chord_lists(item)
+
+
+def iter_corpus_progressions(paths: Iterable[str | Path]) -> Iterator[list[str]]:
+    """
+    Yield chord-symbol progressions from corpus files.
+
+    - .json: every ``"chords": [...]`` list of strings (or space-separated
+      ``"chords": "Cmaj7 Dm7"`` string), at any depth
+      (e.g. data/corpus/*.json backing_tracks / exercises)
+    - .ztprog / .yaml / .yml: same, after YAML parsing (.ztprog may be JSON)
+    - anything else: one progression per non-empty line of space-separated
+      chord symbols (same convention as ``zt-gravity analyze --file``)
+    """
+    for path in paths:
+        p = Path(path)
+        yield from parse_corpus_text(p.read_text(encoding="utf-8"), p.suffix)
+
+
+def parse_corpus_text(text: str, suffix: str) -> Iterator[list[str]]:
+    """iter_corpus_progressions() for already-read file content."""
+    suffix = suffix.lower()
+    if suffix == ".json":
+        yield from _json_chord_lists(json.loads(text))
+    elif suffix in (".ztprog", ".yaml", ".yml"):
+        import yaml  # type: ignore[import-not-found]
+
+        yield from _json_chord_lists(yaml.safe_load(text))
+    else:
+        for line in text.splitlines():
+            chords = line.split()
+            if chords:
+                yield chords
@@ -0,0 +1,294 @@
+"""
+Persistent, incremental analysis index over a directory of progressions.
+
+CorpusIndex stores, per source file (.ztprog, corpus .json, text chord
+files), the 12x12 root transition counts plus a few statistics, keyed by
+the file's content hash. update() re-reads only files whose size/mtime
+changed *and* whose sha256 differs, drops deleted files, and leaves the
+rest untouched. Aggregate queries ("transition matrix across all flamenco
+programs") merge stored counts and never touch the sources.
+
+The index is a single JSON file (default: <root>/.zt-gravity-index.json)
+written atomically.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+from .corpus import chord_tokens, parse_corpus_text
+from .markov import _add_transitions, normalize_transition_matrix
+from .types import Matrix
+
+INDEX_VERSION = 2  # 2: string-form "chords" in .ztprog are parsed
+DEFAULT_INDEX_NAME = ".zt-gravity-index.json"
+DEFAULT_SUFFIXES = (".ztprog", ".json", ".txt")
+
+
+@dataclass
+class IndexEntry:
+    """
+    Analysis of one source file.
+
+    counts is the dense 12x12 root transition matrix (from -> to); transitions
+    never span two progressions. error is set (and counts stay zero) when the
+    file could not be parsed.
+    """
+    path: str
+    sha256: str
+    size: int
+    mtime_ns: int
+    progressions: int = 0
+    skipped: int = 0
+    chords: int = 0
+    counts: list[list[int]] = field(default_factory=lambda: [[0] * 12 for _ in range(12)])
+    error: str | None = None
+
+    def to_json(self) -> dict[str, Any]:
+        d = asdict(self)
+        # Sparse on disk: [from, to, n] triples
+        d["counts"] = [[a, b, n] for a, row in enumerate(self.counts) for b, n in enumerate(row) if n]
+        return d
+
+    @classmethod
+    def from_json(cls, d: dict[str, Any]) -> IndexEntry:
+        counts = [[0] * 12 for _ in range(12)]
+        for a, b, n in d.get("counts", []):
+            counts[a][b] = n
+        return cls(**{**d, "counts": counts})
+
+
+@dataclass(frozen=True)
+class UpdateReport:
+    """Paths touched by CorpusIndex.update()."""
+    added: tuple[str, ...] = ()
+    changed: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    unchanged: int = 0
+
+    @property
+    def reparsed(self) -> int:
+        return len(self.added) + len(self.changed)
+
+
+def transition_stats(counts: Sequence[Sequence[int]]) -> dict[str, int]:
+    """
+    Same statistics as ``zt-gravity analyze``, from a count matrix.
+
+    desc_fourth counts motion up a 5th / down a 4th (interval 7).
+    """
+    return {
+        "total_transitions": sum(sum(row) for row in counts),
+        "desc_fourth": sum(counts[a][(a + 7) % 12] for a in range(12)),
+        "same_root": sum(counts[a][a] for a in range(12)),
+    }
+
+
+def analyze_source(text: str, suffix: str) -> tuple[list[list[int]], int, int, int]:
+    """
+    Parse one source's content into (counts, progressions, skipped, chords).
+
+    Progressions with an unrecognized chord symbol are skipped as a whole.
+    """
+    counts = [[0] * 12 for _ in range(12)]
+    progressions = skipped = chords = 0
+    for prog in parse_corpus_text(text, suffix):
+        try:
+            roots = chord_tokens(prog, kind="roots")
+        except ValueError:
+            skipped += 1
+            continue
+        _add_transitions(counts, roots)
+        progressions += 1
+        chords += len(roots)
+    return counts, progressions, skipped, chords
+
+
+class CorpusIndex:
+    """
+    Incremental transition-count index over a directory tree.
+
+    Parameters
+    ----------
+    root:
+        Directory scanned by update(); stored paths are relative to it.
+    index_path:
+        Index file (default: <root>/.zt-gravity-index.json).
+    suffixes:
+        File suffixes to index.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        index_path: str | Path | None = None,
+        suffixes: Sequence[str] = DEFAULT_SUFFIXES,
+    ) -> None:
+        self.root = Path(root)
+        self.index_path = Path(index_path) if index_path is not None else self.root / DEFAULT_INDEX_NAME
+        self.suffixes = tuple(s.lower() for s in suffixes)
+        self.entries: dict[str, IndexEntry] = {}
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def load(
+        cls,
+        root: str | Path,
+        index_path: str | Path | None = None,
+        suffixes: Sequence[str] = DEFAULT_SUFFIXES,
+    ) -> CorpusIndex:
+        """
+        Open an index, reading the index file if it exists (and matches INDEX_VERSION).
+
+        The index is only a cache: an unreadable, truncated or malformed file
+        is treated like a version mismatch and the index is rebuilt.
+        """
+        index = cls(root, index_path, suffixes)
+        if index.index_path.exists():
+            try:
+                data = json.loads(index.index_path.read_text(encoding="utf-8"))
+                if data.get("version") == INDEX_VERSION:
+                    index.entries = {
+                        e["path"]: IndexEntry.from_json(e) for e in data.get("entries", [])
+                    }
+            except (ValueError, OSError, KeyError, TypeError, AttributeError):
+                index.entries = {}
+        return index
+
+    def save(self) -> None:
+        """Write the index file atomically."""
+        payload = {
+            "version": INDEX_VERSION,
+            "entries": [self.entries[p].to_json() for p in sorted(self.entries)],
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=self.index_path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    # ------------------------------------------------------------------
+    # Incremental update
+    # ------------------------------------------------------------------
+
+    def _scan(self) -> list[Path]:
+        index_file = self.index_path.resolve()
+        found = []
+        for p in self.root.rglob("*"):
+            if p.suffix.lower() not in self.suffixes or not p.is_file():
+                continue
+            rel = p.relative_to(self.root)
+            if any(part.startswith(".") for part in rel.parts) or p.resolve() == index_file:
+                continue
+            found.append(p)
+        return sorted(found)
+
+    def update(self) -> UpdateReport:
+        """
+        Bring the index in line with the files under root.
+
+        Files whose size and mtime are unchanged are trusted without reading.
+        Otherwise the content is hashed; only a changed hash triggers a
+        re-parse (identical content elsewhere in the tree is reused).
+        """
+        by_hash = {e.sha256: e for e in self.entries.values() if e.error is None}
+        seen: set[str] = set()
+        added: list[str] = []
+        changed: list[str] = []
+        unchanged = 0
+
+        for path in self._scan():
+            rel = path.relative_to(self.root).as_posix()
+            seen.add(rel)
+            st = path.stat()
+            old = self.entries.get(rel)
+            if old is not None and old.size == st.st_size and old.mtime_ns == st.st_mtime_ns:
+                unchanged += 1
+                continue
+
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if old is not None and old.sha256 == digest:
+                old.size, old.mtime_ns = st.st_size, st.st_mtime_ns
+                unchanged += 1
+                continue
+
+            entry = IndexEntry(path=rel, sha256=digest, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            twin = by_hash.get(digest)
+            if twin is not None and Path(twin.path).suffix.lower() == path.suffix.lower():
+                entry.progressions, entry.skipped, entry.chords = twin.progressions, twin.skipped, twin.chords
+                entry.counts = [row[:] for row in twin.counts]
+            else:
+                try:
+                    counts, progs, skipped, chords = analyze_source(data.decode("utf-8"), path.suffix)
+                    entry.counts, entry.progressions, entry.skipped, entry.chords = counts, progs, skipped, chords
+                    by_hash[digest] = entry
+                except Exception as exc:  # noqa: BLE001
+                    entry.error = f"{type(exc).__name__}: {exc}"
+
+            self.entries[rel] = entry
+            (changed if old is not None else added).append(rel)
+
+        removed = sorted(set(self.entries) - seen)
+        for rel in removed:
+            del self.entries[rel]
+
+        return UpdateReport(
+            added=tuple(added), changed=tuple(changed), removed=tuple(removed), unchanged=unchanged
+        )
+
+    # ------------------------------------------------------------------
+    # Aggregate queries (no source access)
+    # ------------------------------------------------------------------
+
+    def select(self, patterns: Iterable[str] | None = None) -> list[IndexEntry]:
+        """
+        Entries whose relative path matches any glob pattern (all if None/empty).
+
+        Patterns use fnmatch, e.g. ``programs/flamenco*`` or ``*flamenco*``.
+        """
+        pats = list(patterns or [])
+        out = [self.entries[p] for p in sorted(self.entries)]
+        if not pats:
+            return out
+        return [e for e in out if any(fnmatch(e.path, pat) for pat in pats)]
+
+    def merged_counts(self, patterns: Iterable[str] | None = None) -> list[list[int]]:
+        """Sum of the 12x12 transition counts of the selected entries."""
+        merged = [[0] * 12 for _ in range(12)]
+        for e in self.select(patterns):
+            for a in range(12):
+                row, src = merged[a], e.counts[a]
+                for b in range(12):
+                    row[b] += src[b]
+        return merged
+
+    def matrix(self, patterns: Iterable[str] | None = None, smoothing: float = 0.0) -> Matrix:
+        """Row-stochastic transition matrix over the selected entries."""
+        return normalize_transition_matrix(self.merged_counts(patterns), smoothing=smoothing)
+
+    def summary(self, patterns: Iterable[str] | None = None) -> dict[str, Any]:
+        """File/progression/chord totals plus transition_stats() for the selection."""
+        selected = self.select(patterns)
+        return {
+            "files": len(selected),
+            "errors": sum(1 for e in selected if e.error),
+            "progressions": sum(e.progressions for e in selected),
+            "skipped": sum(e.skipped for e in selected),
+            "chords": sum(e.chords for e in selected),
+            **transition_stats(self.merged_counts(patterns)),
+        }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from .tables import GRAVITY_CYCLE
 from .tritones import is_tritone_pair
 from .types import PitchClass, TritoneAxis
 
@@ -63,9 +64,9 @@ def gravity_chain(root: PitchClass, steps: int) -> list[PitchClass]:
     -------
     list of pitch classes representing the chain.
     """
-    r = root % 12
-    chain: list[PitchClass] = [r]
-    for _ in range(steps):
-        r = (r - 7) % 12  # Move down by perfect 5th (7 semitones)
-        chain.append(r)
-    return chain
+    # Down a perfect 5th (7 semitones) per step; the chain repeats every 12.
+    cycle = GRAVITY_CYCLE[root % 12]
+    n = max(steps, 0) + 1
+    if n <= 12:
+        return list(cycle[:n])
+    return list(cycle * (n // 12 + 1))[:n]
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import random
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from itertools import accumulate
 
 from .types import Matrix, PitchClass, RootSequence
 
@@ -14,15 +17,18 @@ def build_transition_counts(roots: RootSequence) -> list[list[int]]:
     roots: sequence of integers 0-11.
     """
     counts: list[list[int]] = [[0 for _ in range(12)] for _ in range(12)]
-    if len(roots) < 2:
-        return counts
+    _add_transitions(counts, roots)
+    return counts
 
+
+def _add_transitions(counts: list[list[int]], roots: RootSequence) -> None:
+    if len(roots) < 2:
+        return
     prev = roots[0] % 12
     for r in roots[1:]:
         cur = r % 12
         counts[prev][cur] += 1
         prev = cur
-    return counts
 
 
 def normalize_transition_matrix(
@@ -78,13 +84,123 @@ def sample_next_root(
     if rng is None:
         rng = random
 
-    row = matrix[current % 12]
-    # Sampling via cumulative sum
-    x = rng.random()
-    cumulative = 0.0
-    for j, p in enumerate(row):
-        cumulative += p
-        if x <= cumulative:
-            return j
-    # Fallback in case of floating point quirks
-    return 11
+    # First j with x <= cumulative[j]
+    return _sample_row(tuple(accumulate(matrix[current % 12])), rng.random())
+
+
+def _sample_row(cum_row: Sequence[float], x: float) -> PitchClass:
+    j = bisect_left(cum_row, x)
+    # Fallback in case of floating point quirks (row sums to slightly < x)
+    return j if j < 12 else 11
+
+
+class MarkovModel:
+    """
+    First-order 12x12 root transition model.
+
+    Holds transition counts, the row-stochastic matrix (with Laplace
+    smoothing) and its cumulative rows, so sampling a root is one bisect
+    over 12 precomputed floats instead of a linear cumulative scan.
+
+    Sampling draws ``rng.random()`` once per step and picks the same root
+    as sample_next_root() for the same draw, so a seeded model reproduces
+    the function-based sampler exactly.
+
+    Usage:
+        model = MarkovModel.from_roots(roots, smoothing=0.1)
+        chain = model.sample_chain(start=7, length=32, seed=42)
+    """
+
+    __slots__ = ("counts", "smoothing", "_matrix", "_cum")
+
+    def __init__(self, counts: Sequence[Sequence[int]] | None = None, smoothing: float = 0.0) -> None:
+        self.counts: list[list[int]] = (
+            [list(row) for row in counts] if counts is not None else [[0] * 12 for _ in range(12)]
+        )
+        if len(self.counts) != 12 or any(len(row) != 12 for row in self.counts):
+            raise ValueError("MarkovModel counts must be a 12x12 matrix.")
+        self.smoothing = float(smoothing)
+        self._matrix: Matrix | None = None
+        self._cum: tuple[tuple[float, ...], ...] | None = None
+
+    @classmethod
+    def from_roots(cls, roots: RootSequence, smoothing: float = 0.0) -> MarkovModel:
+        """Build a model from one root sequence."""
+        return cls(build_transition_counts(roots), smoothing=smoothing)
+
+    @classmethod
+    def from_corpus(cls, sequences: Iterable[RootSequence], smoothing: float = 0.0) -> MarkovModel:
+        """Build a model from many root sequences (transitions never span sequences)."""
+        model = cls(smoothing=smoothing)
+        for roots in sequences:
+            model.update(roots)
+        return model
+
+    def update(self, roots: RootSequence) -> None:
+        """Add the transitions of another root sequence."""
+        _add_transitions(self.counts, roots)
+        self._matrix = None
+        self._cum = None
+
+    @property
+    def matrix(self) -> Matrix:
+        """Row-stochastic matrix; same values as normalize_transition_matrix()."""
+        if self._matrix is None:
+            self._matrix = normalize_transition_matrix(self.counts, smoothing=self.smoothing)
+        return self._matrix
+
+    @property
+    def cumulative(self) -> tuple[tuple[float, ...], ...]:
+        """Cumulative rows of the matrix (sampling lookup tables)."""
+        if self._cum is None:
+            self._cum = tuple(tuple(accumulate(row)) for row in self.matrix)
+        return self._cum
+
+    def sample_next(self, current: PitchClass, rng: random.Random | None = None) -> PitchClass:
+        """Sample one next root."""
+        if rng is None:
+            rng = random
+        return _sample_row(self.cumulative[current % 12], rng.random())
+
+    def sample_chain(
+        self,
+        start: PitchClass,
+        length: int,
+        *,
+        seed: int | None = None,
+        rng: random.Random | None = None,
+    ) -> list[PitchClass]:
+        """
+        Sample a chain of `length` roots beginning with start.
+
+        Pass either seed (a fresh random.Random(seed)) or an existing rng.
+        """
+        if length <= 0:
+            return []
+        if rng is None:
+            rng = random.Random(seed)
+        cum = self.cumulative
+        draw = rng.random
+        cur = start % 12
+        chain = [cur]
+        for _ in range(length - 1):
+            j = bisect_left(cum[cur], draw())
+            cur = j if j < 12 else 11
+            chain.append(cur)
+        return chain
+
+    def sample_chains(
+        self,
+        starts: Sequence[PitchClass],
+        length: int,
+        *,
+        seed: int | None = None,
+    ) -> list[list[PitchClass]]:
+        """
+        Sample one chain per start root from a single seeded stream.
+
+        Chains are drawn in order, so the result depends only on
+        (starts, length, seed).
+        """
+        rng = random.Random(seed)
+        return [self.sample_chain(s, length, rng=rng) for s in starts]
@@ -0,0 +1,284 @@
+"""
+Sparse higher-order n-gram models over root / (root, quality) sequences.
+
+MarkovModel (markov.py) is a dense first-order 12x12 model. NGramModel keeps
+counts for every context length 0..order-1 in dicts keyed by the context
+tuple, so only observed contexts cost memory; a 4th-order (root, quality)
+model over a large corpus stays small.
+
+Probabilities use interpolated Witten-Bell backoff: a context that has been
+seen T distinct continuations after c observations keeps c/(c+T) of the
+mass for its own counts and hands T/(c+T) to the next-shorter context, down
+to the unigram distribution. Unseen contexts back off entirely.
+
+Trained models serialize to a compact little-endian binary file
+(MAGIC "ZTNG") that loads without re-reading the JSON corpus.
+"""
+from __future__ import annotations
+
+import json
+import random
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Hashable, Iterable, Sequence
+from itertools import accumulate
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"ZTNG"
+FORMAT_VERSION = 1
+MAX_ORDER = 8
+
+# Bounded per-model cache of sampling distributions keyed by context.
+_DIST_CACHE_SIZE = 4096
+
+_HEADER = struct.Struct("<4sHHI")  # magic, version, order, vocab JSON length
+_LEVEL = struct.Struct("<I")       # entries in one context level
+_U32 = "I" if array("I").itemsize == 4 else "L"
+
+
+def _encode_token(tok: Hashable) -> Any:
+    return list(tok) if isinstance(tok, tuple) else tok
+
+
+def _decode_token(raw: Any) -> Hashable:
+    return tuple(raw) if isinstance(raw, list) else raw
+
+
+def _le(arr: array) -> array:
+    """Return arr in little-endian byte order (in place on big-endian hosts)."""
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        arr.byteswap()
+    return arr
+
+
+class NGramModel:
+    """
+    Sparse n-gram model with incremental training and backoff smoothing.
+
+    Parameters
+    ----------
+    order:
+        n of the n-gram (1 = unigram, 2 = first-order Markov, ... up to 8).
+        Contexts are the previous ``order - 1`` tokens.
+
+    Tokens can be any hashable, sortable value; the corpus helpers produce
+    pitch classes (``kind="roots"``) or ``(pc, quality)`` tuples.
+    """
+
+    __slots__ = ("order", "_levels", "_dist_cache")
+
+    def __init__(self, order: int = 2) -> None:
+        if not 1 <= order <= MAX_ORDER:
+            raise ValueError(f"order must be in 1..{MAX_ORDER} (got {order}).")
+        self.order = order
+        # _levels[k]: context tuple of length k -> {token: count}
+        self._levels: list[dict[tuple, dict[Hashable, int]]] = [{} for _ in range(order)]
+        self._dist_cache: dict[tuple, tuple[tuple[Hashable, ...], tuple[float, ...]]] = {}
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    def update(self, sequence: Iterable[Hashable]) -> None:
+        """Add all n-grams (every order up to self.order) of one sequence."""
+        seq = list(sequence)
+        levels = self._levels
+        max_ctx = self.order - 1
+        for i, tok in enumerate(seq):
+            for k in range(min(i, max_ctx) + 1):
+                row = levels[k].setdefault(tuple(seq[i - k:i]), {})
+                row[tok] = row.get(tok, 0) + 1
+        self._dist_cache.clear()
+
+    def update_many(self, sequences: Iterable[Iterable[Hashable]]) -> None:
+        """update() for each sequence; n-grams never span two sequences."""
+        for seq in sequences:
+            self.update(seq)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def vocab(self) -> list[Hashable]:
+        """Sorted list of observed tokens."""
+        return sorted(self._levels[0].get((), {}))
+
+    def __len__(self) -> int:
+        """Number of observed tokens (unigram count total)."""
+        return sum(self._levels[0].get((), {}).values())
+
+    def count(self, context: Sequence[Hashable], token: Hashable) -> int:
+        """Raw count of token after exactly this context (len < order)."""
+        ctx = tuple(context)
+        if len(ctx) >= self.order:
+            raise ValueError(f"context longer than order - 1 ({self.order - 1}).")
+        return self._levels[len(ctx)].get(ctx, {}).get(token, 0)
+
+    def num_contexts(self) -> int:
+        """Number of distinct stored contexts across all levels."""
+        return sum(len(level) for level in self._levels)
+
+    def _context(self, context: Sequence[Hashable]) -> tuple:
+        ctx = tuple(context)
+        keep = self.order - 1
+        return ctx[len(ctx) - keep:] if keep else ()
+
+    def distribution(self, context: Sequence[Hashable] = ()) -> dict[Hashable, float]:
+        """Smoothed next-token distribution after context (sums to 1)."""
+        tokens, cum = self._cumulative(self._context(context))
+        probs = [b - a for a, b in zip((0.0, *cum), cum)]
+        return dict(zip(tokens, probs))
+
+    def prob(self, token: Hashable, context: Sequence[Hashable] = ()) -> float:
+        """Smoothed P(token | context); 0.0 for tokens never observed."""
+        return self.distribution(context).get(token, 0.0)
+
+    def _cumulative(self, ctx: tuple) -> tuple[tuple[Hashable, ...], tuple[float, ...]]:
+        cached = self._dist_cache.get(ctx)
+        if cached is not None:
+            return cached
+
+        unigram = self._levels[0].get(())
+        if not unigram:
+            raise ValueError("NGramModel has no training data.")
+        tokens = tuple(sorted(unigram))
+        total = sum(unigram.values())
+        probs = [unigram[t] / total for t in tokens]
+
+        # Interpolate from the shortest suffix of ctx up to ctx itself.
+        for k in range(1, len(ctx) + 1):
+            row = self._levels[k].get(ctx[len(ctx) - k:])
+            if not row:
+                continue
+            c = sum(row.values())
+            t = len(row)
+            denom = c + t
+            probs = [(row.get(tok, 0) + t * p) / denom for tok, p in zip(tokens, probs)]
+
+        result = (tokens, tuple(accumulate(probs)))
+        if len(self._dist_cache) >= _DIST_CACHE_SIZE:
+            self._dist_cache.clear()
+        self._dist_cache[ctx] = result
+        return result
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def sample_next(self, context: Sequence[Hashable] = (), rng: random.Random | None = None) -> Hashable:
+        """Sample one token after context (bisect over cached cumulative row)."""
+        if rng is None:
+            rng = random
+        tokens, cum = self._cumulative(self._context(context))
+        j = bisect_left(cum, rng.random() * cum[-1])
+        return tokens[min(j, len(tokens) - 1)]
+
+    def generate(
+        self,
+        start: Sequence[Hashable],
+        length: int,
+        *,
+        seed: int | None = None,
+        rng: random.Random | None = None,
+    ) -> list[Hashable]:
+        """
+        Extend start to `length` tokens total (start included).
+
+        Pass either seed (a fresh random.Random(seed)) or an existing rng.
+        """
+        if rng is None:
+            rng = random.Random(seed)
+        out = list(start)
+        keep = self.order - 1
+        while len(out) < length:
+            ctx = tuple(out[len(out) - keep:]) if keep else ()
+            out.append(self.sample_next(ctx, rng))
+        return out[:max(length, 0)]
+
+    # ------------------------------------------------------------------
+    # Binary serialization
+    # ------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to the compact binary format.
+
+        Layout (little-endian):
+            header  <4sHHI  MAGIC, FORMAT_VERSION, order, len(vocab_json)
+            vocab   UTF-8 JSON list of tokens (tuples as lists)
+            per context level k = 0..order-1:
+                <I   n entries
+                u16  n * (k + 1) token ids (context ids then next-token id)
+                u32  n counts
+        """
+        vocab = self.vocab
+        if len(vocab) > 0xFFFF:
+            raise ValueError("NGramModel vocabulary too large to serialize (max 65535 tokens).")
+        ids = {tok: i for i, tok in enumerate(vocab)}
+        vocab_json = json.dumps([_encode_token(t) for t in vocab], separators=(",", ":")).encode("utf-8")
+
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, self.order, len(vocab_json)), vocab_json]
+        for level in self._levels:
+            entries = sorted(
+                (tuple(ids[c] for c in ctx) + (ids[tok],), n)
+                for ctx, row in level.items()
+                for tok, n in row.items()
+            )
+            id_arr = array("H", [i for key, _ in entries for i in key])
+            count_arr = array(_U32, [n for _, n in entries])
+            parts.append(_LEVEL.pack(len(entries)))
+            parts.append(_le(id_arr).tobytes())
+            parts.append(_le(count_arr).tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> NGramModel:
+        """Inverse of to_bytes()."""
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated n-gram model file.")
+        magic, version, order, vocab_len = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an n-gram model file (bad magic).")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported n-gram model format version {version}.")
+        try:
+            pos = _HEADER.size
+            vocab = [_decode_token(t) for t in json.loads(data[pos:pos + vocab_len].decode("utf-8"))]
+            pos += vocab_len
+
+            model = cls(order)
+            for k in range(order):
+                (n,) = _LEVEL.unpack_from(data, pos)
+                pos += _LEVEL.size
+                id_arr = array("H")
+                id_arr.frombytes(data[pos:pos + 2 * n * (k + 1)])
+                pos += 2 * n * (k + 1)
+                count_arr = array(_U32)
+                count_arr.frombytes(data[pos:pos + 4 * n])
+                pos += 4 * n
+                _le(id_arr)
+                _le(count_arr)
+                if len(id_arr) != n * (k + 1) or len(count_arr) != n:
+                    raise ValueError("Truncated n-gram model file.")
+
+                level = model._levels[k]
+                width = k + 1
+                for e in range(n):
+                    key = id_arr[e * width:(e + 1) * width]
+                    ctx = tuple(vocab[i] for i in key[:-1])
+                    level.setdefault(ctx, {})[vocab[key[-1]]] = count_arr[e]
+        except (struct.error, IndexError, TypeError) as e:
+            raise ValueError("Corrupt n-gram model file.") from e
+        return model
+
+    def save(self, path: str | Path) -> None:
+        """Write the binary model file."""
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> NGramModel:
+        """Read a binary model file written by save()."""
+        return cls.from_bytes(Path(path).read_bytes())
@@ -0,0 +1,141 @@
+"""
+Precomputed Z_12 lookup tables.
+
+Every zone / tritone / interval fact in this package depends only on two
+pitch classes mod 12, so the whole space is 12 entries (per pc) or 12x12
+(per ordered pair). The tables are built once at import and are immutable
+tuples; index them with ``pc % 12``.
+
+Per-pc tables (12 entries):
+    ZONE, ZONE_NAME, TRITONE_PARTNER, TRITONE_AXIS, GRAVITY_TARGET, GRAVITY_CYCLE
+
+Per-pair tables (12x12, ``TABLE[a][b]`` describes the motion a -> b):
+    INTERVAL, INTERVAL_CLASS, IS_SAME_ZONE, IS_HALF_STEP, IS_WHOLE_STEP,
+    IS_TRITONE, IS_DESC_FOURTH, IS_ASC_FOURTH, IS_GRAVITY_TARGET, TRANSITION
+
+Bulk helpers classify a whole root sequence in one call.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import NamedTuple, TypeVar
+
+from .types import PitchClass, RootSequence, TritoneAxis
+
+_T = TypeVar("_T")
+
+_PCS = range(12)
+
+
+def _pair_table(fn: Callable[[int, int], _T]) -> tuple[tuple[_T, ...], ...]:
+    return tuple(tuple(fn(a, b) for b in _PCS) for a in _PCS)
+
+
+# ---------------------------------------------------------------------------
+# Per pitch class
+# ---------------------------------------------------------------------------
+
+ZONE: tuple[int, ...] = tuple(pc % 2 for pc in _PCS)
+ZONE_NAME: tuple[str, ...] = tuple("Zone 1" if z == 0 else "Zone 2" for z in ZONE)
+TRITONE_PARTNER: tuple[PitchClass, ...] = tuple((pc + 6) % 12 for pc in _PCS)
+TRITONE_AXIS: tuple[TritoneAxis, ...] = tuple(
+    (min(pc, (pc + 6) % 12), max(pc, (pc + 6) % 12)) for pc in _PCS
+)
+
+# Next root on the gravity chain (down a perfect 5th: R -> R - 7).
+GRAVITY_TARGET: tuple[PitchClass, ...] = tuple((pc - 7) % 12 for pc in _PCS)
+
+
+def _cycle_from(pc: int) -> tuple[PitchClass, ...]:
+    out = [pc]
+    for _ in range(11):
+        out.append(GRAVITY_TARGET[out[-1]])
+    return tuple(out)
+
+
+# The full 12-step gravity cycle starting at each pc.
+GRAVITY_CYCLE: tuple[tuple[PitchClass, ...], ...] = tuple(_cycle_from(pc) for pc in _PCS)
+
+
+# ---------------------------------------------------------------------------
+# Per ordered pair (a -> b)
+# ---------------------------------------------------------------------------
+
+INTERVAL: tuple[tuple[int, ...], ...] = _pair_table(lambda a, b: (b - a) % 12)
+INTERVAL_CLASS: tuple[tuple[int, ...], ...] = _pair_table(
+    lambda a, b: min(INTERVAL[a][b], 12 - INTERVAL[a][b])
+)
+IS_SAME_ZONE: tuple[tuple[bool, ...], ...] = _pair_table(lambda a, b: ZONE[a] == ZONE[b])
+IS_HALF_STEP: tuple[tuple[bool, ...], ...] = _pair_table(lambda a, b: INTERVAL[a][b] in (1, 11))
+IS_WHOLE_STEP: tuple[tuple[bool, ...], ...] = _pair_table(lambda a, b: INTERVAL[a][b] in (2, 10))
+IS_TRITONE: tuple[tuple[bool, ...], ...] = _pair_table(lambda a, b: INTERVAL[a][b] == 6)
+# Same conventions as the explain/analyze CLI: 7 st up == down a 4th.
+IS_DESC_FOURTH: tuple[tuple[bool, ...], ...] = _pair_table(lambda a, b: INTERVAL[a][b] == 7)
+IS_ASC_FOURTH: tuple[tuple[bool, ...], ...] = _pair_table(lambda a, b: INTERVAL[a][b] == 5)
+IS_GRAVITY_TARGET: tuple[tuple[bool, ...], ...] = _pair_table(lambda a, b: GRAVITY_TARGET[a] == b)
+
+
+class Transition(NamedTuple):
+    """Everything the tables know about the root motion a -> b."""
+    from_root: PitchClass
+    to_root: PitchClass
+    interval: int
+    interval_class: int
+    from_zone: int
+    to_zone: int
+    same_zone: bool
+    half_step: bool
+    whole_step: bool
+    tritone: bool
+    desc_fourth: bool
+    asc_fourth: bool
+    gravity_target: bool
+
+
+TRANSITION: tuple[tuple[Transition, ...], ...] = _pair_table(
+    lambda a, b: Transition(
+        from_root=a,
+        to_root=b,
+        interval=INTERVAL[a][b],
+        interval_class=INTERVAL_CLASS[a][b],
+        from_zone=ZONE[a],
+        to_zone=ZONE[b],
+        same_zone=IS_SAME_ZONE[a][b],
+        half_step=IS_HALF_STEP[a][b],
+        whole_step=IS_WHOLE_STEP[a][b],
+        tritone=IS_TRITONE[a][b],
+        desc_fourth=IS_DESC_FOURTH[a][b],
+        asc_fourth=IS_ASC_FOURTH[a][b],
+        gravity_target=IS_GRAVITY_TARGET[a][b],
+    )
+)
+
+
+# ---------------------------------------------------------------------------
+# Bulk variants
+# ---------------------------------------------------------------------------
+
+def zones_of(roots: RootSequence) -> list[int]:
+    """Zone index (0/1) of every root."""
+    return [ZONE[r % 12] for r in roots]
+
+
+def tritone_axes_of(roots: RootSequence) -> list[TritoneAxis]:
+    """Canonical tritone axis containing every root."""
+    return [TRITONE_AXIS[r % 12] for r in roots]
+
+
+def intervals_of(roots: RootSequence) -> list[int]:
+    """Interval (mod 12) of every consecutive pair; len(roots) - 1 entries."""
+    pcs = [r % 12 for r in roots]
+    return [INTERVAL[a][b] for a, b in zip(pcs, pcs[1:])]
+
+
+def classify_transitions(roots: RootSequence) -> list[Transition]:
+    """
+    Classify every consecutive root motion in one pass.
+
+    Returns one Transition per pair (i -> i+1); roots are reduced mod 12.
+    """
+    pcs = [r % 12 for r in roots]
+    return [TRANSITION[a][b] for a, b in zip(pcs, pcs[1:])]
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
+from .tables import IS_TRITONE, TRITONE_AXIS, TRITONE_PARTNER
 from .types import PitchClass, TritoneAxis
-from .zones import interval, is_same_zone
+from .zones import is_same_zone
 
 
 def tritone_partner(pc: PitchClass) -> PitchClass:
     """
     Return the pitch class at tritone distance from pc (pc + 6 mod 12).
     """
-    return (pc + 6) % 12
+    return TRITONE_PARTNER[pc % 12]
 
 
 def tritone_axis(pc: PitchClass) -> TritoneAxis:
@@ -17,15 +18,14 @@ def tritone_axis(pc: PitchClass) -> TritoneAxis:
 
     Note: Both members of the axis always lie in the same zone (parity).
     """
-    partner = tritone_partner(pc)
-    return tuple(sorted((pc % 12, partner)))  # type: ignore[return-value]
+    return TRITONE_AXIS[pc % 12]
 
 
 def is_tritone_pair(a: PitchClass, b: PitchClass) -> bool:
     """
     Return True if (a, b) form a tritone, i.e. differ by 6 semitones mod 12.
     """
-    return interval(a, b) in (6,)
+    return IS_TRITONE[a % 12][b % 12]
 
 
 def all_tritone_axes() -> list[TritoneAxis]:
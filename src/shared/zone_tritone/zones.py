@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from .tables import IS_HALF_STEP, IS_SAME_ZONE, IS_WHOLE_STEP, ZONE_NAME
 from .types import PitchClass
 
 
@@ -15,17 +16,17 @@ def zone(pc: PitchClass) -> int:
 
 def zone_name(pc: PitchClass) -> str:
     """Human-readable zone label."""
-    return "Zone 1" if zone(pc) == 0 else "Zone 2"
+    return ZONE_NAME[pc % 12]
 
 
 def is_same_zone(a: PitchClass, b: PitchClass) -> bool:
     """Return True if both pitch classes lie in the same zone."""
-    return zone(a) == zone(b)
+    return IS_SAME_ZONE[a % 12][b % 12]
 
 
 def is_zone_cross(a: PitchClass, b: PitchClass) -> bool:
     """Return True if the interval crosses zones (i.e. a semitone offset)."""
-    return not is_same_zone(a, b)
+    return not IS_SAME_ZONE[a % 12][b % 12]
 
 
 def interval(pc1: PitchClass, pc2: PitchClass) -> int:
@@ -35,11 +36,9 @@ def interval(pc1: PitchClass, pc2: PitchClass) -> int:
 
 def is_half_step(a: PitchClass, b: PitchClass) -> bool:
     """Return True if the interval between a and b is a semitone (^ or v)."""
-    d = interval(a, b)
-    return d in (1, 11)
+    return IS_HALF_STEP[a % 12][b % 12]
 
 
 def is_whole_step(a: PitchClass, b: PitchClass) -> bool:
     """Return True if the interval between a and b is a whole step (^ or v)."""
-    d = interval(a, b)
-    return d in (2, 10)
+    return IS_WHOLE_STEP[a % 12][b % 12]
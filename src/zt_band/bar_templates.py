@@ -0,0 +1,266 @@
+"""
+Compiled bar templates: memoized, fully post-processed events for one bar.
+
+Everything generate_accompaniment() does inside a bar depends only on the
+style (after overrides), the chord quality and where the bar starts relative
+to the 4-beat grid used by the velocity stages. Chord roots only transpose
+pitches. A BarTemplate captures the result of comp hits, ghost hits, velocity
+contour and velocity profile for one such combination, so rendering a
+progression becomes offsetting and transposing cached templates.
+
+Cache keys:
+    style:   (style_name, overrides_key)
+    bar:     (style_name, overrides_key, quality, phase)
+
+``phase`` is ``bar_start_beats % 4.0``. In 4/4 it is always 0.0; other meters
+cycle through a handful of phases (e.g. 3/4 -> 0, 3, 2, 1), each compiled once.
+
+Call clear_template_cache() after mutating STYLE_REGISTRY at runtime.
+"""
+from __future__ import annotations
+
+import json
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from .chords import Chord, chord_pitches
+from .event_buffer import EventBuffer
+from .expressive_layer import apply_velocity_profile_buffer
+from .ghost_layer import GhostSpec, add_ghost_hits_buffer
+from .musical_contract import validate_event_buffer
+from .patterns import STYLE_REGISTRY, StylePattern
+from .velocity_contour import VelContour, apply_velocity_contour_buffer
+
+# Bounded LRU sizes. A style has at most 5 qualities x a few phases.
+STYLE_CACHE_SIZE = 128
+TEMPLATE_CACHE_SIZE = 1024
+
+# Override keys read by engine._apply_style_overrides (everything else, e.g.
+# technique_tags, does not affect bar content and is left out of the key).
+_STYLE_OVERRIDE_KEYS = (
+    "ghost_hits",
+    "ghost",
+    "ghost_steps",
+    "ghost_vel",
+    "ghost_len_beats",
+    "vel_contour",
+    "vel_contour_enabled",
+    "vel_contour_soft",
+    "vel_contour_strong",
+    "vel_contour_pickup",
+    "vel_contour_ghost",
+    "pickup_beat",
+    "pickup_vel",
+)
+
+# Template pitches are stored relative to the root at this reference pc.
+_REF_ROOT_PC = 0
+_REF_OCTAVE = 4
+
+
+@dataclass(frozen=True)
+class CompiledStyle:
+    """A resolved StylePattern plus the per-style objects the bar loop needs."""
+    style: StylePattern
+    ghost_spec: GhostSpec | None
+    contour: VelContour | None
+    pickup_steps: frozenset[int]
+    ghost_steps: frozenset[int]
+
+
+@dataclass(frozen=True)
+class BarTemplate:
+    """
+    Post-processed events of one bar, relative to the bar start and chord root.
+
+    comp_intervals are semitones above the comping root (octave 4); bass
+    events always sound the bass root. Velocities are final (contour and
+    velocity profile already applied).
+    """
+    comp_rel: tuple[float, ...]
+    comp_dur: tuple[float, ...]
+    comp_intervals: tuple[int, ...]
+    comp_vel: tuple[int, ...]
+    bass_rel: tuple[float, ...]
+    bass_dur: tuple[float, ...]
+    bass_vel: tuple[int, ...]
+
+    def comp_notes(self, root_midi: int) -> list[int]:
+        """Transpose comp intervals onto a concrete root."""
+        return [root_midi + i for i in self.comp_intervals]
+
+
+def style_overrides_key(style_overrides: dict[str, Any] | None) -> str:
+    """
+    Canonical, hashable key for the style-affecting part of style_overrides.
+
+    Returns "" when no style-affecting override is present.
+    """
+    if not style_overrides:
+        return ""
+    relevant = {k: style_overrides[k] for k in _STYLE_OVERRIDE_KEYS if k in style_overrides}
+    if not relevant:
+        return ""
+    return json.dumps(relevant, sort_keys=True, separators=(",", ":"), default=str)
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def compile_style(style_name: str, overrides_key: str = "") -> CompiledStyle:
+    """
+    Resolve STYLE_REGISTRY[style_name] with overrides (memoized).
+
+    Raises:
+        ValueError: If style_name is not registered.
+    """
+    # Local import: engine imports this module.
+    from .engine import _apply_style_overrides
+
+    if style_name not in STYLE_REGISTRY:
+        raise ValueError(f"Unknown style: {style_name}")
+
+    style: StylePattern = STYLE_REGISTRY[style_name]
+    if overrides_key:
+        style = _apply_style_overrides(style, json.loads(overrides_key))
+
+    ghost_spec = None
+    if style.ghost_vel > 0 and style.ghost_steps:
+        ghost_spec = GhostSpec(
+            ghost_vel=style.ghost_vel,
+            ghost_steps=style.ghost_steps,
+            ghost_len_beats=style.ghost_len_beats,
+        )
+
+    contour = None
+    pickup_steps: set[int] = set()
+    if style.vel_contour_enabled:
+        contour = VelContour(
+            enabled=True,
+            soft_mul=style.vel_contour_soft,
+            strong_mul=style.vel_contour_strong,
+            pickup_mul=style.vel_contour_pickup,
+            ghost_mul=style.vel_contour_ghost,
+        )
+        if style.pickup_beat is not None:
+            # Convert pickup beat to 16th-note step: &4 = 3.5 -> step 14
+            pickup_steps.add(int(style.pickup_beat * 4))
+
+    return CompiledStyle(
+        style=style,
+        ghost_spec=ghost_spec,
+        contour=contour,
+        pickup_steps=frozenset(pickup_steps),
+        ghost_steps=frozenset(style.ghost_steps or ()),
+    )
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_bar_template(
+    style_name: str,
+    overrides_key: str,
+    quality: str,
+    phase: float = 0.0,
+) -> BarTemplate:
+    """
+    Build (memoized) the post-processed bar template for one chord quality.
+
+    The raw (pre-profile) events are validated here; the checked fields
+    (duration, velocity, channel) do not depend on root or bar position, and
+    every root keeps comping pitches inside 0..127.
+
+    Raises:
+        ValueError: If style_name is not registered.
+        ContractViolation: If the style produces invalid raw events.
+    """
+    compiled = compile_style(style_name, overrides_key)
+    style = compiled.style
+
+    ref_chord = Chord(symbol="", root_pc=_REF_ROOT_PC, quality=quality, extensions=[])
+    pitches = chord_pitches(ref_chord, octave=_REF_OCTAVE)
+    ref_root = _REF_ROOT_PC + _REF_OCTAVE * 12
+
+    # Lay the bar out at offset 0.0 so start columns are the exact relative beats.
+    comp = EventBuffer()
+    comp.extend_pattern(
+        0.0,
+        [spec.beat for spec in style.comp_hits for _ in pitches],
+        [spec.length_beats for spec in style.comp_hits for _ in pitches],
+        list(pitches) * len(style.comp_hits),
+        [spec.velocity for spec in style.comp_hits for _ in pitches],
+        channel=0,
+    )
+    if compiled.ghost_spec is not None:
+        add_ghost_hits_buffer(
+            comp,
+            chord_pitches=pitches,
+            bar_start_beats=0.0,
+            beats_per_bar=4,
+            ghost_spec=compiled.ghost_spec,
+            comp_channel=0,
+        )
+
+    bass = EventBuffer()
+    bass.extend_pattern(
+        0.0,
+        [beat for beat, _length, _vel in style.bass_pattern],
+        [length for _beat, length, _vel in style.bass_pattern],
+        [ref_root - 24] * len(style.bass_pattern),
+        [vel for _beat, _length, vel in style.bass_pattern],
+        channel=1,
+    )
+
+    # Velocity stages read absolute start % 4, so evaluate them on the
+    # bar's phase within the 4-beat grid.
+    comp_vel = _shaped_velocities(comp, phase, compiled, contour_applies=True)
+    bass_vel = _shaped_velocities(bass, phase, compiled, contour_applies=False)
+
+    return BarTemplate(
+        comp_rel=tuple(comp.start),
+        comp_dur=tuple(comp.duration),
+        comp_intervals=tuple(n - ref_root for n in comp.note),
+        comp_vel=comp_vel,
+        bass_rel=tuple(bass.start),
+        bass_dur=tuple(bass.duration),
+        bass_vel=bass_vel,
+    )
+
+
+def _shaped_velocities(
+    rel: EventBuffer,
+    phase: float,
+    compiled: CompiledStyle,
+    *,
+    contour_applies: bool,
+) -> tuple[int, ...]:
+    """Run contour (comp only), raw validation and velocity profile at a phase."""
+    shadow = rel.copy()
+    shadow.start = array("d", [phase + r for r in rel.start])
+
+    if contour_applies and compiled.contour is not None:
+        apply_velocity_contour_buffer(
+            shadow,
+            meter="4/4",
+            bar_steps=16,
+            contour=compiled.contour,
+            pickup_steps=set(compiled.pickup_steps),
+            ghost_steps=set(compiled.ghost_steps),
+        )
+
+    validate_event_buffer(shadow)
+    apply_velocity_profile_buffer(shadow)
+    return tuple(shadow.velocity)
+
+
+def template_cache_info() -> dict[str, Any]:
+    """Hit/miss/size counters for the style and bar template caches."""
+    return {
+        "style": compile_style.cache_info()._asdict(),
+        "bar": compile_bar_template.cache_info()._asdict(),
+    }
+
+
+def clear_template_cache() -> None:
+    """Drop all compiled styles and bar templates."""
+    compile_style.cache_clear()
+    compile_bar_template.cache_clear()
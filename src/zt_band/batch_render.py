@@ -0,0 +1,243 @@
+"""
+Parallel batch renderer for .ztprog programs and .ztex exercises.
+
+Fans render jobs out over a ProcessPoolExecutor. Each job renders into a
+private temporary directory next to its final location and is moved into
+place with os.replace(), so readers never observe a half-written MIDI or
+sidecar. Rendering is deterministic, so output bytes do not depend on the
+worker count (workers=1 renders serially in-process).
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .config import ProgramConfig, load_program_config
+from .engine import generate_accompaniment
+from .render_cache import RenderCache, cached_render
+
+BATCH_SUFFIXES = (".ztprog", ".ztex")
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """
+    One render job: a source file and its final MIDI path.
+
+    cache_dir=None with use_cache=True uses the default render cache.
+    """
+    source: str
+    outfile: str
+    midi_writer: str = "mido"
+    use_cache: bool = True
+    cache_dir: str | None = None
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one job.
+
+    - ok:      True when the MIDI (and any sidecar) was written
+    - cached:  True when the files were copied from the render cache
+    - seconds: wall time spent in the job (load + render + write)
+    - sha256:  digest of the written MIDI bytes (determinism checks)
+    - files:   final paths written (MIDI first, then sidecars)
+    """
+    source: str
+    outfile: str
+    ok: bool
+    seconds: float
+    cached: bool = False
+    sha256: str | None = None
+    bytes: int = 0
+    files: tuple[str, ...] = ()
+    error: str | None = None
+
+
+def discover_batch_inputs(target: str | Path) -> list[Path]:
+    """
+    Expand a directory (recursive) or glob pattern into sorted source files.
+
+    Only .ztprog and .ztex files are returned.
+    """
+    t = Path(target)
+    if t.is_dir():
+        found = [p for p in t.rglob("*") if p.suffix in BATCH_SUFFIXES and p.is_file()]
+    elif t.is_file():
+        found = [t]
+    else:
+        found = [Path(p) for p in glob.glob(str(target), recursive=True)]
+        found = [p for p in found if p.suffix in BATCH_SUFFIXES and p.is_file()]
+    return sorted(set(found))
+
+
+def plan_batch(
+    sources: list[Path],
+    out_dir: str | Path,
+    *,
+    midi_writer: str = "mido",
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
+) -> list[BatchJob]:
+    """
+    Map sources to output paths under out_dir, mirroring their layout
+    relative to the sources' common parent directory.
+
+    Sources that share a stem (e.g. g_lick_1.ztex and g_lick_1.ztprog) keep
+    their suffix (g_lick_1.ztex.mid, g_lick_1.ztprog.mid) so no two jobs
+    write the same file.
+    """
+    if not sources:
+        return []
+    root = Path(os.path.commonpath([str(p.parent.resolve()) for p in sources]))
+    out = Path(out_dir)
+    rels = [src.resolve().relative_to(root) for src in sources]
+    stem_counts: dict[Path, int] = {}
+    for rel in rels:
+        stem_counts[rel.with_suffix("")] = stem_counts.get(rel.with_suffix(""), 0) + 1
+    jobs: list[BatchJob] = []
+    for src, rel in zip(sources, rels):
+        if stem_counts[rel.with_suffix("")] > 1:
+            rel_out = rel.with_name(rel.name + ".mid")
+        else:
+            rel_out = rel.with_suffix(".mid")
+        jobs.append(
+            BatchJob(
+                source=str(src),
+                outfile=str(out / rel_out),
+                midi_writer=midi_writer,
+                use_cache=use_cache,
+                cache_dir=str(cache_dir) if cache_dir is not None else None,
+            )
+        )
+    return jobs
+
+
+def _load_program(source: Path) -> ProgramConfig:
+    if source.suffix == ".ztex":
+        from .exercises import load_exercise_config
+
+        ex = load_exercise_config(source)
+        if not ex.program_path.exists():
+            raise FileNotFoundError(f"Exercise program config not found: {ex.program_path}")
+        return load_program_config(ex.program_path)
+    return load_program_config(source)
+
+
+def _style_args(cfg: ProgramConfig) -> tuple[str, dict[str, Any] | None]:
+    # Handle style as string OR dict with overrides
+    if isinstance(cfg.style, dict):
+        style_name = cfg.style.get("comp") or cfg.style.get("name") or cfg.style.get("style", "")
+        if not style_name:
+            raise ValueError("style dict must contain 'comp' (or 'name'/'style') key specifying base style name.")
+        return style_name, cfg.style
+    return cfg.style, None
+
+
+def render_job(job: BatchJob) -> BatchResult:
+    """Render one job atomically. Never raises; failures are reported in the result."""
+    t0 = time.perf_counter()
+    final = Path(job.outfile)
+    tmp_dir: str | None = None
+    try:
+        cfg = _load_program(Path(job.source))
+        style_name, style_overrides = _style_args(cfg)
+
+        final.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".render-", dir=final.parent)
+        tmp_out = Path(tmp_dir) / final.name
+
+        render_inputs = {
+            "chord_symbols": cfg.chords,
+            "style_name": style_name,
+            "tempo_bpm": cfg.tempo,
+            "bars_per_chord": cfg.bars_per_chord,
+            "tritone_mode": cfg.tritone_mode,
+            "tritone_strength": cfg.tritone_strength,
+            "tritone_seed": cfg.tritone_seed,
+            "style_overrides": style_overrides,
+        }
+        cache = RenderCache(job.cache_dir) if job.use_cache else None
+        hit = cached_render(
+            cache,
+            tmp_out,
+            lambda: generate_accompaniment(
+                outfile=str(tmp_out), midi_writer=job.midi_writer, **render_inputs
+            ),
+            **render_inputs,
+        )
+
+        data = tmp_out.read_bytes()
+        # MIDI first, then any sidecars written next to it
+        produced = [tmp_out] + sorted(p for p in Path(tmp_dir).iterdir() if p != tmp_out)
+        written: list[str] = []
+        for p in produced:
+            dest = final.parent / p.name
+            os.replace(p, dest)
+            written.append(str(dest))
+
+        return BatchResult(
+            source=job.source,
+            outfile=job.outfile,
+            ok=True,
+            seconds=round(time.perf_counter() - t0, 6),
+            cached=hit,
+            sha256=hashlib.sha256(data).hexdigest(),
+            bytes=len(data),
+            files=tuple(written),
+        )
+    except Exception as exc:  # noqa: BLE001
+        return BatchResult(
+            source=job.source,
+            outfile=job.outfile,
+            ok=False,
+            seconds=round(time.perf_counter() - t0, 6),
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def render_batch(jobs: list[BatchJob], *, workers: int | None = None) -> dict[str, Any]:
+    """
+    Render jobs with up to `workers` processes and return a JSON-ready summary.
+
+    Results are reported in job order regardless of completion order.
+    workers=None uses os.cpu_count(); workers<=1 renders serially in-process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs) or 1))
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [render_job(job) for job in jobs]
+    else:
+        # Chunk so tiny jobs do not pay one IPC round trip each
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(render_job, jobs, chunksize=chunksize))
+    wall = time.perf_counter() - t0
+
+    ok = sum(1 for r in results if r.ok)
+    return {
+        "version": 1,
+        "workers": workers,
+        "total": len(results),
+        "ok": ok,
+        "failed": len(results) - ok,
+        "cached": sum(1 for r in results if r.cached),
+        "wall_seconds": round(wall, 6),
+        "cpu_seconds": round(sum(r.seconds for r in results), 6),
+        "items": [asdict(r) for r in results],
+    }
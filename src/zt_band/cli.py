@@ -10,20 +10,23 @@ import yaml
 
 from shared.zone_tritone.pc import name_from_pc
 
+from .batch_render import discover_batch_inputs, plan_batch, render_batch
 from .config import load_program_config
 from .daw_export import export_for_daw
 from .engine import generate_accompaniment
 from .exercises import load_exercise_config, run_exercise
 from .expressive_swing import ExpressiveSpec
 from .gravity_bridge import annotate_progression, compute_transitions
+from .midi_out import MIDI_WRITERS
 from .patterns import STYLE_REGISTRY
-from .playlist import load_playlist, render_playlist_to_midi
+from .playlist import load_playlist, playlist_render_inputs, render_playlist_to_midi
 from .programs import discover_programs
+from .render_cache import RenderCache, cached_render
 from .realtime import RtSpec, list_midi_ports, practice_lock_to_clave, rt_play_cycle
 from .rt_bridge import (
     RtRenderSpec,
-    gm_program_changes_at_start,
-    note_events_to_step_messages,
+    gm_program_changes_raw,
+    note_events_to_step_raw,
     truncate_events_to_cycle,
 )
 from .validate import format_issues_json, format_issues_text, validate_ztprog_file
@@ -275,6 +278,20 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=None,
         help="Seed for reproducible humanization. Ignored if --config is used.",
     )
+    p_create.add_argument(
+        "--midi-writer",
+        choices=list(MIDI_WRITERS),
+        default="mido",
+        help=(
+            "MIDI file backend: 'mido' (default) or 'fast' (direct byte encoder, "
+            "identical output, no per-message objects)."
+        ),
+    )
+    p_create.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-render; do not read or write the render cache (see: zt-band cache).",
+    )
     p_create.set_defaults(func=cmd_create)
 
     # ---- annotate subcommand ----
@@ -411,8 +428,86 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional override for playlist outfile (e.g. session.mid).",
     )
+    p_play.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Write each playlist item to disk as it is rendered (bounded memory "
+            "for very long sessions; identical output)."
+        ),
+    )
+    p_play.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-render; do not read or write the render cache.",
+    )
     p_play.set_defaults(func=cmd_play)
 
+    # ---- render-batch subcommand ----
+    p_batch = subparsers.add_parser(
+        "render-batch",
+        help="Render many .ztprog/.ztex files in parallel into an output directory.",
+    )
+    p_batch.add_argument(
+        "inputs",
+        nargs="+",
+        help="Directories (scanned recursively) or glob patterns, e.g. 'programs/**/*.ztprog'.",
+    )
+    p_batch.add_argument(
+        "--out-dir",
+        type=str,
+        required=True,
+        help="Output directory; source layout is mirrored underneath it.",
+    )
+    p_batch.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count; 1 = serial in-process).",
+    )
+    p_batch.add_argument(
+        "--midi-writer",
+        choices=MIDI_WRITERS,
+        default="mido",
+        help="MIDI file writer backend (default: mido).",
+    )
+    p_batch.add_argument(
+        "--summary",
+        type=str,
+        default=None,
+        help="Write the JSON summary to this file instead of stdout.",
+    )
+    p_batch.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-render; do not read or write the render cache.",
+    )
+    p_batch.set_defaults(func=cmd_render_batch)
+
+    # ---- cache subcommand ----
+    p_cache = subparsers.add_parser(
+        "cache",
+        help="Inspect or prune the on-disk render cache.",
+    )
+    p_cache.add_argument(
+        "action",
+        choices=["stats", "prune"],
+        help="'stats' prints entry count and size; 'prune' evicts least-recently-used entries.",
+    )
+    p_cache.add_argument(
+        "--dir",
+        type=str,
+        default=None,
+        help="Cache directory (default: $ZT_BAND_CACHE_DIR or ~/.cache/zt-band/renders).",
+    )
+    p_cache.add_argument(
+        "--max-mb",
+        type=float,
+        default=None,
+        help="Size budget for 'prune' in MiB (default: the cache limit; 0 empties the cache).",
+    )
+    p_cache.set_defaults(func=cmd_cache)
+
     # ---- ex-list subcommand ----
     p_ex_list = subparsers.add_parser(
         "ex-list",
@@ -496,6 +591,57 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=True,
         help="Send MIDI panic (CC 120/121/123/64) on exit to prevent stuck notes (default: on).",
     )
+    p_rt.add_argument(
+        "--rt-scheduler",
+        choices=["event", "poll"],
+        default="event",
+        help="Realtime loop: event (sleep until each due time, default) or poll (fixed 10ms tick).",
+    )
+    p_rt.add_argument(
+        "--adaptive-lookahead",
+        action="store_true",
+        help="Widen/narrow the 50ms lookahead per cycle from measured wake lateness and overruns.",
+    )
+    p_rt.add_argument(
+        "--lookahead-min-ms",
+        type=_bounded_int("--lookahead-min-ms", 1, 1000),
+        default=5,
+        metavar="MS",
+        help="With --adaptive-lookahead: lower bound in ms (default: 5).",
+    )
+    p_rt.add_argument(
+        "--lookahead-max-ms",
+        type=_bounded_int("--lookahead-max-ms", 1, 1000),
+        default=200,
+        metavar="MS",
+        help="With --adaptive-lookahead: upper bound in ms (default: 200).",
+    )
+    p_rt.add_argument(
+        "--realtime-priority",
+        action="store_true",
+        help="Try SCHED_FIFO (else nice), mlockall and a frozen/disabled GC for playback; reports what succeeded.",
+    )
+    p_rt.add_argument(
+        "--rt-cpu",
+        type=_bounded_int("--rt-cpu", 0, 1023),
+        default=None,
+        metavar="CPU",
+        help="With --realtime-priority: pin playback to this CPU.",
+    )
+    p_rt.add_argument(
+        "--metrics-out",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Record lateness histograms, drops and overruns; write them as JSON to PATH on exit.",
+    )
+    p_rt.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=10.0,
+        metavar="S",
+        help="With --metrics-out: print a metrics summary line every S seconds (0 = only at exit; default: 10).",
+    )
     p_rt.add_argument(
         "--late-drop-ms",
         type=_bounded_int("--late-drop-ms", 0, 500),
@@ -592,6 +738,11 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=None,
         help="Path to .ztplay playlist file for live rotation of programs.",
     )
+    p_rt.add_argument(
+        "--gapless",
+        action="store_true",
+        help="With --playlist: keep one port and one timeline; render the next item while the current one plays.",
+    )
     p_rt.add_argument(
         "--bar-cc",
         action="store_true",
@@ -800,6 +951,38 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default="nearest",
         help="Quantize mode: nearest (default), down, or up.",
     )
+    p_prac.add_argument(
+        "--input-mode",
+        choices=["poll", "callback"],
+        default="poll",
+        help="MIDI input: poll (iter_pending every tick, default) or callback (timestamped on arrival, lower latency).",
+    )
+    p_prac.add_argument(
+        "--realtime-priority",
+        action="store_true",
+        help="Try SCHED_FIFO (else nice), mlockall and a frozen/disabled GC for playback; reports what succeeded.",
+    )
+    p_prac.add_argument(
+        "--rt-cpu",
+        type=_bounded_int("--rt-cpu", 0, 1023),
+        default=None,
+        metavar="CPU",
+        help="With --realtime-priority: pin playback to this CPU.",
+    )
+    p_prac.add_argument(
+        "--metrics-out",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Record lateness histograms, drops and overruns; write them as JSON to PATH on exit.",
+    )
+    p_prac.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=10.0,
+        metavar="S",
+        help="With --metrics-out: print a metrics summary line every S seconds (0 = only at exit; default: 10).",
+    )
     p_prac.add_argument(
         "--click/--no-click",
         dest="click",
@@ -1002,6 +1185,12 @@ def _load_chords_from_args(args: argparse.Namespace) -> list[str]:
 # ------------------------
 
 
+def _render_cache_from_args(args: argparse.Namespace) -> RenderCache | None:
+    if getattr(args, "no_cache", False):
+        return None
+    return RenderCache()
+
+
 def cmd_create(args: argparse.Namespace) -> int:
     # Prefer config if provided
     if args.config:
@@ -1035,16 +1224,25 @@ def cmd_create(args: argparse.Namespace) -> int:
             )
             return 1
 
-        generate_accompaniment(
-            chord_symbols=cfg.chords,
-            style_name=style_name,
-            tempo_bpm=cfg.tempo,
-            bars_per_chord=cfg.bars_per_chord,
-            outfile=cfg.outfile,
-            tritone_mode=cfg.tritone_mode,
-            tritone_strength=cfg.tritone_strength,
-            tritone_seed=cfg.tritone_seed,
-            style_overrides=style_overrides,
+        render_inputs = {
+            "chord_symbols": cfg.chords,
+            "style_name": style_name,
+            "tempo_bpm": cfg.tempo,
+            "bars_per_chord": cfg.bars_per_chord,
+            "tritone_mode": cfg.tritone_mode,
+            "tritone_strength": cfg.tritone_strength,
+            "tritone_seed": cfg.tritone_seed,
+            "style_overrides": style_overrides,
+        }
+        cached_render(
+            _render_cache_from_args(args),
+            cfg.outfile,
+            lambda: generate_accompaniment(
+                outfile=cfg.outfile,
+                midi_writer=getattr(args, "midi_writer", "mido"),
+                **render_inputs,
+            ),
+            **render_inputs,
         )
 
         label = cfg.name or args.config
@@ -1072,16 +1270,25 @@ def cmd_create(args: argparse.Namespace) -> int:
             seed=args.humanize_seed,
         )
 
-    generate_accompaniment(
-        chord_symbols=chords,
-        style_name=args.style,
-        tempo_bpm=args.tempo,
-        bars_per_chord=args.bars_per_chord,
-        outfile=args.outfile,
-        tritone_mode=args.tritone_mode,
-        tritone_strength=args.tritone_strength,
-        tritone_seed=args.tritone_seed,
-        expressive=expressive,
+    render_inputs = {
+        "chord_symbols": chords,
+        "style_name": args.style,
+        "tempo_bpm": args.tempo,
+        "bars_per_chord": args.bars_per_chord,
+        "tritone_mode": args.tritone_mode,
+        "tritone_strength": args.tritone_strength,
+        "tritone_seed": args.tritone_seed,
+        "expressive": expressive,
+    }
+    cached_render(
+        _render_cache_from_args(args),
+        args.outfile,
+        lambda: generate_accompaniment(
+            outfile=args.outfile,
+            midi_writer=getattr(args, "midi_writer", "mido"),
+            **render_inputs,
+        ),
+        **render_inputs,
     )
 
     print(f"Created backing track: {args.outfile}")
@@ -1499,13 +1706,77 @@ def cmd_play(args: argparse.Namespace) -> int:
     pl = load_playlist(playlist_path)
 
     outfile = args.outfile or pl.outfile or "playlist_session.mid"
-    render_playlist_to_midi(pl, outfile=outfile)
+    cache = _render_cache_from_args(args)
+    cached_render(
+        cache,
+        outfile,
+        lambda: render_playlist_to_midi(pl, outfile=outfile, stream=getattr(args, "stream", False)),
+        **(playlist_render_inputs(pl) if cache is not None else {}),
+    )
 
     label = pl.name or playlist_path
     print(f"Rendered playlist '{label}' to: {outfile}")
     return 0
 
 
+# ------------------------
+# render-batch command
+# ------------------------
+
+
+def cmd_render_batch(args: argparse.Namespace) -> int:
+    sources: list[Path] = []
+    for target in args.inputs:
+        sources.extend(discover_batch_inputs(target))
+    sources = sorted(set(sources))
+
+    if not sources:
+        print("No .ztprog/.ztex files matched.", file=sys.stderr)
+        return 1
+
+    jobs = plan_batch(
+        sources,
+        args.out_dir,
+        midi_writer=args.midi_writer,
+        use_cache=not getattr(args, "no_cache", False),
+    )
+    summary = render_batch(jobs, workers=args.workers)
+
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        Path(args.summary).write_text(text + "\n", encoding="utf-8")
+        print(
+            f"Rendered {summary['ok']}/{summary['total']} files "
+            f"({summary['failed']} failed, {summary['cached']} cached) in {summary['wall_seconds']:.2f}s "
+            f"with {summary['workers']} worker(s). Summary: {args.summary}"
+        )
+    else:
+        print(text)
+
+    return 0 if summary["failed"] == 0 else 1
+
+
+# ------------------------
+# cache command
+# ------------------------
+
+
+def cmd_cache(args: argparse.Namespace) -> int:
+    cache = RenderCache(args.dir)
+
+    if args.action == "prune":
+        max_bytes = None if args.max_mb is None else int(args.max_mb * 1024 * 1024)
+        res = cache.prune(max_bytes)
+        print(f"Pruned {res['removed']} entries ({res['removed_bytes']} bytes) from {cache.root}")
+
+    st = cache.stats()
+    print(
+        f"{st['root']}: {st['entries']} entries, {st['bytes'] / (1024 * 1024):.2f} MiB "
+        f"(limit {st['max_bytes'] / (1024 * 1024):.0f} MiB)"
+    )
+    return 0
+
+
 # ------------------------
 # ex-list / ex-run commands
 # ------------------------
@@ -1632,6 +1903,10 @@ def cmd_rt_play(args: argparse.Namespace) -> int:
                 bar_cc_countdown=getattr(args, "bar_cc_countdown", 20),
                 bar_cc_index=getattr(args, "bar_cc_index", 21),
                 bar_cc_section=getattr(args, "bar_cc_section", 22),
+                realtime_priority=getattr(args, "realtime_priority", False),
+                rt_cpu=getattr(args, "rt_cpu", None),
+                gapless=getattr(args, "gapless", False),
+                backend=getattr(args, "backend", "mido"),
             )
         except (FileNotFoundError, ValueError, RuntimeError) as e:
             print(f"error: {e}", file=sys.stderr)
@@ -1698,7 +1973,17 @@ def cmd_rt_play(args: argparse.Namespace) -> int:
         bar_cc_index=getattr(args, "bar_cc_index", 21),
         bar_cc_section=getattr(args, "bar_cc_section", 22),
         bars_limit=bars_limit,
-    )
+        scheduler=getattr(args, "rt_scheduler", "event"),
+        metrics_out=getattr(args, "metrics_out", None),
+        metrics_interval_s=getattr(args, "metrics_interval", 10.0),
+        adaptive_lookahead=getattr(args, "adaptive_lookahead", False),
+        lookahead_min_s=getattr(args, "lookahead_min_ms", 5) / 1000.0,
+        lookahead_max_s=getattr(args, "lookahead_max_ms", 200) / 1000.0,
+        realtime_priority=getattr(args, "realtime_priority", False),
+        rt_cpu=getattr(args, "rt_cpu", None),
+    )
+    if spec.lookahead_min_s > spec.lookahead_max_s:
+        raise SystemExit("rt-play: --lookahead-min-ms must not exceed --lookahead-max-ms")
 
     events = []
 
@@ -1728,7 +2013,7 @@ def cmd_rt_play(args: argparse.Namespace) -> int:
         comp_events = truncate_events_to_cycle(comp_events, bars_per_cycle)
         bass_events = truncate_events_to_cycle(bass_events, bars_per_cycle)
 
-        # Convert NoteEvents to step-indexed RT messages
+        # Compile NoteEvents to step-indexed raw MIDI (status, data1, data2)
         steps_per_cycle = int(args.grid) * bars_per_cycle
         rts = RtRenderSpec(
             bpm=spec.bpm,
@@ -1737,9 +2022,9 @@ def cmd_rt_play(args: argparse.Namespace) -> int:
             quantize=args.rt_quantize,
         )
 
-        events.extend(gm_program_changes_at_start())
-        events.extend(note_events_to_step_messages(comp_events, spec=rts, steps_per_cycle=steps_per_cycle))
-        events.extend(note_events_to_step_messages(bass_events, spec=rts, steps_per_cycle=steps_per_cycle))
+        events.extend(gm_program_changes_raw())
+        events.extend(note_events_to_step_raw(comp_events, spec=rts, steps_per_cycle=steps_per_cycle))
+        events.extend(note_events_to_step_raw(bass_events, spec=rts, steps_per_cycle=steps_per_cycle))
 
         src = f"file={args.file}" if args.file else "chords=inline"
         print("RT Play: live mode")
@@ -1831,7 +2116,12 @@ def cmd_practice(args: argparse.Namespace) -> int:
         practice_window_off_ms=args.strict_window_off_ms,
         practice_reject_offgrid=args.reject_offgrid,
         practice_quantize=args.quantize,
+        practice_input=args.input_mode,
         click=args.click,
+        metrics_out=args.metrics_out,
+        metrics_interval_s=args.metrics_interval,
+        realtime_priority=args.realtime_priority,
+        rt_cpu=args.rt_cpu,
     )
 
     try:
@@ -6,17 +6,16 @@ from __future__ import annotations
 from dataclasses import replace
 from typing import Any, Tuple
 
-from .chords import Chord, chord_bass_pitch, chord_pitches, parse_chord_symbol
-from .expressive_layer import apply_velocity_profile
+from .bar_templates import compile_bar_template, compile_style, style_overrides_key
+from .chords import Chord, chord_bass_pitch, parse_chord_symbol
+from .event_buffer import EventBuffer
 from .expressive_swing import ExpressiveSpec, apply_expressive
-from .ghost_layer import GhostSpec, add_ghost_hits
 from .gravity_bridge import apply_tritone_substitutions
 from .midi_out import NoteEvent, write_midi_file
-from .musical_contract import enforce_determinism_inputs, validate_note_events
-from .patterns import STYLE_REGISTRY, StylePattern
+from .musical_contract import enforce_determinism_inputs, validate_event_buffer
+from .patterns import StylePattern
 from .rock_articulations import Difficulty, RockStyle
 from .rock_tag_attach import attach_tags_sidecar, write_technique_sidecar_json
-from .velocity_contour import VelContour, apply_velocity_contour
 
 # Velocity contour presets (must match validate.py)
 _VEL_PRESETS: dict[str, dict[str, float]] = {
@@ -101,7 +100,7 @@ def _apply_style_overrides(base: StylePattern, overrides: dict[str, Any]) -> Sty
     return replace(base)
 
 
-def generate_accompaniment(
+def generate_accompaniment_buffers(
     chord_symbols: list[str],
     style_name: str = "swing_basic",
     tempo_bpm: int = 120,
@@ -115,59 +114,25 @@ def generate_accompaniment(
     meter: Tuple[int, int] = (4, 4),
     density_bucket: str | None = None,
     syncopation_bucket: str | None = None,
-) -> tuple[list[NoteEvent], list[NoteEvent]]:
+    midi_writer: str = "mido",
+) -> tuple[EventBuffer, EventBuffer]:
     """
-    Generate comping + bass MIDI note events for a simple chord progression.
+    Array-backed accompaniment renderer (struct-of-arrays event core).
 
-    Parameters
-    ----------
-    chord_symbols:
-        List of chord symbols (e.g. ["Cmaj7", "Dm7", "G7", "Cmaj7"]).
-    style_name:
-        Name of the accompaniment style (see STYLE_REGISTRY).
-    tempo_bpm:
-        Tempo in beats per minute.
-    bars_per_chord:
-        Number of 4/4 bars each chord lasts.
-    outfile:
-        Optional path to write a MIDI file. If None, no file is written.
-    tritone_mode:
-        Tritone substitution behavior:
-            - "none":          no substitutions
-            - "all_doms":      substitute every dominant chord
-            - "probabilistic": substitute dominant chords with given strength
-    tritone_strength:
-        Probability [0.0, 1.0] for 'probabilistic' mode.
-    tritone_seed:
-        Optional random seed for reproducible reharmonization patterns.
-    style_overrides:
-        Optional dict of style knob overrides from .ztprog config.
-        Supports nested sugar (ghost_hits, vel_contour) or flat canonical fields.
-    meter:
-        Time signature as (numerator, denominator), e.g. (4, 4) or (3, 4).
-        Phase 6.0+: Affects bar length calculation and MIDI time signature.
-    density_bucket:
-        Optional density bucket: "sparse", "medium", or "dense".
-        Phase 6.2+: Applies deterministic thinning to comp events.
-        sparse=50%, medium=75%, dense=100% (no thinning).
-    syncopation_bucket:
-        Optional syncopation bucket: "straight", "light", or "heavy".
-        Phase 6.3+: Applies timing offsets to comp events.
-        straight=0 offset, light=small anticipations, heavy=more offbeats.
+    Same parameters, validation, MIDI/sidecar side effects and event values
+    as generate_accompaniment(), but each bar is copied from a cached
+    BarTemplate (see bar_templates.py) into EventBuffer columns, and the
+    remaining whole-progression stages run column-wise instead of copying a
+    list of NoteEvent at every stage.
 
     Returns
     -------
-    (comp_events, bass_events):
-        Lists of NoteEvent for comping and bass tracks.
+    (comp_buf, bass_buf):
+        EventBuffer for comping and bass tracks.
     """
-    if style_name not in STYLE_REGISTRY:
-        raise ValueError(f"Unknown style: {style_name}")
-
-    style: StylePattern = STYLE_REGISTRY[style_name]
-
-    # Apply style overrides from config (never mutates registry)
-    if style_overrides:
-        style = _apply_style_overrides(style, style_overrides)
+    # Resolve style + overrides once per (style, overrides) -- memoized
+    overrides_key = style_overrides_key(style_overrides)
+    compile_style(style_name, overrides_key)
 
     # Parse initial chord symbols
     base_chords: list[Chord] = [parse_chord_symbol(s) for s in chord_symbols]
@@ -186,8 +151,8 @@ def generate_accompaniment(
     else:
         chords = base_chords
 
-    comp_events: list[NoteEvent] = []
-    bass_events: list[NoteEvent] = []
+    comp_buf = EventBuffer()
+    bass_buf = EventBuffer()
 
     current_bar = 0
 
@@ -195,85 +160,26 @@ def generate_accompaniment(
     meter_num, meter_denom = meter
     beats_per_bar = meter_num * (4.0 / meter_denom)
 
+    # Each bar is a cached, fully post-processed template (comp hits, ghost
+    # hits, velocity contour, velocity profile) offset to the bar start and
+    # transposed to the chord root.
     for chord in chords:
-        pitches = chord_pitches(chord, octave=4)
+        root_midi = chord.root_pc + 4 * 12
         bass_pitch = chord_bass_pitch(chord, octave=2)
 
         for bar_offset in range(bars_per_chord):
             bar_start_beats = (current_bar + bar_offset) * beats_per_bar
-
-            # Collect bar events before adding ghosts
-            bar_comp_events: list[NoteEvent] = []
-
-            # Comping hits: full chord on each hit for now
-            for spec in style.comp_hits:
-                for p in pitches:
-                    bar_comp_events.append(
-                        NoteEvent(
-                            start_beats=bar_start_beats + spec.beat,
-                            duration_beats=spec.length_beats,
-                            midi_note=p,
-                            velocity=spec.velocity,
-                            channel=0,
-                        )
-                    )
-
-            # Add ghost hits if style has them enabled
-            if style.ghost_vel > 0 and style.ghost_steps:
-                ghost_spec = GhostSpec(
-                    ghost_vel=style.ghost_vel,
-                    ghost_steps=style.ghost_steps,
-                    ghost_len_beats=style.ghost_len_beats,
-                )
-                bar_comp_events = add_ghost_hits(
-                    bar_comp_events,
-                    chord_pitches=pitches,
-                    bar_start_beats=bar_start_beats,
-                    beats_per_bar=4,
-                    ghost_spec=ghost_spec,
-                    comp_channel=0,
-                )
-
-            # Apply velocity contour if style has it enabled (Brazilian "breathing")
-            if style.vel_contour_enabled:
-                contour = VelContour(
-                    enabled=True,
-                    soft_mul=style.vel_contour_soft,
-                    strong_mul=style.vel_contour_strong,
-                    pickup_mul=style.vel_contour_pickup,
-                    ghost_mul=style.vel_contour_ghost,
-                )
-                # Calculate pickup and ghost step sets for this bar
-                pickup_steps_set = set()
-                if style.pickup_beat is not None:
-                    # Convert pickup beat to 16th-note step: &4 = 3.5 -> step 14
-                    pickup_step = int(style.pickup_beat * 4)
-                    pickup_steps_set.add(pickup_step)
-                ghost_steps_set = set(style.ghost_steps) if style.ghost_steps else set()
-
-                # Use dispatcher: currently assumes 4/4, but ready for 2/4 styles
-                bar_comp_events = apply_velocity_contour(
-                    bar_comp_events,
-                    meter="4/4",
-                    bar_steps=16,
-                    contour=contour,
-                    pickup_steps=pickup_steps_set,
-                    ghost_steps=ghost_steps_set,
-                )
-
-            comp_events.extend(bar_comp_events)
-
-            # Bass pattern: root on pattern beats
-            for beat, length, vel in style.bass_pattern:
-                bass_events.append(
-                    NoteEvent(
-                        start_beats=bar_start_beats + beat,
-                        duration_beats=length,
-                        midi_note=bass_pitch,
-                        velocity=vel,
-                        channel=1,
-                    )
-                )
+            tpl = compile_bar_template(
+                style_name, overrides_key, chord.quality, bar_start_beats % 4.0
+            )
+            comp_buf.extend_pattern(
+                bar_start_beats, tpl.comp_rel, tpl.comp_dur, tpl.comp_notes(root_midi), tpl.comp_vel,
+                channel=0,
+            )
+            bass_buf.extend_pattern(
+                bar_start_beats, tpl.bass_rel, tpl.bass_dur, [bass_pitch] * len(tpl.bass_rel), tpl.bass_vel,
+                channel=1,
+            )
 
         current_bar += bars_per_chord
 
@@ -284,24 +190,31 @@ def generate_accompaniment(
         tritone_seed=tritone_seed,
     )
 
-    # Validate raw generator output before expressive layer
-    validate_note_events(comp_events)
-    validate_note_events(bass_events)
-
-    # ---- Expressive Layer (velocity shaping only; stability-first) ----
-    comp_events = apply_velocity_profile(comp_events)
-    bass_events = apply_velocity_profile(bass_events)
-
-    # Re-validate after shaping to ensure contract still satisfied
-    validate_note_events(comp_events)
-    validate_note_events(bass_events)
+    # Raw (pre-profile) events were validated when each template was compiled;
+    # re-validate the assembled, shaped output (absolute starts, real pitches).
+    validate_event_buffer(comp_buf)
+    validate_event_buffer(bass_buf)
 
     if outfile:
         # Apply optional expressive layer (swing/humanize) before writing
+        # (the expressive result is also what the caller gets back)
         if expressive is not None:
-            comp_events = apply_expressive(comp_events, spec=expressive, tempo_bpm=tempo_bpm)
-            bass_events = apply_expressive(bass_events, spec=expressive, tempo_bpm=tempo_bpm)
-        write_midi_file(comp_events, bass_events, tempo_bpm=tempo_bpm, outfile=outfile, meter=meter)
+            comp_buf = EventBuffer.from_events(
+                apply_expressive(comp_buf, spec=expressive, tempo_bpm=tempo_bpm)
+            )
+            bass_buf = EventBuffer.from_events(
+                apply_expressive(bass_buf, spec=expressive, tempo_bpm=tempo_bpm)
+            )
+        if midi_writer == "fast":
+            # Direct encoder reads the buffer columns (no NoteEvent objects)
+            write_midi_file(
+                comp_buf, bass_buf, tempo_bpm=tempo_bpm, outfile=outfile, meter=meter, writer="fast"
+            )
+        else:
+            write_midi_file(
+                comp_buf.to_events(), bass_buf.to_events(),
+                tempo_bpm=tempo_bpm, outfile=outfile, meter=meter, writer=midi_writer,
+            )
 
     # ---- Technique Tag Attachment (sidecar mode, via style_overrides) ----
     tt_cfg = None
@@ -335,8 +248,8 @@ def generate_accompaniment(
         tag_leadness = float(tt_cfg.get("leadness", 0.5))
 
         comp_tags, bass_tags = attach_tags_sidecar(
-            comp_events=comp_events,
-            bass_events=bass_events,
+            comp_events=comp_buf.to_events(),
+            bass_events=bass_buf.to_events(),
             beats_per_bar=4.0,  # engine hardcodes 4/4
             difficulty=tag_difficulty,
             style=tag_style,
@@ -373,13 +286,11 @@ def generate_accompaniment(
     if density_bucket in ("sparse", "medium", "dense"):
         keep_pct = {"sparse": 50, "medium": 75, "dense": 100}.get(density_bucket, 100)
         if keep_pct < 100:
-            thinned = []
-            for i, ev in enumerate(comp_events):
-                # Deterministic hash based on event index (no RNG)
-                h = (i * 2654435761) & 0xFFFFFFFF
-                if (h % 100) < keep_pct:
-                    thinned.append(ev)
-            comp_events = thinned
+            # Deterministic hash based on event index (no RNG)
+            comp_buf = comp_buf.take(
+                i for i in range(len(comp_buf))
+                if ((i * 2654435761) & 0xFFFFFFFF) % 100 < keep_pct
+            )
 
     # Phase 6.3: Deterministic syncopation offsets (comp only, bass untouched)
     if syncopation_bucket in ("straight", "light", "heavy"):
@@ -387,17 +298,95 @@ def generate_accompaniment(
         offset_map = {"straight": 0.0, "light": -0.125, "heavy": -0.25}
         base_offset = offset_map.get(syncopation_bucket, 0.0)
         if base_offset != 0.0:
-            synced = []
-            for i, ev in enumerate(comp_events):
-                # Deterministic: apply offset to ~60% of events for light, ~80% for heavy
-                apply_pct = 60 if syncopation_bucket == "light" else 80
+            # Deterministic: apply offset to ~60% of events for light, ~80% for heavy
+            apply_pct = 60 if syncopation_bucket == "light" else 80
+            starts = comp_buf.start
+            for i in range(len(starts)):
                 h = (i * 2654435761) & 0xFFFFFFFF
                 if (h % 100) < apply_pct:
                     # Push note slightly early (anticipation)
-                    new_start = max(0.0, ev.start_beats + base_offset)
-                    synced.append(replace(ev, start_beats=new_start))
-                else:
-                    synced.append(ev)
-            comp_events = synced
+                    starts[i] = max(0.0, starts[i] + base_offset)
+
+    return comp_buf, bass_buf
+
 
-    return comp_events, bass_events
+def generate_accompaniment(
+    chord_symbols: list[str],
+    style_name: str = "swing_basic",
+    tempo_bpm: int = 120,
+    bars_per_chord: int = 1,
+    outfile: str | None = None,
+    tritone_mode: str = "none",
+    tritone_strength: float = 1.0,
+    tritone_seed: int | None = None,
+    expressive: ExpressiveSpec | None = None,
+    style_overrides: dict[str, Any] | None = None,
+    meter: Tuple[int, int] = (4, 4),
+    density_bucket: str | None = None,
+    syncopation_bucket: str | None = None,
+    midi_writer: str = "mido",
+) -> tuple[list[NoteEvent], list[NoteEvent]]:
+    """
+    Generate comping + bass MIDI note events for a simple chord progression.
+
+    Parameters
+    ----------
+    chord_symbols:
+        List of chord symbols (e.g. ["Cmaj7", "Dm7", "G7", "Cmaj7"]).
+    style_name:
+        Name of the accompaniment style (see STYLE_REGISTRY).
+    tempo_bpm:
+        Tempo in beats per minute.
+    bars_per_chord:
+        Number of 4/4 bars each chord lasts.
+    outfile:
+        Optional path to write a MIDI file. If None, no file is written.
+    tritone_mode:
+        Tritone substitution behavior:
+            - "none":          no substitutions
+            - "all_doms":      substitute every dominant chord
+            - "probabilistic": substitute dominant chords with given strength
+    tritone_strength:
+        Probability [0.0, 1.0] for 'probabilistic' mode.
+    tritone_seed:
+        Optional random seed for reproducible reharmonization patterns.
+    style_overrides:
+        Optional dict of style knob overrides from .ztprog config.
+        Supports nested sugar (ghost_hits, vel_contour) or flat canonical fields.
+    meter:
+        Time signature as (numerator, denominator), e.g. (4, 4) or (3, 4).
+        Phase 6.0+: Affects bar length calculation and MIDI time signature.
+    density_bucket:
+        Optional density bucket: "sparse", "medium", or "dense".
+        Phase 6.2+: Applies deterministic thinning to comp events.
+        sparse=50%, medium=75%, dense=100% (no thinning).
+    syncopation_bucket:
+        Optional syncopation bucket: "straight", "light", or "heavy".
+        Phase 6.3+: Applies timing offsets to comp events.
+        straight=0 offset, light=small anticipations, heavy=more offbeats.
+    midi_writer:
+        MIDI file backend when outfile is set: "mido" (default) or "fast"
+        (direct byte encoder, identical output; see smf_writer.py).
+
+    Returns
+    -------
+    (comp_events, bass_events):
+        Lists of NoteEvent for comping and bass tracks.
+    """
+    comp_buf, bass_buf = generate_accompaniment_buffers(
+        chord_symbols,
+        style_name=style_name,
+        tempo_bpm=tempo_bpm,
+        bars_per_chord=bars_per_chord,
+        outfile=outfile,
+        tritone_mode=tritone_mode,
+        tritone_strength=tritone_strength,
+        tritone_seed=tritone_seed,
+        expressive=expressive,
+        style_overrides=style_overrides,
+        meter=meter,
+        density_bucket=density_bucket,
+        syncopation_bucket=syncopation_bucket,
+        midi_writer=midi_writer,
+    )
+    return comp_buf.to_events(), bass_buf.to_events()
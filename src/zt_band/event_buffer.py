@@ -0,0 +1,150 @@
+"""
+Struct-of-arrays note event buffer for bulk accompaniment rendering.
+
+The engine historically built one NoteEvent dataclass per chord tone per hit
+and copied the whole list at every post-processing stage. EventBuffer stores
+the same five fields as parallel typed arrays so a style pattern can be laid
+down for a whole bar in one extend, and velocity/timing stages can rewrite a
+single column in place.
+
+The list-of-NoteEvent API remains the public contract: ``to_events()`` (or
+iteration) yields NoteEvent objects equal to what the list path produced.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+
+from .midi_out import NoteEvent
+
+# Column typecodes. Pitch/velocity/channel use signed shorts (not bytes) so
+# out-of-range values survive until validate_event_buffer() reports them,
+# exactly like the NoteEvent path.
+_FLOAT = "d"
+_INT = "h"
+
+
+class EventBuffer:
+    """
+    Parallel typed arrays of note events.
+
+    Columns:
+        start:    start time in beats (float64)
+        duration: duration in beats (float64)
+        note:     MIDI note number
+        velocity: note velocity
+        channel:  MIDI channel
+    """
+
+    __slots__ = ("start", "duration", "note", "velocity", "channel")
+
+    def __init__(self) -> None:
+        self.start: array = array(_FLOAT)
+        self.duration: array = array(_FLOAT)
+        self.note: array = array(_INT)
+        self.velocity: array = array(_INT)
+        self.channel: array = array(_INT)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_events(cls, events: Iterable[NoteEvent]) -> EventBuffer:
+        """Build a buffer from NoteEvent-shaped objects."""
+        buf = cls()
+        for e in events:
+            buf.append(e.start_beats, e.duration_beats, e.midi_note, e.velocity, e.channel)
+        return buf
+
+    def append(
+        self,
+        start_beats: float,
+        duration_beats: float,
+        midi_note: int,
+        velocity: int,
+        channel: int = 0,
+    ) -> None:
+        """Append a single event."""
+        self.start.append(start_beats)
+        self.duration.append(duration_beats)
+        self.note.append(midi_note)
+        self.velocity.append(velocity)
+        self.channel.append(channel)
+
+    def extend_pattern(
+        self,
+        offset_beats: float,
+        rel_starts: Sequence[float],
+        durations: Sequence[float],
+        notes: Sequence[int],
+        velocities: Sequence[int],
+        channel: int = 0,
+    ) -> None:
+        """
+        Append a relative event pattern shifted by offset_beats.
+
+        All sequences must have the same length. Start times are computed as
+        ``offset_beats + rel_start`` (same float operation as the list path).
+        """
+        n = len(rel_starts)
+        self.start.extend([offset_beats + r for r in rel_starts])
+        self.duration.extend(durations)
+        self.note.extend(notes)
+        self.velocity.extend(velocities)
+        self.channel.extend([channel] * n)
+
+    def extend(self, other: EventBuffer, offset_beats: float = 0.0) -> None:
+        """Append all events from another buffer, optionally shifted in time."""
+        if offset_beats:
+            self.start.extend([s + offset_beats for s in other.start])
+        else:
+            self.start.extend(other.start)
+        self.duration.extend(other.duration)
+        self.note.extend(other.note)
+        self.velocity.extend(other.velocity)
+        self.channel.extend(other.channel)
+
+    def take(self, indices: Iterable[int]) -> EventBuffer:
+        """Return a new buffer holding the events at the given indices, in order."""
+        idx = list(indices)
+        out = EventBuffer()
+        start, duration, note, velocity, channel = (
+            self.start, self.duration, self.note, self.velocity, self.channel
+        )
+        out.start.extend([start[i] for i in idx])
+        out.duration.extend([duration[i] for i in idx])
+        out.note.extend([note[i] for i in idx])
+        out.velocity.extend([velocity[i] for i in idx])
+        out.channel.extend([channel[i] for i in idx])
+        return out
+
+    def copy(self) -> EventBuffer:
+        """Return an independent copy of this buffer."""
+        out = EventBuffer()
+        out.extend(self)
+        return out
+
+    # ------------------------------------------------------------------
+    # NoteEvent view
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __iter__(self) -> Iterator[NoteEvent]:
+        for s, d, n, v, c in zip(self.start, self.duration, self.note, self.velocity, self.channel):
+            yield NoteEvent(start_beats=s, duration_beats=d, midi_note=n, velocity=v, channel=c)
+
+    def __getitem__(self, i: int) -> NoteEvent:
+        return NoteEvent(
+            start_beats=self.start[i],
+            duration_beats=self.duration[i],
+            midi_note=self.note[i],
+            velocity=self.velocity[i],
+            channel=self.channel[i],
+        )
+
+    def to_events(self) -> list[NoteEvent]:
+        """Materialize the buffer as a list of NoteEvent."""
+        return list(self)
@@ -8,6 +8,10 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .event_buffer import EventBuffer
 
 
 @dataclass(frozen=True)
@@ -50,3 +54,22 @@ def apply_velocity_profile(events: Iterable[object], profile: VelocityProfile =
         out.append(e2)
 
     return out
+
+
+def apply_velocity_profile_buffer(buf: EventBuffer, profile: VelocityProfile = VelocityProfile()) -> None:
+    """
+    Column-wise equivalent of apply_velocity_profile() for an EventBuffer.
+
+    Rewrites buf.velocity in place; start times are only read.
+    """
+    vel = buf.velocity
+    for i, start in enumerate(buf.start):
+        beat_in_bar = start % 4.0
+        v = vel[i]
+        if abs(beat_in_bar - 0.0) < 1e-9:
+            v += profile.downbeat_boost
+        elif abs(beat_in_bar - 2.0) < 1e-9:
+            v += profile.midbeat_boost
+        elif abs((beat_in_bar - int(beat_in_bar)) - 0.5) < 1e-9:
+            v -= profile.offbeat_cut
+        vel[i] = _clamp(v, profile.min_vel, profile.max_vel)
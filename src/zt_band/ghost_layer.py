@@ -7,9 +7,13 @@ They add "air" to samba/bossa grooves without changing harmonic rhythm.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from .midi_out import NoteEvent
 
+if TYPE_CHECKING:
+    from .event_buffer import EventBuffer
+
 
 @dataclass
 class GhostSpec:
@@ -114,6 +118,64 @@ def add_ghost_hits(
     return out
 
 
+
+def add_ghost_hits_buffer(
+    buf: EventBuffer,
+    chord_pitches: list[int],
+    *,
+    bar_start_beats: float,
+    beats_per_bar: int,
+    ghost_spec: GhostSpec,
+    comp_channel: int = 0,
+    bar_first_index: int = 0,
+) -> None:
+    """
+    Column-wise equivalent of add_ghost_hits() for an EventBuffer (in place).
+
+    Only events from bar_first_index onwards are considered when finding
+    occupied steps, so callers can append one bar at a time into a shared
+    buffer. Ghost events are appended in the same order add_ghost_hits()
+    would produce.
+    """
+    if ghost_spec.ghost_vel <= 0:
+        return
+    if not ghost_spec.ghost_steps:
+        return
+    if not chord_pitches:
+        return
+
+    steps_per_bar = beats_per_bar * 4
+    step_duration_beats = beats_per_bar / steps_per_bar
+
+    occupied_steps: set[int] = set()
+    starts = buf.start[bar_first_index:]
+    channels = buf.channel[bar_first_index:]
+    for s, ch in zip(starts, channels):
+        if ch == comp_channel:
+            relative_beat = s - bar_start_beats
+            if 0 <= relative_beat < beats_per_bar:
+                occupied_steps.add(int(relative_beat / step_duration_beats))
+
+    vel = max(1, min(int(ghost_spec.ghost_vel), 127))
+    channel = ghost_spec.ghost_channel if ghost_spec.ghost_channel is not None else comp_channel
+    length = ghost_spec.ghost_len_beats
+    ghost_pitches = chord_pitches[:3] if len(chord_pitches) >= 3 else chord_pitches
+    n = len(ghost_pitches)
+
+    for step in ghost_spec.ghost_steps:
+        step_idx = int(step) % steps_per_bar
+        if step_idx in occupied_steps:
+            continue
+        buf.extend_pattern(
+            bar_start_beats,
+            [step_idx * step_duration_beats] * n,
+            [length] * n,
+            ghost_pitches,
+            [vel] * n,
+            channel=channel,
+        )
+
+
 # Common ghost step presets (4/4 bar, 16 steps)
 # Beat positions: 1=0, &1=2, 2=4, &2=6, 3=8, &3=10, 4=12, &4=14
 # "e" positions (between beat and &): 1e=1, 2e=5, 3e=9, 4e=13
@@ -11,9 +11,10 @@ from dataclasses import dataclass
 
 from shared.zone_tritone.gravity import gravity_chain
 from shared.zone_tritone.pc import name_from_pc
+from shared.zone_tritone.tables import intervals_of
 from shared.zone_tritone.tritones import tritone_axis
 from shared.zone_tritone.types import PitchClass
-from shared.zone_tritone.zones import interval, zone_name
+from shared.zone_tritone.zones import zone_name
 
 from .chords import Chord, parse_chord_symbol
 
@@ -126,12 +127,13 @@ def compute_transitions(
     if len(annotated) < 2:
         return transitions
 
-    for idx in range(len(annotated) - 1):
+    # Intervals between consecutive roots, one table lookup each
+    steps = intervals_of([ac.root_pc for ac in annotated])
+
+    for idx, d in enumerate(steps):
         a = annotated[idx]
         b = annotated[idx + 1]
 
-        # Calculate interval between roots
-        d = interval(a.root_pc, b.root_pc)
         abs_d = abs(d)
 
         # Detect descending/ascending fourths (5 semitones)
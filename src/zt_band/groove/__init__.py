@@ -6,25 +6,42 @@ Provides a pluggable abstraction for intent sources:
 - AnalyzerIntentProvider: Scaffolded Groove Layer integration (H.1)
 
 Supporting modules:
+- IntentWorker: Background prefetch with a cached last-good intent
 - GrooveProfileStore: Device-local JSON profile store
-- EvidenceWindowProbe: Runtime telemetry snapshot (stub)
+- CachedGrooveProfileStore: Same, cached in memory, revalidated by (mtime, size)
+- EvidenceWindowProbe: Ring buffer of played onsets -> windowed features
 - generate_intent: Groove layer bridge function
+- generate_intents: Batched form (one request per N windows)
+- LocalGrooveGenerator: Warm, memoizing handle on the local generator
 """
 from .intent_provider import IntentContext, IntentProvider
 from .manual_provider import ManualIntentProvider
 from .analyzer_provider import AnalyzerIntentProvider
-from .profile_store import GrooveProfileStore
+from .profile_store import CachedGrooveProfileStore, GrooveProfileStore
 from .window_probe import EvidenceWindow, EvidenceWindowProbe
-from .groove_layer_bridge import generate_intent, GrooveLayer
+from .groove_layer_bridge import (
+    generate_intent,
+    generate_intents,
+    GrooveLayer,
+    GrooveServiceConnection,
+    LocalGrooveGenerator,
+)
+from .intent_worker import IntentWorker, LatestIntent
 
 __all__ = [
     "IntentContext",
     "IntentProvider",
     "ManualIntentProvider",
     "AnalyzerIntentProvider",
+    "IntentWorker",
+    "LatestIntent",
     "GrooveProfileStore",
+    "CachedGrooveProfileStore",
     "EvidenceWindow",
     "EvidenceWindowProbe",
     "generate_intent",
+    "generate_intents",
     "GrooveLayer",
+    "GrooveServiceConnection",
+    "LocalGrooveGenerator",
 ]
@@ -12,9 +12,9 @@ from pathlib import Path
 from typing import Any, Dict
 
 from zt_band.groove.intent_provider import IntentContext, IntentProvider
-from zt_band.groove.profile_store import GrooveProfileStore
+from zt_band.groove.profile_store import CachedGrooveProfileStore, GrooveProfileStore
 from zt_band.groove.window_probe import EvidenceWindowProbe
-from zt_band.groove.groove_layer_bridge import generate_intent
+from zt_band.groove.groove_layer_bridge import GrooveServiceConnection, generate_intent
 
 
 @dataclass(frozen=True)
@@ -33,6 +33,14 @@ class AnalyzerIntentProvider:
     probe: EvidenceWindowProbe = field(default_factory=EvidenceWindowProbe)
     default_horizon_ms: int = 2000
     service_timeout_s: float | None = None
+    # Persistent keep-alive connection for the service path (None = per-call urllib)
+    service: GrooveServiceConnection | None = None
+    # Profile store (default: an in-memory cache over profile_store_dir)
+    store: CachedGrooveProfileStore | GrooveProfileStore | None = None
+
+    def __post_init__(self) -> None:
+        if self.store is None:
+            object.__setattr__(self, "store", CachedGrooveProfileStore(self.profile_store_dir))
 
     def get_intent(self, ctx: IntentContext) -> Dict[str, Any] | None:
         """
@@ -45,8 +53,7 @@ class AnalyzerIntentProvider:
         - Any exception occurs
         """
         try:
-            store = GrooveProfileStore(root_dir=self.profile_store_dir)
-            profile = store.load_profile(ctx.profile_id)
+            profile = self.store.load_profile(ctx.profile_id)
             if not profile:
                 return None
 
@@ -60,6 +67,7 @@ class AnalyzerIntentProvider:
                 window=window,
                 now_utc=now,
                 timeout_s=self.service_timeout_s,
+                service=self.service,
             )
             if not intent or not isinstance(intent, dict):
                 return None
@@ -4,21 +4,29 @@ Groove layer bridge: interface for intent generation.
 H.2: Real implementation with local Python and service client integration.
 
 Priority:
-  1) Local Python integration (sg_coach/sg_spec if installed)
+  1) Local Python integration (sg_coach/sg_spec if installed), through a
+     warm, memoizing LocalGrooveGenerator handle
   2) Service client (SG_GROOVE_SERVICE_URL env var)
   3) None (fail closed)
+
+generate_intents() is the batched form for replay/evaluation; see
+reference_service.py for an in-process stand-in service.
 """
 from __future__ import annotations
 
 import hashlib
+import http.client
 import importlib.metadata
 import json
 import os
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, Optional, Protocol, Tuple
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
 
 
 ENGINE_SALT = "zt_band_groove_layer_bridge_v1"
@@ -27,6 +35,8 @@ DEFAULT_TIMEOUT_S = 2.0
 RETRY_MAX_ATTEMPTS = 2          # 1 retry => 2 total attempts
 RETRY_BACKOFF_S = 0.15          # base backoff before retry
 RETRY_JITTER_MAX_S = 0.10       # jitter range added to backoff (deterministic)
+BATCH_MAX_ITEMS = 64            # windows per /generate_intents request
+LOCAL_MEMO_SIZE = 128           # memoized local intents (LRU)
 
 
 def _get_runtime_pkg_version(pkg_name: str = "smart-guitar") -> str | None:
@@ -98,10 +108,13 @@ def _map_window_features_to_analyzer_inputs(window: Any) -> Dict[str, Any]:
       features = {
         "timing": {"mean_offset_ms": ..., "stddev_ms": ..., "direction": ...},
         "tempo": {"bpm_estimate": ..., "drift_slope": ...},
-        "dynamics": {"assist_pressure": ...},
-        "events": {"recent_note_onsets_ms": [...], "recent_iois_ms": [...]}
+        "dynamics": {"assist_pressure": ..., "velocity_mean": ..., "velocity_stddev": ...},
+        "events": {"count": ..., "onset_density_hz": ...,
+                   "recent_note_onsets_ms": [...], "recent_iois_ms": [...]}
       }
 
+    EvidenceWindowProbe.snapshot() produces this shape from live onsets.
+
     The analyzer can ignore unknown fields; this shape is intentionally additive.
     """
     features = getattr(window, "features", None)
@@ -128,8 +141,12 @@ def _map_window_features_to_analyzer_inputs(window: Any) -> Dict[str, Any]:
             },
             "dynamics": {
                 "assist_pressure": _safe_get(features, "dynamics.assist_pressure"),
+                "velocity_mean": _safe_get(features, "dynamics.velocity_mean"),
+                "velocity_stddev": _safe_get(features, "dynamics.velocity_stddev"),
             },
             "events": {
+                "count": _safe_get(features, "events.count"),
+                "onset_density_hz": _safe_get(features, "events.onset_density_hz"),
                 "recent_note_onsets_ms": _safe_get(features, "events.recent_note_onsets_ms", []),
                 "recent_iois_ms": _safe_get(features, "events.recent_iois_ms", []),
             },
@@ -161,11 +178,230 @@ def _validate_intent_shape(intent: Any, profile_id: str) -> Dict[str, Any] | Non
     return intent
 
 
+LOCAL_CANDIDATES: Tuple[Tuple[str, str], ...] = (
+    ("sg_coach.groove_layer", "generate_intent"),
+    ("sg_coach.groove_layer", "generate_control_intent"),
+    ("sg_coach.groove_layer.api", "generate_intent"),
+)
+
+
+# Memo-key resolution per analyzer input (dotted path under "features"),
+# in each feature's own unit; features not listed are keyed exactly.
+LOCAL_FEATURE_QUANTA: Dict[str, float] = {
+    "timing.mean_offset_ms": 0.5,
+    "timing.stddev_ms": 0.5,
+    "tempo.bpm_estimate": 0.1,
+    "tempo.drift_slope": 0.01,          # ms of drift per second
+    "dynamics.assist_pressure": 0.01,
+    "dynamics.velocity_mean": 0.5,
+    "dynamics.velocity_stddev": 0.5,
+    "events.onset_density_hz": 0.01,
+    "events.recent_note_onsets_ms": 1.0,
+    "events.recent_iois_ms": 1.0,
+}
+
+
+def _quantize_value(value: Any, quantum: float) -> Any:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    return round(round(value / quantum) * quantum, 6)
+
+
+def _quantize_features(window_inputs: Dict[str, Any], quanta: Dict[str, float]) -> Dict[str, Any]:
+    """Copy of an analyzer window payload with the listed features rounded to their quanta."""
+    features = window_inputs.get("features")
+    if not isinstance(features, dict):
+        return window_inputs
+    out_features = {k: dict(v) if isinstance(v, dict) else v for k, v in features.items()}
+    for path, quantum in quanta.items():
+        group, _, name = path.partition(".")
+        section = out_features.get(group)
+        if not isinstance(section, dict) or name not in section or quantum <= 0:
+            continue
+        value = section[name]
+        if isinstance(value, list):
+            section[name] = [_quantize_value(v, quantum) for v in value]
+        else:
+            section[name] = _quantize_value(value, quantum)
+    return {**window_inputs, "features": out_features}
+
+
+class LocalGrooveGenerator:
+    """
+    Warm handle on the locally installed groove-layer generator.
+
+    The sg_coach candidates (and sg_spec's GrooveProfileV1, if present) are
+    imported once, on first use, and kept; a missing package is remembered
+    too, so later calls return None at once. Results are memoized in a
+    small LRU keyed by a sha256 of (engine identity, profile, quantized
+    window features), each feature rounded to its own quantum
+    (LOCAL_FEATURE_QUANTA) for the key only: the generator always gets the
+    unmodified window, so a hit may return the intent of a window that
+    differed below those resolutions. With quantize_inputs=True the
+    generator gets the quantized window instead, making hits exact.
+    now_utc is not part of the key; a hit returns the intent generated at
+    the first call. Returned dicts are shared; treat them as read-only.
+
+    Each generate() is timed: last_call_s plus stats() (calls, hits,
+    misses, mean/max ms).
+    """
+
+    def __init__(
+        self,
+        *,
+        memo_size: int = LOCAL_MEMO_SIZE,
+        feature_quanta: Dict[str, float] | None = None,
+        quantize_inputs: bool = False,
+        candidates: Tuple[Tuple[str, str], ...] = LOCAL_CANDIDATES,
+    ) -> None:
+        self.memo_size = max(0, int(memo_size))
+        self.feature_quanta = dict(LOCAL_FEATURE_QUANTA if feature_quanta is None else feature_quanta)
+        self.quantize_inputs = quantize_inputs
+        self.candidates = candidates
+        self._fns: List[Tuple[str, Any]] | None = None
+        self._profile_model: Any = None
+        self._identity = ""
+        self._memo: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+        self.last_call_s = 0.0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def _resolve(self) -> List[Tuple[str, Any]]:
+        if self._fns is None:
+            fns: List[Tuple[str, Any]] = []
+            for mod_name, fn_name in self.candidates:
+                try:
+                    mod = __import__(mod_name, fromlist=[fn_name])
+                    fn = getattr(mod, fn_name, None)
+                    if callable(fn):
+                        fns.append((f"{mod_name}.{fn_name}", fn))
+                except Exception:
+                    continue
+            # Optional: pydantic validation/coercion if sg_spec exists
+            try:
+                from sg_spec.schemas.groove_layer import GrooveProfileV1  # type: ignore
+                self._profile_model = GrooveProfileV1
+            except Exception:
+                self._profile_model = None
+            self._identity = _engine_identity()
+            self._fns = fns
+        return self._fns
+
+    @property
+    def available(self) -> bool:
+        return bool(self._resolve())
+
+    def _memo_key(self, profile: Dict[str, Any], window_inputs: Dict[str, Any]) -> str:
+        names = [name for name, _ in self._fns or []]
+        blob = json.dumps([self._identity, names, profile, window_inputs], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def generate(
+        self,
+        *,
+        profile: Dict[str, Any],
+        window: Any,
+        now_utc: datetime,
+    ) -> Dict[str, Any] | None:
+        """Same contract as _try_local_python(); never raises."""
+        started = time.perf_counter()
+        try:
+            return self._generate(profile, window, now_utc)
+        except Exception:
+            return None
+        finally:
+            dt = time.perf_counter() - started
+            with self._lock:
+                self.calls += 1
+                self.last_call_s = dt
+                self.total_s += dt
+                self.max_s = max(self.max_s, dt)
+
+    def _generate(self, profile: Dict[str, Any], window: Any, now_utc: datetime) -> Dict[str, Any] | None:
+        fns = self._resolve()
+        if not fns:
+            return None
+        profile_id = str(profile.get("profile_id", ""))
+        window_inputs = _map_window_features_to_analyzer_inputs(window)
+        quantized = None
+        if self.memo_size or self.quantize_inputs:
+            quantized = _quantize_features(window_inputs, self.feature_quanta)
+            if self.quantize_inputs:
+                window_inputs = quantized
+
+        key = ""
+        if self.memo_size:
+            key = self._memo_key(profile, quantized)
+            with self._lock:
+                hit = self._memo.get(key)
+                if hit is not None:
+                    self._memo.move_to_end(key)
+                    self.hits += 1
+                    return hit
+                self.misses += 1
+
+        gp_obj: Any = profile
+        if self._profile_model is not None:
+            try:
+                gp_obj = self._profile_model.model_validate(profile)
+            except Exception:
+                gp_obj = profile
+
+        for _, fn in fns:
+            try:
+                produced = fn(profile=gp_obj, window=window_inputs, now_utc=now_utc)
+                # If pydantic intent returned, convert to dict
+                if hasattr(produced, "model_dump"):
+                    produced = produced.model_dump(mode="json")
+                intent = _validate_intent_shape(produced, profile_id)
+            except Exception:
+                continue
+            if intent is not None and self.memo_size:
+                with self._lock:
+                    self._memo[key] = intent
+                    while len(self._memo) > self.memo_size:
+                        self._memo.popitem(last=False)
+            return intent
+
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hits": self.hits,
+                "misses": self.misses,
+                "mean_ms": round(self.total_s * 1000.0 / self.calls, 3) if self.calls else 0.0,
+                "max_ms": round(self.max_s * 1000.0, 3),
+                "last_ms": round(self.last_call_s * 1000.0, 3),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+
+_LOCAL_GENERATOR: LocalGrooveGenerator | None = None
+
+
+def local_generator() -> LocalGrooveGenerator:
+    """Process-wide warm handle used by generate_intent()/generate_intents()."""
+    global _LOCAL_GENERATOR
+    if _LOCAL_GENERATOR is None:
+        _LOCAL_GENERATOR = LocalGrooveGenerator()
+    return _LOCAL_GENERATOR
+
+
 def _try_local_python(
     *,
     profile: Dict[str, Any],
     window: Any,
     now_utc: datetime,
+    local: LocalGrooveGenerator | None = None,
 ) -> Dict[str, Any] | None:
     """
     Attempts to generate intent via locally installed sg_coach (preferred),
@@ -175,42 +411,12 @@ def _try_local_python(
       - sg_coach.groove_layer.generate_intent
       - sg_coach.groove_layer.generate_control_intent
       - sg_coach.groove_layer.api.generate_intent
-    """
-    profile_id = str(profile.get("profile_id", ""))
-
-    # Optional: pydantic validation/coercion if sg_spec exists
-    gp_obj: Any = profile
-    try:
-        from sg_spec.schemas.groove_layer import GrooveProfileV1  # type: ignore
-        gp_obj = GrooveProfileV1.model_validate(profile)
-    except Exception:
-        gp_obj = profile
 
-    window_inputs = _map_window_features_to_analyzer_inputs(window)
-
-    candidates: Tuple[Tuple[str, str], ...] = (
-        ("sg_coach.groove_layer", "generate_intent"),
-        ("sg_coach.groove_layer", "generate_control_intent"),
-        ("sg_coach.groove_layer.api", "generate_intent"),
-    )
-
-    for mod_name, fn_name in candidates:
-        try:
-            mod = __import__(mod_name, fromlist=[fn_name])
-            fn = getattr(mod, fn_name, None)
-            if not callable(fn):
-                continue
-
-            produced = fn(profile=gp_obj, window=window_inputs, now_utc=now_utc)
-            # If pydantic intent returned, convert to dict
-            if hasattr(produced, "model_dump"):
-                produced = produced.model_dump(mode="json")
-
-            return _validate_intent_shape(produced, profile_id)
-        except Exception:
-            continue
-
-    return None
+    Goes through local (default: the process-wide local_generator()), so
+    the imports happen once and repeated windows are memoized.
+    """
+    handle = local if local is not None else local_generator()
+    return handle.generate(profile=profile, window=window, now_utc=now_utc)
 
 
 def _det_jitter_s(seed: str, jitter_max_s: float) -> float:
@@ -227,6 +433,10 @@ def _det_jitter_s(seed: str, jitter_max_s: float) -> float:
     return frac * float(jitter_max_s)
 
 
+def _utc_z(now_utc: datetime) -> str:
+    return now_utc.isoformat().replace("+00:00", "Z")
+
+
 def _make_request_id(profile_id: str, now_utc: datetime) -> str:
     """
     Deterministic request id derived from (profile_id, now_utc).
@@ -240,88 +450,149 @@ def _make_request_id(profile_id: str, now_utc: datetime) -> str:
     return f"sg-{h[:12]}"
 
 
-def _try_service_client(
+class GrooveServiceConnection:
+    """
+    One persistent (HTTP/1.1 keep-alive) connection to the groove service.
+
+    urllib opens a new TCP (and TLS) connection per request; a worker that
+    asks for an intent every bar reuses this one instead. A connection the
+    server dropped while idle is reopened once, transparently. Thread-safe
+    (requests are serialized); close() when done.
+    """
+
+    def __init__(self, base_url: str, *, token: str = "") -> None:
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported groove service URL: {base_url!r}")
+        self.base_url = base_url
+        self.token = token
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self._conn: http.client.HTTPConnection | None = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.requests = 0
+
+    @classmethod
+    def from_env(cls) -> GrooveServiceConnection | None:
+        """Connection to SG_GROOVE_SERVICE_URL, or None if unset/invalid."""
+        base = os.environ.get("SG_GROOVE_SERVICE_URL")
+        if not base:
+            return None
+        try:
+            return cls(base, token=os.environ.get("SG_GROOVE_SERVICE_TOKEN", ""))
+        except ValueError:
+            return None
+
+    def _connect(self, timeout_s: float) -> http.client.HTTPConnection:
+        if self._https:
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(self._host, self._port, timeout=timeout_s)
+        else:
+            conn = http.client.HTTPConnection(self._host, self._port, timeout=timeout_s)
+        self.connects += 1
+        return conn
+
+    def post(self, path: str, data: bytes, headers: Dict[str, str], timeout_s: float) -> Tuple[int, bytes]:
+        """POST data to base path + path; returns (status, body). Raises on network errors."""
+        with self._lock:
+            for fresh in (False, True):
+                reused = self._conn is not None and not fresh
+                if self._conn is None:
+                    self._conn = self._connect(timeout_s)
+                conn = self._conn
+                conn.timeout = timeout_s
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout_s)
+                try:
+                    conn.request("POST", self._prefix + path, body=data, headers=headers)
+                    resp = conn.getresponse()
+                    raw = resp.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    self._close_locked()
+                    if reused:
+                        continue  # idle keep-alive connection was dropped; retry on a new one
+                    raise
+                except BaseException:
+                    self._close_locked()
+                    raise
+                self.requests += 1
+                if resp.will_close:
+                    self._close_locked()
+                return resp.status, raw
+        raise ConnectionError("groove service connection dropped")
+
+    def _close_locked(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+
+def _post_json(
     *,
-    profile: Dict[str, Any],
-    window: Any,
-    now_utc: datetime,
+    path: str,
+    body: Dict[str, Any],
+    profile_id: str,
+    base_req_id: str,
     timeout_s: float,
     retry: bool,
     retry_backoff_s: float,
     retry_jitter_s: float,
-) -> Dict[str, Any] | None:
+    service: GrooveServiceConnection | None,
+) -> Tuple[int, bytes] | None:
     """
-    Calls a groove intent service if SG_GROOVE_SERVICE_URL is set.
+    POST body to the groove service with the shared retry policy.
 
-    Env vars:
-      SG_GROOVE_SERVICE_URL=https://... (base URL)
-      SG_GROOVE_SERVICE_TOKEN=...       (optional bearer token)
-
-    Endpoint:
-      POST {base}/generate_intent
-      JSON body: {profile, window, now_utc}
-
-    Retry behavior (service-only):
-      - At most 1 retry (2 total attempts) if retry=True
-      - Bounded backoff with deterministic jitter
-      - Only retries on transient failures (timeout, connection, 429, 5xx)
+    Uses service if given, else SG_GROOVE_SERVICE_URL/SG_GROOVE_SERVICE_TOKEN
+    with a new urllib connection. Returns (status, body) of the final
+    attempt, or None if unconfigured or the network failed. Non-200
+    statuses have an empty body.
     """
-    base = os.environ.get("SG_GROOVE_SERVICE_URL")
+    if service is not None:
+        base, token = service.base_url, service.token
+    else:
+        base = os.environ.get("SG_GROOVE_SERVICE_URL", "")
+        token = os.environ.get("SG_GROOVE_SERVICE_TOKEN", "")
     if not base:
         return None
 
-    token = os.environ.get("SG_GROOVE_SERVICE_TOKEN", "")
-    url = base.rstrip("/") + "/generate_intent"
-
-    profile_id = str(profile.get("profile_id", ""))
-
-    body = {
-        "profile": profile,
-        "window": _map_window_features_to_analyzer_inputs(window),
-        "now_utc": now_utc.isoformat().replace("+00:00", "Z"),
-    }
+    url = base.rstrip("/") + path
     data = json.dumps(body).encode("utf-8")
 
-    req = urllib.request.Request(url=url, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
+    headers = {"Content-Type": "application/json"}
     if token:
-        req.add_header("Authorization", f"Bearer {token}")
+        headers["Authorization"] = f"Bearer {token}"
     # Identify client engine + contract + package version (when available)
-    req.add_header("X-Engine-Identity", _engine_identity())
+    headers["X-Engine-Identity"] = _engine_identity()
 
     max_attempts = RETRY_MAX_ATTEMPTS if retry else 1
-    base_req_id = _make_request_id(profile_id, now_utc)
 
     for attempt in range(1, max_attempts + 1):
         try:
             # Attach deterministic request id with attempt suffix
-            req.add_header("X-Request-Id", f"{base_req_id}-a{attempt}")
-
-            with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-                status = getattr(resp, "status", 200)
-                if status != 200:
-                    # Retry only on transient server responses
-                    if attempt < max_attempts and (status == 429 or 500 <= status <= 599):
-                        seed = f"{ENGINE_SALT}|{profile_id}|http{status}|attempt{attempt}"
-                        delay = float(retry_backoff_s) + _det_jitter_s(seed, float(retry_jitter_s))
-                        time.sleep(delay)
-                        continue
-                    return None
-
-                payload = json.loads(resp.read().decode("utf-8"))
-                return _validate_intent_shape(payload, profile_id)
+            headers["X-Request-Id"] = f"{base_req_id}-a{attempt}"
+
+            if service is not None:
+                status, raw = service.post(path, data, headers, timeout_s)
+            else:
+                req = urllib.request.Request(url=url, data=data, headers=headers, method="POST")
+                with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+                    status = getattr(resp, "status", 200)
+                    raw = resp.read() if status == 200 else b""
 
         except urllib.error.HTTPError as e:
             # HTTPError is also an exception path; status available via e.code
             code = getattr(e, "code", None)
-            if attempt < max_attempts and isinstance(code, int) and (code == 429 or 500 <= code <= 599):
-                seed = f"{ENGINE_SALT}|{profile_id}|http{code}|attempt{attempt}"
-                delay = float(retry_backoff_s) + _det_jitter_s(seed, float(retry_jitter_s))
-                time.sleep(delay)
-                continue
-            return None
+            if not isinstance(code, int):
+                return None
+            status, raw = code, b""
 
-        except (urllib.error.URLError, TimeoutError):
+        except (urllib.error.URLError, TimeoutError, ConnectionError, http.client.HTTPException):
             # Network-ish transient failures: retry once if enabled
             if attempt < max_attempts:
                 seed = f"{ENGINE_SALT}|{profile_id}|net|attempt{attempt}"
@@ -330,13 +601,156 @@ def _try_service_client(
                 continue
             return None
 
-        except Exception:
-            # Unknown exception: fail closed, no retry
-            return None
+        if status != 200:
+            # Retry only on transient server responses
+            if attempt < max_attempts and (status == 429 or 500 <= status <= 599):
+                seed = f"{ENGINE_SALT}|{profile_id}|http{status}|attempt{attempt}"
+                delay = float(retry_backoff_s) + _det_jitter_s(seed, float(retry_jitter_s))
+                time.sleep(delay)
+                continue
+            return status, b""
+        return status, raw
 
     return None
 
 
+def _try_service_client(
+    *,
+    profile: Dict[str, Any],
+    window: Any,
+    now_utc: datetime,
+    timeout_s: float,
+    retry: bool,
+    retry_backoff_s: float,
+    retry_jitter_s: float,
+    service: GrooveServiceConnection | None = None,
+) -> Dict[str, Any] | None:
+    """
+    Calls a groove intent service if SG_GROOVE_SERVICE_URL is set.
+
+    Env vars:
+      SG_GROOVE_SERVICE_URL=https://... (base URL)
+      SG_GROOVE_SERVICE_TOKEN=...       (optional bearer token)
+
+    Endpoint:
+      POST {base}/generate_intent
+      JSON body: {profile, window, now_utc}
+
+    With service given, the request goes over that persistent connection
+    (its URL and token) instead of a fresh urllib connection.
+
+    Retry behavior (service-only):
+      - At most 1 retry (2 total attempts) if retry=True
+      - Bounded backoff with deterministic jitter
+      - Only retries on transient failures (timeout, connection, 429, 5xx)
+    """
+    try:
+        profile_id = str(profile.get("profile_id", ""))
+        body = {
+            "profile": profile,
+            "window": _map_window_features_to_analyzer_inputs(window),
+            "now_utc": _utc_z(now_utc),
+        }
+        res = _post_json(
+            path="/generate_intent",
+            body=body,
+            profile_id=profile_id,
+            base_req_id=_make_request_id(profile_id, now_utc),
+            timeout_s=timeout_s,
+            retry=retry,
+            retry_backoff_s=retry_backoff_s,
+            retry_jitter_s=retry_jitter_s,
+            service=service,
+        )
+        if res is None or res[0] != 200:
+            return None
+        payload = json.loads(res[1].decode("utf-8"))
+        return _validate_intent_shape(payload, profile_id)
+    except Exception:
+        # Unknown exception: fail closed, no retry
+        return None
+
+
+def _make_batch_request_id(item_ids: Sequence[str]) -> str:
+    """
+    Deterministic id for a batch request, derived from its item ids.
+
+    Format:
+      sgb-<hex12>
+    """
+    h = hashlib.sha256("|".join(item_ids).encode("utf-8")).hexdigest()
+    return f"sgb-{h[:12]}"
+
+
+def _try_service_client_batch(
+    *,
+    profile: Dict[str, Any],
+    windows: Sequence[Any],
+    now_utcs: Sequence[datetime],
+    item_ids: Sequence[str],
+    timeout_s: float,
+    retry: bool,
+    retry_backoff_s: float,
+    retry_jitter_s: float,
+    service: GrooveServiceConnection | None = None,
+) -> List[Dict[str, Any] | None] | None:
+    """
+    Sends several windows to the groove service in one request.
+
+    Endpoint:
+      POST {base}/generate_intents
+      JSON body: {profile, items: [{request_id, window, now_utc}, ...]}
+      Response:  {results: [{request_id, intent}, ...]}
+
+    Results are matched by request_id and each intent is validated like a
+    single call; missing or invalid ones are None. Returns None only when
+    the service does not offer the endpoint (404/405/501), so the caller
+    can fall back to one request per window. Any other failure gives a
+    list of None (no fallback storm against a service that is down).
+    """
+    failed: List[Dict[str, Any] | None] = [None] * len(windows)
+    try:
+        profile_id = str(profile.get("profile_id", ""))
+        body = {
+            "profile": profile,
+            "items": [
+                {
+                    "request_id": rid,
+                    "window": _map_window_features_to_analyzer_inputs(window),
+                    "now_utc": _utc_z(now),
+                }
+                for rid, window, now in zip(item_ids, windows, now_utcs)
+            ],
+        }
+        res = _post_json(
+            path="/generate_intents",
+            body=body,
+            profile_id=profile_id,
+            base_req_id=_make_batch_request_id(item_ids),
+            timeout_s=timeout_s,
+            retry=retry,
+            retry_backoff_s=retry_backoff_s,
+            retry_jitter_s=retry_jitter_s,
+            service=service,
+        )
+        if res is None:
+            return failed
+        status, raw = res
+        if status in (404, 405, 501):
+            return None
+        if status != 200:
+            return failed
+
+        payload = json.loads(raw.decode("utf-8"))
+        by_id: Dict[str, Any] = {}
+        for entry in payload.get("results", []) if isinstance(payload, dict) else []:
+            if isinstance(entry, dict) and isinstance(entry.get("request_id"), str):
+                by_id[entry["request_id"]] = entry.get("intent")
+        return [_validate_intent_shape(by_id.get(rid), profile_id) for rid in item_ids]
+    except Exception:
+        return failed
+
+
 def generate_intent(
     *,
     profile: Dict[str, Any],
@@ -346,6 +760,8 @@ def generate_intent(
     retry: bool = True,
     retry_backoff_s: float = RETRY_BACKOFF_S,
     retry_jitter_s: float = RETRY_JITTER_MAX_S,
+    service: GrooveServiceConnection | None = None,
+    local: LocalGrooveGenerator | None = None,
 ) -> Dict[str, Any] | None:
     """
     H.2: Real implementation with local Python and service client integration.
@@ -366,6 +782,9 @@ def generate_intent(
         retry: Enable service retry on transient failures (default: True)
         retry_backoff_s: Base backoff before retry (default: 0.15)
         retry_jitter_s: Max jitter added to backoff (default: 0.10)
+        service: Persistent service connection to use instead of
+            SG_GROOVE_SERVICE_URL with a new connection per call
+        local: Warm local generator handle (default: local_generator())
 
     Returns:
         GrooveControlIntentV1 dict, or None if unavailable
@@ -375,7 +794,7 @@ def generate_intent(
         eff_timeout = float(timeout_s) if timeout_s is not None else DEFAULT_TIMEOUT_S
 
         # 1) local python integration
-        intent = _try_local_python(profile=profile, window=window, now_utc=now_utc)
+        intent = _try_local_python(profile=profile, window=window, now_utc=now_utc, local=local)
         if intent:
             return intent
 
@@ -388,6 +807,7 @@ def generate_intent(
             retry=bool(retry),
             retry_backoff_s=float(retry_backoff_s),
             retry_jitter_s=float(retry_jitter_s),
+            service=service,
         )
         if intent:
             return intent
@@ -395,3 +815,85 @@ def generate_intent(
         return None
     except Exception:
         return None
+
+
+def generate_intents(
+    *,
+    profile: Dict[str, Any],
+    windows: Sequence[Any],
+    now_utc: datetime | Sequence[datetime],
+    timeout_s: float | None = None,
+    retry: bool = True,
+    retry_backoff_s: float = RETRY_BACKOFF_S,
+    retry_jitter_s: float = RETRY_JITTER_MAX_S,
+    service: GrooveServiceConnection | None = None,
+    batch_size: int = BATCH_MAX_ITEMS,
+    local: LocalGrooveGenerator | None = None,
+) -> List[Dict[str, Any] | None]:
+    """
+    Batch counterpart of generate_intent() for replay and evaluation.
+
+    Returns one GrooveControlIntentV1 dict (or None) per window, in order.
+    Never raises.
+
+    Windows the local Python integration handles are done in-process; the
+    rest go to POST {base}/generate_intents, batch_size windows per request.
+    If the service lacks the batch endpoint, it falls back to one
+    /generate_intent call per window (and stops trying the batch endpoint).
+
+    Args:
+        profile: GrooveProfileV1 dict
+        windows: EvidenceWindows to generate intents for
+        now_utc: One timestamp for all windows, or one per window
+        batch_size: Max windows per batch request (default: 64)
+
+    Request ids are deterministic: item i gets
+    <_make_request_id(profile_id, now_utc[i])>-i<i>, and the batch request
+    an id hashed from its item ids.
+    """
+    n = len(windows)
+    try:
+        nows = [now_utc] * n if isinstance(now_utc, datetime) else list(now_utc)
+        if len(nows) != n:
+            return [None] * n
+        eff_timeout = float(timeout_s) if timeout_s is not None else DEFAULT_TIMEOUT_S
+        profile_id = str(profile.get("profile_id", ""))
+        retry_args: Dict[str, Any] = {
+            "timeout_s": eff_timeout,
+            "retry": bool(retry),
+            "retry_backoff_s": float(retry_backoff_s),
+            "retry_jitter_s": float(retry_jitter_s),
+            "service": service,
+        }
+
+        out: List[Dict[str, Any] | None] = [None] * n
+        remote: List[int] = []
+        for i in range(n):
+            out[i] = _try_local_python(profile=profile, window=windows[i], now_utc=nows[i], local=local)
+            if out[i] is None:
+                remote.append(i)
+
+        size = max(1, int(batch_size))
+        batch_ok = True
+        for start in range(0, len(remote), size):
+            chunk = remote[start:start + size]
+            results = None
+            if batch_ok:
+                results = _try_service_client_batch(
+                    profile=profile,
+                    windows=[windows[i] for i in chunk],
+                    now_utcs=[nows[i] for i in chunk],
+                    item_ids=[f"{_make_request_id(profile_id, nows[i])}-i{i}" for i in chunk],
+                    **retry_args,
+                )
+            if results is None:
+                batch_ok = False
+                results = [
+                    _try_service_client(profile=profile, window=windows[i], now_utc=nows[i], **retry_args)
+                    for i in chunk
+                ]
+            for i, intent in zip(chunk, results):
+                out[i] = intent
+        return out
+    except Exception:
+        return [None] * n
@@ -0,0 +1,140 @@
+"""
+Background intent worker: keeps the playback path off the intent provider.
+
+A provider call can block for a full service timeout plus retry backoff.
+IntentWorker runs the provider on its own thread and publishes each good
+intent into a single "latest" slot; the playback path reads that slot and
+never waits on the provider.
+
+    worker = IntentWorker(provider).start()
+    intent = worker.get_intent(ctx)   # cached intent (None if stale); refetch queued
+    ...
+    worker.stop()
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from zt_band.groove.intent_provider import IntentContext, IntentProvider
+
+DEFAULT_MAX_AGE_S = 30.0
+DEFAULT_FIRST_WAIT_S = 2.5
+
+
+@dataclass(frozen=True)
+class LatestIntent:
+    """Last good intent and when it was fetched (monotonic seconds)."""
+    intent: Dict[str, Any]
+    ctx: IntentContext
+    fetched_at: float
+    fetch_s: float  # how long the provider call took
+
+
+class IntentWorker:
+    """
+    Prefetches intents on a daemon thread.
+
+    request(ctx) asks for a fresh intent; only the newest pending request
+    is kept, so a slow provider never builds a backlog. Results go into
+    one slot that is replaced whole (a single reference assignment), so
+    latest() reads it without taking a lock. A None from the provider
+    keeps the last good intent in place; max_age_s bounds how long it is
+    served.
+
+    Implements IntentProvider: get_intent(ctx) returns the cached intent
+    for ctx.profile_id and queues a refetch for next time. Before anything
+    has been fetched, the first call waits up to first_wait_s for the first
+    provider call (meant to happen before playback starts); later calls
+    never wait.
+    """
+
+    def __init__(
+        self,
+        provider: IntentProvider,
+        *,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        first_wait_s: float = DEFAULT_FIRST_WAIT_S,
+        now_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.provider = provider
+        self.max_age_s = max_age_s
+        self.first_wait_s = first_wait_s
+        self._now = now_fn
+        self._latest: LatestIntent | None = None
+        self._pending: IntentContext | None = None
+        self._pending_lock = threading.Lock()  # request() vs. the worker's take-and-clear
+        self._wake = threading.Event()
+        self._published = threading.Event()
+        self._fetched = threading.Event()  # first provider call finished (good or not)
+        self._stopping = False
+        self._waited_first = False
+        self._thread: threading.Thread | None = None
+        self.fetches = 0
+        self.failures = 0
+
+    def start(self) -> IntentWorker:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="groove-intent-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout_s: float = 1.0) -> None:
+        """Stop the thread; an in-flight provider call is left to finish on its own."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+            self._thread = None
+
+    def request(self, ctx: IntentContext) -> None:
+        """Queue a fetch for ctx (replaces any fetch not yet started)."""
+        with self._pending_lock:
+            self._pending = ctx
+        self._wake.set()
+
+    def latest(self) -> LatestIntent | None:
+        """Newest published intent, however old. Never blocks."""
+        return self._latest
+
+    def wait_published(self, timeout_s: float) -> bool:
+        """Block until the first intent is published (startup only)."""
+        return self._published.wait(timeout_s)
+
+    def get_intent(self, ctx: IntentContext) -> Dict[str, Any] | None:
+        self.request(ctx)
+        if self._latest is None and not self._waited_first:
+            self._waited_first = True
+            self._fetched.wait(self.first_wait_s)
+        slot = self._latest
+        if slot is None or slot.ctx.profile_id != ctx.profile_id:
+            return None
+        if self._now() - slot.fetched_at > self.max_age_s:
+            return None
+        return slot.intent
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping:
+                return
+            with self._pending_lock:
+                ctx, self._pending = self._pending, None
+            if ctx is None:
+                continue
+            started = self._now()
+            try:
+                intent = self.provider.get_intent(ctx)
+            except Exception:
+                intent = None
+            self.fetches += 1
+            if isinstance(intent, dict):
+                done = self._now()
+                self._latest = LatestIntent(intent=intent, ctx=ctx, fetched_at=done, fetch_s=done - started)
+                self._published.set()
+            else:
+                self.failures += 1
+            self._fetched.set()
@@ -2,13 +2,37 @@
 Device-local GrooveProfileV1 JSON store.
 
 Profiles are stored as JSON files named: <profile_id>.json
+
+CachedGrooveProfileStore keeps parsed profiles in memory for callers that
+load at bar granularity (the analyzer provider).
 """
 from __future__ import annotations
 
 import json
+import os
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+
+def _parse_profile(p: Path, profile_id: str) -> Dict[str, Any] | None:
+    """Read and sanity-check one profile file; None (fail closed) on any problem."""
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        # Minimal sanity checks: shape of GrooveProfileV1-like contract
+        if not isinstance(data, dict):
+            return None
+        if data.get("schema_id") != "groove_profile":
+            return None
+        if data.get("schema_version") != "v1":
+            return None
+        if data.get("profile_id") != profile_id:
+            # allow mismatch to fail closed; avoids accidentally using wrong file
+            return None
+        return data
+    except Exception:
+        return None
 
 
 @dataclass(frozen=True)
@@ -34,17 +58,66 @@ class GrooveProfileStore:
             p = self.root_dir / f"{profile_id}.json"
             if not p.exists():
                 return None
-            data = json.loads(p.read_text(encoding="utf-8"))
-            # Minimal sanity checks: shape of GrooveProfileV1-like contract
-            if not isinstance(data, dict):
-                return None
-            if data.get("schema_id") != "groove_profile":
-                return None
-            if data.get("schema_version") != "v1":
-                return None
-            if data.get("profile_id") != profile_id:
-                # allow mismatch to fail closed; avoids accidentally using wrong file
+            return _parse_profile(p, profile_id)
+        except Exception:
+            return None
+
+
+class CachedGrooveProfileStore:
+    """
+    GrooveProfileStore that keeps parsed, validated profiles in memory.
+
+    Each load_profile() costs one os.stat(): the cached result (profile or
+    None for an invalid file) is reused while the file's (mtime_ns, size)
+    is unchanged and re-read otherwise, so edits and deletions still take
+    effect on the next call with the same fail-closed rules. Returned
+    dicts are shared; treat them as read-only.
+
+    hits / misses count calls served from memory / by reading the file.
+    """
+
+    def __init__(self, root_dir: Path) -> None:
+        self.root_dir = Path(root_dir)
+        self._cache: Dict[str, Tuple[int, int, Dict[str, Any] | None]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load_profile(self, profile_id: str) -> Dict[str, Any] | None:
+        """Same contract as GrooveProfileStore.load_profile()."""
+        try:
+            p = self.root_dir / f"{profile_id}.json"
+            try:
+                st = os.stat(p)
+            except OSError:
+                with self._lock:
+                    self._cache.pop(profile_id, None)
+                    self.misses += 1
                 return None
+            with self._lock:
+                entry = self._cache.get(profile_id)
+                if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                    self.hits += 1
+                    return entry[2]
+            data = _parse_profile(p, profile_id)
+            with self._lock:
+                self._cache[profile_id] = (st.st_mtime_ns, st.st_size, data)
+                self.misses += 1
             return data
         except Exception:
             return None
+
+    def preload(self) -> int:
+        """Load every <profile_id>.json under root_dir; returns how many are valid."""
+        try:
+            paths = sorted(self.root_dir.glob("*.json"))
+        except OSError:
+            return 0
+        return sum(1 for p in paths if self.load_profile(p.stem) is not None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,172 @@
+"""
+In-process reference groove intent service (tests and benchmarks).
+
+Serves the endpoints the bridge client speaks on 127.0.0.1, HTTP/1.1
+keep-alive, with a small deterministic window -> intent mapping:
+
+  POST /generate_intent   {profile, window, now_utc}         -> intent
+  POST /generate_intents  {profile, items: [{request_id, window, now_utc}]}
+                          -> {results: [{request_id, intent}]}
+
+    with ReferenceGrooveService() as svc:
+        conn = GrooveServiceConnection(svc.url)
+        intents = generate_intents(profile=p, windows=ws, now_utc=now, service=conn)
+
+batch=False leaves /generate_intents unimplemented (404), as an older
+service would; delay_s adds a fixed per-request service time.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+
+def _clamp01(x: float) -> float:
+    return max(0.0, min(1.0, float(x)))
+
+
+def reference_intent(profile: Dict[str, Any], window: Dict[str, Any], now_utc: str) -> Dict[str, Any]:
+    """GrooveControlIntentV1 from an analyzer window payload (deterministic)."""
+    profile_id = str(profile.get("profile_id", ""))
+    features = window.get("features", {}) if isinstance(window, dict) else {}
+    timing = features.get("timing", {})
+    tempo = features.get("tempo", {})
+    events = features.get("events", {})
+
+    stddev = float(timing.get("stddev_ms", 0.0) or 0.0)
+    drift = abs(float(tempo.get("drift_slope", 0.0) or 0.0))
+    bias = timing.get("direction", "neutral")
+    if bias not in ("ahead", "behind", "neutral"):
+        bias = "neutral"
+    lock = _clamp01(1.0 - stddev / 50.0)
+    mode = "stabilize" if lock < 0.5 or drift > 5.0 else "follow"
+
+    key = json.dumps([profile_id, window, now_utc], sort_keys=True)
+    return {
+        "schema_id": "groove_control_intent",
+        "schema_version": "v1",
+        "intent_id": "ref-" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:12],
+        "profile_id": profile_id,
+        "generated_at_utc": now_utc,
+        "horizon_ms": int(window.get("horizon_ms", 2000)) if isinstance(window, dict) else 2000,
+        "confidence": _clamp01(float(events.get("count", 0) or 0) / 16.0),
+        "control_modes": [mode],
+        "tempo": {
+            "target_bpm": float(tempo.get("bpm_estimate", 120.0) or 120.0),
+            "lock_strength": lock,
+            "drift_correction": "soft" if drift > 2.0 else "none",
+        },
+        "timing": {
+            "microshift_ms": max(-20.0, min(20.0, -float(timing.get("mean_offset_ms", 0.0) or 0.0))),
+            "anticipation_bias": bias,
+        },
+        "dynamics": {"assist_gain": 0.6, "expression_window": 0.5},
+        "recovery": {"enabled": False, "grace_beats": 1.0},
+        "reason_codes": ["reference_service"],
+        "extensions": {},
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    service: ReferenceGrooveService
+
+    def do_POST(self) -> None:
+        svc = self.service
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        svc._count(self.headers.get("X-Request-Id", ""))
+        if svc.delay_s:
+            time.sleep(svc.delay_s)
+        try:
+            body = json.loads(raw)
+            profile = body.get("profile", {})
+            if self.path.endswith("/generate_intents") and svc.batch:
+                items = body.get("items", [])
+                svc._count_items(len(items))
+                out: Any = {
+                    "results": [
+                        {
+                            "request_id": item.get("request_id"),
+                            "intent": reference_intent(profile, item.get("window", {}), item.get("now_utc", "")),
+                        }
+                        for item in items
+                    ]
+                }
+            elif self.path.endswith("/generate_intent"):
+                svc._count_items(1)
+                out = reference_intent(profile, body.get("window", {}), body.get("now_utc", ""))
+            else:
+                self._reply(404, b"")
+                return
+        except Exception:
+            self._reply(400, b"")
+            return
+        self._reply(200, json.dumps(out).encode("utf-8"))
+
+    def _reply(self, status: int, data: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class ReferenceGrooveService:
+    """Threaded reference service on an ephemeral localhost port."""
+
+    def __init__(self, *, batch: bool = True, delay_s: float = 0.0) -> None:
+        self.batch = batch
+        self.delay_s = delay_s
+        self.requests = 0
+        self.items = 0
+        self.request_ids: list[str] = []
+        self._lock = threading.Lock()
+        handler = type("ReferenceHandler", (_Handler,), {"service": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _count(self, request_id: str) -> None:
+        with self._lock:
+            self.requests += 1
+            self.request_ids.append(request_id)
+
+    def _count_items(self, n: int) -> None:
+        with self._lock:
+            self.items += n
+
+    def start(self) -> ReferenceGrooveService:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                name="groove-reference-service",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> ReferenceGrooveService:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
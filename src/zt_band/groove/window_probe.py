@@ -1,12 +1,24 @@
 """
 Evidence window probe for runtime telemetry.
 
-Stub implementation: captures minimal snapshot for groove-layer intent generator.
+The realtime loops (practice_lock_to_clave, rt_play_cycle) record note
+onsets into a preallocated ring buffer; snapshot() turns the most recent
+horizon into features for the groove-layer intent generator.
 """
 from __future__ import annotations
 
+import math
+import threading
+import time
+from array import array
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from itertools import accumulate
+from typing import Any, Callable, Dict
+
+# |mean offset| below this (ms) is reported as "neutral"
+DIRECTION_TOLERANCE_MS = 3.0
+# Onsets listed under events.recent_* in a snapshot
+RECENT_ONSETS = 16
 
 
 @dataclass(frozen=True)
@@ -22,20 +34,175 @@ class EvidenceWindow:
 
 class EvidenceWindowProbe:
     """
-    Stub probe. In later ships, attach this to realtime telemetry buffers.
+    Fixed-capacity ring buffer of note onsets with windowed features.
+
+    record_onset() stores (time, velocity, quantization offset) in
+    preallocated arrays together with running prefix sums, so recording is
+    O(1) with no per-event containers, and snapshot() gets the sums over
+    any horizon by a binary search plus one subtraction instead of
+    rescanning history. Each time the ring wraps, the time origin moves to
+    the oldest buffered onset and the sums are rebuilt over the buffer
+    (amortized O(1)), so they stay the size of one buffer's worth of data
+    however long the session runs and the subtractions keep their precision.
+    Onset times must be non-decreasing.
 
     Usage:
         probe = EvidenceWindowProbe()
-        window = probe.snapshot(horizon_ms=2000)
+        probe.record_onset(t_s, velocity=96, offset_ms=-4.0)   # realtime loop
+        window = probe.snapshot(horizon_ms=2000)               # intent loop
+
+    An empty window gives features == {}.
     """
 
-    def snapshot(self, *, horizon_ms: int) -> EvidenceWindow | None:
+    def __init__(self, capacity: int = 1024, *, now_fn: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = max(2, int(capacity))
+        self.reference_bpm: float | None = None
+        self._now = now_fn
+        self._lock = threading.Lock()
+        n = self.capacity
+        self._t = array("d", bytes(8 * n))
+        self._vel = array("d", bytes(8 * n))
+        self._off = array("d", bytes(8 * n))
+        # Prefix sums of everything recorded *before* the onset in each slot
+        self._p = [array("d", bytes(8 * n)) for _ in range(7)]
+        # Running totals: off, off^2, vel, vel^2, t, t^2, t*off (t relative to origin)
+        self._s = [0.0] * 7
+        self._count = 0
+        self._origin = 0.0
+
+    def set_reference_bpm(self, bpm: float | None) -> None:
+        """Tempo the onsets are quantized against (enables tempo.bpm_estimate)."""
+        self.reference_bpm = float(bpm) if bpm else None
+
+    def record_onset(self, t_s: float, velocity: float, offset_ms: float) -> None:
+        """Record one note onset: monotonic time, velocity, offset from grid (ms, + = late)."""
+        with self._lock:
+            k = self._count
+            if k == 0:
+                self._origin = t_s
+            slot = k % self.capacity
+            if slot == 0 and k > 0:
+                self._rebase()
+            p = self._p
+            for i in range(7):
+                p[i][slot] = self._s[i]
+            self._t[slot] = t_s
+            self._vel[slot] = velocity
+            self._off[slot] = offset_ms
+            rt = t_s - self._origin
+            s = self._s
+            s[0] += offset_ms
+            s[1] += offset_ms * offset_ms
+            s[2] += velocity
+            s[3] += velocity * velocity
+            s[4] += rt
+            s[5] += rt * rt
+            s[6] += rt * offset_ms
+            self._count = k + 1
+
+    def _rebase(self) -> None:
+        """
+        Restart the sums at the oldest onset that survives the next write.
+
+        Called when the ring is full and about to overwrite slot 0, so the
+        survivors sit in slots 1..capacity-1 in order.
+        """
+        origin = self._t[1]
+        off = self._off[1:]
+        vel = self._vel[1:]
+        rt = [t - origin for t in self._t[1:]]
+        terms = (
+            off,
+            [x * x for x in off],
+            vel,
+            [x * x for x in vel],
+            rt,
+            [x * x for x in rt],
+            [a * b for a, b in zip(rt, off)],
+        )
+        for i, xs in enumerate(terms):
+            sums = array("d", accumulate(xs, initial=0.0))
+            self._p[i][1:] = sums[:-1]
+            self._s[i] = sums[-1]
+        self._origin = origin
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def _first_index_at_or_after(self, t_s: float) -> int:
+        """Logical index of the oldest buffered onset with time >= t_s."""
+        lo = max(0, self._count - self.capacity)
+        hi = self._count
+        n = self.capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._t[mid % n] < t_s:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def snapshot(self, *, horizon_ms: int, now_s: float | None = None) -> EvidenceWindow | None:
         """
         Capture a snapshot of the current evidence window.
 
         Returns None (fail closed) if snapshot cannot be captured.
         """
         try:
-            return EvidenceWindow(horizon_ms=int(horizon_ms), features={})
+            with self._lock:
+                features = self._features(int(horizon_ms), self._now() if now_s is None else now_s)
+            return EvidenceWindow(horizon_ms=int(horizon_ms), features=features)
         except Exception:
             return None
+
+    def _features(self, horizon_ms: int, now: float) -> Dict[str, Any]:
+        k = self._count
+        if k == 0 or horizon_ms <= 0:
+            return {}
+        j = self._first_index_at_or_after(now - horizon_ms / 1000.0)
+        m = k - j
+        if m <= 0:
+            return {}
+        n = self.capacity
+        slot = j % n
+        off, off2, vel, vel2, st, st2, stoff = (self._s[i] - self._p[i][slot] for i in range(7))
+
+        mean_off = off / m
+        mean_vel = vel / m
+        timing: Dict[str, Any] = {
+            "mean_offset_ms": round(mean_off, 3),
+            "stddev_ms": round(math.sqrt(max(0.0, off2 / m - mean_off * mean_off)), 3),
+            "direction": (
+                "ahead" if mean_off < -DIRECTION_TOLERANCE_MS
+                else "behind" if mean_off > DIRECTION_TOLERANCE_MS
+                else "neutral"
+            ),
+        }
+        tempo: Dict[str, Any] = {}
+        stt = st2 - st * st / m
+        if m >= 3 and stt > 1e-9:
+            # Least-squares slope of offset over time: ms of drift per second
+            slope = (stoff - st * off / m) / stt
+            tempo["drift_slope"] = round(slope, 4)
+            if self.reference_bpm:
+                # Offsets growing by slope ms/s => player's beat is that much longer
+                tempo["bpm_estimate"] = round(self.reference_bpm / (1.0 + slope / 1000.0), 2)
+
+        recent = min(m, RECENT_ONSETS)
+        onsets = [self._t[(k - recent + i) % n] for i in range(recent)]
+        features: Dict[str, Any] = {
+            "timing": timing,
+            "dynamics": {
+                "velocity_mean": round(mean_vel, 2),
+                "velocity_stddev": round(math.sqrt(max(0.0, vel2 / m - mean_vel * mean_vel)), 2),
+            },
+            "events": {
+                "count": m,
+                "onset_density_hz": round(m * 1000.0 / horizon_ms, 3),
+                "recent_note_onsets_ms": [round((t - now) * 1000.0, 1) for t in onsets],
+                "recent_iois_ms": [round((b - a) * 1000.0, 1) for a, b in zip(onsets, onsets[1:])],
+            },
+        }
+        if tempo:
+            features["tempo"] = tempo
+        return features
@@ -19,7 +19,10 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass, field
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from ..rt_metrics import RtMetrics
 
 # MIDI realtime bytes
 MIDI_CLOCK = 0xF8
@@ -149,6 +152,7 @@ class MidiClockMaster:
         smoother: Optional[TempoSmoother] = None,
         max_catchup_ticks: int = 6,
         emit_start_stop: bool = True,
+        metrics: Optional[RtMetrics] = None,
     ) -> None:
         """
         Args:
@@ -156,11 +160,14 @@ class MidiClockMaster:
             smoother: Optional custom TempoSmoother (default creates one)
             max_catchup_ticks: Max ticks to emit in one tick() call if behind
             emit_start_stop: Whether to emit MIDI Start/Stop messages
+            metrics: Optional rt_metrics.RtMetrics ("clock" lateness per tick,
+                catch-up resets as overruns, skipped ticks as drops)
         """
         self._send = send_bytes
         self._smoother = smoother or TempoSmoother()
         self._max_catchup_ticks = int(max_catchup_ticks)
         self._emit_start_stop = bool(emit_start_stop)
+        self._metrics = metrics
 
         self._running = False
         self._next_tick_t: float = 0.0
@@ -212,6 +219,8 @@ class MidiClockMaster:
 
         # Emit all due ticks, up to max_catchup_ticks
         while self._next_tick_t <= t and ticks_emitted < self._max_catchup_ticks:
+            if self._metrics is not None:
+                self._metrics.record_lateness("clock", t - self._next_tick_t)
             self._send(bytes([MIDI_CLOCK]))
             self._tick_count += 1
             ticks_emitted += 1
@@ -223,9 +232,15 @@ class MidiClockMaster:
 
         # If we hit max_catchup_ticks, we're behind. Reset to avoid spiraling.
         if ticks_emitted >= self._max_catchup_ticks and self._next_tick_t < t:
+            if self._metrics is not None:
+                self._metrics.record_overrun("clock")
+                skipped = int((t - self._next_tick_t) / bpm_to_tick_period_s(self._smoother.bpm_current))
+                self._metrics.record_drop("clock_skipped", skipped + 1)
             # Skip ahead to now to avoid endless catch-up
             self._next_tick_t = t
 
+        if self._metrics is not None:
+            self._metrics.maybe_report()
         return ticks_emitted
 
     @property
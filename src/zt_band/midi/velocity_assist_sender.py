@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+from ..rt_bridge import scale_velocity
+
 
 @dataclass(frozen=True)
 class VelocityAssistSender:
@@ -16,17 +18,15 @@ class VelocityAssistSender:
     sender: Any
     velocity_mul: float = 1.0
 
-    def send(self, msg: Any) -> None:
+    def _scaled(self, msg: Any) -> Any:
         try:
             mtype = getattr(msg, "type", None)
             if mtype != "note_on":
-                self.sender.send(msg)
-                return
+                return msg
 
             vel = getattr(msg, "velocity", None)
             if vel is None:
-                self.sender.send(msg)
-                return
+                return msg
 
             new_vel = int(round(float(vel) * float(self.velocity_mul)))
             if new_vel < 1:
@@ -36,15 +36,26 @@ class VelocityAssistSender:
 
             # Preserve original message object if possible (avoid mutating shared refs)
             if hasattr(msg, "copy"):
-                m2 = msg.copy(velocity=new_vel)
-                self.sender.send(m2)
-            else:
-                # Fallback: mutate if we can't copy (best effort)
-                try:
-                    setattr(msg, "velocity", new_vel)
-                except Exception:
-                    pass
-                self.sender.send(msg)
+                return msg.copy(velocity=new_vel)
+            # Fallback: mutate if we can't copy (best effort)
+            try:
+                setattr(msg, "velocity", new_vel)
+            except Exception:
+                pass
+            return msg
         except Exception:
             # Never break playback
-            self.sender.send(msg)
+            return msg
+
+    def send(self, msg: Any) -> None:
+        self.sender.send(self._scaled(msg))
+
+    def send_at(self, due: float, msg: Any) -> None:
+        """Scaled send through a queued output stage (see senders.ThreadedSender)."""
+        self.sender.send_at(due, self._scaled(msg))
+
+    def send_raw(self, data: bytes) -> None:
+        """Scale a raw note-on (velocity 0 stays a note-off), then send_raw."""
+        if len(data) == 3 and data[0] & 0xF0 == 0x90 and data[2] > 0:
+            data = bytes((data[0], data[1], scale_velocity(data[2], self.velocity_mul)))
+        self.sender.send_raw(data)
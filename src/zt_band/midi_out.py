@@ -12,6 +12,9 @@ try:
 except ImportError:
     MIDO_AVAILABLE = False
 
+# Selectable backends for write_midi_file(writer=...)
+MIDI_WRITERS = ("mido", "fast")
+
 
 @dataclass
 class NoteEvent:
@@ -38,6 +41,7 @@ def write_midi_file(
     tempo_bpm: int = 120,
     outfile: str = "backing.mid",
     meter: Tuple[int, int] = (4, 4),
+    writer: str = "mido",
 ) -> None:
     """
     Write MIDI note events to a .mid file with enforced stability invariants.
@@ -56,11 +60,23 @@ def write_midi_file(
         outfile: Output filename
         meter: Time signature as (numerator, denominator), e.g. (4, 4) or (3, 4).
                Phase 6.0+: Used for MIDI time signature meta event.
+        writer: "mido" (default) builds mido messages and saves via mido;
+                "fast" uses the direct byte encoder in smf_writer.py, which
+                produces identical bytes and does not need mido. The fast
+                writer also accepts EventBuffer inputs.
 
     Raises:
-        ImportError: If mido library is not installed
+        ImportError: If mido library is not installed (mido writer only)
         ValueError: If stuck notes detected (unbalanced note on/off)
     """
+    if writer == "fast":
+        from .smf_writer import write_smf_file
+
+        write_smf_file(comp_events, bass_events, tempo_bpm=tempo_bpm, outfile=outfile, meter=meter)
+        return
+    if writer not in MIDI_WRITERS:
+        raise ValueError(f"Unknown MIDI writer: {writer!r} (expected one of {MIDI_WRITERS})")
+
     if not MIDO_AVAILABLE:
         raise ImportError(
             "mido library required for MIDI output. Install with: pip install mido"
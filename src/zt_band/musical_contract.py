@@ -8,6 +8,10 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .event_buffer import EventBuffer
 
 
 class ContractViolation(ValueError):
@@ -76,3 +80,29 @@ def enforce_determinism_inputs(
         raise ContractViolation(
             "tritone_mode=probabilistic requires tritone_seed for reproducible output."
         )
+
+
+def validate_event_buffer(
+    buf: EventBuffer,
+    *,
+    contract: MusicalContract = MusicalContract(),
+) -> None:
+    """
+    Column-wise validation of an EventBuffer (same rules as validate_note_events).
+
+    Checks whole-column bounds first; only when a bound fails does it fall
+    back to the per-event scan so the ContractViolation message names the
+    first offending value, exactly as the list path does.
+    """
+    if not len(buf):
+        return
+    ok = (
+        (not contract.forbid_negative_start or min(buf.start) >= 0)
+        and (not contract.forbid_nonpositive_duration or min(buf.duration) > 0)
+        and 0 <= min(buf.note) and max(buf.note) <= 127
+        and 0 <= min(buf.channel) and max(buf.channel) <= 15
+        and (not contract.forbid_velocity_zero or min(buf.velocity) > 0)
+        and max(buf.velocity) <= 127
+    )
+    if not ok:
+        validate_note_events(buf, contract=contract)
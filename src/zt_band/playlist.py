@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -8,8 +9,10 @@ from typing import Any
 import yaml  # type: ignore[import-not-found]
 
 from .config import load_program_config
-from .engine import generate_accompaniment
-from .midi_out import NoteEvent, write_midi_file
+from .engine import generate_accompaniment_buffers
+from .event_buffer import EventBuffer
+from .midi_out import write_midi_file
+from .smf_writer import StreamingSmfWriter
 
 
 @dataclass
@@ -132,23 +135,19 @@ def load_playlist(path: str | Path) -> Playlist:
     return Playlist(name=name, tempo=tempo, items=items, outfile=outfile)
 
 
-def render_playlist_to_midi(playlist: Playlist, outfile: str) -> None:
+def _iter_playlist_segments(
+    playlist: Playlist,
+) -> Iterator[tuple[int, EventBuffer, EventBuffer, float]]:
     """
-    Render a playlist into a single combined MIDI file.
+    Render playlist items one at a time.
 
-    Assumptions / rules:
-      - All programs in the playlist must share the same tempo.
-        If Playlist.tempo is set, each ProgramConfig.tempo must match it.
-        If Playlist.tempo is None, the first program's tempo is used and
-        subsequent programs must match.
-      - Each ProgramConfig's 'outfile' is ignored; 'outfile' arg is used instead.
+    Yields (global_tempo, comp_buf, bass_buf, segment_beats) once per repeat,
+    in playback order. Each item is rendered once and reused for its repeats
+    (generation is deterministic). Raises on missing configs or tempo mismatch
+    when the offending item is reached.
     """
-    all_comp: list[NoteEvent] = []
-    all_bass: list[NoteEvent] = []
-
     # Determine global tempo
     global_tempo: int | None = playlist.tempo
-    total_beats: float = 0.0
 
     first = True
 
@@ -172,52 +171,110 @@ def render_playlist_to_midi(playlist: Playlist, outfile: str) -> None:
                 f"tempo {cfg.tempo}, but global tempo is {global_tempo}."
             )
 
-        for _ in range(item.repeat):
-            # Generate accompaniment for this config, but don't write a file.
-            comp_events, bass_events = generate_accompaniment(
-                chord_symbols=cfg.chords,
-                style_name=cfg.style,
-                tempo_bpm=cfg.tempo,
-                bars_per_chord=cfg.bars_per_chord,
-                outfile=None,
-                tritone_mode=cfg.tritone_mode,
-                tritone_strength=cfg.tritone_strength,
-                tritone_seed=cfg.tritone_seed,
-            )
+        # Generate accompaniment for this config, but don't write a file.
+        comp_buf, bass_buf = generate_accompaniment_buffers(
+            chord_symbols=cfg.chords,
+            style_name=cfg.style,
+            tempo_bpm=cfg.tempo,
+            bars_per_chord=cfg.bars_per_chord,
+            outfile=None,
+            tritone_mode=cfg.tritone_mode,
+            tritone_strength=cfg.tritone_strength,
+            tritone_seed=cfg.tritone_seed,
+        )
 
-            # Compute length in beats for this segment
-            segment_max: float = 0.0
-            for ev in comp_events + bass_events:
-                end = ev.start_beats + ev.duration_beats
+        # Compute length in beats for this segment
+        segment_max: float = 0.0
+        for buf in (comp_buf, bass_buf):
+            for start, dur in zip(buf.start, buf.duration):
+                end = start + dur
                 if end > segment_max:
                     segment_max = end
 
-            # Offset events by total_beats so they chain in time
-            for ev in comp_events:
-                all_comp.append(
-                    NoteEvent(
-                        start_beats=ev.start_beats + total_beats,
-                        duration_beats=ev.duration_beats,
-                        midi_note=ev.midi_note,
-                        velocity=ev.velocity,
-                        channel=ev.channel,
-                    )
-                )
-            for ev in bass_events:
-                all_bass.append(
-                    NoteEvent(
-                        start_beats=ev.start_beats + total_beats,
-                        duration_beats=ev.duration_beats,
-                        midi_note=ev.midi_note,
-                        velocity=ev.velocity,
-                        channel=ev.channel,
-                    )
-                )
-
-            total_beats += segment_max
+        for _ in range(item.repeat):
+            yield global_tempo, comp_buf, bass_buf, segment_max
+
+
+def playlist_render_inputs(playlist: Playlist) -> dict[str, Any]:
+    """
+    Everything that determines render_playlist_to_midi() output, as plain data
+    (for render_cache.render_cache_key). Program configs are read, not rendered.
+    """
+    segments: list[dict[str, Any]] = []
+    for item in playlist.items:
+        cfg = load_program_config(item.config_path)
+        segments.append(
+            {
+                "chord_symbols": cfg.chords,
+                "style_name": cfg.style,
+                "tempo_bpm": cfg.tempo,
+                "bars_per_chord": cfg.bars_per_chord,
+                "tritone_mode": cfg.tritone_mode,
+                "tritone_strength": cfg.tritone_strength,
+                "tritone_seed": cfg.tritone_seed,
+                "repeat": item.repeat,
+            }
+        )
+    return {"kind": "playlist", "tempo": playlist.tempo, "segments": segments}
+
+
+def render_playlist_to_midi(playlist: Playlist, outfile: str, *, stream: bool = False) -> None:
+    """
+    Render a playlist into a single combined MIDI file.
+
+    Assumptions / rules:
+      - All programs in the playlist must share the same tempo.
+        If Playlist.tempo is set, each ProgramConfig.tempo must match it.
+        If Playlist.tempo is None, the first program's tempo is used and
+        subsequent programs must match.
+      - Each ProgramConfig's 'outfile' is ignored; 'outfile' arg is used instead.
+
+    With stream=True, items are written to disk as they are rendered (see
+    smf_writer.StreamingSmfWriter), so peak memory is bounded by the largest
+    single item instead of the whole session. The file bytes are identical
+    to the default mode.
+    """
+    if stream:
+        _render_playlist_streaming(playlist, outfile)
+        return
+
+    all_comp = EventBuffer()
+    all_bass = EventBuffer()
+    global_tempo: int | None = playlist.tempo
+    total_beats: float = 0.0
+
+    for tempo, comp_buf, bass_buf, segment_beats in _iter_playlist_segments(playlist):
+        global_tempo = tempo
+        # Offset events by total_beats so they chain in time
+        all_comp.extend(comp_buf, offset_beats=total_beats)
+        all_bass.extend(bass_buf, offset_beats=total_beats)
+        total_beats += segment_beats
 
     if global_tempo is None:
         # This should not happen, but guard anyway
         global_tempo = 120
 
-    write_midi_file(all_comp, all_bass, tempo_bpm=global_tempo, outfile=outfile)
+    write_midi_file(all_comp.to_events(), all_bass.to_events(), tempo_bpm=global_tempo, outfile=outfile)
+
+
+def _render_playlist_streaming(playlist: Playlist, outfile: str) -> None:
+    """Streaming variant of render_playlist_to_midi (one item in memory)."""
+    segments = _iter_playlist_segments(playlist)
+    first = next(segments, None)
+    if first is None:
+        # Nothing to stream; the default path writes the (empty) session
+        render_playlist_to_midi(playlist, outfile)
+        return
+
+    tempo = first[0]
+    total_beats: float = 0.0
+    with StreamingSmfWriter(outfile, tempo_bpm=tempo) as writer:
+        seg: tuple[int, EventBuffer, EventBuffer, float] | None = first
+        while seg is not None:
+            _tempo, comp_buf, bass_buf, segment_beats = seg
+            next_offset = total_beats + segment_beats
+            writer.add_segment(
+                comp_buf, bass_buf, offset_beats=total_beats, next_offset_beats=next_offset
+            )
+            total_beats = next_offset
+            seg = next(segments, None)
@@ -2,14 +2,18 @@
 Real-time MIDI scheduler and practice quantizer.
 
 Provides:
-- rt_play_cycle: Real-time playback aligned to clave grid
+- rt_play_cycle: Real-time playback aligned to clave grid (event-driven or polling)
 - practice_lock_to_clave: MIDI IN quantized/locked to clave grid -> MIDI OUT
 """
 from __future__ import annotations
 
+import heapq
+import itertools
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Iterable, Literal
+from typing import TYPE_CHECKING, Callable, Iterable, Literal
 
 try:
     import mido
@@ -17,10 +21,18 @@ try:
 except ImportError:
     MIDO_AVAILABLE = False
 
-from .senders import create_sender
+from .realtime_telemetry import make_bar_cc_raw, make_lookahead_cc_messages, make_lookahead_cc_raw
+from .rt_bridge import RawStepEvent, compile_step_messages, raw_message_bytes, scale_velocity
+from .rt_lookahead import LookaheadController
+from .rt_metrics import RtMetrics
+from .rt_priority import RealtimeSetup
+from .senders import ThreadedSender, create_sender
 
 from .clave import ClaveGrid, clave_hit_steps, is_allowed_on_clave, quantize_step
 
+if TYPE_CHECKING:
+    from .groove.window_probe import EvidenceWindowProbe
+
 
 @dataclass(frozen=True)
 class RtSpec:
@@ -32,8 +44,15 @@ class RtSpec:
     clave: Literal["son_2_3", "son_3_2"] = "son_2_3"
 
     # Scheduler behavior
-    lookahead_s: float = 0.05    # how far ahead to schedule
-    tick_s: float = 0.01         # loop sleep
+    scheduler: Literal["event", "poll"] = "event"  # event timeline vs fixed-tick polling
+    lookahead_s: float = 0.05    # how far ahead to schedule (poll)
+    tick_s: float = 0.01         # loop sleep (poll)
+    spin_s: float = 0.001        # busy-wait margin before each due time (event)
+    adaptive_lookahead: bool = False  # adapt lookahead_s per cycle (see rt_lookahead.py)
+    lookahead_min_s: float = 0.005
+    lookahead_max_s: float = 0.200
+    realtime_priority: bool = False  # SCHED_FIFO/nice, affinity, mlock, gc freeze (see rt_priority.py)
+    rt_cpu: int | None = None        # with realtime_priority: CPU to pin to
 
     # Practice behavior
     practice_strict: bool = True
@@ -42,6 +61,7 @@ class RtSpec:
     practice_window_off_ms: float | None = None  # override for NOTE-OFF (defaults loose)
     practice_quantize: Literal["nearest", "down", "up"] = "nearest"
     practice_reject_offgrid: bool = False  # if True, drop notes not on allowed steps (strict mode)
+    practice_input: Literal["poll", "callback"] = "poll"  # iter_pending every tick_s vs port callback
 
     # Click
     click: bool = True
@@ -55,11 +75,20 @@ class RtSpec:
     bar_cc_countdown: int = 20  # CC number for bars-remaining countdown
     bar_cc_index: int = 21  # CC number for bar index count-up
     bar_cc_section: int = 22  # CC number for section/item marker
+    bar_cc_lookahead: int = 23  # CC number for adaptive lookahead (ms, clamped 127)
+    bar_cc_lookahead_state: int = 24  # CC number for controller state (0 steady, 1 widened, 2 narrowed)
     bars_limit: int | None = None  # total bars for countdown calculation
 
     # Performance controls (E2E wiring)
     velocity_mul: float = 1.0  # Note-on velocity scaling from arranger
 
+    # Metrics (opt-in latency/jitter recording, see rt_metrics.py)
+    metrics_out: str | None = None  # JSON path; enables recording when set
+    metrics_interval_s: float = 10.0  # periodic summary line (0 = off)
+
+    # Groove evidence: note onsets are recorded here (see groove/window_probe.py)
+    evidence_probe: EvidenceWindowProbe | None = None
+
 
 def _now() -> float:
     return time.monotonic()
@@ -172,9 +201,16 @@ def _step_to_t(step_i: int, grid: ClaveGrid) -> float:
 def _send_at(outport, msg, when: float) -> None:
     """
     Busy-wait is avoided; caller uses lookahead scheduling.
+
+    Queued output stages (senders.ThreadedSender) take the due time and do
+    the final wait on their own thread; plain senders write immediately.
     """
     # msg.time is ignored for realtime; we schedule by wall clock.
-    outport.send(msg)
+    send_at = getattr(outport, "send_at", None)
+    if send_at is not None:
+        send_at(when, msg)
+    else:
+        outport.send(msg)
 
 
 def _make_click_msgs(grid: ClaveGrid, spec: RtSpec) -> list[tuple[int, mido.Message]]:
@@ -194,9 +230,407 @@ def _make_click_msgs(grid: ClaveGrid, spec: RtSpec) -> list[tuple[int, mido.Mess
     return out
 
 
+# Timeline entry kinds; also the dispatch order for entries sharing a due time
+# (bar CC first, as the polling loop emits it before the events of that tick).
+_TL_BAR_CC = 0
+_TL_MAIN = 1
+_TL_CLICK = 2
+
+TimelineEntry = tuple[float, int, object]  # (offset_s in cycle, kind, payload)
+
+
+def _bar_cc_args(spec: RtSpec, bar_index: int, total_bars: int | None) -> dict:
+    if total_bars is not None:
+        bars_remaining = max(0, total_bars - bar_index - 1)
+    else:
+        bars_remaining = 127  # no countdown in infinite mode
+    return {
+        "channel": spec.bar_cc_channel,
+        "cc_countdown": spec.bar_cc_countdown,
+        "cc_index": spec.bar_cc_index,
+        "bars_remaining": bars_remaining,
+        "bar_index": bar_index,
+    }
+
+
+def _bar_cc_messages(spec: RtSpec, bar_index: int, total_bars: int | None) -> list:
+    """Bar-boundary telemetry CCs (countdown + index) for one bar."""
+    from .realtime_telemetry import make_bar_cc_messages
+
+    return make_bar_cc_messages(**_bar_cc_args(spec, bar_index, total_bars))
+
+
+def _bar_cc_raw(spec: RtSpec, bar_index: int, total_bars: int | None) -> list[bytes]:
+    """_bar_cc_messages() as raw bytes."""
+    return make_bar_cc_raw(**_bar_cc_args(spec, bar_index, total_bars))
+
+
+def _lookahead_cc_args(spec: RtSpec, controller: LookaheadController) -> dict:
+    return {
+        "channel": spec.bar_cc_channel,
+        "cc_lookahead": spec.bar_cc_lookahead,
+        "cc_state": spec.bar_cc_lookahead_state,
+        "lookahead_s": controller.lookahead_s,
+        "state": controller.state,
+    }
+
+
+StepEvent = tuple[int, "mido.Message"] | RawStepEvent
+
+
+def _as_message(ev: StepEvent) -> mido.Message:
+    if len(ev) == 4:
+        return mido.Message.from_bytes(raw_message_bytes(*ev[1:]))
+    return ev[1]
+
+
+def _encode_step_events(events: Iterable[StepEvent], *, velocity_mul: float = 1.0) -> list[tuple[int, bytes]]:
+    """
+    (step_i, raw bytes) for (step_i, mido.Message) pairs and/or RawStepEvents.
+
+    Note-on velocities are scaled here (compile time) rather than per send.
+    """
+    out = []
+    for ev in events:
+        step_i, status, d1, d2 = ev if len(ev) == 4 else compile_step_messages([ev])[0]
+        if velocity_mul != 1.0 and status & 0xF0 == 0x90 and d2 > 0:
+            d2 = scale_velocity(d2, velocity_mul)
+        out.append((step_i, raw_message_bytes(status, d1, d2)))
+    return out
+
+
+def _build_cycle_timeline(
+    events: Iterable[StepEvent],
+    clicks: Iterable[StepEvent],
+    grid: ClaveGrid,
+    spec: RtSpec,
+) -> list[TimelineEntry]:
+    """
+    Merge main, click and bar-CC events into one sorted timeline for a cycle.
+
+    Offsets are seconds from the cycle start and do not depend on which cycle
+    is playing, so the timeline is built once per rt_play_cycle call. Main and
+    click payloads are pre-encoded MIDI bytes (velocity_mul applied); bar-CC
+    payloads are the bar number within the cycle, encoded at dispatch time.
+    Same-step events keep their input order.
+    """
+    steps_per_cycle = grid.steps_per_cycle()
+    keyed: list[tuple[float, int, int, object]] = []
+    if spec.bar_cc_enabled:
+        bar_len = grid.seconds_per_bar()
+        for b in range(grid.bars_per_cycle):
+            keyed.append((b * bar_len, _TL_BAR_CC, b, b))
+    for kind, source in ((_TL_MAIN, events), (_TL_CLICK, clicks)):
+        for n, (step_i, data) in enumerate(_encode_step_events(source, velocity_mul=spec.velocity_mul)):
+            keyed.append((_step_to_t(step_i % steps_per_cycle, grid), kind, n, data))
+    keyed.sort(key=lambda e: (e[0], e[1], e[2]))
+    return [(offset, kind, payload) for offset, kind, _, payload in keyed]
+
+
+def _should_drop_raw_note_on(*, data: bytes, lateness_s: float, policy: LateDropPolicy) -> bool:
+    """_should_drop_note_on() for raw bytes (note-off / vel 0 never dropped)."""
+    if not policy.enabled or data[0] & 0xF0 != 0x90 or data[2] == 0:
+        return False
+    if lateness_s <= policy.late_drop_s():
+        return False
+    return data[2] <= policy.ghost_note_on_max_vel
+
+
+def _raw_writer(sender) -> Callable[[float, bytes], None]:
+    """(due, data) writer: queued send_at, else send_raw, else a rebuilt mido.Message."""
+    send_at = getattr(sender, "send_at", None)
+    if send_at is not None:
+        return send_at
+    send_raw = getattr(sender, "send_raw", None)
+    if send_raw is not None:
+        return lambda due, data: send_raw(data)
+    return lambda due, data: sender.send(mido.Message.from_bytes(data))
+
+
+def _sleep_until(
+    due: float,
+    *,
+    spin_s: float,
+    now_fn: Callable[[], float] = _now,
+    sleep_fn: Callable[[float], None] = time.sleep,
+) -> None:
+    """Sleep until spin_s before due, then busy-wait the remainder."""
+    while True:
+        dt = due - now_fn()
+        if dt <= 0:
+            return
+        if dt > spin_s:
+            sleep_fn(dt - spin_s)
+
+
+def _run_event_loop(
+    sender,
+    *,
+    timeline: list[TimelineEntry],
+    grid: ClaveGrid,
+    spec: RtSpec,
+    max_cycles: int | None,
+    policy: LateDropPolicy,
+    now_fn: Callable[[], float] = _now,
+    sleep_fn: Callable[[float], None] = time.sleep,
+    metrics: RtMetrics | None = None,
+    controller: LookaheadController | None = None,
+    start_at: float | None = None,
+) -> float:
+    """
+    Event-driven scheduler: sleep exactly until the next due time.
+
+    Wakes once per timeline entry (minus spin_s for the final busy-wait)
+    instead of every tick_s. With a queued output stage (sender.send_at)
+    it wakes lookahead_s early and only enqueues; the output thread does
+    the precise wait. Cycle starts are derived from t0 so error never
+    accumulates; whole cycles that have already passed (e.g. after a stall)
+    are skipped like the polling loop does. Returns at the end of the last
+    cycle (lookahead_s early when queued) with that end time, so a follow-up
+    timeline can continue gaplessly via start_at (default: now).
+
+    metrics (optional) gets "loop" lateness relative to each wake target,
+    late drops, stall overruns and sleep overshoot.
+
+    controller (optional, queued output only) replaces the fixed
+    lookahead_s: it sees each wake lateness and stall, and is re-evaluated
+    once per cycle. Its state rides along with the bar CCs.
+
+    spec.evidence_probe (optional) gets every note-on handed off, with its
+    hand-off lateness as the offset.
+    """
+    cycle_len = _cycle_time(grid)
+    bars_per_cycle = grid.bars_per_cycle
+    total_bars = (max_cycles * bars_per_cycle) if max_cycles else None
+    queued = hasattr(sender, "send_at")
+    write = _raw_writer(sender)
+    ahead = max(0.0, spec.lookahead_s) if queued else 0.0
+    spin_s = 0.0 if queued else max(0.0, spec.spin_s)
+    if not queued:
+        controller = None  # nothing is sent ahead, so there is no lead to adapt
+    if controller is not None:
+        ahead = controller.lookahead_s
+    probe = spec.evidence_probe
+
+    t0 = now_fn() if start_at is None else start_at
+    cycle_count = 0
+    while not (max_cycles and cycle_count >= max_cycles):
+        cycle_start = t0 + cycle_count * cycle_len
+        for n, (offset, kind, payload) in enumerate(timeline):
+            due = cycle_start + offset
+            _sleep_until(due - ahead, spin_s=spin_s, now_fn=now_fn, sleep_fn=sleep_fn)
+            lateness_s = now_fn() - due
+            if metrics is not None:
+                metrics.record_lateness("loop", lateness_s + ahead)
+                metrics.record_sleep_overshoot(lateness_s + ahead)
+            if controller is not None:
+                controller.observe(lateness_s + ahead)
+            if lateness_s >= cycle_len:
+                # stalled past this whole cycle; resync below
+                if metrics is not None:
+                    metrics.record_overrun("loop")
+                    metrics.record_drop("stall_skip", len(timeline) - n)
+                if controller is not None:
+                    controller.observe_overrun()
+                break
+            if kind == _TL_BAR_CC:
+                for data in _bar_cc_raw(spec, cycle_count * bars_per_cycle + payload, total_bars):
+                    write(due, data)
+                if controller is not None:
+                    for data in make_lookahead_cc_raw(**_lookahead_cc_args(spec, controller)):
+                        write(due, data)
+            elif kind == _TL_MAIN:
+                # Late-drop only applies to ornament note-ons; never drop note-off
+                if _should_drop_raw_note_on(data=payload, lateness_s=lateness_s, policy=policy):
+                    if metrics is not None:
+                        metrics.record_drop("late_ghost")
+                    continue
+                write(due, payload)
+                if probe is not None and payload[0] & 0xF0 == 0x90 and payload[2]:
+                    probe.record_onset(due, payload[2], max(0.0, lateness_s) * 1000.0)
+            elif not _should_drop_click(lateness_s=lateness_s, policy=policy):
+                write(due, payload)
+            elif metrics is not None:
+                metrics.record_drop("late_click")
+
+        next_cycle = max(cycle_count + 1, int((now_fn() - t0) // cycle_len))
+        if metrics is not None:
+            if next_cycle > cycle_count + 1:
+                metrics.record_drop("stall_skip", (next_cycle - cycle_count - 1) * len(timeline))
+            metrics.maybe_report()
+        if controller is not None:
+            ahead = controller.end_window()
+        cycle_count = next_cycle
+        _sleep_until(t0 + cycle_count * cycle_len - ahead, spin_s=spin_s, now_fn=now_fn, sleep_fn=sleep_fn)
+    return t0 + cycle_count * cycle_len
+
+
+def _run_poll_loop(
+    sender,
+    *,
+    events_sorted: list[tuple[int, mido.Message]],
+    click_sorted: list[tuple[int, mido.Message]],
+    grid: ClaveGrid,
+    spec: RtSpec,
+    max_cycles: int | None,
+    policy: LateDropPolicy,
+    now_fn: Callable[[], float] = _now,
+    sleep_fn: Callable[[float], None] = time.sleep,
+    metrics: RtMetrics | None = None,
+    controller: LookaheadController | None = None,
+) -> None:
+    """
+    Fixed-tick scheduler: wake every tick_s and send what falls in the lookahead window.
+
+    metrics (optional) gets "loop" lateness of every send (negative = sent
+    ahead), late drops, ticks whose work overran tick_s and sleep overshoot.
+
+    controller (optional) replaces the fixed lookahead_s window: it sees
+    every tick-to-tick interval and overrun, and is re-evaluated once per
+    cycle. Its state rides along with the bar CCs.
+    """
+    cycle_len = _cycle_time(grid)
+    bar_len = grid.seconds_per_bar()
+    ahead = controller.lookahead_s if controller is not None else spec.lookahead_s
+    probe = spec.evidence_probe
+
+    t0 = now_fn()
+    next_cycle_start = t0
+    prev_now = t0
+
+    # schedule loop
+    i = 0
+    ci = 0
+    cycle_count = 0
+
+    # bar CC tracking
+    bars_per_cycle = 2
+    total_bars = (max_cycles * bars_per_cycle) if max_cycles else None
+    bars_in_cycle_emitted = [False, False]  # track which bars in current cycle have had CC emitted
+
+    while True:
+        # Check cycle limit
+        if max_cycles and cycle_count >= max_cycles:
+            break
+
+        now = now_fn()
+        if controller is not None:
+            controller.observe(now - prev_now)
+            prev_now = now
+
+        # advance cycle start if we're past it
+        while now >= next_cycle_start + cycle_len:
+            next_cycle_start += cycle_len
+            i = 0
+            ci = 0
+            cycle_count += 1
+            bars_in_cycle_emitted = [False, False]
+            if controller is not None:
+                ahead = controller.end_window()
+            if max_cycles and cycle_count >= max_cycles:
+                break
+        if max_cycles and cycle_count >= max_cycles:
+            break
+
+        # emit bar CC messages at bar boundaries
+        if spec.bar_cc_enabled:
+            elapsed_in_cycle = now - next_cycle_start
+            for bar_in_cycle in range(bars_per_cycle):
+                bar_start = bar_in_cycle * bar_len
+                if elapsed_in_cycle >= bar_start and not bars_in_cycle_emitted[bar_in_cycle]:
+                    current_bar_index = (cycle_count * bars_per_cycle) + bar_in_cycle
+                    for msg in _bar_cc_messages(spec, current_bar_index, total_bars):
+                        _send_at(sender, msg, next_cycle_start + bar_start)
+                    if controller is not None:
+                        for msg in make_lookahead_cc_messages(**_lookahead_cc_args(spec, controller)):
+                            _send_at(sender, msg, next_cycle_start + bar_start)
+                    bars_in_cycle_emitted[bar_in_cycle] = True
+
+        # schedule events within lookahead window
+        window_end = now + ahead
+
+        # main events
+        while i < len(events_sorted):
+            step_i, msg = events_sorted[i]
+            due = next_cycle_start + _step_to_t(step_i, grid)
+            if due > window_end:
+                break
+            if due <= now:
+                lateness_s = now - due
+                # Late-drop only applies to ornament note-ons; never drop note-off
+                if msg.type == "note_on" and _should_drop_note_on(msg=msg, lateness_s=lateness_s, policy=policy):
+                    if metrics is not None:
+                        metrics.record_drop("late_ghost")
+                    i += 1
+                    continue
+            if metrics is not None:
+                metrics.record_lateness("loop", now - due)
+            _send_at(sender, msg, due)
+            if probe is not None and msg.type == "note_on" and msg.velocity:
+                probe.record_onset(due, msg.velocity, max(0.0, now - due) * 1000.0)
+            i += 1
+
+        # click events
+        while ci < len(click_sorted):
+            step_i, msg = click_sorted[ci]
+            due = next_cycle_start + _step_to_t(step_i, grid)
+            if due > window_end:
+                break
+            if due <= now:
+                lateness_s = now - due
+                if _should_drop_click(lateness_s=lateness_s, policy=policy):
+                    if metrics is not None:
+                        metrics.record_drop("late_click")
+                    ci += 1
+                    continue
+            if metrics is not None:
+                metrics.record_lateness("loop", now - due)
+            _send_at(sender, msg, due)
+            ci += 1
+
+        if metrics is not None or controller is not None:
+            before = now_fn()
+            if before - now > spec.tick_s:
+                # this tick's work took longer than a tick
+                if metrics is not None:
+                    metrics.record_overrun("loop")
+                if controller is not None:
+                    controller.observe_overrun()
+        if metrics is not None:
+            metrics.maybe_report()
+        sleep_fn(spec.tick_s)
+        if metrics is not None:
+            metrics.record_sleep_overshoot(now_fn() - before - spec.tick_s)
+
+
+def _make_metrics(spec: RtSpec) -> RtMetrics | None:
+    return RtMetrics(interval_s=spec.metrics_interval_s) if spec.metrics_out else None
+
+
+def _write_metrics(metrics: RtMetrics | None, path: str | None) -> None:
+    """Final summary line + JSON dump; never raises during shutdown."""
+    if metrics is None or not path:
+        return
+    print(metrics.summary_line())
+    try:
+        metrics.write_json(path)
+        print(f"Metrics: {path}")
+    except OSError as e:
+        print(f"warning: could not write metrics to {path}: {e}")
+
+
+def _make_realtime_setup(spec: RtSpec) -> RealtimeSetup | None:
+    """Apply the opt-in soft-realtime setup and print what succeeded."""
+    if not spec.realtime_priority:
+        return None
+    setup = RealtimeSetup(cpu=spec.rt_cpu).apply()
+    setup.print_report()
+    return setup
+
+
 def rt_play_cycle(
     *,
-    events: list[tuple[int, mido.Message]],
+    events: list[StepEvent],
     spec: RtSpec,
     max_cycles: int | None = None,
     backend: str = "mido",
@@ -205,49 +639,59 @@ def rt_play_cycle(
 ) -> None:
     """
     Real-time scheduler: repeatedly plays a 2-bar cycle of step-indexed MIDI messages.
-    events: list of (step_i, Message) in cycle coordinates (0..steps_per_cycle-1)
+    events: list of (step_i, Message) or raw (step_i, status, data1, data2)
+    tuples (see rt_bridge.note_events_to_step_raw) in cycle coordinates
+    (0..steps_per_cycle-1)
+
+    spec.scheduler selects the loop: "event" (default) sleeps until each
+    due time of a precomputed per-cycle timeline; "poll" wakes every
+    spec.tick_s and sends everything inside the lookahead window.
 
     If max_cycles is set, exits after that many cycles. Otherwise loops forever.
     Press Ctrl+C to stop.
+
+    With spec.metrics_out set, lateness/drop/overrun metrics are recorded,
+    summarized every spec.metrics_interval_s and written there as JSON on exit.
+
+    With spec.realtime_priority set, the process is given soft-realtime
+    scheduling for the duration of playback (see rt_priority.py).
     """
     if not MIDO_AVAILABLE:
         raise RuntimeError("mido is not installed; cannot use realtime features")
 
     grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
     steps_per_cycle = grid.steps_per_cycle()
-    cycle_len = _cycle_time(grid)
-    bar_len = grid.seconds_per_bar()
-
-    events_sorted = sorted(((s % steps_per_cycle), msg) for s, msg in events)
+    policy = late_drop if late_drop is not None else LateDropPolicy()
+    metrics = _make_metrics(spec)
+    if spec.evidence_probe is not None:
+        spec.evidence_probe.set_reference_bpm(spec.bpm)
+    controller = None
+    if spec.adaptive_lookahead:
+        controller = LookaheadController(
+            min_s=spec.lookahead_min_s,
+            max_s=spec.lookahead_max_s,
+            initial_s=spec.lookahead_s,
+        )
+
+    # optional click layer
+    click_events = _make_click_msgs(grid, spec)
+    # Build the hot data before the optional realtime setup freezes it.
+    if spec.scheduler == "poll":
+        events_sorted = sorted(((ev[0] % steps_per_cycle, _as_message(ev)) for ev in events), key=lambda e: e[0])
+        click_sorted = sorted(((s % steps_per_cycle, msg) for s, msg in click_events), key=lambda e: e[0])
+    else:
+        # Events are compiled to MIDI bytes once (velocity_mul included).
+        timeline = _build_cycle_timeline(events, click_events, grid, spec)
 
     # Use sender factory for backend abstraction (mido or rtmidi)
     raw_sender = create_sender(backend=backend, port_name=spec.midi_out)
+    # Before the output thread starts, so it inherits policy and affinity.
+    rt_setup = _make_realtime_setup(spec)
+    # Port writes happen on a dedicated output thread; the loop only enqueues.
+    output = ThreadedSender(raw_sender, spin_s=spec.spin_s, metrics=metrics)
 
-    # Wrap with VelocityAssistSender if velocity_mul != 1.0
-    if spec.velocity_mul != 1.0:
-        from .midi.velocity_assist_sender import VelocityAssistSender
-        sender = VelocityAssistSender(sender=raw_sender, velocity_mul=spec.velocity_mul)
-    else:
-        sender = raw_sender
-
+    drain = True
     try:
-        t0 = _now()
-        next_cycle_start = t0
-
-        # optional click layer
-        click_events = _make_click_msgs(grid, spec)
-        click_sorted = sorted(((s % steps_per_cycle), msg) for s, msg in click_events)
-
-        # schedule loop
-        i = 0
-        ci = 0
-        cycle_count = 0
-
-        # bar CC tracking
-        bars_per_cycle = 2
-        total_bars = (max_cycles * bars_per_cycle) if max_cycles else None
-        bars_in_cycle_emitted = [False, False]  # track which bars in current cycle have had CC emitted
-
         print(f"RT Play: {spec.bpm} BPM, grid={spec.grid}, clave={spec.clave}, backend={backend}")
         print(f"Output: {spec.midi_out}")
         if max_cycles:
@@ -256,94 +700,328 @@ def rt_play_cycle(
             print("Press Ctrl+C to stop...")
         if spec.bar_cc_enabled:
             print(f"Bar CC: channel={spec.bar_cc_channel}, countdown=CC#{spec.bar_cc_countdown}, index=CC#{spec.bar_cc_index}")
-
-        while True:
-            # Check cycle limit
-            if max_cycles and cycle_count >= max_cycles:
-                break
-
-            now = _now()
-
-            # advance cycle start if we're past it
-            while now >= next_cycle_start + cycle_len:
-                next_cycle_start += cycle_len
-                i = 0
-                ci = 0
-                cycle_count += 1
-                bars_in_cycle_emitted = [False, False]
-                if max_cycles and cycle_count >= max_cycles:
-                    break
-
-            # emit bar CC messages at bar boundaries
-            if spec.bar_cc_enabled:
-                elapsed_in_cycle = now - next_cycle_start
-                for bar_in_cycle in range(bars_per_cycle):
-                    bar_start = bar_in_cycle * bar_len
-                    if elapsed_in_cycle >= bar_start and not bars_in_cycle_emitted[bar_in_cycle]:
-                        # calculate countdown (bars remaining) and bar index
-                        current_bar_index = (cycle_count * bars_per_cycle) + bar_in_cycle
-                        if total_bars is not None:
-                            bars_remaining = max(0, total_bars - current_bar_index - 1)
-                        else:
-                            bars_remaining = 127  # no countdown in infinite mode
-
-                        # emit CC messages
-                        from .realtime_telemetry import make_bar_cc_messages
-                        cc_msgs = make_bar_cc_messages(
-                            channel=spec.bar_cc_channel,
-                            cc_countdown=spec.bar_cc_countdown,
-                            cc_index=spec.bar_cc_index,
-                            bars_remaining=bars_remaining,
-                            bar_index=current_bar_index,
-                        )
-                        for msg in cc_msgs:
-                            sender.send(msg)
-                        bars_in_cycle_emitted[bar_in_cycle] = True
-
-            # schedule events within lookahead window
-            window_end = now + spec.lookahead_s
-
-            # main events
-            while i < len(events_sorted):
-                step_i, msg = events_sorted[i]
-                due = next_cycle_start + _step_to_t(step_i, grid)
-                if due > window_end:
-                    break
-                if due <= now:
-                    lateness_s = now - due
-                    # Late-drop only applies to ornament note-ons; never drop note-off
-                    if msg.type == "note_on" and _should_drop_note_on(msg=msg, lateness_s=lateness_s, policy=policy):
-                        i += 1
-                        continue
-                    _send_at(sender, msg, due)
-                i += 1
-
-            # click events
-            while ci < len(click_sorted):
-                step_i, msg = click_sorted[ci]
-                due = next_cycle_start + _step_to_t(step_i, grid)
-                if due > window_end:
-                    break
-                if due <= now:
-                    lateness_s = now - due
-                    if _should_drop_click(lateness_s=lateness_s, policy=policy):
-                        ci += 1
-                        continue
-                    _send_at(sender, msg, due)
-                ci += 1
-
-            time.sleep(spec.tick_s)
+        if controller is not None:
+            print(
+                f"Adaptive lookahead: {controller.lookahead_s * 1000:.0f}ms "
+                f"(bounds {controller.min_s * 1000:.0f}-{controller.max_s * 1000:.0f}ms)"
+            )
+
+        if spec.scheduler == "poll":
+            # The polling loop works on mido messages; velocity_mul is applied per send.
+            sender = output
+            if spec.velocity_mul != 1.0:
+                from .midi.velocity_assist_sender import VelocityAssistSender
+                sender = VelocityAssistSender(sender=output, velocity_mul=spec.velocity_mul)
+            _run_poll_loop(
+                sender,
+                events_sorted=events_sorted,
+                click_sorted=click_sorted,
+                grid=grid,
+                spec=spec,
+                max_cycles=max_cycles,
+                policy=policy,
+                metrics=metrics,
+                controller=controller,
+            )
+        else:
+            _run_event_loop(
+                output,
+                timeline=timeline,
+                grid=grid,
+                spec=spec,
+                max_cycles=max_cycles,
+                policy=policy,
+                metrics=metrics,
+                controller=controller,
+            )
     except KeyboardInterrupt:
+        drain = False
         print("\nStopped.")
     finally:
-        # PANIC CLEANUP FIRST (if enabled), then close the port.
-        # Use raw_sender for cleanup since it owns the MIDI port.
-        if panic:
-            _panic_cleanup(raw_sender)
-        try:
-            raw_sender.close()
-        except Exception:
-            pass
+        # Stop the output thread (discarding queued events on Ctrl+C) so the
+        # port has a single writer again.
+        if output.stop(drain=drain):
+            # PANIC CLEANUP FIRST (if enabled), then close the port.
+            # Use raw_sender for cleanup since it owns the MIDI port.
+            if panic:
+                _panic_cleanup(raw_sender)
+            try:
+                raw_sender.close()
+            except Exception:
+                pass
+        else:
+            print("warning: MIDI output thread did not stop; port left open")
+        if rt_setup is not None:
+            rt_setup.restore()
+        if controller is not None:
+            print(
+                f"Adaptive lookahead: final {controller.lookahead_s * 1000:.1f}ms "
+                f"(widened {controller.widened}x, narrowed {controller.narrowed}x)"
+            )
+        _write_metrics(metrics, spec.metrics_out)
+
+
+class _DueQueue:
+    """Due-time priority queue of outgoing messages (FIFO among equal due times)."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, object]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, due: float, msg) -> None:
+        heapq.heappush(self._heap, (due, next(self._seq), msg))
+
+    def next_due(self) -> float | None:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_until(self, until: float) -> list[tuple[float, object]]:
+        """Remove and return (due, msg) for every entry due at or before until."""
+        out = []
+        while self._heap and self._heap[0][0] <= until:
+            due, _, msg = heapq.heappop(self._heap)
+            out.append((due, msg))
+        return out
+
+
+def _practice_due(
+    msg: mido.Message,
+    *,
+    now: float,
+    cycle_start: float,
+    grid: ClaveGrid,
+    spec: RtSpec,
+    allowed: list[int],
+) -> float | None:
+    """
+    Output due time for one practice-mode input message, or None to reject it.
+
+    Non-note messages, notes inside the strict window and note-offs that
+    strict mode would reject pass through (due = now); everything else is
+    snapped to a step boundary of the cycle starting at cycle_start.
+    """
+    if msg.type not in ("note_on", "note_off"):
+        return now
+
+    steps_per_cycle = grid.steps_per_cycle()
+    cycle_len = _cycle_time(grid)
+
+    # Determine note type: note_on with velocity>0 vs note_off (or note_on with velocity=0)
+    is_note_on = (msg.type == "note_on" and getattr(msg, "velocity", 0) > 0)
+    is_note_off = (msg.type == "note_off" or (msg.type == "note_on" and getattr(msg, "velocity", 0) == 0))
+
+    # Compute per-type windows
+    base_window_s = max(0.0, spec.practice_window_ms) / 1000.0
+    if spec.practice_window_on_ms is not None:
+        on_window_s = max(0.0, spec.practice_window_on_ms) / 1000.0
+    else:
+        on_window_s = base_window_s
+    if spec.practice_window_off_ms is not None:
+        off_window_s = max(0.0, spec.practice_window_off_ms) / 1000.0
+    else:
+        # Default NOTE-OFF window: looser to prevent choke artifacts in legato
+        off_window_s = max(base_window_s * 4.0, 0.080)  # >= 80ms or 4x base
+
+    # map arrival time to step in current cycle
+    t_in_cycle = (now - cycle_start) % cycle_len
+    step_f = _t_to_step(t_in_cycle, grid)
+    step_i = quantize_step(step_f, grid_steps=steps_per_cycle, mode=spec.practice_quantize)
+
+    if spec.practice_strict:
+        ok = is_allowed_on_clave(step_i, allowed=allowed, strict=True)
+        if not ok:
+            # Find nearest allowed hit step
+            nearest = min(allowed, key=lambda a: abs(a - step_i))
+
+            # Window check: if actual time is within ±window of nearest hit, pass-through
+            win_s = on_window_s if is_note_on else off_window_s
+            if win_s > 0.0:
+                nearest_due = cycle_start + _step_to_t(nearest, grid)
+                # Handle cycle boundary wrap
+                if nearest_due < now - (cycle_len / 2.0):
+                    nearest_due += cycle_len
+                elif nearest_due > now + (cycle_len / 2.0):
+                    nearest_due -= cycle_len
+                if abs(nearest_due - now) <= win_s:
+                    # Within tolerance: send immediately without snapping
+                    return now
+
+            # NOTE-OFF safety: never reject note-off to prevent stuck notes
+            if is_note_off:
+                return now
+
+            # For NOTE-ON: reject or snap based on settings
+            if spec.practice_reject_offgrid:
+                return None
+            step_i = nearest
+
+    # schedule output at the quantized step boundary (in this cycle)
+    due = cycle_start + _step_to_t(step_i, grid)
+
+    if due < now - (cycle_len / 2.0):
+        # Snapped across the cycle boundary (e.g. step 0 of the next cycle)
+        due += cycle_len
+    elif due < now:
+        # If due is in the past (late), push to next step boundary
+        due += grid.seconds_per_step()
+    return due
+
+
+class _PolledInput:
+    """Practice input read with iter_pending(); messages are stamped when read."""
+
+    def __init__(
+        self,
+        port,
+        *,
+        max_wait_s: float,
+        now_fn: Callable[[], float] = _now,
+        sleep_fn: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.port = port
+        self.max_wait_s = max_wait_s
+        self._now = now_fn
+        self._sleep = sleep_fn
+
+    def pending(self) -> list[tuple[float, mido.Message]]:
+        stamp = self._now()
+        return [(stamp, msg) for msg in self.port.iter_pending()]
+
+    def wait(self, timeout: float) -> None:
+        self._sleep(timeout)
+
+
+class _CallbackInput:
+    """
+    Practice input fed by the port callback (mido.open_input(callback=...)).
+
+    Each message is stamped with its arrival time on the callback thread,
+    and wait() returns as soon as one arrives.
+    """
+
+    def __init__(self, *, max_wait_s: float, now_fn: Callable[[], float] = _now) -> None:
+        self.max_wait_s = max_wait_s
+        self._now = now_fn
+        self._inbox: deque[tuple[float, mido.Message]] = deque()
+        self._arrived = threading.Event()
+
+    def put(self, msg: mido.Message) -> None:
+        """Port callback; runs on the MIDI backend's thread."""
+        self._inbox.append((self._now(), msg))
+        self._arrived.set()
+
+    def pending(self) -> list[tuple[float, mido.Message]]:
+        out = []
+        while self._inbox:
+            out.append(self._inbox.popleft())
+        return out
+
+    def wait(self, timeout: float) -> None:
+        self._arrived.wait(timeout)
+        self._arrived.clear()
+
+
+def _run_practice_loop(
+    inbox: _PolledInput | _CallbackInput,
+    output,
+    *,
+    grid: ClaveGrid,
+    spec: RtSpec,
+    now_fn: Callable[[], float] = _now,
+    metrics: RtMetrics | None = None,
+) -> None:
+    """
+    Practice-mode loop: read input, decide due times, dispatch in due order.
+
+    Quantized notes and the click timeline share one due-time priority
+    queue, so reading input never waits on an output: any number of notes
+    snapped to the same step leave together. Steps are mapped from each
+    message's arrival stamp. Entries are handed to output spec.spin_s
+    before they are due (a ThreadedSender does the final wait).
+    Runs until interrupted.
+
+    metrics (optional) gets "input" latency (arrival -> decision), "loop"
+    hand-off lateness, rejected notes and wait overshoot.
+
+    spec.evidence_probe (optional) gets every played note-on with its
+    offset from the nearest grid step.
+
+    A note-off is never due before its own note-on: if the note-on was
+    snapped to a later step (strict mode) while the note-off passes
+    through, the note-off waits for it (equal due times keep input order).
+    """
+    cycle_len = _cycle_time(grid)
+    steps_per_cycle = grid.steps_per_cycle()
+    allowed = clave_hit_steps(grid.grid, grid.clave)
+    click_timeline = [
+        (_step_to_t(s % steps_per_cycle, grid), msg)
+        for s, msg in sorted(_make_click_msgs(grid, spec), key=lambda e: e[0] % steps_per_cycle)
+    ]
+
+    queue = _DueQueue()
+    note_on_due: dict[tuple[int, int], float] = {}  # (channel, note) -> due of last queued note-on
+    probe = spec.evidence_probe
+    step_len = grid.seconds_per_step()
+    t0 = now_fn()
+    cycle = 0  # cycle the input clock is in
+    click_cycle = 0  # next cycle whose clicks go into the queue
+
+    while True:
+        now = now_fn()
+
+        # maintain cycle alignment
+        cycle = max(cycle, int((now - t0) // cycle_len))
+
+        # queue each cycle's clicks once its start is within lookahead
+        if click_timeline:
+            click_cycle = max(click_cycle, cycle)
+            while t0 + click_cycle * cycle_len <= now + spec.lookahead_s:
+                start = t0 + click_cycle * cycle_len
+                for off, msg in click_timeline:
+                    queue.push(start + off, msg)
+                click_cycle += 1
+
+        # read input messages (non-blocking); decisions only, no waiting
+        for arrived, msg in inbox.pending():
+            arrived_cycle_start = t0 + ((arrived - t0) // cycle_len) * cycle_len
+            due = _practice_due(msg, now=arrived, cycle_start=arrived_cycle_start, grid=grid, spec=spec, allowed=allowed)
+            if probe is not None and msg.type == "note_on" and msg.velocity:
+                # offset from the nearest grid step (+ = played late)
+                pos = arrived - arrived_cycle_start
+                probe.record_onset(arrived, msg.velocity, (pos - round(pos / step_len) * step_len) * 1000.0)
+            if metrics is not None:
+                metrics.record_lateness("input", now_fn() - arrived)
+                if due is None:
+                    metrics.record_drop("rejected_offgrid")
+            if due is not None:
+                if msg.type in ("note_on", "note_off"):
+                    key = (msg.channel, msg.note)
+                    if msg.type == "note_on" and msg.velocity:
+                        note_on_due[key] = due
+                    elif key in note_on_due:
+                        due = max(due, note_on_due.pop(key))
+                queue.push(due, msg)
+
+        handoff = now_fn()
+        for due, msg in queue.pop_until(handoff + spec.spin_s):
+            if metrics is not None:
+                metrics.record_lateness("loop", handoff - (due - spec.spin_s))
+            _send_at(output, msg, due)
+
+        # wake for input or the next due entry, whichever is first
+        wait = inbox.max_wait_s
+        next_due = queue.next_due()
+        if next_due is not None:
+            wait = min(wait, next_due - spec.spin_s - now_fn())
+        if metrics is not None:
+            metrics.maybe_report()
+        if wait > 0:
+            before = now_fn() if metrics is not None else 0.0
+            inbox.wait(wait)
+            if metrics is not None:
+                metrics.record_sleep_overshoot(now_fn() - before - wait)
 
 
 def practice_lock_to_clave(spec: RtSpec) -> None:
@@ -359,120 +1037,42 @@ def practice_lock_to_clave(spec: RtSpec) -> None:
         raise ValueError("practice requires midi_in")
 
     grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
-    steps_per_cycle = grid.steps_per_cycle()
-    cycle_len = _cycle_time(grid)
-    allowed = clave_hit_steps(grid.grid, grid.clave)
+    metrics = _make_metrics(spec)
+    if spec.evidence_probe is not None:
+        spec.evidence_probe.set_reference_bpm(spec.bpm)
 
     print(f"Practice Mode: {spec.bpm} BPM, grid={spec.grid}, clave={spec.clave}")
     print(f"Input: {spec.midi_in}")
     print(f"Output: {spec.midi_out}")
-    print(f"Strict: {spec.practice_strict}, Quantize: {spec.practice_quantize}")
+    print(f"Strict: {spec.practice_strict}, Quantize: {spec.practice_quantize}, Input: {spec.practice_input}")
     print("Press Ctrl+C to stop...")
 
-    with mido.open_input(spec.midi_in) as inport, mido.open_output(spec.midi_out) as outport:
-        t0 = _now()
+    callback_input = None
+    open_kwargs = {}
+    if spec.practice_input == "callback":
+        # Messages are stamped on arrival; the loop wakes as soon as one lands.
+        callback_input = _CallbackInput(max_wait_s=spec.lookahead_s)
+        open_kwargs["callback"] = callback_input.put
 
-        # optional click
-        click_events = _make_click_msgs(grid, spec)
-        click_sorted = sorted(((s % steps_per_cycle), msg) for s, msg in click_events)
-        ci = 0
-        next_cycle_start = t0
-
-        try:
-            while True:
-                now = _now()
-
-                # maintain cycle alignment
-                while now >= next_cycle_start + cycle_len:
-                    next_cycle_start += cycle_len
-                    ci = 0
-
-                # schedule click within lookahead
-                if spec.click:
-                    window_end = now + spec.lookahead_s
-                    while ci < len(click_sorted):
-                        step_i, msg = click_sorted[ci]
-                        due = next_cycle_start + _step_to_t(step_i, grid)
-                        if due > window_end:
-                            break
-                        if due <= now:
-                            outport.send(msg)
-                        ci += 1
-
-                # read input messages (non-blocking-ish)
-                for msg in inport.iter_pending():
-                    if msg.type not in ("note_on", "note_off"):
-                        outport.send(msg)
-                        continue
-
-                    # Determine note type: note_on with velocity>0 vs note_off (or note_on with velocity=0)
-                    is_note_on = (msg.type == "note_on" and getattr(msg, "velocity", 0) > 0)
-                    is_note_off = (msg.type == "note_off" or (msg.type == "note_on" and getattr(msg, "velocity", 0) == 0))
-
-                    # Compute per-type windows
-                    base_window_s = max(0.0, spec.practice_window_ms) / 1000.0
-                    if spec.practice_window_on_ms is not None:
-                        on_window_s = max(0.0, spec.practice_window_on_ms) / 1000.0
-                    else:
-                        on_window_s = base_window_s
-                    if spec.practice_window_off_ms is not None:
-                        off_window_s = max(0.0, spec.practice_window_off_ms) / 1000.0
-                    else:
-                        # Default NOTE-OFF window: looser to prevent choke artifacts in legato
-                        off_window_s = max(base_window_s * 4.0, 0.080)  # >= 80ms or 4x base
-
-                    # map arrival time to step in current cycle
-                    t_in_cycle = (now - next_cycle_start) % cycle_len
-                    step_f = _t_to_step(t_in_cycle, grid)
-                    step_i = quantize_step(step_f, grid_steps=steps_per_cycle, mode=spec.practice_quantize)
-
-                    if spec.practice_strict:
-                        ok = is_allowed_on_clave(step_i, allowed=allowed, strict=True)
-                        if not ok:
-                            # Find nearest allowed hit step
-                            nearest = min(allowed, key=lambda a: abs(a - step_i))
-
-                            # Window check: if actual time is within ±window of nearest hit, pass-through
-                            win_s = on_window_s if is_note_on else off_window_s
-                            if win_s > 0.0:
-                                nearest_due = next_cycle_start + _step_to_t(nearest, grid)
-                                # Handle cycle boundary wrap
-                                if nearest_due < now - (cycle_len / 2.0):
-                                    nearest_due += cycle_len
-                                elif nearest_due > now + (cycle_len / 2.0):
-                                    nearest_due -= cycle_len
-                                if abs(nearest_due - now) <= win_s:
-                                    # Within tolerance: send immediately without snapping
-                                    outport.send(msg)
-                                    continue
-
-                            # NOTE-OFF safety: never reject note-off to prevent stuck notes
-                            if is_note_off:
-                                outport.send(msg)
-                                continue
-
-                            # For NOTE-ON: reject or snap based on settings
-                            if spec.practice_reject_offgrid:
-                                continue
-                            step_i = nearest
-
-                    # schedule output at the quantized step boundary (in this cycle)
-                    due = next_cycle_start + _step_to_t(step_i, grid)
-
-                    # If due is in the past (late), push to next step boundary
-                    if due < now:
-                        due += grid.seconds_per_step()
-
-                    # Sleep tiny amount if needed then send (kept simple; can be improved later)
-                    wait = due - _now()
-                    if wait > 0:
-                        time.sleep(min(wait, spec.lookahead_s))
-
-                    outport.send(msg)
-
-                time.sleep(spec.tick_s)
-        except KeyboardInterrupt:
-            print("\nStopped.")
+    # Before the ports open, so the input callback and output threads inherit it.
+    rt_setup = _make_realtime_setup(spec)
+    try:
+        with mido.open_input(spec.midi_in, **open_kwargs) as inport, mido.open_output(spec.midi_out) as outport:
+            inbox = callback_input or _PolledInput(inport, max_wait_s=spec.tick_s, sleep_fn=time.sleep)
+            # Port writes happen on a dedicated output thread.
+            output = ThreadedSender(outport, spin_s=spec.spin_s, metrics=metrics)
+            drain = True
+            try:
+                _run_practice_loop(inbox, output, grid=grid, spec=spec, now_fn=_now, metrics=metrics)
+            except KeyboardInterrupt:
+                drain = False
+                print("\nStopped.")
+            finally:
+                output.stop(drain=drain)
+                _write_metrics(metrics, spec.metrics_out)
+    finally:
+        if rt_setup is not None:
+            rt_setup.restore()
 
 
 def list_midi_ports() -> tuple[list[str], list[str]]:
@@ -55,3 +55,73 @@ def make_bar_cc_messages(
             value=_clamp_cc_value(bar_index),
         ),
     ]
+
+
+def make_bar_cc_raw(
+    channel: int,
+    cc_countdown: int,
+    cc_index: int,
+    bars_remaining: int,
+    bar_index: int,
+) -> list[bytes]:
+    """
+    make_bar_cc_messages() as raw MIDI bytes (no mido objects).
+
+    Returns:
+        List of two 3-byte control-change messages (countdown CC, index CC)
+    """
+    status = 0xB0 | (int(channel) % 16)
+    return [
+        bytes((status, int(cc_countdown) % 128, _clamp_cc_value(bars_remaining))),
+        bytes((status, int(cc_index) % 128, _clamp_cc_value(bar_index))),
+    ]
+
+
+def _lookahead_cc_values(lookahead_s: float, state: int) -> tuple[int, int]:
+    return _clamp_cc_value(int(round(lookahead_s * 1000.0))), _clamp_cc_value(state)
+
+
+def make_lookahead_cc_messages(
+    channel: int,
+    cc_lookahead: int,
+    cc_state: int,
+    lookahead_s: float,
+    state: int,
+):
+    """
+    Create MIDI CC messages for adaptive lookahead telemetry.
+
+    Args:
+        channel: MIDI channel (0-15)
+        cc_lookahead: CC number for the current lookahead in ms (clamped to 127)
+        cc_state: CC number for the last controller decision
+        lookahead_s: Current lookahead in seconds
+        state: 0 steady, 1 widened, 2 narrowed (rt_lookahead constants)
+
+    Returns:
+        List of two mido.Message objects (lookahead CC, state CC)
+    """
+    if not MIDO_AVAILABLE:
+        return []
+
+    ms, st = _lookahead_cc_values(lookahead_s, state)
+    return [
+        mido.Message("control_change", channel=int(channel) % 16, control=int(cc_lookahead) % 128, value=ms),
+        mido.Message("control_change", channel=int(channel) % 16, control=int(cc_state) % 128, value=st),
+    ]
+
+
+def make_lookahead_cc_raw(
+    channel: int,
+    cc_lookahead: int,
+    cc_state: int,
+    lookahead_s: float,
+    state: int,
+) -> list[bytes]:
+    """make_lookahead_cc_messages() as raw MIDI bytes."""
+    status = 0xB0 | (int(channel) % 16)
+    ms, st = _lookahead_cc_values(lookahead_s, state)
+    return [
+        bytes((status, int(cc_lookahead) % 128, ms)),
+        bytes((status, int(cc_state) % 128, st)),
+    ]
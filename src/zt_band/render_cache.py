@@ -0,0 +1,291 @@
+"""
+Content-addressed on-disk cache for rendered MIDI files.
+
+A render is fully determined by its inputs (chords, style + overrides, tempo,
+meter, tritone settings, seeds, ...) and the engine that renders it: the
+package version plus a hash of the engine sources (zt_band and
+shared.zone_tritone), so editing a style or the engine in a checkout never
+serves a stale render. render_cache_key() hashes a canonical JSON form of
+those; the cache stores the MIDI bytes plus the technique sidecar (if any)
+under that key, so a hit costs one file copy instead of a full render.
+
+Layout:
+    {root}/{key[:2]}/{key}/render.mid
+    {root}/{key[:2]}/{key}/technique_tags.json   (optional)
+    {root}/{key[:2]}/{key}/inputs.json           (canonical inputs, for humans)
+
+Entries are published and evicted with atomic directory renames. Eviction
+is LRU by the mtime of render.mid, which is touched on every hit. A
+RenderCache tracks its total size incrementally (one scan on first store)
+and only rescans to evict once a store takes it past max_bytes. An entry
+evicted by another process while it is being read is a miss.
+
+Renders whose inputs are not reproducible (a probabilistic or humanized
+render without a seed) get no key and always bypass the cache.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable
+from dataclasses import asdict, is_dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import shared.zone_tritone
+
+from . import __version__
+from .rock_tag_attach import sidecar_json_path
+
+# Bump when the entry layout or key format changes.
+CACHE_FORMAT = 1
+ENGINE_VERSION = f"{__version__}+c{CACHE_FORMAT}"
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_MIDI_NAME = "render.mid"
+_SIDECAR_NAME = "technique_tags.json"
+_INPUTS_NAME = "inputs.json"
+
+
+def default_cache_root() -> Path:
+    """$ZT_BAND_CACHE_DIR, else ~/.cache/zt-band/renders."""
+    env = os.environ.get("ZT_BAND_CACHE_DIR")
+    return Path(env) if env else Path.home() / ".cache" / "zt-band" / "renders"
+
+
+@lru_cache(maxsize=1)
+def engine_fingerprint() -> str:
+    """Hash of every .py source in zt_band and shared.zone_tritone (computed once)."""
+    h = hashlib.sha256()
+    for pkg in (Path(__file__).parent, Path(shared.zone_tritone.__file__).parent):
+        for src in sorted(pkg.rglob("*.py")):
+            h.update(src.relative_to(pkg.parent).as_posix().encode("utf-8") + b"\0")
+            try:
+                h.update(src.read_bytes())
+            except OSError:
+                continue
+    return h.hexdigest()[:16]
+
+
+def _canonical(value: Any) -> Any:
+    """Normalize render inputs into plain JSON types with a stable layout."""
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Path):
+        return value.as_posix()
+    if hasattr(value, "value") and not isinstance(value, (str, int, float, bool)):
+        return _canonical(value.value)  # Enum
+    return value
+
+
+def _is_reproducible(inputs: dict[str, Any]) -> bool:
+    seed = inputs.get("tritone_seed")
+    if inputs.get("tritone_mode") == "probabilistic" and seed is None:
+        strength = inputs.get("tritone_strength", 1.0)
+        if 0.0 < float(strength) < 1.0:
+            return False
+
+    expressive = inputs.get("expressive")
+    if expressive is not None:
+        spec = asdict(expressive) if is_dataclass(expressive) else dict(expressive)
+        if (spec.get("humanize_ms", 0) > 0 or spec.get("humanize_vel", 0) > 0) and spec.get("seed") is None:
+            return False
+
+    overrides = inputs.get("style_overrides") or {}
+    tt_cfg = overrides.get("technique_tags") if isinstance(overrides, dict) else None
+    if isinstance(tt_cfg, dict) and tt_cfg.get("enabled", False):
+        if tt_cfg.get("seed", seed) is None:
+            return False
+
+    return True
+
+
+def render_cache_key(**inputs: Any) -> str | None:
+    """
+    Content hash for a render, or None if the render is not reproducible.
+
+    Pass the same keyword arguments as generate_accompaniment() (minus
+    outfile and midi_writer, which do not change the output bytes).
+    Items nested under ``segments`` (e.g. playlist entries) are checked too.
+    """
+    for part in [inputs, *inputs.get("segments", ())]:
+        if isinstance(part, dict) and not _is_reproducible(part):
+            return None
+    blob = json.dumps(
+        {"engine": ENGINE_VERSION, "sources": engine_fingerprint(), "inputs": _canonical(inputs)},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Size-bounded LRU cache of rendered MIDI (+ sidecar) files.
+
+    Parameters
+    ----------
+    root:
+        Cache directory (default: $ZT_BAND_CACHE_DIR or ~/.cache/zt-band/renders).
+    max_bytes:
+        Total size budget; least-recently-used entries are evicted past it.
+    """
+
+    def __init__(self, root: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root) if root is not None else default_cache_root()
+        self.max_bytes = int(max_bytes)
+        self._total_bytes: int | None = None  # known total; None = scan on next store
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str, outfile: str | Path) -> bool:
+        """
+        Copy a cached render to outfile (and its sidecar next to it).
+
+        An entry without a sidecar removes any stale one next to outfile.
+        Returns True on a hit, False on a miss.
+        """
+        entry = self._entry_dir(key)
+        midi = entry / _MIDI_NAME
+        try:
+            names = os.listdir(entry)
+            shutil.copyfile(midi, outfile)
+            sidecar_out = Path(sidecar_json_path(str(outfile)))
+            if _SIDECAR_NAME in names:
+                shutil.copyfile(entry / _SIDECAR_NAME, sidecar_out)
+            else:
+                # Don't leave a previous render's sidecar next to this MIDI
+                sidecar_out.unlink(missing_ok=True)
+        except FileNotFoundError:
+            # Missing, or evicted (e.g. by another process's prune) mid-copy.
+            return False
+        # LRU bookkeeping
+        try:
+            os.utime(midi)
+        except OSError:
+            pass
+        return True
+
+    def put(self, key: str, outfile: str | Path, inputs: dict[str, Any] | None = None) -> None:
+        """Store a freshly rendered outfile (and its sidecar) under key; evict if over budget."""
+        entry = self._entry_dir(key)
+        if (entry / _MIDI_NAME).exists():
+            return
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=entry.parent))
+        try:
+            shutil.copyfile(outfile, tmp_dir / _MIDI_NAME)
+            sidecar = Path(sidecar_json_path(str(outfile)))
+            if sidecar.exists():
+                shutil.copyfile(sidecar, tmp_dir / _SIDECAR_NAME)
+            if inputs is not None:
+                (tmp_dir / _INPUTS_NAME).write_text(
+                    json.dumps(_canonical(inputs), indent=2, default=str) + "\n", encoding="utf-8"
+                )
+            size = sum(f.stat().st_size for f in tmp_dir.iterdir())
+            if self._total_bytes is None:
+                self._total_bytes = sum(s for _, s, _ in self._entries())
+            try:
+                os.replace(tmp_dir, entry)
+                self._total_bytes += size
+            except OSError:
+                # Another process published the same key first.
+                pass
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        if self._total_bytes > self.max_bytes:
+            self.prune()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """(last_used, size_bytes, entry_dir) for every complete entry."""
+        out: list[tuple[float, int, Path]] = []
+        if not self.root.is_dir():
+            return out
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in shard.iterdir():
+                if entry.name.startswith("."):
+                    continue  # being published or removed
+                midi = entry / _MIDI_NAME
+                try:
+                    last_used = midi.stat().st_mtime
+                except OSError:
+                    continue
+                size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                out.append((last_used, size, entry))
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count and total size."""
+        entries = self._entries()
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def prune(self, max_bytes: int | None = None) -> dict[str, int]:
+        """
+        Evict least-recently-used entries until the cache fits max_bytes.
+
+        max_bytes=0 empties the cache. Returns counts of removed entries/bytes.
+        """
+        budget = self.max_bytes if max_bytes is None else int(max_bytes)
+        entries = sorted(self._entries(), key=lambda e: (e[0], e[2].name))
+        total = sum(size for _, size, _ in entries)
+        removed = removed_bytes = 0
+        for _, size, entry in entries:
+            if total <= budget:
+                break
+            # Unpublish atomically first so a concurrent get() sees all or nothing.
+            doomed = entry.with_name(f".del-{entry.name}")
+            try:
+                os.replace(entry, doomed)
+            except FileNotFoundError:
+                total -= size  # already evicted elsewhere
+                continue
+            except OSError:
+                continue
+            shutil.rmtree(doomed, ignore_errors=True)
+            total -= size
+            removed += 1
+            removed_bytes += size
+        self._total_bytes = total
+        return {"removed": removed, "removed_bytes": removed_bytes}
+
+
+def cached_render(
+    cache: RenderCache | None,
+    outfile: str | Path,
+    render: Callable[[], Any],
+    **inputs: Any,
+) -> bool:
+    """
+    Produce outfile from the cache or by calling render().
+
+    render() must write outfile (and its sidecar, if any). Returns True on a
+    cache hit. With cache=None, or non-reproducible inputs, always renders.
+    """
+    key = render_cache_key(**inputs) if cache is not None else None
+    if key is not None and cache.get(key, outfile):
+        return True
+    render()
+    if key is not None:
+        cache.put(key, outfile, inputs)
+    return False
+
@@ -4,6 +4,11 @@ RT Bridge: Convert NoteEvents (start_beats/duration_beats) into step-indexed
 
 This module bridges the locked file-generation engine to the live RT scheduler
 without touching the core MIDI writer.
+
+For loops that repeat one cycle for minutes, the *_raw variants compile the
+cycle once into RawStepEvent tuples (step_i, status, data1, data2) with no
+mido objects; rt_play_cycle turns them into bytes once and the senders'
+send_raw() writes them directly.
 """
 from __future__ import annotations
 
@@ -53,6 +58,48 @@ def _step_index(start_beats: float, spec: RtRenderSpec, steps_per_cycle: int) ->
     return int(round(x)) % steps_per_cycle
 
 
+# Compiled cycle entry: (step_i, status, data1, data2). data2 is ignored for
+# two-byte messages (program change, channel pressure).
+RawStepEvent = tuple[int, int, int, int]
+
+_NOTE_OFF = 0x80
+_NOTE_ON = 0x90
+
+
+def scale_velocity(velocity: int, velocity_mul: float) -> int:
+    """Velocity scaling used by VelocityAssistSender (rounded, clamped to 1..127)."""
+    return min(127, max(1, int(round(float(velocity) * float(velocity_mul)))))
+
+
+def raw_message_bytes(status: int, data1: int, data2: int = 0) -> bytes:
+    """Wire bytes for one channel message."""
+    if status & 0xF0 in (0xC0, 0xD0):
+        return bytes((status, data1))
+    return bytes((status, data1, data2))
+
+
+def _note_steps(ev: NoteEvent, spec: RtRenderSpec, steps_per_cycle: int) -> tuple[int, int]:
+    """(start_step, end_step) of a NoteEvent within the cycle."""
+    bps = _beats_per_step(spec)
+    bpc = _beats_per_cycle(spec)
+
+    # Map start beat to step (mod cycle)
+    start_step = _step_index(ev.start_beats, spec, steps_per_cycle)
+
+    # Map end beat to step
+    end_beats = ev.start_beats + ev.duration_beats
+    end_step_f = ((end_beats % bpc) / bps)
+    if spec.quantize == "down":
+        end_step = int(end_step_f // 1) % steps_per_cycle
+    else:
+        end_step = int(round(end_step_f)) % steps_per_cycle
+
+    # Ensure note_off is not the same step as note_on (prevents stuck notes in RT)
+    if end_step == start_step:
+        end_step = (end_step + 1) % steps_per_cycle
+    return start_step, end_step
+
+
 def note_events_to_step_messages(
     note_events: list[NoteEvent],
     *,
@@ -70,25 +117,9 @@ def note_events_to_step_messages(
         raise RuntimeError("mido is not installed; cannot use RT bridge")
 
     out: list[tuple[int, mido.Message]] = []
-    bps = _beats_per_step(spec)
-    bpc = _beats_per_cycle(spec)
 
     for ev in note_events:
-        # Map start beat to step (mod cycle)
-        start_step = _step_index(ev.start_beats, spec, steps_per_cycle)
-
-        # Map end beat to step
-        end_beats = ev.start_beats + ev.duration_beats
-        end_step_f = ((end_beats % bpc) / bps)
-        if spec.quantize == "down":
-            end_step = int(end_step_f // 1) % steps_per_cycle
-        else:
-            end_step = int(round(end_step_f)) % steps_per_cycle
-
-        # Ensure note_off is not the same step as note_on (prevents stuck notes in RT)
-        if end_step == start_step:
-            end_step = (end_step + 1) % steps_per_cycle
-
+        start_step, end_step = _note_steps(ev, spec, steps_per_cycle)
         out.append(
             (start_step, mido.Message("note_on", note=ev.midi_note, velocity=ev.velocity, channel=ev.channel))
         )
@@ -105,6 +136,68 @@ def note_events_to_step_messages(
     return out
 
 
+def note_events_to_step_raw(
+    note_events: list[NoteEvent],
+    *,
+    spec: RtRenderSpec,
+    steps_per_cycle: int,
+    velocity_mul: float = 1.0,
+) -> list[RawStepEvent]:
+    """
+    note_events_to_step_messages() compiled to RawStepEvent tuples.
+
+    Same steps and ordering, no mido objects. velocity_mul != 1.0 applies
+    VelocityAssistSender's scaling to the note-ons here, once.
+    """
+    out: list[RawStepEvent] = []
+    for ev in note_events:
+        start_step, end_step = _note_steps(ev, spec, steps_per_cycle)
+        ch = int(ev.channel) & 0x0F
+        vel = int(ev.velocity)
+        if velocity_mul != 1.0:
+            vel = scale_velocity(vel, velocity_mul)
+        out.append((start_step, _NOTE_ON | ch, int(ev.midi_note), vel))
+        out.append((end_step, _NOTE_OFF | ch, int(ev.midi_note), 0))
+
+    # Deterministic ordering: step, then note_off before note_on at same step
+    def _prio(ev: RawStepEvent) -> int:
+        return 0 if ev[1] & 0xF0 == _NOTE_OFF or ev[3] == 0 else 1
+
+    out.sort(key=lambda e: (e[0], _prio(e), e[1] & 0x0F, e[2]))
+    return out
+
+
+def compile_step_messages(
+    events: list[tuple[int, mido.Message]],
+    *,
+    velocity_mul: float = 1.0,
+) -> list[RawStepEvent]:
+    """
+    Compile (step_i, mido.Message) pairs into RawStepEvent tuples (order kept).
+
+    Only channel messages (status 0x80-0xEF) can be compiled; system and
+    realtime messages raise ValueError. Note-ons with a
+    non-zero velocity are scaled like VelocityAssistSender.
+    """
+    out: list[RawStepEvent] = []
+    for step_i, msg in events:
+        data = msg.bytes()
+        if len(data) > 3 or data[0] >= 0xF0:
+            raise ValueError(f"cannot compile {msg.type} to a raw step event")
+        status = data[0]
+        d1 = data[1] if len(data) > 1 else 0
+        d2 = data[2] if len(data) > 2 else 0
+        if velocity_mul != 1.0 and status & 0xF0 == _NOTE_ON and d2 > 0:
+            d2 = scale_velocity(d2, velocity_mul)
+        out.append((int(step_i), status, d1, d2))
+    return out
+
+
+def gm_program_changes_raw() -> list[RawStepEvent]:
+    """gm_program_changes_at_start() as RawStepEvent tuples."""
+    return [(0, 0xC0, 0, 0), (0, 0xC1, 32, 0)]
+
+
 def gm_program_changes_at_start() -> list[tuple[int, mido.Message]]:
     """
     Minimal GM setup for live RT: comp=Acoustic Grand (0), bass=Acoustic Bass (32).
@@ -0,0 +1,88 @@
+"""
+rt_lookahead.py -- Adaptive lookahead controller for realtime playback.
+
+The realtime loops act `lookahead_s` before each due time (the event loop
+hands entries to the output thread that early; the polling loop sends
+everything inside the window). A loaded machine wakes later than asked and
+needs more lead; an idle one can run tighter.
+
+LookaheadController watches, per window (one cycle), how much lead the loop
+actually needed -- wake lateness in the event loop, tick-to-tick interval in
+the polling loop -- plus loop overruns, and widens or narrows lookahead_s
+within [min_s, max_s]:
+
+  - widen immediately when the needed lead uses more than widen_ratio of the
+    current lookahead, or on any overrun
+  - narrow only after hold_windows consecutive windows below narrow_ratio
+
+The gap between the two ratios plus the hold count is the hysteresis. The
+controller only moves timing; drop decisions (and the note-off-never-dropped
+rule) stay with LateDropPolicy.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+STEADY = 0
+WIDENED = 1
+NARROWED = 2
+
+
+@dataclass
+class LookaheadController:
+    min_s: float = 0.005
+    max_s: float = 0.200
+    initial_s: float = 0.050
+    widen_ratio: float = 0.5     # needed lead above this share of lookahead -> widen
+    narrow_ratio: float = 0.2    # needed lead below this share -> calm window
+    widen_factor: float = 1.5
+    narrow_factor: float = 0.85  # narrowing is slower than widening
+    hold_windows: int = 4        # calm windows required before narrowing
+
+    lookahead_s: float = field(default=0.0, init=False)
+    state: int = field(default=STEADY, init=False)  # last end_window() decision
+    widened: int = field(default=0, init=False)
+    narrowed: int = field(default=0, init=False)
+    _need_s: float = field(default=0.0, init=False, repr=False)
+    _overruns: int = field(default=0, init=False, repr=False)
+    _calm: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.min_s <= 0 or self.max_s < self.min_s:
+            raise ValueError("need 0 < min_s <= max_s")
+        self.lookahead_s = self._clamp(self.initial_s)
+
+    def _clamp(self, v: float) -> float:
+        return min(self.max_s, max(self.min_s, v))
+
+    def observe(self, needed_lead_s: float) -> None:
+        """Record how much lead one dispatch needed (wake lateness, tick gap)."""
+        if needed_lead_s > self._need_s:
+            self._need_s = needed_lead_s
+
+    def observe_overrun(self) -> None:
+        """Record a loop overrun (stall, tick work longer than a tick)."""
+        self._overruns += 1
+
+    def end_window(self) -> float:
+        """Close the current window, adapt lookahead_s and return it."""
+        need = self._need_s
+        if self._overruns or need > self.lookahead_s * self.widen_ratio:
+            self.lookahead_s = self._clamp(max(self.lookahead_s * self.widen_factor, need / self.widen_ratio))
+            self.state = WIDENED
+            self.widened += 1
+            self._calm = 0
+        elif need < self.lookahead_s * self.narrow_ratio:
+            self._calm += 1
+            self.state = STEADY
+            if self._calm >= self.hold_windows:
+                self.lookahead_s = self._clamp(self.lookahead_s * self.narrow_factor)
+                self.state = NARROWED
+                self.narrowed += 1
+                self._calm = 0
+        else:
+            self.state = STEADY
+            self._calm = 0
+        self._need_s = 0.0
+        self._overruns = 0
+        return self.lookahead_s
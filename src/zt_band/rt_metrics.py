@@ -0,0 +1,186 @@
+"""
+rt_metrics.py -- Opt-in latency/jitter metrics for the realtime entry points.
+
+RtMetrics collects, per source ("loop", "output", "input", "scheduler",
+"clock"), a lateness histogram with HDR-style log-linear buckets, plus
+dropped-event counts by reason, loop overrun counts and the worst sleep
+overshoot. Recording is a few integer operations, so it is safe to call
+from the realtime loops; entry points take `metrics=None` and skip it.
+
+    metrics = RtMetrics(interval_s=10.0)
+    metrics.record_lateness("output", sent - due)
+    metrics.maybe_report()           # prints a summary line every interval_s
+    metrics.write_json("metrics.json")
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# 2**_SUB_BITS linear sub-buckets per power of two (<= 6.25% relative error)
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _bucket_index(us: int) -> int:
+    """Bucket for a non-negative value in microseconds."""
+    if us < 2 * _SUB_COUNT:
+        return us
+    shift = us.bit_length() - _SUB_BITS - 1
+    return _SUB_COUNT * (shift + 1) + (us >> shift) - _SUB_COUNT
+
+
+def _bucket_bounds(index: int) -> tuple[int, int]:
+    """[low, high) microsecond range covered by a bucket."""
+    if index < 2 * _SUB_COUNT:
+        return index, index + 1
+    shift = index // _SUB_COUNT - 1
+    low = (index % _SUB_COUNT + _SUB_COUNT) << shift
+    return low, low + (1 << shift)
+
+
+class LatencyHistogram:
+    """
+    Lateness histogram in microseconds with log-linear (HDR-style) buckets.
+
+    Negative lateness (sent early) is counted in `early` and recorded as 0.
+    """
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.early = 0
+        self.total_s = 0.0
+        self.min_s = float("inf")
+        self.max_s = float("-inf")
+
+    def record(self, lateness_s: float) -> None:
+        self.count += 1
+        self.total_s += lateness_s
+        if lateness_s < self.min_s:
+            self.min_s = lateness_s
+        if lateness_s > self.max_s:
+            self.max_s = lateness_s
+        if lateness_s < 0.0:
+            self.early += 1
+            lateness_s = 0.0
+        idx = _bucket_index(int(lateness_s * 1e6))
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+
+    def percentile(self, p: float) -> float:
+        """Upper bound (seconds) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * p // 100.0))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(_bucket_bounds(idx)[1] / 1e6, max(self.max_s, 0.0))
+        return max(self.max_s, 0.0)
+
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "count": self.count,
+            "early": self.early,
+            "min_ms": round(self.min_s * 1000.0, 3) if self.count else None,
+            "mean_ms": round(self.mean_s() * 1000.0, 3),
+            "max_ms": round(self.max_s * 1000.0, 3) if self.count else None,
+        }
+        for p in PERCENTILES:
+            out[f"p{p:g}_ms"] = round(self.percentile(p) * 1000.0, 3)
+        # Sparse buckets: [low_us, high_us, count]
+        out["buckets_us"] = [[*_bucket_bounds(i), self.counts[i]] for i in sorted(self.counts)]
+        return out
+
+
+class RtMetrics:
+    """
+    Latency/jitter recorder shared by one realtime session.
+
+    Args:
+        interval_s: Seconds between maybe_report() summary lines (0 = never)
+        now_fn: Monotonic clock
+        report_fn: Sink for summary lines (default: print)
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_s: float = 10.0,
+        now_fn: Callable[[], float] = time.monotonic,
+        report_fn: Callable[[str], None] = print,
+    ) -> None:
+        self.interval_s = max(0.0, interval_s)
+        self.lateness: dict[str, LatencyHistogram] = {}
+        self.drops: dict[str, int] = {}
+        self.overruns: dict[str, int] = {}
+        self.max_sleep_overshoot_s = 0.0
+        self._now = now_fn
+        self._report = report_fn
+        self._started = now_fn()
+        self._next_report = self._started + self.interval_s
+
+    def record_lateness(self, source: str, lateness_s: float) -> None:
+        hist = self.lateness.get(source)
+        if hist is None:
+            hist = self.lateness[source] = LatencyHistogram()
+        hist.record(lateness_s)
+
+    def record_drop(self, reason: str, n: int = 1) -> None:
+        self.drops[reason] = self.drops.get(reason, 0) + n
+
+    def record_overrun(self, source: str) -> None:
+        self.overruns[source] = self.overruns.get(source, 0) + 1
+
+    def record_sleep_overshoot(self, overshoot_s: float) -> None:
+        if overshoot_s > self.max_sleep_overshoot_s:
+            self.max_sleep_overshoot_s = overshoot_s
+
+    def summary_line(self) -> str:
+        parts = []
+        for source, hist in sorted(self.lateness.items()):
+            parts.append(
+                f"{source} n={hist.count} p50={hist.percentile(50) * 1000:.2f}ms "
+                f"p99={hist.percentile(99) * 1000:.2f}ms max={max(hist.max_s, 0.0) * 1000:.2f}ms"
+            )
+        drops = " ".join(f"{k}={v}" for k, v in sorted(self.drops.items())) or "0"
+        overruns = sum(self.overruns.values())
+        parts.append(f"drops {drops}")
+        parts.append(f"overruns {overruns}")
+        parts.append(f"max sleep overshoot {self.max_sleep_overshoot_s * 1000:.2f}ms")
+        return "metrics: " + " | ".join(parts)
+
+    def maybe_report(self) -> None:
+        """Emit summary_line() if interval_s has elapsed since the last one."""
+        if not self.interval_s:
+            return
+        now = self._now()
+        if now >= self._next_report:
+            self._report(self.summary_line())
+            self._next_report = now + self.interval_s
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "elapsed_s": round(self._now() - self._started, 3),
+            "lateness": {k: v.to_dict() for k, v in sorted(self.lateness.items())},
+            "drops": dict(sorted(self.drops.items())),
+            "overruns": dict(sorted(self.overruns.items())),
+            "max_sleep_overshoot_ms": round(self.max_sleep_overshoot_s * 1000.0, 3),
+        }
+
+    def write_json(self, path: str | Path) -> None:
+        """Write to_dict() to path (atomic replace)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
@@ -9,6 +9,8 @@ import argparse
 import importlib.metadata
 import json
 import os
+import queue
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -16,18 +18,38 @@ from typing import Any
 import yaml
 
 from .ui.manual_intent import ManualBandControls, build_groove_intent_from_controls
-from .groove import IntentContext, ManualIntentProvider, AnalyzerIntentProvider
+from .groove import (
+    AnalyzerIntentProvider,
+    CachedGrooveProfileStore,
+    EvidenceWindowProbe,
+    GrooveServiceConnection,
+    IntentContext,
+    IntentWorker,
+    ManualIntentProvider,
+)
 from .adapters.arranger_intent_adapter import build_arranger_control_plan
 from .arranger.performance_controls import derive_controls
 
 from .arranger.runtime import select_pattern_from_intent
 from .engine import generate_accompaniment
 from .patterns import STYLE_REGISTRY
-from .realtime import RtSpec, rt_play_cycle
+from .clave import ClaveGrid
+from .realtime import (
+    LateDropPolicy,
+    RtSpec,
+    _build_cycle_timeline,
+    _make_click_msgs,
+    _now,
+    _panic_cleanup,
+    _run_event_loop,
+    rt_play_cycle,
+)
+from .realtime_telemetry import _clamp_cc_value
+from .rt_priority import RealtimeSetup
 from .rt_bridge import (
     RtRenderSpec,
-    gm_program_changes_at_start,
-    note_events_to_step_messages,
+    gm_program_changes_raw,
+    note_events_to_step_raw,
     truncate_events_to_cycle,
 )
 
@@ -49,6 +71,141 @@ class Playlist:
     defaults: dict[str, Any]
 
 
+@dataclass
+class _RenderedItem:
+    """One playlist item, fully rendered ahead of its turn (gapless mode)."""
+    index: int
+    header: list[str]
+    spec: RtSpec
+    grid: ClaveGrid
+    timeline: list
+    repeats: int
+
+
+def _render_item(index: int, header: list[str], spec: RtSpec, events: list, repeats: int) -> _RenderedItem:
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    clicks = _make_click_msgs(grid, spec)
+    timeline = _build_cycle_timeline(events, clicks, grid, spec)
+    return _RenderedItem(index=index, header=header, spec=spec, grid=grid, timeline=timeline, repeats=repeats)
+
+
+class _PlaylistStopped(Exception):
+    pass
+
+
+class _GaplessPlayer:
+    """
+    Plays rendered items back to back on one sender and one timeline.
+
+    The port is opened once; a player thread feeds a single ThreadedSender.
+    Each item starts exactly where the previous one's last cycle ends (a bar
+    boundary), with its section CC on that same timeline. submit() blocks
+    while one item is already waiting, so the caller renders item N+1 while
+    item N plays. A gap only happens if rendering falls behind playback.
+    """
+
+    def __init__(self, *, midi_out: str, backend: str = "mido", panic: bool = True) -> None:
+        from .senders import ThreadedSender, create_sender
+
+        self.panic = panic
+        self.gaps = 0
+        self._raw = create_sender(backend=backend, port_name=midi_out)
+        self._output = ThreadedSender(self._raw)
+        self._queue: queue.Queue[_RenderedItem | None] = queue.Queue(maxsize=1)
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="zt-playlist", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: _RenderedItem | None) -> None:
+        """Queue the next item (None = end of playlist)."""
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        self._raise_error()
+
+    def finish(self) -> None:
+        """Wait for every submitted item to finish playing."""
+        self.submit(None)
+        while self._thread.is_alive():
+            self._thread.join(0.1)
+        self._raise_error()
+
+    def close(self, *, drain: bool = True) -> None:
+        """Stop playback (if still running), then panic and close the port."""
+        self._stop.set()
+        self._thread.join(2.0)
+        # drain=False (Ctrl+C) discards what is queued before the panic
+        if not self._output.stop(drain=drain):
+            print("  [gapless] MIDI output thread did not stop; port left open")
+            return
+        if self.panic:
+            _panic_cleanup(self._raw)
+        try:
+            self._raw.close()
+        except Exception:
+            pass
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _write(self, due: float, data: bytes) -> None:
+        if self._stop.is_set():
+            raise _PlaylistStopped
+        self._output.send_at(due, data)
+
+    def _sleep(self, dt: float) -> None:
+        if self._stop.wait(dt):
+            raise _PlaylistStopped
+
+    def _run(self) -> None:
+        writer = _StopAwareOutput(self._write)
+        next_start: float | None = None
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                now = _now()
+                start = now if next_start is None else next_start
+                if start < now:
+                    self.gaps += 1  # rendering fell behind; start late rather than burst
+                    start = now
+                for line in item.header:
+                    print(line)
+                spec = item.spec
+                if spec.bar_cc_enabled:
+                    status = 0xB0 | (spec.bar_cc_channel % 16)
+                    self._write(start, bytes((status, spec.bar_cc_section % 128, _clamp_cc_value(item.index))))
+                if spec.evidence_probe is not None:
+                    spec.evidence_probe.set_reference_bpm(spec.bpm)
+                next_start = _run_event_loop(
+                    writer,
+                    timeline=item.timeline,
+                    grid=item.grid,
+                    spec=spec,
+                    max_cycles=item.repeats,
+                    policy=LateDropPolicy(),
+                    sleep_fn=self._sleep,
+                    start_at=start,
+                )
+        except _PlaylistStopped:
+            return
+        except BaseException as e:
+            self._error = e
+
+
+class _StopAwareOutput:
+    """send_at() view of the player's output that aborts once stop is set."""
+
+    def __init__(self, write) -> None:
+        self.send_at = write
+
+
 def load_ztplay(path: str) -> Playlist:
     """Load and parse a .ztplay YAML file."""
     p = Path(path)
@@ -513,6 +670,10 @@ def rt_play_playlist(
     bar_cc_countdown: int = 20,
     bar_cc_index: int = 21,
     bar_cc_section: int = 22,
+    realtime_priority: bool = False,
+    rt_cpu: int | None = None,
+    gapless: bool = False,
+    backend: str = "mido",
 ) -> None:
     """
     Play a .ztplay playlist live, rotating through items at bar boundaries.
@@ -523,6 +684,21 @@ def rt_play_playlist(
     If bar_cc_enabled, emits:
     - CC#section at start of each item (item index 0, 1, 2, ...)
     - CC#countdown/index at each bar boundary
+
+    If realtime_priority, the soft-realtime setup (rt_priority.py) is applied
+    once for the whole playlist; the GC is re-frozen before each item.
+
+    If gapless, one port (backend) stays open and items play back to back on
+    one continuous timeline, switching at the exact bar boundary: item N+1
+    is rendered while item N plays (_GaplessPlayer), and section CCs ride on
+    that timeline instead of a second port. Ignored for --dry-run. With
+    realtime_priority, only the player threads keep the realtime policy;
+    the rendering (calling) thread goes back to normal priority.
+
+    With --intent-source analyzer, intents come from a background
+    IntentWorker over one keep-alive service connection: each item uses the
+    intent fetched while the previous one played, so a slow groove service
+    never delays an item start (only the first item waits, before playback).
     """
     # Print engine banner once at startup
     _print_engine_banner_once()
@@ -546,14 +722,36 @@ def rt_play_playlist(
     # Open MIDI port for section markers (reused per item)
     try:
         import mido
-        section_port = mido.open_output(midi_out) if bar_cc_enabled else None
+        section_port = mido.open_output(midi_out) if bar_cc_enabled and not gapless else None
     except Exception:
         section_port = None
 
     # Dry-run stats (compact mode)
     dry_run_stats = DryRunStats()
 
+    # Played onsets feed the analyzer's evidence window across items
+    evidence_probe = EvidenceWindowProbe()
+
+    rt_setup = None
+    if realtime_priority:
+        rt_setup = RealtimeSetup(cpu=rt_cpu).apply()
+        rt_setup.print_report()
+
+    if gapless and getattr(_parse_band_control_args(), "dry_run", False):
+        gapless = False  # dry runs never play
+    player = None
+    drain = True
+    # Analyzer intents are fetched in the background while playing (not for dry runs)
+    intent_worker = None
+    intent_service = None
+
     try:
+        if gapless:
+            player = _GaplessPlayer(midi_out=midi_out, backend=backend)
+            if rt_setup is not None:
+                # Player/output threads inherited the realtime policy; this
+                # thread renders the next item and must not compete with them.
+                rt_setup.release_current_thread()
         for item_idx, item in enumerate(playlist.items):
             if not item.file:
                 print(f"  [{item_idx + 1}] {item.name}: skipped (no file)")
@@ -607,9 +805,24 @@ def rt_play_playlist(
                     profile_id=band_args.profile_id,
                 )
             elif band_args.intent_source == "analyzer":
-                provider = AnalyzerIntentProvider(
-                    profile_store_dir=Path(band_args.profile_store_dir),
-                )
+                if band_args.dry_run:
+                    provider = AnalyzerIntentProvider(
+                        profile_store_dir=Path(band_args.profile_store_dir),
+                        probe=evidence_probe,
+                    )
+                else:
+                    if intent_worker is None:
+                        # Parse every profile once, before playback touches the store
+                        profile_store = CachedGrooveProfileStore(Path(band_args.profile_store_dir))
+                        profile_store.preload()
+                        intent_service = GrooveServiceConnection.from_env()
+                        intent_worker = IntentWorker(AnalyzerIntentProvider(
+                            profile_store_dir=Path(band_args.profile_store_dir),
+                            probe=evidence_probe,
+                            service=intent_service,
+                            store=profile_store,
+                        )).start()
+                    provider = intent_worker
             # else: intent_source == "none", provider stays None
             
             # Produce intent from provider, track success
@@ -748,9 +961,9 @@ def rt_play_playlist(
             )
 
             events = []
-            events.extend(gm_program_changes_at_start())
-            events.extend(note_events_to_step_messages(comp_events, spec=rts, steps_per_cycle=steps_per_cycle))
-            events.extend(note_events_to_step_messages(bass_events, spec=rts, steps_per_cycle=steps_per_cycle))
+            events.extend(gm_program_changes_raw())
+            events.extend(note_events_to_step_raw(comp_events, spec=rts, steps_per_cycle=steps_per_cycle))
+            events.extend(note_events_to_step_raw(bass_events, spec=rts, steps_per_cycle=steps_per_cycle))
 
             # Build spec with bar CC settings and bars_limit
             total_bars = prog_bars_per_chord * len(prog_chords)
@@ -766,13 +979,23 @@ def rt_play_playlist(
                 bar_cc_index=bar_cc_index,
                 bar_cc_section=bar_cc_section,
                 bars_limit=total_bars,
+                evidence_probe=evidence_probe if band_args.intent_source == "analyzer" else None,
             )
 
             # Play for N repeats
             repeats = item.repeats or 1
-            print(f"  [{item_idx + 1}/{len(playlist.items)}] {prog_name}")
-            print(f"      chords: {' '.join(prog_chords)}")
-            print(f"      bpm: {effective_bpm}, style: {prog_style}, repeats: {repeats}, bars: {total_bars}")
+            header = [
+                f"  [{item_idx + 1}/{len(playlist.items)}] {prog_name}",
+                f"      chords: {' '.join(prog_chords)}",
+                f"      bpm: {effective_bpm}, style: {prog_style}, repeats: {repeats}, bars: {total_bars}",
+            ]
+            if player is not None:
+                # Blocks until the player has room, i.e. while the previous
+                # item plays; the player prints the header when this one starts.
+                player.submit(_render_item(item_idx, header, spec, events, repeats))
+                continue
+            for line in header:
+                print(line)
 
             # Emit section marker CC at item start
             if section_port and bar_cc_enabled:
@@ -786,6 +1009,10 @@ def rt_play_playlist(
                     value=_clamp_cc_value(item_idx),
                 ))
 
+            if rt_setup is not None:
+                # Freeze this item's freshly generated events too.
+                rt_setup.refreeze()
+
             try:
                 # Each repeat = 1 cycle (2 bars)
                 rt_play_cycle(events=events, spec=spec, max_cycles=repeats)
@@ -795,9 +1022,27 @@ def rt_play_playlist(
                     section_port.close()
                 return
 
+        if player is not None:
+            player.finish()
+    except KeyboardInterrupt:
+        if player is None:
+            raise
+        drain = False
+        print("\n  [interrupted by user]")
+        return
     finally:
         if section_port:
             section_port.close()
+        if player is not None:
+            player.close(drain=drain)
+            if player.gaps:
+                print(f"  [gapless] {player.gaps} item(s) started late (rendering fell behind)")
+        if intent_worker is not None:
+            intent_worker.stop()
+        if intent_service is not None:
+            intent_service.close()
+        if rt_setup is not None:
+            rt_setup.restore()
 
     # Handle dry-run --all-programs completion
     band_args = _parse_band_control_args()
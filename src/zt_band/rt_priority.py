@@ -0,0 +1,189 @@
+"""
+rt_priority.py -- Opt-in soft-realtime process setup for playback.
+
+RealtimeSetup.apply() tries, in order:
+
+  - SCHED_FIFO at a modest priority, else a negative nice value
+  - pinning to one CPU (os.sched_setaffinity)
+  - locking the pages mapped so far in RAM (mlockall, MCL_CURRENT only) so
+    the prepared timeline does not page-fault; later allocations are left
+    unlocked so they can never fail against RLIMIT_MEMLOCK mid-playback
+  - gc.collect() + gc.freeze() so the timeline/event structures built so
+    far are never rescanned, then gc.disable() for the playback
+
+Each step that the platform or the user's privileges refuse is reported
+and skipped; playback then runs exactly as it would without the flag.
+Policy and affinity are per thread on Linux and inherited by threads
+created later, so apply() must run on the main thread before the output
+and input threads start. release_current_thread() then hands the calling
+thread its old policy back when it has other (non-realtime) work to do.
+restore() undoes everything that succeeded.
+
+    setup = RealtimeSetup(cpu=2).apply()
+    setup.print_report()
+    try:
+        ...play...
+    finally:
+        setup.restore()
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import gc
+import os
+from dataclasses import dataclass, field
+
+_MCL_CURRENT = 1
+
+
+def _libc():
+    name = ctypes.util.find_library("c")
+    if not name:
+        return None
+    try:
+        return ctypes.CDLL(name, use_errno=True)
+    except OSError:
+        return None
+
+
+def _why(exc: BaseException) -> str:
+    if isinstance(exc, PermissionError):
+        return "permission denied"
+    return str(exc) or type(exc).__name__
+
+
+@dataclass
+class RealtimeSetup:
+    fifo_priority: int = 10   # SCHED_FIFO priority (1-99); low enough not to starve the MIDI driver
+    nice: int = -10           # fallback when SCHED_FIFO is refused
+    cpu: int | None = None    # CPU to pin to (None = leave affinity alone)
+    lock_memory: bool = True
+    freeze_gc: bool = True
+
+    # (step, ok, detail) for every step attempted
+    results: list[tuple[str, bool, str]] = field(default_factory=list, init=False)
+    _prev_sched: tuple[int, int] | None = field(default=None, init=False, repr=False)
+    _prev_nice: int | None = field(default=None, init=False, repr=False)
+    _prev_affinity: set[int] | None = field(default=None, init=False, repr=False)
+    _locked: bool = field(default=False, init=False, repr=False)
+    _gc_was_enabled: bool | None = field(default=None, init=False, repr=False)
+
+    def _record(self, step: str, ok: bool, detail: str) -> None:
+        self.results.append((step, ok, detail))
+
+    def apply(self) -> RealtimeSetup:
+        """Attempt every step; never raises."""
+        self._apply_priority()
+        if self.cpu is not None:
+            self._apply_affinity()
+        if self.lock_memory:
+            self._apply_mlock()
+        if self.freeze_gc:
+            self._gc_was_enabled = gc.isenabled()
+            self.refreeze()
+            gc.disable()
+            self._record("gc", True, "frozen, cyclic collector disabled")
+        return self
+
+    def _apply_priority(self) -> None:
+        if hasattr(os, "sched_setscheduler") and hasattr(os, "SCHED_FIFO"):
+            try:
+                prev = (os.sched_getscheduler(0), os.sched_getparam(0).sched_priority)
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.fifo_priority))
+                self._prev_sched = prev
+                self._record("sched", True, f"SCHED_FIFO priority {self.fifo_priority}")
+                return
+            except (OSError, ValueError) as e:
+                self._record("sched", False, f"SCHED_FIFO: {_why(e)}")
+        else:
+            self._record("sched", False, "SCHED_FIFO: not supported on this platform")
+        if hasattr(os, "getpriority"):
+            try:
+                prev_nice = os.getpriority(os.PRIO_PROCESS, 0)
+                os.setpriority(os.PRIO_PROCESS, 0, self.nice)
+                self._prev_nice = prev_nice
+                self._record("nice", True, f"nice {self.nice}")
+            except OSError as e:
+                self._record("nice", False, f"nice {self.nice}: {_why(e)}")
+
+    def _apply_affinity(self) -> None:
+        if not hasattr(os, "sched_setaffinity"):
+            self._record("affinity", False, "not supported on this platform")
+            return
+        try:
+            prev = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, {self.cpu})
+            self._prev_affinity = prev
+            self._record("affinity", True, f"pinned to CPU {self.cpu}")
+        except OSError as e:
+            self._record("affinity", False, f"CPU {self.cpu}: {_why(e)}")
+
+    def _apply_mlock(self) -> None:
+        libc = _libc()
+        if libc is None or not hasattr(libc, "mlockall"):
+            self._record("mlock", False, "mlockall not available")
+            return
+        if libc.mlockall(_MCL_CURRENT) != 0:
+            self._record("mlock", False, f"mlockall: {os.strerror(ctypes.get_errno())}")
+            return
+        self._locked = True
+        self._record("mlock", True, "current pages locked")
+
+    def refreeze(self) -> None:
+        """Collect, then move everything allocated so far out of GC tracking."""
+        if not self.freeze_gc:
+            return
+        gc.collect()
+        gc.freeze()
+
+    def restore(self) -> None:
+        """Undo every step that succeeded (best effort)."""
+        if self._gc_was_enabled is not None:
+            gc.unfreeze()
+            if self._gc_was_enabled:
+                gc.enable()
+            self._gc_was_enabled = None
+        if self._locked:
+            libc = _libc()
+            if libc is not None:
+                libc.munlockall()
+            self._locked = False
+        self._revert_thread()
+        self._prev_affinity = None
+        self._prev_sched = None
+        self._prev_nice = None
+
+    def release_current_thread(self) -> None:
+        """
+        Put the calling thread back on its previous policy, nice value and
+        affinity. Threads started since apply() keep the realtime settings;
+        restore() still undoes the process-wide steps.
+        """
+        self._revert_thread()
+
+    def _revert_thread(self) -> None:
+        if self._prev_affinity is not None:
+            try:
+                os.sched_setaffinity(0, self._prev_affinity)
+            except OSError:
+                pass
+        if self._prev_sched is not None:
+            policy, prio = self._prev_sched
+            try:
+                os.sched_setscheduler(0, policy, os.sched_param(prio))
+            except OSError:
+                pass
+        if self._prev_nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, self._prev_nice)
+            except OSError:
+                pass
+
+    def report_lines(self) -> list[str]:
+        return [f"  {step}: {'ok' if ok else 'skipped'} ({detail})" for step, ok, detail in self.results]
+
+    def print_report(self) -> None:
+        print("Realtime setup:")
+        for line in self.report_lines():
+            print(line)
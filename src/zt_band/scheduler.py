@@ -12,11 +12,14 @@ Both file writers and realtime schedulers consume the same stream.
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Iterable, Protocol
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Iterable, Protocol, Sequence
 
 if TYPE_CHECKING:
     from zt_band.midi.humanizer import DeterministicHumanizer
+    from zt_band.midi.midi_clock import TempoSmoother
+    from zt_band.rt_metrics import RtMetrics
 
 try:
     import mido
@@ -81,6 +84,7 @@ class Scheduler(Protocol):
 
     Implementations:
         - RealtimeScheduler: wall-clock dispatch to MIDI port
+        - TempoMapScheduler: precomputed timeline, tempo maps, live tempo
         - CollectingScheduler: test helper that collects messages
         - (future) FileScheduler: delta-encode to MidiFile
     """
@@ -129,6 +133,8 @@ class RealtimeScheduler:
     # Humanizer for deterministic jitter (optional)
     humanizer: "DeterministicHumanizer | None" = None
     humanize_ms: float = 0.0
+    # Optional latency recorder ("scheduler" lateness; late > max_late_s = overrun)
+    metrics: "RtMetrics | None" = None
 
     def run(
         self,
@@ -172,6 +178,7 @@ class RealtimeScheduler:
                     target = now
 
             # Sleep-until-target loop
+            slept = False
             while True:
                 now = self.now_fn()
                 dt = target - now
@@ -179,10 +186,197 @@ class RealtimeScheduler:
                     break
                 # Sleep in small chunks (≤2ms) to reduce jitter
                 self.sleep_fn(min(dt, 0.002))
+                slept = True
 
             # Late handling: send immediately; do not time-warp
             self.sender.send(msg)
 
+            if self.metrics is not None:
+                lateness_s = now - target
+                self.metrics.record_lateness("scheduler", lateness_s)
+                if slept:
+                    self.metrics.record_sleep_overshoot(lateness_s)
+                if lateness_s > self.max_late_s:
+                    self.metrics.record_overrun("scheduler")
+                self.metrics.maybe_report()
+
+
+@dataclass(frozen=True)
+class TempoMap:
+    """
+    Piecewise-constant tempo map: (abs_tick, bpm) change points.
+
+    The first change must be at tick 0; each tempo holds until the next
+    change. Segment start times are precomputed, so seconds_at() is a
+    bisect and event_times() is a single linear walk over sorted ticks.
+    """
+
+    changes: tuple[tuple[int, float], ...]
+    # Seconds at each change point for ticks_per_beat=1 (divide by tpb)
+    _start_units: tuple[float, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        changes = tuple((int(t), float(b)) for t, b in self.changes)
+        if not changes or changes[0][0] != 0:
+            raise ValueError("tempo map must start with a change at tick 0")
+        if any(b <= 0 for _, b in changes):
+            raise ValueError("tempo map bpm must be > 0")
+        if any(changes[i][0] >= changes[i + 1][0] for i in range(len(changes) - 1)):
+            raise ValueError("tempo map ticks must be strictly increasing")
+        starts = [0.0]
+        for (t0, b0), (t1, _) in zip(changes, changes[1:]):
+            starts.append(starts[-1] + (t1 - t0) * 60.0 / b0)
+        object.__setattr__(self, "changes", changes)
+        object.__setattr__(self, "_start_units", tuple(starts))
+
+    @classmethod
+    def constant(cls, bpm: float) -> TempoMap:
+        return cls(((0, bpm),))
+
+    def _segment(self, tick: int) -> int:
+        return max(0, bisect_right(self.changes, (tick, float("inf"))) - 1)
+
+    def bpm_at(self, tick: int) -> float:
+        return self.changes[self._segment(tick)][1]
+
+    def seconds_at(self, tick: int, ticks_per_beat: int) -> float:
+        """Seconds from tick 0 to tick."""
+        i = self._segment(tick)
+        t0, bpm = self.changes[i]
+        return (self._start_units[i] + (tick - t0) * 60.0 / bpm) / ticks_per_beat
+
+    def event_times(self, ticks: Sequence[int], ticks_per_beat: int) -> list[float]:
+        """seconds_at() for every tick of an ascending sequence, in one pass."""
+        out: list[float] = []
+        changes = self.changes
+        n = len(changes)
+        i = 0
+        t0, bpm = changes[0]
+        base = 0.0
+        for tick in ticks:
+            while i + 1 < n and changes[i + 1][0] <= tick:
+                i += 1
+                t0, bpm = changes[i]
+                base = self._start_units[i]
+            out.append((base + (tick - t0) * 60.0 / bpm) / ticks_per_beat)
+        return out
+
+
+@dataclass
+class TempoMapScheduler:
+    """
+    Realtime scheduler driven by a precomputed, tempo-map-aware timeline.
+
+    run() converts the whole (normalized) TickEvent stream to score seconds
+    once via tempo_map (constant `bpm` if None), groups events sharing a
+    tick, and wakes once per group: one sleep to just before the due time,
+    then a short spin (spin_s). Late groups are sent immediately (no
+    time-warp), as in RealtimeScheduler.
+
+    Live tempo: with a smoother, set_bpm() moves its target and the smoothed
+    bpm scales playback relative to run()'s `bpm` (so the map's relative
+    changes are kept). Each change re-anchors only what is left: the score
+    position at `now` becomes the new origin, so conversion stays O(1) per
+    event and nothing already sent moves. Sleeps are capped at retempo_s
+    while the smoother is slewing. Per REALTIME_MIDI_CONTRACT §5, callers
+    issue set_bpm() at bar boundaries.
+
+    Humanize jitter is not applied here (it would split the batches).
+    """
+
+    sender: MidiSender
+    tempo_map: TempoMap | None = None
+    smoother: TempoSmoother | None = None
+    sleep_fn: Callable[[float], None] = time.sleep
+    now_fn: Callable[[], float] = time.monotonic
+    spin_s: float = 0.001        # busy-wait margin before each due time
+    retempo_s: float = 0.005     # max sleep while the tempo is slewing
+    max_late_s: float = 0.020    # lateness above this counts as an overrun
+    metrics: RtMetrics | None = None
+
+    def set_bpm(self, bpm: float) -> None:
+        """Change the live tempo target (safe to call from another thread)."""
+        if self.smoother is None:
+            raise RuntimeError("live tempo changes need a TempoSmoother")
+        self.smoother.set_target(bpm)
+
+    def run(
+        self,
+        events: Iterable[TickEvent],
+        *,
+        bpm: float,
+        ticks_per_beat: int,
+    ) -> None:
+        """
+        Execute events in realtime.
+
+        Parameters:
+            events: Iterable of (abs_tick, mido.Message)
+            bpm: Reference tempo (the whole stream if tempo_map is None)
+            ticks_per_beat: MIDI resolution
+        """
+        if bpm <= 0:
+            raise ValueError("bpm must be > 0")
+        ev = normalize_tick_events(events)
+        tempo_map = self.tempo_map or TempoMap.constant(bpm)
+
+        # One wake-up per distinct tick
+        group_ticks: list[int] = []
+        groups: list[list] = []
+        for abs_tick, msg in ev:
+            if group_ticks and group_ticks[-1] == int(abs_tick):
+                groups[-1].append(msg)
+            else:
+                group_ticks.append(int(abs_tick))
+                groups.append([msg])
+        score_s = tempo_map.event_times(group_ticks, ticks_per_beat)
+
+        now_fn = self.now_fn
+        sleep_fn = self.sleep_fn
+        smoother = self.smoother
+        metrics = self.metrics
+        # wall = anchor_wall + (score - anchor_score) / scale
+        anchor_wall = now_fn()
+        anchor_score = 0.0
+        scale = 1.0
+        if smoother is not None:
+            smoother.reset(bpm, anchor_wall)
+
+        for score, msgs in zip(score_s, groups):
+            slept = False
+            while True:
+                now = now_fn()
+                if smoother is not None:
+                    new_scale = smoother.step(now) / bpm
+                    if new_scale != scale:
+                        anchor_score += (now - anchor_wall) * scale
+                        anchor_wall = now
+                        scale = new_scale
+                target = anchor_wall + (score - anchor_score) / scale
+                dt = target - now
+                if dt <= 0:
+                    break
+                wait = dt - self.spin_s
+                if smoother is not None and not smoother.is_settled:
+                    wait = min(wait, self.retempo_s)
+                if wait > 0:
+                    sleep_fn(wait)
+                    slept = True
+                # else: busy-wait the last spin_s
+
+            for msg in msgs:
+                self.sender.send(msg)
+
+            if metrics is not None:
+                lateness_s = now - target
+                for _ in msgs:
+                    metrics.record_lateness("scheduler", lateness_s)
+                if slept:
+                    metrics.record_sleep_overshoot(lateness_s)
+                if lateness_s > self.max_late_s:
+                    metrics.record_overrun("scheduler")
+                metrics.maybe_report()
+
 
 @dataclass(frozen=True)
 class CollectingScheduler:
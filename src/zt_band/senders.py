@@ -8,10 +8,21 @@ Usage:
     sender = create_sender(backend="mido", port_name="My MIDI Port")
     sender.send(mido.Message("note_on", note=60, velocity=64))
     sender.close()
+
+ThreadedSender moves the port write onto a dedicated output thread:
+
+    out = ThreadedSender(create_sender(backend="mido", port_name="My MIDI Port"))
+    out.send_at(due_monotonic, msg)   # scheduler thread only enqueues
+    out.stop()                        # drain, then join the output thread
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol
 
 try:
     import mido
@@ -64,6 +75,10 @@ class MidoSender:
     def send(self, msg: "mido.Message") -> None:
         self._port.send(msg)
 
+    def send_raw(self, data: bytes) -> None:
+        # mido ports only accept Message objects
+        self._port.send(mido.Message.from_bytes(data))
+
     def close(self) -> None:
         self._port.close()
 
@@ -102,24 +117,188 @@ class RtMidiSender:
         # Convert mido Message to raw MIDI bytes
         self._midi_out.send_message(msg.bytes())
 
+    def send_raw(self, data: bytes) -> None:
+        # Pre-encoded bytes go straight to the port (no Message round-trip)
+        self._midi_out.send_message(data)
+
     def close(self) -> None:
         self._midi_out.close_port()
         del self._midi_out
 
 
+class SendRecord(NamedTuple):
+    """One completed write: requested due time, actual send time, raw bytes."""
+    due: float
+    sent: float
+    data: bytes
+
+    @property
+    def lateness_s(self) -> float:
+        return self.sent - self.due
+
+
+def _to_bytes(msg: Any) -> bytes:
+    """Raw MIDI bytes for a mido.Message (bytes/bytearray pass through)."""
+    if isinstance(msg, (bytes, bytearray)):
+        return bytes(msg)
+    return bytes(msg.bytes())
+
+
 class DummySender:
-    """No-op sender for testing (collects messages)."""
+    """
+    No-op sender for testing (collects messages).
 
-    def __init__(self) -> None:
+    send_at()/send_raw() mirror ThreadedSender synchronously: each write is
+    appended to `records` with its due time and the now_fn() time it was
+    taken, so tests can assert ordering and timing without a thread.
+    """
+
+    def __init__(self, now_fn: Callable[[], float] | None = None) -> None:
         self.sent: list["mido.Message"] = []
+        self.records: list[SendRecord] = []
+        self._now = now_fn or time.monotonic
 
     def send(self, msg: "mido.Message") -> None:
         self.sent.append(msg)
 
+    def send_raw(self, data: bytes) -> None:
+        t = self._now()
+        self.records.append(SendRecord(t, t, bytes(data)))
+
+    def send_at(self, due: float, msg: Any) -> None:
+        self.records.append(SendRecord(due, self._now(), _to_bytes(msg)))
+
     def close(self) -> None:
         pass
 
 
+class ThreadedSender:
+    """
+    Output stage that owns a sender on its own thread.
+
+    The scheduling thread calls send_at(due, msg) (or send(msg) for "now"),
+    which only encodes the message to raw bytes and puts (due, bytes) on a
+    bounded FIFO. The output thread sleeps until spin_s before each due
+    time, busy-waits the remainder, writes, and appends a SendRecord with
+    the real send time to `records` (most recent record_limit entries).
+
+    Entries are written in enqueue order; producers enqueue in due order.
+    A full queue blocks the producer (backpressure) rather than dropping.
+    Inner senders with send_raw(bytes) get the bytes directly; others get
+    a mido.Message rebuilt from them. An optional rt_metrics.RtMetrics gets
+    "output" lateness for every write and port errors as drops.
+    """
+
+    def __init__(
+        self,
+        sender: Any,
+        *,
+        maxsize: int = 1024,
+        spin_s: float = 0.001,
+        record_limit: int = 10000,
+        now_fn: Callable[[], float] | None = None,
+        metrics: Any = None,
+    ) -> None:
+        self.sender = sender
+        self.spin_s = max(0.0, spin_s)
+        self.records: deque[SendRecord] = deque(maxlen=record_limit)
+        self.errors = 0
+        self.discarded = 0
+        self.metrics = metrics
+        self._now = now_fn or time.monotonic
+        self._queue: queue.Queue[tuple[float, bytes] | None] = queue.Queue(maxsize=maxsize)
+        self._abort = threading.Event()
+        self._write = getattr(sender, "send_raw", None) or self._send_as_message
+        self._thread = threading.Thread(target=self._run, name="zt-midi-out", daemon=True)
+        self._thread.start()
+
+    # -- producer side -------------------------------------------------
+
+    def send_at(self, due: float, msg: Any) -> None:
+        """Enqueue msg (mido.Message or raw bytes) for output at monotonic time due."""
+        self._queue.put((due, _to_bytes(msg)))
+
+    def send(self, msg: Any) -> None:
+        """Enqueue msg for output as soon as possible."""
+        self._queue.put((self._now(), _to_bytes(msg)))
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Block until every enqueued entry has been written."""
+        self._queue.join()
+
+    def stop(self, *, drain: bool = True, timeout: float | None = 2.0) -> bool:
+        """
+        Stop the output thread without closing the inner sender.
+
+        drain=True writes everything still queued (at its due time) first;
+        drain=False discards pending entries (e.g. on Ctrl+C before panic).
+        If the drain does not finish within timeout, the rest is discarded
+        and the thread gets another timeout to exit. Returns False if it is
+        still running (a write is stuck in the port): the caller must not
+        write to or close the inner sender then.
+        """
+        if not self._thread.is_alive():
+            return True
+        if not drain:
+            self._abort.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self._abort.set()
+            self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def close(self) -> None:
+        """stop() (draining), then close the inner sender unless the thread is stuck in it."""
+        if self.stop():
+            self.sender.close()
+
+    # -- output thread ---------------------------------------------------
+
+    def _send_as_message(self, data: bytes) -> None:
+        self.sender.send(mido.Message.from_bytes(data))
+
+    def _wait_until(self, due: float) -> None:
+        while not self._abort.is_set():
+            dt = due - self._now()
+            if dt <= 0:
+                return
+            if dt > self.spin_s:
+                # Event.wait doubles as an interruptible sleep
+                self._abort.wait(dt - self.spin_s)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                due, data = item
+                self._wait_until(due)
+                if self._abort.is_set():
+                    self.discarded += 1
+                    if self.metrics is not None:
+                        self.metrics.record_drop("discarded")
+                    continue
+                try:
+                    self._write(data)
+                except Exception:
+                    # Never let a port error kill the output thread
+                    self.errors += 1
+                    if self.metrics is not None:
+                        self.metrics.record_drop("port_error")
+                    continue
+                sent = self._now()
+                self.records.append(SendRecord(due, sent, data))
+                if self.metrics is not None:
+                    self.metrics.record_lateness("output", sent - due)
+            finally:
+                self._queue.task_done()
+
+
 def create_sender(backend: str = "mido", port_name: str | None = None) -> MidiSender:
     """
     Factory for MIDI sender backends.
@@ -0,0 +1,399 @@
+"""
+Direct Standard MIDI File encoder for the accompaniment writer.
+
+Produces the same bytes as midi_out.write_midi_file()'s mido path without
+building mido.Message objects: one integer sort per track keyed on
+(tick, off-before-on, event index), integer note balance counters for the
+stuck-note invariant, and variable-length quantities written straight into a
+bytearray. mido is not required.
+
+Byte-for-byte parity details (mirroring mido.MidiFile.save):
+- running status for channel messages; meta events reset it
+- note_off is encoded as 0x80 with velocity 0
+- every track ends with a single end_of_track meta at delta 0
+"""
+from __future__ import annotations
+
+import os
+import struct
+import tempfile
+from bisect import bisect_right
+from collections.abc import Iterable
+
+from .event_buffer import EventBuffer
+from .midi_out import NoteEvent
+
+TICKS_PER_BEAT = 480  # canonical resolution for this repo (see midi_out)
+
+# Sort key layout (one Python int per MIDI message, high to low bits):
+#   tick | priority (0 = note_off, 1 = note_on) | event seq | channel | note | velocity
+# Sorting the ints orders by (tick, off-before-on, original event order),
+# which is exactly the mido path's stable sort on (tick, priority).
+_SEQ_SHIFT = 24
+_SLOT_SHIFT = 64
+
+_END_OF_TRACK = b"\x00\xff\x2f\x00"
+
+
+def encode_vlq(value: int, out: bytearray) -> None:
+    """Append a MIDI variable-length quantity to out."""
+    if value < 0:
+        raise ValueError("message time must be non-negative in MIDI file")
+    if value < 0x80:
+        out.append(value)
+        return
+    stack = [value & 0x7F]
+    value >>= 7
+    while value:
+        stack.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.extend(reversed(stack))
+
+
+def _as_buffer(events: EventBuffer | Iterable[NoteEvent]) -> EventBuffer:
+    if isinstance(events, EventBuffer):
+        return events
+    return EventBuffer.from_events(events)
+
+
+def _check_data_byte(name: str, value: int) -> None:
+    if not 0 <= value <= 127:
+        raise ValueError(f"{name} must be in range 0..127, got {value}")
+
+
+def _meta(out: bytearray, meta_type: int, payload: bytes) -> None:
+    out.append(0x00)  # delta time
+    out.append(0xFF)
+    out.append(meta_type)
+    encode_vlq(len(payload), out)
+    out.extend(payload)
+
+
+def _tempo_track(tempo_bpm: int, meter: tuple[int, int]) -> bytearray:
+    """Encode track 0: tempo + time signature at time 0 (INVARIANT)."""
+    if not (1 <= tempo_bpm <= 999):
+        raise ValueError(f"tempo_bpm out of reasonable range 1-999: {tempo_bpm}")
+
+    meter_num, meter_denom = meter
+    if not 0 <= meter_num <= 255:
+        raise ValueError(f"time signature numerator must be in range 0..255: {meter_num}")
+    if meter_denom <= 0 or meter_denom & (meter_denom - 1):
+        raise ValueError(f"time signature denominator must be a power of 2: {meter_denom}")
+
+    # Same rounding as mido.bpm2tempo()
+    tempo_us = int(round(60 * 1e6 / tempo_bpm))
+    if tempo_us > 0xFFFFFF:
+        raise ValueError(f"tempo out of range for set_tempo: {tempo_us}")
+
+    track = bytearray()
+    _meta(track, 0x51, tempo_us.to_bytes(3, "big"))
+    _meta(track, 0x58, bytes((meter_num, meter_denom.bit_length() - 1, 24, 8)))
+    track.extend(_END_OF_TRACK)
+    return track
+
+
+def _check_balance(balance: dict[tuple[int, int], int]) -> None:
+    stuck_notes = [(ch, note) for (ch, note), bal in balance.items() if bal != 0]
+    if stuck_notes:
+        raise ValueError(
+            f"Stuck notes detected (unbalanced note on/off): {stuck_notes}. "
+            "This indicates a bug in event generation."
+        )
+
+
+class _TrackEncoder:
+    """
+    Incremental encoder for one note track.
+
+    Events may be added in segments (offset in beats). Messages are emitted
+    once no later segment can sort before them; the rest are carried over
+    and merged with the next segment's keys.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        program: int,
+        balance: dict[tuple[int, int], int],
+        ticks_per_beat: int = TICKS_PER_BEAT,
+    ) -> None:
+        self.ticks_per_beat = ticks_per_beat
+        self.balance = balance
+        self.data = bytearray()
+        _meta(self.data, 0x03, name.encode("latin-1"))
+        self.data.extend((0x00, 0xC0, program))
+        self._running_status = 0xC0
+        self._last_tick = 0
+        self._seq = 0
+        self._carry: list[int] = []
+
+    def add(self, buf: EventBuffer, offset_beats: float = 0.0) -> None:
+        """Queue a segment of events, shifted by offset_beats."""
+        tpb = self.ticks_per_beat
+        keys = self._carry
+        seq = self._seq
+        starts, durations = buf.start, buf.duration
+        notes, velocities, channels = buf.note, buf.velocity, buf.channel
+        for i in range(len(starts)):
+            dur = durations[i]
+            if dur <= 0:
+                # zero/negative duration should never happen; skipped like the mido path
+                continue
+            start = starts[i] + offset_beats if offset_beats else starts[i]
+            start_tick = int(round(start * tpb))
+            end_tick = int(round((start + dur) * tpb))
+            if end_tick <= start_tick:
+                end_tick = start_tick + 1  # minimum 1 tick duration
+            if start_tick < 0:
+                raise ValueError("message time must be non-negative in MIDI file")
+            note, vel, ch = notes[i], velocities[i], channels[i]
+            _check_data_byte("note", note)
+            _check_data_byte("velocity", vel)
+            if not 0 <= ch <= 15:
+                raise ValueError(f"channel must be in range 0..15, got {ch}")
+            payload = (seq << _SEQ_SHIFT) | (ch << 16) | (note << 8)
+            keys.append((((start_tick << 1) | 1) << _SLOT_SHIFT) | payload | vel)
+            keys.append(((end_tick << 1) << _SLOT_SHIFT) | payload)
+            seq += 1
+        self._seq = seq
+        keys.sort()
+        self._carry = keys
+
+    def flush(self, until_tick: int | None = None) -> None:
+        """
+        Encode queued messages with tick <= until_tick (all when None).
+
+        Safe whenever every later segment starts at or after until_tick:
+        later messages at that tick can only be note_ons with a larger seq.
+        """
+        keys = self._carry
+        if until_tick is None:
+            n = len(keys)
+        else:
+            limit = ((((until_tick << 1) | 1) + 1) << _SLOT_SHIFT) - 1
+            n = bisect_right(keys, limit)
+
+        data = self.data
+        balance = self.balance
+        running_status = self._running_status
+        last_tick = self._last_tick
+        for key in keys[:n]:
+            slot = key >> _SLOT_SHIFT
+            tick = slot >> 1
+            ch = (key >> 16) & 0xFF
+            note = (key >> 8) & 0xFF
+            vel = key & 0xFF
+
+            encode_vlq(tick - last_tick, data)
+            last_tick = tick
+
+            if slot & 1:
+                status = 0x90 | ch
+                # note_on with velocity 0 counts as a note_off (same as the mido check)
+                balance[(ch, note)] = balance.get((ch, note), 0) + (1 if vel > 0 else -1)
+            else:
+                status = 0x80 | ch
+                balance[(ch, note)] = balance.get((ch, note), 0) - 1
+
+            if status != running_status:
+                data.append(status)
+                running_status = status
+            data.append(note)
+            data.append(vel)
+
+        self._running_status = running_status
+        self._last_tick = last_tick
+        self._carry = keys[n:]
+
+    def take_bytes(self) -> bytes:
+        """Return and clear the encoded bytes produced so far."""
+        out = bytes(self.data)
+        self.data = bytearray()
+        return out
+
+    def finish(self) -> bytes:
+        """Flush everything, append end_of_track and return remaining bytes."""
+        self.flush()
+        self.data.extend(_END_OF_TRACK)
+        return self.take_bytes()
+
+
+def encode_smf(
+    comp_events: EventBuffer | Iterable[NoteEvent],
+    bass_events: EventBuffer | Iterable[NoteEvent],
+    *,
+    tempo_bpm: int = 120,
+    meter: tuple[int, int] = (4, 4),
+    ticks_per_beat: int = TICKS_PER_BEAT,
+) -> bytes:
+    """
+    Encode comping + bass events as an SMF Type 1 file (tempo, Comping, Bass).
+
+    Raises:
+        ValueError: On out-of-range tempo/data, bad meter, or stuck notes.
+    """
+    tempo_track = _tempo_track(tempo_bpm, meter)
+
+    balance: dict[tuple[int, int], int] = {}
+    tracks = [bytes(tempo_track)]
+    for name, program, events in (("Comping", 0, comp_events), ("Bass", 32, bass_events)):
+        enc = _TrackEncoder(name, program, balance, ticks_per_beat)
+        enc.add(_as_buffer(events))
+        tracks.append(enc.finish())
+
+    # Verify no stuck notes before writing (INVARIANT)
+    _check_balance(balance)
+
+    out = bytearray(b"MThd")
+    out.extend(struct.pack(">Lhhh", 6, 1, len(tracks), ticks_per_beat))
+    for track in tracks:
+        out.extend(b"MTrk")
+        out.extend(struct.pack(">L", len(track)))
+        out.extend(track)
+    return bytes(out)
+
+
+def write_smf_file(
+    comp_events: EventBuffer | Iterable[NoteEvent],
+    bass_events: EventBuffer | Iterable[NoteEvent],
+    *,
+    tempo_bpm: int = 120,
+    outfile: str = "backing.mid",
+    meter: tuple[int, int] = (4, 4),
+) -> None:
+    """Encode with encode_smf() and write the bytes to outfile."""
+    data = encode_smf(comp_events, bass_events, tempo_bpm=tempo_bpm, meter=meter)
+    with open(outfile, "wb") as f:
+        f.write(data)
+
+
+class StreamingSmfWriter:
+    """
+    Write a Comping + Bass SMF Type 1 file one segment at a time.
+
+    The comping chunk is written straight to outfile; the bass chunk is
+    spooled to a temporary file and appended on close(), after which the
+    comping MTrk length is patched in place. Only the current segment (plus
+    any notes still sounding across its end) is held in memory.
+
+    Segments must be added in time order and must not start before the end
+    offset passed to the previous add_segment() call (playlist items never
+    overlap). The bytes are identical to encode_smf() over the concatenated
+    events. If close() detects stuck notes, outfile is removed.
+
+    Usage:
+        with StreamingSmfWriter("session.mid", tempo_bpm=120) as w:
+            w.add_segment(comp_buf, bass_buf, offset_beats=0.0, next_offset_beats=16.0)
+            ...
+    """
+
+    def __init__(
+        self,
+        outfile: str,
+        *,
+        tempo_bpm: int = 120,
+        meter: tuple[int, int] = (4, 4),
+        ticks_per_beat: int = TICKS_PER_BEAT,
+    ) -> None:
+        tempo_track = _tempo_track(tempo_bpm, meter)
+        self.outfile = outfile
+        self.ticks_per_beat = ticks_per_beat
+        self._balance: dict[tuple[int, int], int] = {}
+        self._comp = _TrackEncoder("Comping", 0, self._balance, ticks_per_beat)
+        self._bass = _TrackEncoder("Bass", 32, self._balance, ticks_per_beat)
+        self._closed = False
+
+        self._fh = open(outfile, "wb")
+        self._spool = tempfile.TemporaryFile()
+        self._fh.write(b"MThd")
+        self._fh.write(struct.pack(">Lhhh", 6, 1, 3, ticks_per_beat))
+        self._fh.write(b"MTrk")
+        self._fh.write(struct.pack(">L", len(tempo_track)))
+        self._fh.write(tempo_track)
+        self._fh.write(b"MTrk")
+        self._comp_len_pos = self._fh.tell()
+        self._fh.write(b"\x00\x00\x00\x00")  # patched in close()
+        self._comp_len = 0
+        self._bass_len = 0
+
+    def add_segment(
+        self,
+        comp_events: EventBuffer | Iterable[NoteEvent],
+        bass_events: EventBuffer | Iterable[NoteEvent],
+        *,
+        offset_beats: float = 0.0,
+        next_offset_beats: float | None = None,
+    ) -> None:
+        """
+        Add one segment whose events are shifted by offset_beats.
+
+        next_offset_beats is where the following segment will start; every
+        message up to that tick is encoded and written out immediately.
+        """
+        self._comp.add(_as_buffer(comp_events), offset_beats)
+        self._bass.add(_as_buffer(bass_events), offset_beats)
+        if next_offset_beats is not None:
+            until_tick = int(round(next_offset_beats * self.ticks_per_beat))
+            self._comp.flush(until_tick)
+            self._bass.flush(until_tick)
+            self._drain()
+
+    def _drain(self) -> None:
+        comp = self._comp.take_bytes()
+        self._fh.write(comp)
+        self._comp_len += len(comp)
+        bass = self._bass.take_bytes()
+        self._spool.write(bass)
+        self._bass_len += len(bass)
+
+    def close(self) -> None:
+        """Finish both tracks, append the bass chunk and patch chunk lengths."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            comp = self._comp.finish()
+            bass = self._bass.finish()
+            # Verify no stuck notes before finalizing (INVARIANT)
+            _check_balance(self._balance)
+
+            self._fh.write(comp)
+            self._comp_len += len(comp)
+            self._spool.write(bass)
+            self._bass_len += len(bass)
+
+            self._fh.write(b"MTrk")
+            self._fh.write(struct.pack(">L", self._bass_len))
+            self._spool.seek(0)
+            while True:
+                chunk = self._spool.read(1 << 16)
+                if not chunk:
+                    break
+                self._fh.write(chunk)
+
+            self._fh.seek(self._comp_len_pos)
+            self._fh.write(struct.pack(">L", self._comp_len))
+        except BaseException:
+            self._abort()
+            raise
+        finally:
+            self._spool.close()
+            self._fh.close()
+
+    def _abort(self) -> None:
+        self._spool.close()
+        self._fh.close()
+        try:
+            os.remove(self.outfile)
+        except OSError:
+            pass
+
+    def __enter__(self) -> StreamingSmfWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None and not self._closed:
+            self._closed = True
+            self._abort()
+            return
+        self.close()
@@ -14,9 +14,13 @@ The contour applies:
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from .midi_out import NoteEvent
 
+if TYPE_CHECKING:
+    from .event_buffer import EventBuffer
+
 
 @dataclass(frozen=True)
 class VelContour:
@@ -359,3 +363,59 @@ def apply_velocity_contour(
 
     # Unknown meter: do nothing (strict & safe)
     return events
+
+
+# (meter) -> (bar_steps, bar_beats, soft_steps, strong_steps); mirrors the
+# per-meter functions above.
+_BUFFER_GRIDS: dict[str, tuple[int, int, frozenset[int], frozenset[int]]] = {
+    "4/4": (16, 4, frozenset({0, 8}), frozenset({6, 14})),
+    "2/4": (8, 2, frozenset({0}), frozenset({6})),
+}
+
+
+def apply_velocity_contour_buffer(
+    buf: EventBuffer,
+    *,
+    meter: str,
+    bar_steps: int,
+    contour: VelContour,
+    pickup_steps: set[int] | None = None,
+    ghost_steps: set[int] | None = None,
+) -> None:
+    """
+    Column-wise equivalent of apply_velocity_contour() for an EventBuffer.
+
+    Rewrites buf.velocity in place; timing columns are never touched.
+    Same strict meter/steps rules as the dispatcher: a mismatch or disabled
+    contour leaves the buffer unchanged.
+    """
+    if not contour.enabled:
+        return
+
+    grid = _BUFFER_GRIDS.get(str(meter).strip())
+    if grid is None or grid[0] != bar_steps:
+        return
+    _, bar_beats, soft_steps, strong_steps = grid
+
+    pickup_steps = pickup_steps or set()
+    ghost_steps = ghost_steps or set()
+
+    # Precompute the multiplier for every grid step once.
+    step_mul: list[float] = []
+    for step in range(bar_steps):
+        if step in pickup_steps:
+            mul = contour.pickup_mul
+        elif step in strong_steps:
+            mul = contour.strong_mul
+        elif step in soft_steps:
+            mul = contour.soft_mul
+        else:
+            mul = 1.0
+        if step in ghost_steps and contour.ghost_mul != 1.0:
+            mul *= contour.ghost_mul
+        step_mul.append(mul)
+
+    vel = buf.velocity
+    for i, start in enumerate(buf.start):
+        step = int((start % bar_beats) * 4) % bar_steps
+        vel[i] = _clamp_vel(int(round(vel[i] * step_mul[step])))
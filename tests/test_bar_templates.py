@@ -0,0 +1,83 @@
+"""
+Tests for bar_templates.py — compiled, memoized per-bar event templates.
+"""
+import pytest
+
+from zt_band.bar_templates import (
+    clear_template_cache,
+    compile_bar_template,
+    compile_style,
+    style_overrides_key,
+    template_cache_info,
+)
+from zt_band.engine import generate_accompaniment
+from zt_band.patterns import STYLE_REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+
+class TestStyleOverridesKey:
+    def test_empty(self):
+        assert style_overrides_key(None) == ""
+        assert style_overrides_key({}) == ""
+
+    def test_non_style_keys_ignored(self):
+        assert style_overrides_key({"technique_tags": {"enabled": True}}) == ""
+
+    def test_order_independent(self):
+        a = style_overrides_key({"ghost_vel": 12, "pickup_beat": 3.5})
+        b = style_overrides_key({"pickup_beat": 3.5, "ghost_vel": 12})
+        assert a == b != ""
+
+
+class TestCompileStyle:
+    def test_unknown_style_raises(self):
+        with pytest.raises(ValueError, match="Unknown style"):
+            compile_style("no_such_style")
+
+    def test_registry_not_mutated(self):
+        before = STYLE_REGISTRY["swing_basic"].ghost_vel
+        key = style_overrides_key({"ghost_hits": {"enabled": True, "steps": [1, 5], "vel": 20}})
+        compiled = compile_style("swing_basic", key)
+        assert compiled.style.ghost_vel == 20
+        assert compiled.ghost_spec is not None
+        assert STYLE_REGISTRY["swing_basic"].ghost_vel == before
+
+
+class TestCompileBarTemplate:
+    def test_template_is_memoized(self):
+        t1 = compile_bar_template("swing_basic", "", "dom", 0.0)
+        t2 = compile_bar_template("swing_basic", "", "dom", 0.0)
+        assert t1 is t2
+        assert template_cache_info()["bar"]["hits"] == 1
+
+    def test_transpose(self):
+        tpl = compile_bar_template("swing_basic", "", "maj", 0.0)
+        assert tpl.comp_notes(48)[:4] == [48, 52, 55, 59]
+        assert tpl.comp_notes(50)[:4] == [50, 54, 57, 61]
+
+    def test_phase_changes_profile_only(self):
+        t0 = compile_bar_template("swing_basic", "", "maj", 0.0)
+        t3 = compile_bar_template("swing_basic", "", "maj", 3.0)
+        assert t0.comp_rel == t3.comp_rel
+        assert t0.comp_vel != t3.comp_vel
+
+
+def test_progression_renders_from_cache():
+    chords = ["Dm7", "G7", "Cmaj7", "A7"] * 6
+    generate_accompaniment(chords, style_name="bossa_basic")
+    info = template_cache_info()["bar"]
+    # Three qualities in 4/4 -> three compiled templates, the rest are hits.
+    assert info["misses"] == 3
+    assert info["hits"] == len(chords) - 3
+
+
+def test_three_four_cycles_phases():
+    comp, _ = generate_accompaniment(["C", "F", "G", "C", "F"], meter=(3, 4))
+    assert template_cache_info()["bar"]["misses"] == 4
+    assert comp[0].start_beats == 0.0
@@ -0,0 +1,124 @@
+"""
+Tests for the parallel batch renderer (zt-band render-batch).
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from zt_band.batch_render import discover_batch_inputs, plan_batch, render_batch, render_job
+from zt_band.cli import main
+from zt_band.config import load_program_config
+from zt_band.engine import generate_accompaniment
+
+
+def _write_tree(root: Path) -> Path:
+    src = root / "src"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.ztprog").write_text(
+        "name: A\nchords: [Dm7, G7, Cmaj7]\nstyle: swing_basic\ntempo: 110\nbars_per_chord: 2\n",
+        encoding="utf-8",
+    )
+    (src / "sub" / "b.ztprog").write_text(
+        "name: B\nchords: [Am7, D7]\nstyle:\n  comp: bossa_basic\n  ghost_vel: 18\n"
+        "  ghost_steps: [3, 11]\ntempo: 140\n",
+        encoding="utf-8",
+    )
+    (src / "sub" / "c.ztprog").write_text(
+        "name: C\nchords: [Cm7, F7]\nstyle: swing_basic\ntempo: 96\ntritone_mode: probabilistic\n"
+        "tritone_strength: 0.5\ntritone_seed: 7\n",
+        encoding="utf-8",
+    )
+    (src / "sub" / "broken.ztprog").write_text("name: Broken\nstyle: swing_basic\n", encoding="utf-8")
+    (src / "notes.txt").write_text("ignored", encoding="utf-8")
+    return src
+
+
+def test_discover_directory_and_glob(tmp_path):
+    src = _write_tree(tmp_path)
+    found = discover_batch_inputs(src)
+    assert [p.name for p in found] == ["a.ztprog", "b.ztprog", "broken.ztprog", "c.ztprog"]
+    assert discover_batch_inputs(str(src / "**" / "b.*")) == [src / "sub" / "b.ztprog"]
+
+
+def test_plan_mirrors_layout(tmp_path):
+    src = _write_tree(tmp_path)
+    jobs = plan_batch(discover_batch_inputs(src), tmp_path / "out")
+    assert [Path(j.outfile).relative_to(tmp_path / "out").as_posix() for j in jobs] == [
+        "a.mid", "sub/b.mid", "sub/broken.mid", "sub/c.mid",
+    ]
+
+
+def test_plan_keeps_suffix_for_shared_stems(tmp_path):
+    sources = [tmp_path / "g_lick_1.ztex", tmp_path / "g_lick_1.ztprog", tmp_path / "other.ztprog"]
+    jobs = plan_batch(sources, tmp_path / "out")
+    outs = [Path(j.outfile).name for j in jobs]
+    assert outs == ["g_lick_1.ztex.mid", "g_lick_1.ztprog.mid", "other.mid"]
+    assert len(set(outs)) == len(jobs)
+
+
+def test_render_job_matches_single_render(tmp_path):
+    src = _write_tree(tmp_path)
+    (job,) = plan_batch([src / "a.ztprog"], tmp_path / "out", use_cache=False)
+    res = render_job(job)
+    assert res.ok, res.error
+
+    cfg = load_program_config(src / "a.ztprog")
+    ref = tmp_path / "ref.mid"
+    generate_accompaniment(
+        chord_symbols=cfg.chords,
+        style_name=cfg.style,
+        tempo_bpm=cfg.tempo,
+        bars_per_chord=cfg.bars_per_chord,
+        outfile=str(ref),
+    )
+    assert Path(job.outfile).read_bytes() == ref.read_bytes()
+    # No temp directories are left behind.
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["a.mid"]
+
+
+def test_parallel_matches_serial(tmp_path):
+    src = _write_tree(tmp_path)
+    sources = discover_batch_inputs(src)
+    serial = render_batch(plan_batch(sources, tmp_path / "s", use_cache=False), workers=1)
+    parallel = render_batch(plan_batch(sources, tmp_path / "p", use_cache=False), workers=2)
+
+    assert serial["workers"] == 1 and parallel["workers"] == 2
+    assert serial["total"] == parallel["total"] == 4
+    assert serial["ok"] == parallel["ok"] == 3
+    assert [i["sha256"] for i in serial["items"]] == [i["sha256"] for i in parallel["items"]]
+    for rel in ("a.mid", "sub/b.mid", "sub/c.mid"):
+        assert (tmp_path / "s" / rel).read_bytes() == (tmp_path / "p" / rel).read_bytes()
+
+    failed = [i for i in serial["items"] if not i["ok"]]
+    assert len(failed) == 1 and "chords" in failed[0]["error"]
+    assert not (tmp_path / "s" / "sub" / "broken.mid").exists()
+
+
+def test_cached_batch_matches_fresh_render(tmp_path):
+    src = _write_tree(tmp_path)
+    sources = discover_batch_inputs(src)
+    cache_dir = tmp_path / "cache"
+    fresh = render_batch(plan_batch(sources, tmp_path / "f", cache_dir=cache_dir), workers=1)
+    again = render_batch(plan_batch(sources, tmp_path / "c", cache_dir=cache_dir), workers=2)
+
+    assert fresh["cached"] == 0
+    assert again["cached"] == 3
+    assert [i["sha256"] for i in fresh["items"]] == [i["sha256"] for i in again["items"]]
+
+
+def test_cli_render_batch_summary(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("ZT_BAND_CACHE_DIR", str(tmp_path / "cache"))
+    src = _write_tree(tmp_path)
+    (src / "sub" / "broken.ztprog").unlink()
+    summary_path = tmp_path / "summary.json"
+
+    rc = main([
+        "render-batch", str(src), "--out-dir", str(tmp_path / "out"),
+        "--workers", "1", "--summary", str(summary_path),
+    ])
+    assert rc == 0
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert summary["ok"] == 3 and summary["failed"] == 0
+    assert all(i["seconds"] >= 0 and i["bytes"] > 0 for i in summary["items"])
+    assert "Rendered 3/3" in capsys.readouterr().out
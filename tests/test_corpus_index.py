@@ -0,0 +1,157 @@
+"""
+Tests for the incremental corpus analysis index (zt-gravity corpus-index).
+"""
+from __future__ import annotations
+
+import json
+import os
+
+from shared.zone_tritone import CorpusIndex, build_transition_counts
+from shared.zone_tritone.cli import main
+from shared.zone_tritone.corpus import chord_sequence_to_roots
+from shared.zone_tritone.corpus_index import INDEX_VERSION, analyze_source, transition_stats
+
+
+def _write_tree(root):
+    (root / "flamenco").mkdir(parents=True)
+    (root / "flamenco" / "solea.ztprog").write_text(
+        "name: Solea\nchords: [E, F, G, F, E]\nstyle: swing_basic\n", encoding="utf-8"
+    )
+    (root / "flamenco" / "corpus.json").write_text(
+        json.dumps({"backing_tracks": [{"chords": ["Am", "G", "F", "E"]}]}), encoding="utf-8"
+    )
+    (root / "jazz.txt").write_text("Dm7 G7 Cmaj7\nEm7 A7 Dm7 G7\n", encoding="utf-8")
+    return root
+
+
+def _parsed(monkeypatch):
+    """Record every file content analyze_source() is asked to parse."""
+    calls = []
+    import shared.zone_tritone.corpus_index as mod
+
+    real = mod.analyze_source
+
+    def spy(text, suffix):
+        calls.append(suffix)
+        return real(text, suffix)
+
+    monkeypatch.setattr(mod, "analyze_source", spy)
+    return calls
+
+
+def test_analyze_source_matches_build_transition_counts():
+    counts, progs, skipped, chords = analyze_source("Dm7 G7 Cmaj7\nH7 C\n", ".txt")
+    assert (progs, skipped, chords) == (1, 1, 3)
+    assert counts == build_transition_counts(chord_sequence_to_roots(["Dm7", "G7", "Cmaj7"]))
+
+
+def test_rerun_only_reparses_changed_files(tmp_path, monkeypatch):
+    root = _write_tree(tmp_path / "corpus")
+    calls = _parsed(monkeypatch)
+
+    index = CorpusIndex.load(root)
+    report = index.update()
+    index.save()
+    assert len(report.added) == 3 and calls == [".json", ".ztprog", ".txt"]
+
+    # Fresh load, nothing changed: no parsing at all.
+    calls.clear()
+    index = CorpusIndex.load(root)
+    report = index.update()
+    assert report.reparsed == 0 and report.unchanged == 3 and calls == []
+
+    # Touched but identical content: hashed, not parsed.
+    jazz = root / "jazz.txt"
+    st = jazz.stat()
+    os.utime(jazz, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    report = index.update()
+    assert report.reparsed == 0 and calls == []
+
+    jazz.write_text("Dm7 G7 Cmaj7 A7\n", encoding="utf-8")
+    (root / "flamenco" / "corpus.json").unlink()
+    report = index.update()
+    assert report.changed == ("jazz.txt",)
+    assert report.removed == ("flamenco/corpus.json",)
+    assert calls == [".txt"]
+    assert sorted(index.entries) == ["flamenco/solea.ztprog", "jazz.txt"]
+
+
+def test_aggregate_query_uses_stored_counts(tmp_path):
+    root = _write_tree(tmp_path / "corpus")
+    index = CorpusIndex.load(root)
+    index.update()
+    index.save()
+
+    # Sources are gone; the saved index still answers queries.
+    for p in sorted(root.rglob("*.*"), reverse=True):
+        if p.name != ".zt-gravity-index.json":
+            p.unlink()
+    index = CorpusIndex.load(root)
+
+    expected = build_transition_counts(chord_sequence_to_roots(["E", "F", "G", "F", "E"]))
+    for a, b in ((9, 7), (7, 5), (5, 4)):
+        expected[a][b] += 1
+    assert index.merged_counts(["flamenco/*"]) == expected
+    assert index.summary(["flamenco/*"]) == {
+        "files": 2, "errors": 0, "progressions": 2, "skipped": 0, "chords": 9,
+        **transition_stats(expected),
+    }
+    assert index.summary()["total_transitions"] == 7 + 5
+    assert index.matrix(["*.txt"])[2][7] == 1.0
+
+
+def test_unparseable_file_is_recorded(tmp_path):
+    root = _write_tree(tmp_path / "corpus")
+    (root / "bad.json").write_text("{not json", encoding="utf-8")
+    index = CorpusIndex.load(root)
+    index.update()
+    assert index.entries["bad.json"].error.startswith("JSONDecodeError")
+    assert index.summary()["errors"] == 1
+
+
+def test_corrupt_index_file_is_rebuilt(tmp_path):
+    root = _write_tree(tmp_path / "corpus")
+    index = CorpusIndex.load(root)
+    index.update()
+    index.save()
+    good = index.index_path.read_text(encoding="utf-8")
+
+    malformed = json.dumps({"version": INDEX_VERSION, "entries": [{}]})
+    for broken in (good[: len(good) // 2], "[]", malformed):
+        index.index_path.write_text(broken, encoding="utf-8")
+        index = CorpusIndex.load(root)
+        assert index.entries == {}
+        assert len(index.update().added) == 3
+
+
+def test_cli_corpus_index(tmp_path, capsys):
+    root = _write_tree(tmp_path / "corpus")
+    index_path = tmp_path / "idx.json"
+    args = ["corpus-index", "--dir", str(root), "--index", str(index_path), "--match", "*flamenco*"]
+
+    assert main(args) == 0
+    out = capsys.readouterr().out
+    assert "3 added, 0 changed, 0 removed, 0 unchanged" in out
+    assert "Files                  : 2 (0 unreadable)" in out
+    assert "Total transitions      : 7" in out
+
+    assert main([*args, "--no-update", "--show-matrix"]) == 0
+    out = capsys.readouterr().out
+    assert "added" not in out
+    assert "# Transition probability matrix" in out
+    assert not (root / ".zt-gravity-index.json").exists()
+
+
+def test_string_form_ztprog_chords_are_indexed(tmp_path):
+    from shared.zone_tritone.corpus import parse_corpus_text
+
+    text = "name: swing\nchords: Cmaj7 Dm7  G7 Cmaj7\ntempo: 120\n"
+    assert list(parse_corpus_text(text, ".ztprog")) == [["Cmaj7", "Dm7", "G7", "Cmaj7"]]
+
+    root = tmp_path / "corpus"
+    root.mkdir()
+    (root / "swing.ztprog").write_text(text, encoding="utf-8")
+    index = CorpusIndex.load(root)
+    index.update()
+    assert index.summary()["progressions"] == 1
+    assert index.summary()["chords"] == 4
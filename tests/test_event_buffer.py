@@ -0,0 +1,115 @@
+"""
+Tests for event_buffer.py — struct-of-arrays event core and its engine path.
+"""
+import pytest
+
+from zt_band.engine import generate_accompaniment, generate_accompaniment_buffers
+from zt_band.event_buffer import EventBuffer
+from zt_band.expressive_layer import apply_velocity_profile, apply_velocity_profile_buffer
+from zt_band.ghost_layer import GHOST_SPEC_BRAZIL, add_ghost_hits, add_ghost_hits_buffer
+from zt_band.midi_out import NoteEvent
+from zt_band.musical_contract import ContractViolation, validate_event_buffer
+from zt_band.velocity_contour import (
+    VelContour,
+    apply_velocity_contour,
+    apply_velocity_contour_buffer,
+)
+
+
+def _events():
+    return [
+        NoteEvent(0.0, 1.0, 60, 90, 0),
+        NoteEvent(1.5, 0.5, 64, 80, 0),
+        NoteEvent(2.0, 0.5, 67, 80, 0),
+        NoteEvent(3.5, 0.25, 48, 70, 1),
+        NoteEvent(4.0, 1.0, 60, 100, 0),
+    ]
+
+
+class TestEventBuffer:
+    def test_roundtrip(self):
+        evs = _events()
+        buf = EventBuffer.from_events(evs)
+        assert len(buf) == len(evs)
+        assert buf.to_events() == evs
+        assert buf[3] == evs[3]
+
+    def test_extend_pattern_offsets_starts(self):
+        buf = EventBuffer()
+        buf.extend_pattern(8.0, [0.0, 1.5], [1.0, 0.5], [60, 64], [90, 80], channel=2)
+        assert buf.to_events() == [
+            NoteEvent(8.0, 1.0, 60, 90, 2),
+            NoteEvent(9.5, 0.5, 64, 80, 2),
+        ]
+
+    def test_take_preserves_order(self):
+        buf = EventBuffer.from_events(_events())
+        assert buf.take([4, 0]).to_events() == [_events()[4], _events()[0]]
+
+    def test_copy_is_independent(self):
+        buf = EventBuffer.from_events(_events())
+        cp = buf.copy()
+        cp.velocity[0] = 1
+        assert buf.velocity[0] == 90
+
+
+class TestColumnStagesMatchListStages:
+    def test_velocity_profile(self):
+        buf = EventBuffer.from_events(_events())
+        apply_velocity_profile_buffer(buf)
+        assert buf.to_events() == apply_velocity_profile(_events())
+
+    def test_velocity_contour(self):
+        contour = VelContour(enabled=True, ghost_mul=0.5)
+        kwargs = {"meter": "4/4", "bar_steps": 16, "contour": contour, "pickup_steps": {14}, "ghost_steps": {6}}
+        buf = EventBuffer.from_events(_events())
+        apply_velocity_contour_buffer(buf, **kwargs)
+        assert buf.to_events() == apply_velocity_contour(_events(), **kwargs)
+
+    def test_velocity_contour_meter_mismatch_is_noop(self):
+        buf = EventBuffer.from_events(_events())
+        apply_velocity_contour_buffer(buf, meter="4/4", bar_steps=8, contour=VelContour(enabled=True))
+        assert buf.to_events() == _events()
+
+    def test_ghost_hits(self):
+        bar = [NoteEvent(4.0, 1.0, 60, 90, 0), NoteEvent(5.5, 0.5, 64, 80, 0)]
+        expected = add_ghost_hits(
+            bar, [60, 64, 67, 71], bar_start_beats=4.0, beats_per_bar=4, ghost_spec=GHOST_SPEC_BRAZIL
+        )
+        buf = EventBuffer.from_events(_events()[:1])
+        buf.extend(EventBuffer.from_events(bar))
+        add_ghost_hits_buffer(
+            buf, [60, 64, 67, 71], bar_start_beats=4.0, beats_per_bar=4,
+            ghost_spec=GHOST_SPEC_BRAZIL, bar_first_index=1,
+        )
+        assert buf.to_events()[1:] == expected
+
+
+class TestValidateEventBuffer:
+    def test_valid_passes(self):
+        validate_event_buffer(EventBuffer.from_events(_events()))
+        validate_event_buffer(EventBuffer())
+
+    def test_first_violation_reported(self):
+        buf = EventBuffer.from_events(_events())
+        buf.velocity[2] = 0
+        buf.velocity[3] = 200
+        with pytest.raises(ContractViolation, match="velocity must be > 0: 0"):
+            validate_event_buffer(buf)
+
+
+@pytest.mark.parametrize("style", ["swing_basic", "bossa_basic", "samba_4_4"])
+def test_engine_buffer_path_matches_list_api(style):
+    kwargs = {
+        "style_name": style,
+        "bars_per_chord": 2,
+        "style_overrides": {"ghost_hits": {"enabled": True}, "vel_contour": {"enabled": True, "preset": "brazil_samba"}},
+        "density_bucket": "medium",
+        "syncopation_bucket": "light",
+    }
+    chords = ["Dm7", "G7", "Cmaj7", "A7"]
+    comp, bass = generate_accompaniment(chords, **kwargs)
+    comp_buf, bass_buf = generate_accompaniment_buffers(chords, **kwargs)
+    assert comp_buf.to_events() == comp
+    assert bass_buf.to_events() == bass
+    assert all(isinstance(e, NoteEvent) for e in comp)
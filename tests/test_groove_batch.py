@@ -0,0 +1,99 @@
+"""
+Tests for the batched groove intent client against the reference service.
+"""
+from datetime import datetime, timedelta, timezone
+
+from zt_band.groove import (
+    EvidenceWindow,
+    GrooveServiceConnection,
+    generate_intent,
+    generate_intents,
+)
+from zt_band.groove.groove_layer_bridge import _make_request_id
+from zt_band.groove.reference_service import ReferenceGrooveService
+
+PROFILE = {"schema_id": "groove_profile", "schema_version": "v1", "profile_id": "p1"}
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _windows(n):
+    return [
+        EvidenceWindow(horizon_ms=2000, features={
+            "timing": {"mean_offset_ms": float(i), "stddev_ms": 4.0, "direction": "behind" if i > 3 else "neutral"},
+            "events": {"count": i},
+        })
+        for i in range(n)
+    ]
+
+
+def test_batch_matches_single_calls_in_few_requests():
+    windows = _windows(10)
+    nows = [T0 + timedelta(seconds=i) for i in range(10)]
+    with ReferenceGrooveService() as svc:
+        conn = GrooveServiceConnection(svc.url)
+        try:
+            batched = generate_intents(profile=PROFILE, windows=windows, now_utc=nows, service=conn, batch_size=4)
+            assert svc.requests == 3 and svc.items == 10
+            singles = [generate_intent(profile=PROFILE, window=w, now_utc=t, service=conn) for w, t in zip(windows, nows)]
+        finally:
+            conn.close()
+        assert conn.connects == 1
+
+    assert batched == singles
+    assert [i["timing"]["anticipation_bias"] for i in batched[3:5]] == ["neutral", "behind"]
+
+
+def test_batch_request_ids_are_deterministic():
+    windows = _windows(3)
+    ids = []
+    for _ in range(2):
+        with ReferenceGrooveService() as svc:
+            conn = GrooveServiceConnection(svc.url)
+            generate_intents(profile=PROFILE, windows=windows, now_utc=T0, service=conn)
+            conn.close()
+            ids.append(svc.request_ids)
+    assert ids[0] == ids[1]
+    assert ids[0][0].startswith("sgb-") and ids[0][0].endswith("-a1")
+
+
+def test_falls_back_to_single_calls_without_batch_endpoint():
+    windows = _windows(5)
+    with ReferenceGrooveService(batch=False) as svc:
+        conn = GrooveServiceConnection(svc.url)
+        try:
+            out = generate_intents(profile=PROFILE, windows=windows, now_utc=T0, service=conn, batch_size=2)
+        finally:
+            conn.close()
+        # one rejected batch attempt, then per-window calls only
+        assert svc.requests == 1 + 5
+        assert svc.request_ids[1] == f"{_make_request_id('p1', T0)}-a1"
+    assert all(i is not None and i["profile_id"] == "p1" for i in out)
+
+
+def test_invalid_results_fail_closed_per_item(monkeypatch):
+    from zt_band.groove import reference_service
+
+    real = reference_service.reference_intent
+
+    def flaky(profile, window, now_utc):
+        intent = real(profile, window, now_utc)
+        if window["features"]["events"]["count"] == 1:
+            intent["schema_version"] = "v0"
+        return intent
+
+    monkeypatch.setattr(reference_service, "reference_intent", flaky)
+    windows = _windows(3)
+    with ReferenceGrooveService() as svc:
+        conn = GrooveServiceConnection(svc.url)
+        try:
+            out = generate_intents(profile=PROFILE, windows=windows, now_utc=T0, service=conn)
+            # mismatched timestamp count: nothing is requested
+            assert generate_intents(profile=PROFILE, windows=windows, now_utc=[T0], service=conn) == [None] * 3
+        finally:
+            conn.close()
+        assert svc.requests == 1
+    assert out[0] is not None and out[1] is None and out[2] is not None
+
+    # Service down: all None, no per-item fallback storm
+    conn = GrooveServiceConnection("http://127.0.0.1:9")
+    assert generate_intents(profile=PROFILE, windows=windows, now_utc=T0, service=conn, retry=False) == [None] * 3
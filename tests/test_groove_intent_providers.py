@@ -13,6 +13,7 @@ from zt_band.groove import (
     ManualIntentProvider,
     AnalyzerIntentProvider,
     GrooveProfileStore,
+    CachedGrooveProfileStore,
     EvidenceWindow,
     EvidenceWindowProbe,
 )
@@ -211,6 +212,57 @@ def test_profile_store_returns_none_for_invalid_json(tmp_path: Path):
     assert result is None
 
 
+def test_cached_profile_store_hits_and_revalidates(tmp_path: Path, valid_profile: dict):
+    """CachedGrooveProfileStore should parse once and re-read only when the file changes."""
+    import os
+
+    profile_path = tmp_path / "test_profile.json"
+    profile_path.write_text(json.dumps(valid_profile), encoding="utf-8")
+
+    store = CachedGrooveProfileStore(tmp_path)
+    first = store.load_profile("test_profile")
+    assert first is not None
+    assert store.load_profile("test_profile") is first
+    assert (store.hits, store.misses) == (1, 1)
+
+    # Edited file (new mtime/size) is re-read and re-validated
+    valid_profile["schema_version"] = "v2"
+    profile_path.write_text(json.dumps(valid_profile), encoding="utf-8")
+    st = profile_path.stat()
+    os.utime(profile_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert store.load_profile("test_profile") is None
+    assert store.load_profile("test_profile") is None  # invalid result is cached too
+    assert (store.hits, store.misses) == (2, 2)
+
+    # Deleted file fails closed and drops the entry
+    profile_path.unlink()
+    assert store.load_profile("test_profile") is None
+    assert len(store) == 0
+
+
+def test_cached_profile_store_preload(tmp_path: Path, valid_profile: dict):
+    """preload() should parse every profile in the directory up front."""
+    (tmp_path / "test_profile.json").write_text(json.dumps(valid_profile), encoding="utf-8")
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+
+    store = CachedGrooveProfileStore(tmp_path)
+    assert store.preload() == 1
+    assert store.misses == 2
+    assert store.load_profile("test_profile") is not None
+    assert store.hits == 1
+    assert CachedGrooveProfileStore(tmp_path / "missing").preload() == 0
+
+
+def test_analyzer_provider_reuses_its_profile_store(tmp_path: Path, valid_profile: dict, sample_context: IntentContext):
+    """AnalyzerIntentProvider should load the profile from its cached store, not disk, on repeat calls."""
+    (tmp_path / "test_profile.json").write_text(json.dumps(valid_profile), encoding="utf-8")
+    provider = AnalyzerIntentProvider(profile_store_dir=tmp_path)
+    provider.get_intent(sample_context)
+    provider.get_intent(sample_context)
+    assert isinstance(provider.store, CachedGrooveProfileStore)
+    assert (provider.store.hits, provider.store.misses) == (1, 1)
+
+
 # -----------------------------------------------------------------------------
 # H.1: Evidence Window Probe Tests
 # -----------------------------------------------------------------------------
@@ -0,0 +1,120 @@
+"""
+Tests for LocalGrooveGenerator -- warm import and memoized local intents.
+"""
+import builtins
+import sys
+import types
+from datetime import datetime, timezone
+
+import pytest
+
+from zt_band.groove import EvidenceWindow, LocalGrooveGenerator, generate_intent
+
+PROFILE = {"schema_id": "groove_profile", "schema_version": "v1", "profile_id": "p1"}
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+CANDIDATES = (("zt_test_groove_layer", "generate_intent"),)
+
+
+@pytest.fixture
+def fake_layer(monkeypatch):
+    mod = types.ModuleType("zt_test_groove_layer")
+    mod.calls = []
+
+    def generate(*, profile, window, now_utc):
+        mod.calls.append(window)
+        if window["features"]["timing"].get("direction") == "boom":
+            raise RuntimeError("analyzer failure")
+        return {
+            "schema_id": "groove_control_intent",
+            "schema_version": "v1",
+            "profile_id": profile["profile_id"],
+            "microshift_ms": window["features"]["timing"]["mean_offset_ms"],
+        }
+
+    mod.generate_intent = generate
+    monkeypatch.setitem(sys.modules, "zt_test_groove_layer", mod)
+    return mod
+
+
+def _window(offset_ms, direction="behind"):
+    return EvidenceWindow(horizon_ms=2000, features={"timing": {"mean_offset_ms": offset_ms, "direction": direction}})
+
+
+def test_memoizes_on_quantized_window(fake_layer):
+    gen = LocalGrooveGenerator(candidates=CANDIDATES)
+    a = gen.generate(profile=PROFILE, window=_window(4.1), now_utc=NOW)
+    b = gen.generate(profile=PROFILE, window=_window(3.9), now_utc=NOW)  # same 0.5ms bucket
+    assert a is b and a["microshift_ms"] == 4.1  # generator saw the real window
+    assert len(fake_layer.calls) == 1
+
+    gen.generate(profile={**PROFILE, "tempo_bias": 1}, window=_window(4.1), now_utc=NOW)
+    gen.generate(profile=PROFILE, window=_window(6.0), now_utc=NOW)
+    assert len(fake_layer.calls) == 3
+    stats = gen.stats()
+    assert (stats["calls"], stats["hits"], stats["misses"]) == (4, 1, 3)
+    assert stats["max_ms"] >= stats["last_ms"] >= 0.0
+
+
+def test_generator_gets_unquantized_window_unless_opted_in(fake_layer):
+    window = EvidenceWindow(horizon_ms=2000, features={
+        "timing": {"mean_offset_ms": 4.1, "direction": "behind"},
+        "tempo": {"drift_slope": 0.2, "bpm_estimate": 118.37},
+        "events": {"onset_density_hz": 1.3},
+    })
+    for memo_size in (0, 128):
+        LocalGrooveGenerator(candidates=CANDIDATES, memo_size=memo_size).generate(
+            profile=PROFILE, window=window, now_utc=NOW)
+        seen = fake_layer.calls[-1]["features"]
+        assert seen["tempo"] == {"drift_slope": 0.2, "bpm_estimate": 118.37}
+        assert seen["events"]["onset_density_hz"] == 1.3
+
+    # Each feature keys at its own resolution: a 0.2 ms/s drift change is a miss
+    gen = LocalGrooveGenerator(candidates=CANDIDATES)
+    gen.generate(profile=PROFILE, window=window, now_utc=NOW)
+    drifted = EvidenceWindow(horizon_ms=2000, features={**window.features, "tempo": {"drift_slope": 0.0, "bpm_estimate": 118.37}})
+    gen.generate(profile=PROFILE, window=drifted, now_utc=NOW)
+    assert gen.misses == 2
+
+    gen = LocalGrooveGenerator(candidates=CANDIDATES, quantize_inputs=True)
+    gen.generate(profile=PROFILE, window=window, now_utc=NOW)
+    seen = fake_layer.calls[-1]["features"]
+    assert seen["timing"]["mean_offset_ms"] == 4.0 and seen["tempo"]["bpm_estimate"] == 118.4
+    assert seen["tempo"]["drift_slope"] == 0.2
+
+
+def test_lru_eviction_and_failures_not_cached(fake_layer):
+    gen = LocalGrooveGenerator(candidates=CANDIDATES, memo_size=2)
+    for off in (1.0, 2.0, 3.0):
+        gen.generate(profile=PROFILE, window=_window(off), now_utc=NOW)
+    gen.generate(profile=PROFILE, window=_window(3.0), now_utc=NOW)  # still cached
+    gen.generate(profile=PROFILE, window=_window(1.0), now_utc=NOW)  # evicted
+    assert len(fake_layer.calls) == 4
+
+    for _ in range(2):
+        assert gen.generate(profile=PROFILE, window=_window(0.0, "boom"), now_utc=NOW) is None
+    assert len(fake_layer.calls) == 6
+
+
+def test_missing_generator_is_resolved_once(monkeypatch):
+    imports = []
+    real_import = builtins.__import__
+
+    def counting_import(name, *args, **kwargs):
+        if name == "zt_no_such_groove_layer":
+            imports.append(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", counting_import)
+    gen = LocalGrooveGenerator(candidates=(("zt_no_such_groove_layer", "generate_intent"),))
+    for _ in range(3):
+        assert gen.generate(profile=PROFILE, window=_window(0.0), now_utc=NOW) is None
+    assert gen.available is False
+    assert imports == ["zt_no_such_groove_layer"]
+
+
+def test_generate_intent_uses_given_handle(fake_layer):
+    gen = LocalGrooveGenerator(candidates=CANDIDATES)
+    for _ in range(3):
+        intent = generate_intent(profile=PROFILE, window=_window(2.0), now_utc=NOW, local=gen)
+        assert intent["profile_id"] == "p1"
+    assert len(fake_layer.calls) == 1 and gen.hits == 2
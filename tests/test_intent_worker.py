@@ -0,0 +1,175 @@
+"""
+Tests for the background intent worker and the keep-alive service connection.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from zt_band.groove import EvidenceWindow, IntentContext, IntentWorker
+from zt_band.groove.groove_layer_bridge import GrooveServiceConnection, generate_intent
+
+PROFILE = {"schema_id": "groove_profile", "schema_version": "v1", "profile_id": "p1"}
+
+
+class _StandInService(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    drop_after_reply = False
+    log: list = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.log.append((self.client_address[1], self.path, self.headers["X-Request-Id"]))
+        out = json.dumps({
+            "schema_id": "groove_control_intent",
+            "schema_version": "v1",
+            "profile_id": body["profile"]["profile_id"],
+            "seen_count": body["window"]["features"]["events"].get("count"),
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+        if self.drop_after_reply:
+            self.close_connection = True  # hang up without telling the client
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def service():
+    handler = type("Handler", (_StandInService,), {"log": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, handler
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/api"
+
+
+def _window(count):
+    return EvidenceWindow(horizon_ms=2000, features={"events": {"count": count}})
+
+
+def test_service_connection_is_reused(service):
+    server, handler = service
+    conn = GrooveServiceConnection(_url(server))
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    try:
+        for i in range(3):
+            intent = generate_intent(profile=PROFILE, window=_window(i), now_utc=now, service=conn, retry=False)
+            assert intent["seen_count"] == i
+    finally:
+        conn.close()
+
+    assert conn.connects == 1 and conn.requests == 3
+    assert len({port for port, _, _ in handler.log}) == 1
+    assert {path for _, path, _ in handler.log} == {"/api/generate_intent"}
+    # Deterministic request id (same profile + now) with attempt suffix
+    assert len({rid for _, _, rid in handler.log}) == 1
+    assert handler.log[0][2].startswith("sg-") and handler.log[0][2].endswith("-a1")
+
+
+def test_service_connection_reopens_dropped_keepalive(service):
+    server, handler = service
+    handler.drop_after_reply = True
+    conn = GrooveServiceConnection(_url(server))
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    try:
+        for i in range(3):
+            time.sleep(0.02)  # let the server hang up first
+            assert generate_intent(profile=PROFILE, window=_window(i), now_utc=now, service=conn, retry=False)
+    finally:
+        conn.close()
+    assert conn.requests == 3 and conn.connects == 3
+
+
+def test_service_connection_rejects_bad_url_and_fails_closed():
+    with pytest.raises(ValueError):
+        GrooveServiceConnection("ftp://example")
+    # Nothing listening: fail closed, never raise
+    conn = GrooveServiceConnection("http://127.0.0.1:9")
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert generate_intent(profile=PROFILE, window=_window(0), now_utc=now, service=conn, retry=False) is None
+
+
+class _SlowProvider:
+    def __init__(self):
+        self.gate = threading.Event()
+        self.calls = []
+        self.result = {"schema_id": "groove_control_intent", "profile_id": "p1"}
+
+    def get_intent(self, ctx):
+        self.calls.append(ctx)
+        self.gate.wait(5.0)
+        return self.result
+
+
+def test_worker_serves_cached_intent_without_waiting():
+    provider = _SlowProvider()
+    worker = IntentWorker(provider, first_wait_s=0.05).start()
+    try:
+        ctx = IntentContext(profile_id="p1", bpm=120.0, item_idx=0)
+        t = time.monotonic()
+        assert worker.get_intent(ctx) is None  # first call waits at most first_wait_s
+        assert time.monotonic() - t < 1.0
+
+        provider.gate.set()
+        assert worker.wait_published(2.0)
+        assert worker.get_intent(ctx) == provider.result
+        assert worker.latest().ctx.profile_id == "p1"
+
+        # A failing fetch keeps the last good intent; other profiles get none
+        provider.result = None
+        worker.request(ctx)
+        deadline = time.monotonic() + 2.0
+        while worker.failures == 0 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert worker.failures >= 1
+        assert worker.get_intent(ctx)["profile_id"] == "p1"
+        assert worker.get_intent(IntentContext(profile_id="other", bpm=120.0)) is None
+    finally:
+        provider.gate.set()
+        worker.stop()
+
+
+def test_worker_drops_stale_intent():
+    clock = [100.0]
+    provider = _SlowProvider()
+    provider.gate.set()
+    worker = IntentWorker(provider, max_age_s=5.0, now_fn=lambda: clock[0]).start()
+    try:
+        ctx = IntentContext(profile_id="p1", bpm=120.0)
+        worker.request(ctx)
+        assert worker.wait_published(2.0)
+        assert worker.get_intent(ctx) is not None
+        clock[0] += 6.0
+        assert worker.get_intent(ctx) is None
+    finally:
+        worker.stop()
+
+
+def test_worker_never_loses_newest_request():
+    provider = _SlowProvider()
+    provider.gate.set()
+    worker = IntentWorker(provider).start()
+    try:
+        for i in range(200):
+            worker.request(IntentContext(profile_id="p1", bpm=120.0, item_idx=i))
+        deadline = time.monotonic() + 2.0
+        while (not provider.calls or provider.calls[-1].item_idx != 199) and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert provider.calls[-1].item_idx == 199
+        assert len(provider.calls) <= 200  # superseded requests are dropped, never duplicated
+    finally:
+        worker.stop()
@@ -1,4 +1,7 @@
+import random
+
 from shared.zone_tritone import (
+    MarkovModel,
     build_transition_counts,
     normalize_transition_matrix,
     sample_next_root,
@@ -35,3 +38,36 @@ def test_markov_smoothing():
     for i in range(12):
         for j in range(12):
             assert matrix[i][j] > 0
+
+
+def test_markov_model_matches_function_api():
+    roots = [7, 0, 5, 10, 3, 8, 1, 6, 11, 4, 9, 2, 7, 0, 7, 0, 5]
+    model = MarkovModel.from_roots(roots, smoothing=0.25)
+    counts = build_transition_counts(roots)
+    matrix = normalize_transition_matrix(counts, smoothing=0.25)
+    assert model.counts == counts
+    assert model.matrix == matrix
+
+    # Same draws -> same roots as the linear-scan sampler
+    rng_a, rng_b = random.Random(9), random.Random(9)
+    expected = [7]
+    for _ in range(63):
+        expected.append(sample_next_root(expected[-1], matrix, rng_a))
+    assert model.sample_chain(7, 64, rng=rng_b) == expected
+    assert model.sample_chain(7, 64, seed=9) == expected
+
+
+def test_markov_model_corpus_and_bulk_chains():
+    model = MarkovModel.from_corpus([[7, 0], [0, 5], []])
+    # No transition is counted across sequence boundaries
+    assert model.counts[0][0] == 0
+    assert model.counts[7][0] == 1 and model.counts[0][5] == 1
+
+    model.update([5, 10])
+    assert model.sample_chain(7, 4, seed=1) == [7, 0, 5, 10]
+
+    chains = model.sample_chains([7, 0, 5], 3, seed=3)
+    assert chains == model.sample_chains([7, 0, 5], 3, seed=3)
+    assert [c[0] for c in chains] == [7, 0, 5]
+    assert all(len(c) == 3 for c in chains)
+    assert model.sample_chain(0, 0) == []
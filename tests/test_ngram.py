@@ -0,0 +1,132 @@
+import random
+
+import pytest
+
+from shared.zone_tritone import MarkovModel, NGramModel
+from shared.zone_tritone.cli import main
+from shared.zone_tritone.corpus import (
+    chord_root_and_quality,
+    chord_tokens,
+    iter_corpus_progressions,
+)
+
+ii_v_i = [2, 7, 0, 0]
+blues = [0, 5, 0, 0, 5, 5, 0, 0, 7, 5, 0, 7]
+
+
+def _model(order: int = 3) -> NGramModel:
+    model = NGramModel(order=order)
+    model.update_many([ii_v_i, ii_v_i, blues])
+    return model
+
+
+def test_counts_cover_every_order():
+    model = _model()
+    assert model.count((), 0) == 2 * 2 + 6
+    assert model.count((7,), 0) == 2
+    assert model.count((7,), 5) == 1
+    assert model.count((2, 7), 0) == 2
+    # n-grams never span sequences
+    assert model.count((0,), 2) == 0
+    with pytest.raises(ValueError):
+        model.count((1, 2, 3), 0)
+
+
+def test_backoff_distribution():
+    model = _model()
+    dist = model.distribution((2, 7))
+    assert abs(sum(dist.values()) - 1.0) < 1e-12
+    # Seen context: its own continuation dominates
+    assert max(dist, key=dist.get) == 0
+
+    # Unseen trigram context backs off to the bigram on the last token
+    assert model.distribution((11, 7)) == model.distribution((7,))
+    # Unseen everything backs off to unigram frequencies
+    unigram = model.distribution(())
+    assert model.distribution((11, 11)) == unigram
+    assert abs(unigram[0] - 10 / 20) < 1e-12
+    # Longer contexts than order - 1 are truncated
+    assert model.distribution((5, 5, 2, 7)) == dist
+
+
+def test_order_two_matches_markov_counts():
+    model = NGramModel(order=2)
+    model.update(blues)
+    markov = MarkovModel.from_roots(blues)
+    for a in range(12):
+        for b in range(12):
+            assert model.count((a,), b) == markov.counts[a][b]
+
+
+def test_generate_is_seeded():
+    model = _model()
+    a = model.generate([2], 16, seed=5)
+    assert a == model.generate([2], 16, rng=random.Random(5))
+    assert len(a) == 16 and a[0] == 2
+    assert set(a) <= set(model.vocab)
+    assert model.generate([2, 7, 0], 2) == [2, 7]
+
+
+def test_binary_roundtrip(tmp_path):
+    model = NGramModel(order=4)
+    model.update(chord_tokens("Dm7 G7 Cmaj7 A7 Dm7 G7 Cmaj7".split(), kind="root_quality"))
+    model.update(chord_tokens(["ii7", "V7", "Imaj7"], kind="root_quality"))
+
+    path = tmp_path / "m.ztng"
+    model.save(path)
+    loaded = NGramModel.load(path)
+    assert loaded.order == 4
+    assert loaded.vocab == model.vocab
+    assert loaded.to_bytes() == model.to_bytes()
+    ctx = ((2, "m7"), (7, "7"))
+    assert loaded.distribution(ctx) == model.distribution(ctx)
+    assert loaded.generate(list(ctx), 10, seed=1) == model.generate(list(ctx), 10, seed=1)
+
+    with pytest.raises(ValueError):
+        NGramModel.from_bytes(b"XXXX" + model.to_bytes()[4:])
+    blob = model.to_bytes()
+    for cut in range(len(blob)):  # every truncation is a ValueError, never struct.error
+        with pytest.raises(ValueError):
+            NGramModel.from_bytes(blob[:cut])
+
+
+def test_empty_model_raises():
+    with pytest.raises(ValueError):
+        NGramModel(order=2).distribution(())
+    with pytest.raises(ValueError):
+        NGramModel(order=0)
+
+
+def test_corpus_helpers(tmp_path):
+    assert chord_root_and_quality("bVII7") == (10, "7")
+    assert chord_root_and_quality("ii7") == (2, "m7")
+    assert chord_root_and_quality("IVmaj7") == (5, "maj7")
+    assert chord_root_and_quality("F#m7b5") == (6, "m7b5")
+
+    (tmp_path / "c.json").write_text(
+        '{"backing_tracks": [{"chords": ["I", "IV", "V7"]}], "x": {"chords": ["ii7", "V7"]}}',
+        encoding="utf-8",
+    )
+    (tmp_path / "c.txt").write_text("Dm7 G7 Cmaj7\n\nA7 Dm7\n", encoding="utf-8")
+    progs = list(iter_corpus_progressions([tmp_path / "c.json", tmp_path / "c.txt"]))
+    assert progs == [["I", "IV", "V7"], ["ii7", "V7"], ["Dm7", "G7", "Cmaj7"], ["A7", "Dm7"]]
+
+
+def test_cli_train_and_sample(tmp_path, capsys):
+    corpus = tmp_path / "c.txt"
+    corpus.write_text("Dm7 G7 Cmaj7\nDm7 G7 Cmaj7 A7\n", encoding="utf-8")
+    out = tmp_path / "m.ztng"
+
+    assert main(["ngram-train", str(corpus), "--order", "3", "--kind", "root_quality",
+                 "--out", str(out)]) == 0
+    assert "2 progressions" in capsys.readouterr().out
+
+    assert main(["ngram-sample", "--model", str(out), "--start", "Dm7 G7", "--length", "3",
+                 "--seed", "1"]) == 0
+    assert capsys.readouterr().out.split() == ["Dm7", "G7", "Cmaj7"]
+
+    for argv in (["--start", "Dm7 H7"], ["--model", str(tmp_path / "missing.ztng")],
+                 ["--model", str(corpus)]):
+        args = ["ngram-sample", "--model", str(out), *argv]
+        assert main(args) == 1
+        assert capsys.readouterr().err.startswith("error: ")
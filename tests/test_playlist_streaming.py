@@ -0,0 +1,75 @@
+"""
+Tests for streaming playlist rendering (playlist.render_playlist_to_midi(stream=True)).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from zt_band.event_buffer import EventBuffer
+from zt_band.midi_out import NoteEvent
+from zt_band.playlist import load_playlist, render_playlist_to_midi
+from zt_band.smf_writer import StreamingSmfWriter, encode_smf
+
+
+def _write_playlist(tmp_path: Path, tempo_b: int = 100) -> Path:
+    (tmp_path / "a.ztprog").write_text(
+        "name: A\nchords: [Dm7, G7, Cmaj7, A7]\nstyle: swing_basic\ntempo: 100\nbars_per_chord: 2\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "b.ztprog").write_text(
+        f"name: B\nchords: [Cm7, F7, Bbmaj7]\nstyle: bossa_basic\ntempo: {tempo_b}\n",
+        encoding="utf-8",
+    )
+    pl = tmp_path / "set.ztplay"
+    pl.write_text(
+        "name: Set\nprograms:\n"
+        "  - config: a.ztprog\n    repeat: 3\n"
+        "  - config: b.ztprog\n    repeat: 2\n"
+        "  - config: a.ztprog\n",
+        encoding="utf-8",
+    )
+    return pl
+
+
+def test_stream_matches_default_bytes(tmp_path):
+    pl = load_playlist(_write_playlist(tmp_path))
+    default_out = tmp_path / "default.mid"
+    stream_out = tmp_path / "stream.mid"
+    render_playlist_to_midi(pl, str(default_out))
+    render_playlist_to_midi(pl, str(stream_out), stream=True)
+    assert stream_out.read_bytes() == default_out.read_bytes()
+
+
+def test_stream_tempo_mismatch_leaves_no_file(tmp_path):
+    pl = load_playlist(_write_playlist(tmp_path, tempo_b=140))
+    out = tmp_path / "stream.mid"
+    with pytest.raises(ValueError, match="Tempo mismatch"):
+        render_playlist_to_midi(pl, str(out), stream=True)
+    assert not out.exists()
+
+
+def test_streaming_writer_carries_notes_across_segments(tmp_path):
+    # Second segment starts exactly where the first one ends; a re-hit lands on
+    # the boundary tick and a 1-tick note spills past it.
+    seg1 = [NoteEvent(0.0, 2.0, 60, 90, 0), NoteEvent(1.9999, 0.0001, 62, 80, 0)]
+    seg2 = [NoteEvent(0.0, 1.0, 60, 90, 0), NoteEvent(0.0, 1.0, 64, 70, 0)]
+    bass = [NoteEvent(0.0, 2.0, 36, 80, 1)]
+
+    out = tmp_path / "stream.mid"
+    with StreamingSmfWriter(str(out), tempo_bpm=90) as w:
+        w.add_segment(seg1, bass, offset_beats=0.0, next_offset_beats=2.0)
+        w.add_segment(seg2, [], offset_beats=2.0, next_offset_beats=3.0)
+
+    shifted = [NoteEvent(e.start_beats + 2.0, e.duration_beats, e.midi_note, e.velocity, e.channel) for e in seg2]
+    assert out.read_bytes() == encode_smf(seg1 + shifted, bass, tempo_bpm=90)
+
+
+def test_streaming_writer_stuck_note_removes_file(tmp_path):
+    out = tmp_path / "stuck.mid"
+    w = StreamingSmfWriter(str(out))
+    w.add_segment(EventBuffer.from_events([NoteEvent(0.0, 1.0, 60, 0, 0)]), EventBuffer())
+    with pytest.raises(ValueError, match="Stuck notes"):
+        w.close()
+    assert not out.exists()
@@ -0,0 +1,247 @@
+"""
+Tests for practice-mode scheduling: due-time decisions and the priority queue loop.
+"""
+import threading
+import time
+
+import mido
+import pytest
+
+from zt_band.clave import ClaveGrid, clave_hit_steps
+from zt_band.realtime import (
+    RtSpec,
+    _CallbackInput,
+    _DueQueue,
+    _PolledInput,
+    _practice_due,
+    _run_practice_loop,
+)
+from zt_band.senders import DummySender
+
+
+class _Stop(Exception):
+    pass
+
+
+class _Clock:
+    def __init__(self, end):
+        self.t = 1000.0
+        self.end = 1000.0 + end
+
+    def now(self):
+        return self.t
+
+    def sleep(self, dt):
+        self.t += max(dt, 1e-6)  # timer granularity
+        if self.t >= self.end:
+            raise _Stop
+
+
+class _ScriptedIn:
+    """iter_pending() yields each scripted batch once its arrival time has passed."""
+
+    def __init__(self, clock, batches):
+        self.clock = clock
+        self.batches = sorted(batches, key=lambda b: b[0])
+
+    def iter_pending(self):
+        out = []
+        while self.batches and self.batches[0][0] <= self.clock.t:
+            out.extend(self.batches.pop(0)[1])
+        return out
+
+
+def _on(note, vel=90):
+    return mido.Message("note_on", note=note, velocity=vel)
+
+
+def _polled(inport, clock, spec):
+    return _PolledInput(inport, max_wait_s=spec.tick_s, now_fn=clock.now, sleep_fn=clock.sleep)
+
+
+def _spec(**kw):
+    base = {"midi_in": "in", "midi_out": "out", "bpm": 120.0, "click": False, "practice_strict": False}
+    base.update(kw)
+    return RtSpec(**base)
+
+
+def test_due_queue_orders_by_due_then_insertion():
+    q = _DueQueue()
+    q.push(2.0, "c")
+    q.push(1.0, "a")
+    q.push(1.0, "b")
+    assert q.next_due() == 1.0
+    assert q.pop_until(1.5) == [(1.0, "a"), (1.0, "b")]
+    assert len(q) == 1
+
+
+def test_practice_due_snaps_and_rejects():
+    spec = _spec(practice_strict=True, practice_reject_offgrid=False)
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    allowed = clave_hit_steps(grid.grid, grid.clave)
+    step = grid.seconds_per_step()
+    kw = {"cycle_start": 0.0, "grid": grid, "spec": spec, "allowed": allowed}
+
+    # Off-clave step 5 snaps forward to the hit at step 6.
+    assert _practice_due(_on(60), now=5 * step, **kw) == pytest.approx(6 * step)
+    # Note-off is never rejected: passes through now.
+    assert _practice_due(mido.Message("note_off", note=60), now=5 * step, **kw) == 5 * step
+    # Non-note messages pass through.
+    assert _practice_due(mido.Message("control_change", control=64, value=0), now=1.0, **kw) == 1.0
+
+    kw["spec"] = _spec(practice_strict=True, practice_reject_offgrid=True)
+    assert _practice_due(_on(60), now=5 * step, **kw) is None
+
+
+def test_practice_due_wraps_to_next_cycle():
+    spec = _spec()
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    cycle_len = grid.seconds_per_bar() * grid.bars_per_cycle
+    # Just before the cycle end, "nearest" rounds to step 0 of the next cycle.
+    now = cycle_len - 0.01
+    due = _practice_due(_on(60), now=now, cycle_start=0.0, grid=grid, spec=spec, allowed=[])
+    assert due == pytest.approx(cycle_len)
+
+
+def test_chord_snaps_to_one_step_without_blocking_later_input():
+    spec = _spec(practice_quantize="up")
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    step = grid.seconds_per_step()
+    clock = _Clock(end=1.0)
+    t0 = clock.t
+    chord = [_on(60), _on(64), _on(67)]
+    inport = _ScriptedIn(clock, [(t0 + 2.4 * step, chord), (t0 + 2.6 * step, [_on(72)])])
+    out = DummySender(now_fn=clock.now)
+
+    with pytest.raises(_Stop):
+        _run_practice_loop(_polled(inport, clock, spec), out, grid=grid, spec=spec, now_fn=clock.now)
+
+    # All four notes leave together on step 3; reading the late one never waited on the chord.
+    assert [r.data[1] for r in out.records] == [60, 64, 67, 72]
+    assert {round((r.due - t0) / step, 6) for r in out.records} == {3.0}
+    assert all(0.0 <= -r.lateness_s <= spec.spin_s for r in out.records)
+
+
+def test_clicks_and_notes_dispatch_in_due_order():
+    spec = _spec(click=True)
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    step = grid.seconds_per_step()
+    cycle_len = grid.seconds_per_bar() * grid.bars_per_cycle
+    clock = _Clock(end=cycle_len + 0.5)
+    t0 = clock.t
+    inport = _ScriptedIn(clock, [(t0 + 5.2 * step, [_on(60)]), (t0 + cycle_len + 0.1, [_on(62)])])
+    out = DummySender(now_fn=clock.now)
+
+    with pytest.raises(_Stop):
+        _run_practice_loop(_polled(inport, clock, spec), out, grid=grid, spec=spec, now_fn=clock.now)
+
+    dues = [r.due for r in out.records]
+    assert dues == sorted(dues)
+    notes = [r for r in out.records if r.data[1] != spec.click_note]
+    # Step 5.2 rounds back to 5 (already past) and moves to 6; step 32.8 rounds up to 33.
+    assert [round((r.due - t0) / step, 6) for r in notes] == [6.0, 33.0]
+    # Clicks for the second cycle were queued as well.
+    assert any(r.due >= t0 + cycle_len and r.data[1] == spec.click_note for r in out.records)
+
+
+def test_strict_note_off_never_precedes_snapped_note_on():
+    spec = _spec(practice_strict=True)
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    step = grid.seconds_per_step()
+    clock = _Clock(end=1.0)
+    t0 = clock.t
+    # Note-on at step 4.1 snaps to the clave hit at step 6; its note-off
+    # 60 ms later passes through (never rejected) and must wait for it.
+    inport = _ScriptedIn(clock, [
+        (t0 + 4.1 * step, [_on(60)]),
+        (t0 + 4.1 * step + 0.060, [mido.Message("note_off", note=60)]),
+    ])
+    out = DummySender(now_fn=clock.now)
+
+    with pytest.raises(_Stop):
+        _run_practice_loop(_polled(inport, clock, spec), out, grid=grid, spec=spec, now_fn=clock.now)
+
+    assert [r.data[0] for r in out.records] == [0x90, 0x80]
+    assert [round((r.due - t0) / step, 6) for r in out.records] == [6.0, 6.0]
+
+
+class _ScriptedCallbackInput(_CallbackInput):
+    """Delivers scripted arrivals through put(); the loop then wakes `delay` late."""
+
+    def __init__(self, clock, arrivals, *, delay, max_wait_s):
+        super().__init__(max_wait_s=max_wait_s, now_fn=clock.now)
+        self.clock = clock
+        self.arrivals = sorted(arrivals, key=lambda a: a[0])
+        self.delay = delay
+
+    def wait(self, timeout):
+        if self.arrivals and self.arrivals[0][0] <= self.clock.t + timeout:
+            at, msgs = self.arrivals.pop(0)
+            self.clock.t = at
+            for msg in msgs:
+                self.put(msg)
+            self.clock.sleep(self.delay)
+        else:
+            self.clock.sleep(timeout)
+
+
+def test_callback_input_maps_steps_from_arrival_time():
+    spec = _spec(practice_quantize="down", practice_input="callback")
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    step = grid.seconds_per_step()
+    clock = _Clock(end=1.0)
+    t0 = clock.t
+    # Arrives at step 2.9, but the loop only gets to it at step 3.1.
+    inbox = _ScriptedCallbackInput(clock, [(t0 + 2.9 * step, [_on(60)])], delay=0.2 * step, max_wait_s=spec.lookahead_s)
+    out = DummySender(now_fn=clock.now)
+
+    with pytest.raises(_Stop):
+        _run_practice_loop(inbox, out, grid=grid, spec=spec, now_fn=clock.now)
+
+    # "down" from the arrival (2.9) is step 2, already past -> step 3 (not 4).
+    assert [round((r.due - t0) / step, 6) for r in out.records] == [3.0]
+
+
+def test_callback_input_window_uses_arrival_time():
+    spec = _spec(practice_strict=True, practice_window_ms=40.0, practice_quantize="up", practice_input="callback")
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    step = grid.seconds_per_step()
+    clock = _Clock(end=1.0)
+    t0 = clock.t
+    arrival = t0 + 6 * step + 0.030  # 30 ms after the clave hit at step 6
+    inbox = _ScriptedCallbackInput(clock, [(arrival, [_on(60)])], delay=0.020, max_wait_s=spec.lookahead_s)
+    out = DummySender(now_fn=clock.now)
+
+    with pytest.raises(_Stop):
+        _run_practice_loop(inbox, out, grid=grid, spec=spec, now_fn=clock.now)
+
+    # 30 ms from the hit at arrival (50 ms by the time the loop runs): passed through, not snapped.
+    assert [r.due for r in out.records] == [arrival]
+
+
+def test_callback_input_wakes_on_arrival():
+    inbox = _CallbackInput(max_wait_s=1.0)
+    timer = threading.Timer(0.01, inbox.put, args=(_on(60),))
+    start = time.monotonic()
+    timer.start()
+    inbox.wait(5.0)
+    assert time.monotonic() - start < 1.0
+    (arrived, msg), = inbox.pending()
+    assert msg.note == 60 and start <= arrived <= time.monotonic()
+    assert inbox.pending() == []
+
+
+def test_practice_cli_input_mode(monkeypatch):
+    from zt_band import cli as zcli
+
+    captured = {}
+
+    def fake_practice_lock(spec):
+        captured["input"] = spec.practice_input
+        raise SystemExit(0)
+
+    monkeypatch.setattr(zcli, "practice_lock_to_clave", fake_practice_lock)
+
+    with pytest.raises(SystemExit):
+        zcli.main(["practice", "--midi-in", "In", "--midi-out", "Out", "--input-mode", "callback"])
+    assert captured["input"] == "callback"
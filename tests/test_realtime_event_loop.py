@@ -0,0 +1,187 @@
+"""
+Tests for the event-driven rt_play_cycle loop (timeline + sleep-until-due).
+"""
+import mido
+
+from zt_band.clave import ClaveGrid
+from zt_band.realtime import (
+    LateDropPolicy,
+    RtSpec,
+    _build_cycle_timeline,
+    _make_click_msgs,
+    _run_event_loop,
+    _run_poll_loop,
+)
+
+
+class _FakeClock:
+    """Monotonic fake: sleep() advances time; each now() read costs a few µs."""
+
+    def __init__(self):
+        self.t = 1000.0
+        self.sleeps = 0
+        self.stall_at = None  # (time, seconds): one-off stall when crossed
+
+    def now(self):
+        self.t += 0.000005
+        return self.t
+
+    def sleep(self, dt):
+        self.sleeps += 1
+        self.t += dt
+        if self.stall_at and self.t >= self.stall_at[0]:
+            self.t += self.stall_at[1]
+            self.stall_at = None
+
+
+class _RecordingSender:
+    def __init__(self, clock):
+        self.clock = clock
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append((self.clock.t, msg))
+
+
+def _setup(spec):
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    events = sorted([
+        (0, mido.Message("note_on", note=36, velocity=100)),
+        (4, mido.Message("note_off", note=36, velocity=0)),
+        (8, mido.Message("note_on", note=60, velocity=15)),  # ghost
+        (9, mido.Message("note_off", note=60, velocity=0)),
+    ])
+    clicks = sorted(_make_click_msgs(grid, spec))
+    return grid, events, clicks
+
+
+def test_timeline_merges_sources_in_due_order():
+    spec = RtSpec(midi_out="x", bar_cc_enabled=True)
+    grid, events, clicks = _setup(spec)
+    timeline = _build_cycle_timeline(events, clicks, grid, spec)
+
+    assert len(timeline) == len(events) + len(clicks) + grid.bars_per_cycle
+    assert [e[0] for e in timeline] == sorted(e[0] for e in timeline)
+    # Same due time: bar CC, then main, then click.
+    assert [k for off, k, _ in timeline if off == 0.0] == [0, 1, 2]
+    assert timeline[-1][0] < grid.seconds_per_bar() * grid.bars_per_cycle
+
+
+def test_event_loop_sends_on_time_and_sleeps_per_event():
+    spec = RtSpec(midi_out="x", bpm=120, bar_cc_enabled=True)
+    grid, events, clicks = _setup(spec)
+    timeline = _build_cycle_timeline(events, clicks, grid, spec)
+    clock = _FakeClock()
+    sender = _RecordingSender(clock)
+    t0 = clock.t
+
+    _run_event_loop(
+        sender, timeline=timeline, grid=grid, spec=spec, max_cycles=2,
+        policy=LateDropPolicy(), now_fn=clock.now, sleep_fn=clock.sleep,
+    )
+
+    cycle_len = grid.seconds_per_bar() * 2
+    bar_msgs = 2 * grid.bars_per_cycle * 2  # 2 CCs per bar
+    assert len(sender.sent) == 2 * (len(events) + len(clicks)) + bar_msgs
+    # Never early, never more than a few µs late.
+    dues = [t0 + c * cycle_len + off for c in range(2) for off, kind, _ in timeline for _ in range(2 if kind == 0 else 1)]
+    for (sent_t, _), due in zip(sender.sent, dues):
+        assert 0.0 <= sent_t - due < 0.001
+    # At most one sleep per distinct due time (plus the end-of-cycle waits), far below 10ms ticks.
+    assert clock.sleeps <= 2 * len({off for off, _, _ in timeline}) + 2
+    # Returns at the end of the last cycle.
+    assert t0 + 2 * cycle_len <= clock.t < t0 + 2 * cycle_len + 0.001
+    # Countdown / index values continue across cycles.
+    ccs = [m for _, m in sender.sent if m.type == "control_change"]
+    assert [m.value for m in ccs] == [3, 0, 2, 1, 1, 2, 0, 3]
+
+
+def test_event_loop_late_drop_and_stall_resync():
+    spec = RtSpec(midi_out="x", bpm=120, click=False)
+    grid, events, _ = _setup(spec)
+    timeline = _build_cycle_timeline(events, [], grid, spec)
+    clock = _FakeClock()
+    sender = _RecordingSender(clock)
+    t0 = clock.t
+    step = grid.seconds_per_step()
+    # Wake 50ms late for the ghost note at step 8 (threshold 35ms).
+    clock.stall_at = (t0 + 8 * step - 0.002, 0.050)
+
+    _run_event_loop(
+        sender, timeline=timeline, grid=grid, spec=spec, max_cycles=1,
+        policy=LateDropPolicy(late_drop_ms=35), now_fn=clock.now, sleep_fn=clock.sleep,
+    )
+    notes = [(m.type, m.note) for _, m in sender.sent]
+    assert notes == [("note_on", 36), ("note_off", 36), ("note_off", 60)]
+
+    # A stall longer than a cycle skips the rest of that cycle.
+    clock = _FakeClock()
+    sender = _RecordingSender(clock)
+    cycle_len = grid.seconds_per_bar() * 2
+    clock.stall_at = (clock.t + 3 * step, 1.5 * cycle_len)
+    _run_event_loop(
+        sender, timeline=timeline, grid=grid, spec=spec, max_cycles=3,
+        policy=LateDropPolicy(), now_fn=clock.now, sleep_fn=clock.sleep,
+    )
+    assert len(sender.sent) < 3 * len(events)
+
+
+def test_poll_loop_sends_events_in_lookahead_window():
+    spec = RtSpec(midi_out="x", bpm=120, scheduler="poll", click=False)
+    grid, events, _ = _setup(spec)
+    clock = _FakeClock()
+    sender = _RecordingSender(clock)
+
+    _run_poll_loop(
+        sender, events_sorted=events, click_sorted=[], grid=grid, spec=spec, max_cycles=1,
+        policy=LateDropPolicy(), now_fn=clock.now, sleep_fn=clock.sleep,
+    )
+    assert [m for _, m in sender.sent] == [m for _, m in events]
+
+
+def test_event_loop_enqueues_ahead_for_output_stage():
+    from zt_band.senders import DummySender
+
+    spec = RtSpec(midi_out="x", bpm=120, click=False, lookahead_s=0.05)
+    grid, events, _ = _setup(spec)
+    timeline = _build_cycle_timeline(events, [], grid, spec)
+    clock = _FakeClock()
+    sender = DummySender(now_fn=clock.now)
+    t0 = clock.t
+
+    _run_event_loop(
+        sender, timeline=timeline, grid=grid, spec=spec, max_cycles=1,
+        policy=LateDropPolicy(), now_fn=clock.now, sleep_fn=clock.sleep,
+    )
+    # Due times are passed through; each entry is handed over up to lookahead_s early.
+    step = grid.seconds_per_step()
+    assert [round((r.due - t0) / step) for r in sender.records] == [0, 4, 8, 9]
+    assert all(-0.051 < r.lateness_s <= 0.001 for r in sender.records)
+
+
+def test_timeline_compiles_raw_bytes_with_velocity_mul():
+    spec = RtSpec(midi_out="x", click=False, velocity_mul=2.0)
+    grid, events, _ = _setup(spec)
+    raw_events = [(0, 0x90, 36, 100), (4, 0x80, 36, 0), (8, 0x90, 60, 15), (9, 0x90, 60, 0)]
+    timeline = _build_cycle_timeline(raw_events, [], grid, spec)
+
+    assert [p for _, _, p in timeline] == [b"\x90\x24\x7f", b"\x80\x24\x00", b"\x90\x3c\x1e", b"\x90\x3c\x00"]
+    # Message and raw inputs compile to the same timeline.
+    assert _build_cycle_timeline(events, [], grid, spec)[:3] == timeline[:3]
+
+
+def test_event_loop_uses_send_raw():
+    spec = RtSpec(midi_out="x", bpm=120, click=False)
+    grid, events, _ = _setup(spec)
+    clock = _FakeClock()
+
+    class _RawSender(_RecordingSender):
+        def send_raw(self, data):
+            self.sent.append((self.clock.t, data))
+
+    sender = _RawSender(clock)
+    _run_event_loop(
+        sender, timeline=_build_cycle_timeline(events, [], grid, spec), grid=grid, spec=spec, max_cycles=1,
+        policy=LateDropPolicy(), now_fn=clock.now, sleep_fn=clock.sleep,
+    )
+    assert [d for _, d in sender.sent] == [bytes(m.bytes()) for _, m in events]
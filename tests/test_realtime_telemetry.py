@@ -7,6 +7,7 @@ from zt_band.realtime_telemetry import (
     MIDO_AVAILABLE,
     _clamp_cc_value,
     make_bar_cc_messages,
+    make_bar_cc_raw,
 )
 
 
@@ -129,6 +130,15 @@ class TestMakeBarCcMessages:
         assert msgs[1].value == 0  # clamped
 
 
+class TestMakeBarCcRaw:
+    @pytest.mark.skipif(not MIDO_AVAILABLE, reason="mido not installed")
+    def test_matches_message_bytes(self):
+        args = {"channel": 17, "cc_countdown": 148, "cc_index": 21, "bars_remaining": 200, "bar_index": 3}
+        raw = make_bar_cc_raw(**args)
+        assert raw == [bytes(m.bytes()) for m in make_bar_cc_messages(**args)]
+        assert raw[0] == bytes((0xB1, 20, 127))
+
+
 class TestMakeBarCcMessagesWithoutMido:
     def test_returns_empty_when_mido_unavailable(self):
         # This test verifies the fallback behavior
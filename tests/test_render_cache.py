@@ -0,0 +1,182 @@
+"""
+Tests for the content-addressed render cache (render_cache.py).
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from zt_band import render_cache
+from zt_band.cli import main
+from zt_band.engine import generate_accompaniment
+from zt_band.expressive_swing import ExpressiveSpec
+from zt_band.render_cache import RenderCache, cached_render, render_cache_key
+from zt_band.rock_tag_attach import sidecar_json_path
+
+_INPUTS = {
+    "chord_symbols": ["Dm7", "G7", "Cmaj7"],
+    "style_name": "swing_basic",
+    "tempo_bpm": 120,
+    "bars_per_chord": 2,
+    "tritone_mode": "none",
+    "tritone_strength": 1.0,
+    "tritone_seed": None,
+}
+
+
+def test_key_is_canonical_and_input_sensitive():
+    k = render_cache_key(**_INPUTS)
+    assert k == render_cache_key(**dict(reversed(list(_INPUTS.items()))))
+    assert k == render_cache_key(**{**_INPUTS, "tempo_bpm": 120.0})
+    assert k != render_cache_key(**{**_INPUTS, "tempo_bpm": 121})
+    assert k != render_cache_key(**{**_INPUTS, "style_overrides": {"ghost_vel": 20}})
+    assert render_cache_key(**{**_INPUTS, "style_overrides": {"a": 1, "b": 2}}) == render_cache_key(
+        **{**_INPUTS, "style_overrides": {"b": 2, "a": 1}}
+    )
+
+
+def test_unreproducible_renders_have_no_key():
+    assert render_cache_key(**{**_INPUTS, "tritone_mode": "probabilistic", "tritone_strength": 0.5}) is None
+    assert render_cache_key(
+        **{**_INPUTS, "tritone_mode": "probabilistic", "tritone_strength": 0.5, "tritone_seed": 3}
+    ) is not None
+    # strength 1.0 substitutes every dominant without consulting the RNG
+    assert render_cache_key(**{**_INPUTS, "tritone_mode": "probabilistic"}) is not None
+    assert render_cache_key(**{**_INPUTS, "expressive": ExpressiveSpec(humanize_ms=5.0)}) is None
+    assert render_cache_key(**{**_INPUTS, "expressive": ExpressiveSpec(humanize_ms=5.0, seed=1)}) is not None
+    tagged = {"comp": "swing_basic", "technique_tags": {"enabled": True}}
+    assert render_cache_key(**{**_INPUTS, "style_overrides": tagged}) is None
+    assert render_cache_key(**{"segments": [{**_INPUTS, "tritone_mode": "probabilistic",
+                                             "tritone_strength": 0.5}]}) is None
+
+
+def test_cached_render_hit_copies_midi_and_sidecar(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    overrides = {"comp": "swing_basic", "technique_tags": {"enabled": True, "seed": 5}}
+    inputs = {**_INPUTS, "style_overrides": overrides}
+    calls = []
+
+    def render(out: Path):
+        calls.append(out)
+        generate_accompaniment(outfile=str(out), **inputs)
+
+    first = tmp_path / "first.mid"
+    assert cached_render(cache, first, lambda: render(first), **inputs) is False
+    second = tmp_path / "second.mid"
+    assert cached_render(cache, second, lambda: render(second), **inputs) is True
+
+    assert calls == [first]
+    assert second.read_bytes() == first.read_bytes()
+    assert Path(sidecar_json_path(str(second))).read_bytes() == Path(sidecar_json_path(str(first))).read_bytes()
+    assert cache.stats()["entries"] == 1
+
+    # No cache: always renders
+    third = tmp_path / "third.mid"
+    assert cached_render(None, third, lambda: render(third), **inputs) is False
+    assert calls == [first, third]
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    keys = []
+    for i, tempo in enumerate((100, 110, 120)):
+        out = tmp_path / f"{i}.mid"
+        out.write_bytes(bytes(1000))
+        key = render_cache_key(**{**_INPUTS, "tempo_bpm": tempo})
+        cache.put(key, out)
+        midi = cache.root / key[:2] / key / "render.mid"
+        os.utime(midi, (1000 + i, 1000 + i))
+        keys.append(key)
+
+    # Touch the oldest entry so the middle one becomes least recently used.
+    assert cache.get(keys[0], tmp_path / "hit.mid")
+
+    res = cache.prune(max_bytes=2500)
+    assert res == {"removed": 1, "removed_bytes": 1000}
+    assert not cache.get(keys[1], tmp_path / "miss.mid")
+    assert cache.get(keys[2], tmp_path / "hit2.mid")
+
+    cache.prune(max_bytes=0)
+    assert cache.stats()["entries"] == 0
+
+
+def test_put_respects_size_budget(tmp_path):
+    cache = RenderCache(tmp_path / "cache", max_bytes=1500)
+    for tempo in (100, 110, 120):
+        out = tmp_path / "x.mid"
+        out.write_bytes(bytes(1000))
+        cache.put(render_cache_key(**{**_INPUTS, "tempo_bpm": tempo}), out)
+    assert cache.stats()["entries"] == 1
+
+
+def test_put_scans_once_and_evicts_only_over_budget(tmp_path, monkeypatch):
+    cache = RenderCache(tmp_path / "cache", max_bytes=2500)
+    scans = []
+    real_entries = RenderCache._entries
+    monkeypatch.setattr(RenderCache, "_entries", lambda self: scans.append(1) or real_entries(self))
+    out = tmp_path / "x.mid"
+    out.write_bytes(bytes(1000))
+    for tempo in (100, 110):
+        cache.put(render_cache_key(**{**_INPUTS, "tempo_bpm": tempo}), out)
+    assert len(scans) == 1  # initial size scan only; no prune under budget
+    cache.put(render_cache_key(**{**_INPUTS, "tempo_bpm": 120}), out)
+    assert len(scans) == 2
+    assert cache.stats()["entries"] == 2
+
+
+def test_key_tracks_engine_sources(monkeypatch):
+    k = render_cache_key(**_INPUTS)
+    monkeypatch.setattr(render_cache, "engine_fingerprint", lambda: "edited-style")
+    assert render_cache_key(**_INPUTS) != k
+
+
+def test_hit_without_sidecar_removes_stale_sidecar(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    src = tmp_path / "x.mid"
+    src.write_bytes(b"MThd")
+    key = render_cache_key(**_INPUTS)
+    cache.put(key, src)
+
+    out = tmp_path / "out.mid"
+    stale = Path(sidecar_json_path(str(out)))
+    stale.write_text("{}", encoding="utf-8")  # from an earlier tagged render
+    assert cache.get(key, out)
+    assert not stale.exists()
+
+
+def test_entry_evicted_during_get_is_a_miss(tmp_path, monkeypatch):
+    cache = RenderCache(tmp_path / "cache")
+    src = tmp_path / "x.mid"
+    src.write_bytes(b"MThd")
+    Path(sidecar_json_path(str(src))).write_text("{}", encoding="utf-8")
+    key = render_cache_key(**_INPUTS)
+    cache.put(key, src)
+
+    real_copy = render_cache.shutil.copyfile
+
+    def copy_then_evict(a, b):
+        out = real_copy(a, b)
+        cache.prune(max_bytes=0)  # another process prunes mid-get
+        return out
+
+    monkeypatch.setattr(render_cache.shutil, "copyfile", copy_then_evict)
+    assert cache.get(key, tmp_path / "out.mid") is False
+
+
+def test_cli_create_and_cache_commands(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("ZT_BAND_CACHE_DIR", str(tmp_path / "cache"))
+    args = ["create", "--chords", "Dm7 G7 Cmaj7", "--style", "bossa_basic"]
+
+    assert main([*args, "--outfile", str(tmp_path / "a.mid")]) == 0
+    assert main([*args, "--outfile", str(tmp_path / "b.mid")]) == 0
+    assert main([*args, "--no-cache", "--outfile", str(tmp_path / "c.mid")]) == 0
+    assert (tmp_path / "a.mid").read_bytes() == (tmp_path / "b.mid").read_bytes()
+    assert (tmp_path / "a.mid").read_bytes() == (tmp_path / "c.mid").read_bytes()
+    assert RenderCache().stats()["entries"] == 1
+    capsys.readouterr()
+
+    assert main(["cache", "stats"]) == 0
+    assert "1 entries" in capsys.readouterr().out
+    assert main(["cache", "prune", "--max-mb", "0"]) == 0
+    out = capsys.readouterr().out
+    assert "Pruned 1 entries" in out and "0 entries" in out
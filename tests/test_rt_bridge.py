@@ -1,14 +1,20 @@
 """
 Tests for RT bridge: NoteEvents -> step-indexed MIDI messages.
 """
+import pytest
+
 from zt_band.midi_out import NoteEvent
 from zt_band.rt_bridge import (
     RtRenderSpec,
     _beats_per_cycle,
     _beats_per_step,
     _step_index,
+    compile_step_messages,
     gm_program_changes_at_start,
+    gm_program_changes_raw,
     note_events_to_step_messages,
+    note_events_to_step_raw,
+    raw_message_bytes,
     truncate_events_to_cycle,
 )
 
@@ -122,6 +128,53 @@ class TestGmProgramChanges:
             assert msg.type == "program_change"
 
 
+class TestRawCompile:
+    def _events(self):
+        return [
+            NoteEvent(start_beats=0.0, duration_beats=1.0, midi_note=60, velocity=100, channel=0),
+            NoteEvent(start_beats=1.0, duration_beats=0.5, midi_note=64, velocity=10, channel=1),
+            NoteEvent(start_beats=1.0, duration_beats=2.0, midi_note=36, velocity=90, channel=1),
+        ]
+
+    def test_raw_matches_message_bytes(self):
+        spec = RtRenderSpec(bpm=120.0, grid=16, bars_per_cycle=2)
+        msgs = note_events_to_step_messages(self._events(), spec=spec, steps_per_cycle=32)
+        raw = note_events_to_step_raw(self._events(), spec=spec, steps_per_cycle=32)
+
+        assert [(s, raw_message_bytes(*r)) for s, *r in raw] == [(s, bytes(m.bytes())) for s, m in msgs]
+        assert compile_step_messages(msgs) == raw
+
+    def test_program_changes_are_two_bytes(self):
+        raw = gm_program_changes_raw()
+        assert [(s, raw_message_bytes(*r)) for s, *r in raw] == [
+            (s, bytes(m.bytes())) for s, m in gm_program_changes_at_start()
+        ]
+        assert all(len(raw_message_bytes(*r[1:])) == 2 for r in raw)
+
+    def test_velocity_mul_scales_note_ons_only(self):
+        spec = RtRenderSpec(bpm=120.0, grid=16, bars_per_cycle=2)
+        raw = note_events_to_step_raw(self._events(), spec=spec, steps_per_cycle=32, velocity_mul=2.0)
+        assert sorted(r[3] for r in raw if r[1] & 0xF0 == 0x90) == [20, 127, 127]
+        assert all(r[3] == 0 for r in raw if r[1] & 0xF0 == 0x80)
+
+        msgs = note_events_to_step_messages(self._events(), spec=spec, steps_per_cycle=32)
+        assert compile_step_messages(msgs, velocity_mul=2.0) == raw
+
+    def test_compile_rejects_sysex(self):
+        import mido
+
+        with pytest.raises(ValueError):
+            compile_step_messages([(0, mido.Message("sysex", data=[1, 2, 3]))])
+
+    def test_compile_rejects_system_messages(self):
+        import mido
+
+        # 0xF6 would otherwise go out padded as F6 00 00
+        for msg in (mido.Message("tune_request"), mido.Message("clock"), mido.Message("songpos", pos=8)):
+            with pytest.raises(ValueError):
+                compile_step_messages([(0, msg)])
+
+
 class TestTruncateEventsToCycle:
     def test_keeps_events_within_cycle(self):
         events = [
@@ -0,0 +1,150 @@
+"""
+Tests for rt_lookahead.py -- adaptive lookahead with hysteresis.
+"""
+import mido
+import pytest
+
+from zt_band.clave import ClaveGrid
+from zt_band.realtime import LateDropPolicy, RtSpec, _build_cycle_timeline, _run_event_loop
+from zt_band.realtime_telemetry import make_lookahead_cc_messages, make_lookahead_cc_raw
+from zt_band.rt_lookahead import NARROWED, STEADY, WIDENED, LookaheadController
+
+
+def test_widens_immediately_on_high_need_or_overrun():
+    c = LookaheadController(initial_s=0.050)
+    c.observe(0.030)  # > 50% of 50ms
+    assert c.end_window() == pytest.approx(0.075)
+    assert c.state == WIDENED and c.widened == 1
+
+    # need far above the lookahead jumps straight to need / widen_ratio
+    c.observe(0.060)
+    assert c.end_window() == pytest.approx(0.120)
+
+    c.observe_overrun()
+    assert c.end_window() == pytest.approx(0.180)
+    c.observe_overrun()
+    assert c.end_window() == pytest.approx(0.200)  # clamped to max_s
+
+
+def test_narrows_only_after_hold_windows():
+    c = LookaheadController(initial_s=0.050, hold_windows=3)
+    for _ in range(2):
+        c.observe(0.001)
+        assert c.end_window() == pytest.approx(0.050)
+        assert c.state == STEADY
+    # a window in the dead band resets the calm count
+    c.observe(0.015)
+    c.end_window()
+    for _ in range(2):
+        c.observe(0.001)
+        assert c.end_window() == pytest.approx(0.050)
+    c.observe(0.001)
+    assert c.end_window() == pytest.approx(0.050 * 0.85)
+    assert c.state == NARROWED and c.narrowed == 1
+
+
+def test_narrowing_stops_at_min_and_no_oscillation():
+    c = LookaheadController(min_s=0.005, initial_s=0.010, hold_windows=1)
+    for _ in range(20):
+        c.end_window()
+    assert c.lookahead_s == pytest.approx(0.005)
+
+    # steady 10ms tick gap: settles between 20ms (widen) and 50ms (narrow)
+    c = LookaheadController(initial_s=0.050, hold_windows=1)
+    history = []
+    for _ in range(30):
+        c.observe(0.0101)
+        history.append(c.end_window())
+    assert c.widened == 0
+    assert all(0.020 <= v <= 0.050 for v in history)
+
+
+def test_rejects_bad_bounds():
+    with pytest.raises(ValueError):
+        LookaheadController(min_s=0.1, max_s=0.05)
+
+
+def test_lookahead_cc_encoding():
+    raw = make_lookahead_cc_raw(channel=15, cc_lookahead=23, cc_state=24, lookahead_s=0.0754, state=WIDENED)
+    assert raw == [bytes((0xBF, 23, 75)), bytes((0xBF, 24, 1))]
+    msgs = make_lookahead_cc_messages(channel=15, cc_lookahead=23, cc_state=24, lookahead_s=0.5, state=STEADY)
+    assert [m.bytes() for m in msgs] == [[0xBF, 23, 127], [0xBF, 24, 0]]
+
+
+class _FakeClock:
+    def __init__(self):
+        self.t = 1000.0
+        self.lag = 0.0  # every sleep overshoots by this much
+
+    def now(self):
+        self.t += 0.000005
+        return self.t
+
+    def sleep(self, dt):
+        self.t += dt + self.lag
+
+
+class _QueuedSink:
+    def __init__(self, clock):
+        self.clock = clock
+        self.sent = []
+
+    def send_at(self, due, msg):
+        self.sent.append((due, self.clock.t, bytes(msg)))
+
+
+def test_event_loop_adapts_and_keeps_note_offs():
+    spec = RtSpec(midi_out="x", bpm=120, click=False, bar_cc_enabled=True)
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    events = [
+        (0, mido.Message("note_on", note=36, velocity=100)),
+        (4, mido.Message("note_off", note=36, velocity=0)),
+    ]
+    timeline = _build_cycle_timeline(events, [], grid, spec)
+    clock = _FakeClock()
+    clock.lag = 0.040  # loaded machine: wakes 40ms late
+    sink = _QueuedSink(clock)
+    controller = LookaheadController(initial_s=0.050)
+
+    _run_event_loop(
+        sink, timeline=timeline, grid=grid, spec=spec, max_cycles=3,
+        policy=LateDropPolicy(), now_fn=clock.now, sleep_fn=clock.sleep, controller=controller,
+    )
+    assert controller.widened >= 1
+    assert controller.lookahead_s > 0.050
+    # Every note-off was handed off regardless of lateness
+    assert sum(1 for _, _, b in sink.sent if b[0] & 0xF0 == 0x80) == 3
+    # Telemetry CCs follow each bar CC
+    assert any(b[:2] == bytes((0xBF, 23)) for _, _, b in sink.sent)
+    assert any(b == bytes((0xBF, 24, WIDENED)) for _, _, b in sink.sent)
+
+
+def test_rt_play_cli_adaptive_lookahead_flags(monkeypatch):
+    from zt_band import cli as zcli
+
+    captured = {}
+
+    def fake_rt_play_cycle(*, events, spec, backend="mido", late_drop=None, panic=True):
+        captured["spec"] = spec
+        raise SystemExit(0)
+
+    monkeypatch.setattr(zcli, "rt_play_cycle", fake_rt_play_cycle)
+
+    with pytest.raises(SystemExit):
+        zcli.main([
+            "rt-play", "--midi-out", "DummyOut", "--no-click",
+            "--adaptive-lookahead", "--lookahead-min-ms", "10", "--lookahead-max-ms", "120",
+        ])
+    spec = captured["spec"]
+    assert spec.adaptive_lookahead is True
+    assert spec.lookahead_min_s == pytest.approx(0.010)
+    assert spec.lookahead_max_s == pytest.approx(0.120)
+
+
+def test_poll_loop_and_rt_play_cycle_report(capsys):
+    from zt_band.realtime import rt_play_cycle
+
+    spec = RtSpec(midi_out="dummy", bpm=960.0, scheduler="poll", adaptive_lookahead=True)
+    rt_play_cycle(events=[(0, 0x90, 60, 100), (2, 0x80, 60, 0)], spec=spec, max_cycles=2, backend="dummy", panic=False)
+    out = capsys.readouterr().out
+    assert "Adaptive lookahead: final" in out
@@ -0,0 +1,186 @@
+"""
+Tests for rt_metrics.py -- latency histograms and realtime instrumentation.
+"""
+import json
+import time
+
+import mido
+import pytest
+
+from zt_band.clave import ClaveGrid
+from zt_band.midi.midi_clock import MidiClockMaster
+from zt_band.realtime import LateDropPolicy, RtSpec, _build_cycle_timeline, _run_event_loop
+from zt_band.rt_metrics import LatencyHistogram, RtMetrics, _bucket_bounds, _bucket_index
+from zt_band.scheduler import RealtimeScheduler
+
+
+def test_bucket_bounds_contain_value_with_bounded_error():
+    for us in [0, 1, 31, 32, 33, 100, 1023, 1024, 5000, 123456, 10**7]:
+        low, high = _bucket_bounds(_bucket_index(us))
+        assert low <= us < high
+        assert (high - low) <= max(1, low / 16)
+    # Buckets are contiguous and ordered
+    for i in range(1, 200):
+        assert _bucket_bounds(i - 1)[1] == _bucket_bounds(i)[0]
+
+
+def test_histogram_percentiles_and_early():
+    h = LatencyHistogram()
+    for us in range(1, 1001):
+        h.record(us / 1e6)
+    h.record(-0.002)  # sent 2 ms early
+
+    assert h.count == 1001
+    assert h.early == 1
+    assert h.percentile(50) == pytest.approx(0.0005, rel=0.07)
+    assert h.percentile(99) == pytest.approx(0.00099, rel=0.07)
+    assert h.percentile(100) == pytest.approx(0.001)  # capped at max
+    d = h.to_dict()
+    assert d["min_ms"] == -2.0 and d["max_ms"] == 1.0
+    assert sum(b[2] for b in d["buckets_us"]) == 1001
+
+
+def test_metrics_summary_report_and_json(tmp_path):
+    t = {"v": 0.0}
+    lines = []
+    m = RtMetrics(interval_s=5.0, now_fn=lambda: t["v"], report_fn=lines.append)
+    m.record_lateness("output", 0.0004)
+    m.record_drop("late_click")
+    m.record_drop("late_click")
+    m.record_overrun("loop")
+    m.record_sleep_overshoot(0.0012)
+    m.record_sleep_overshoot(0.0003)
+
+    m.maybe_report()
+    assert lines == []
+    t["v"] = 5.0
+    m.maybe_report()
+    m.maybe_report()
+    assert len(lines) == 1
+    assert "output n=1" in lines[0] and "late_click=2" in lines[0] and "overruns 1" in lines[0]
+
+    path = tmp_path / "metrics.json"
+    m.write_json(path)
+    data = json.loads(path.read_text())
+    assert data["drops"] == {"late_click": 2}
+    assert data["overruns"] == {"loop": 1}
+    assert data["max_sleep_overshoot_ms"] == 1.2
+    assert data["lateness"]["output"]["count"] == 1
+
+
+class _FakeClock:
+    def __init__(self):
+        self.t = 1000.0
+        self.stall_at = None
+
+    def now(self):
+        self.t += 0.000005
+        return self.t
+
+    def sleep(self, dt):
+        self.t += dt
+        if self.stall_at and self.t >= self.stall_at[0]:
+            self.t += self.stall_at[1]
+            self.stall_at = None
+
+
+class _Sink:
+    def send(self, msg):
+        pass
+
+
+def test_event_loop_records_drops_and_stall_overrun():
+    spec = RtSpec(midi_out="x", bpm=120, click=False)
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    events = [
+        (0, mido.Message("note_on", note=36, velocity=100)),
+        (8, mido.Message("note_on", note=60, velocity=15)),  # ghost
+        (9, mido.Message("note_off", note=60, velocity=0)),
+    ]
+    timeline = _build_cycle_timeline(events, [], grid, spec)
+    clock = _FakeClock()
+    step = grid.seconds_per_step()
+    cycle_len = grid.seconds_per_bar() * 2
+    # Late for the ghost note, then a stall longer than a cycle.
+    clock.stall_at = (clock.t + 8 * step - 0.002, 0.050)
+    metrics = RtMetrics(interval_s=0, now_fn=clock.now)
+
+    _run_event_loop(
+        _Sink(), timeline=timeline, grid=grid, spec=spec, max_cycles=1,
+        policy=LateDropPolicy(late_drop_ms=35), now_fn=clock.now, sleep_fn=clock.sleep, metrics=metrics,
+    )
+    assert metrics.drops == {"late_ghost": 1}
+    assert metrics.lateness["loop"].count == 3
+    assert metrics.max_sleep_overshoot_s > 0.045
+
+    clock.stall_at = (clock.t + 3 * step, 1.5 * cycle_len)
+    _run_event_loop(
+        _Sink(), timeline=timeline, grid=grid, spec=spec, max_cycles=3,
+        policy=LateDropPolicy(), now_fn=clock.now, sleep_fn=clock.sleep, metrics=metrics,
+    )
+    assert metrics.overruns == {"loop": 1}
+    assert metrics.drops["stall_skip"] >= 1
+
+
+def test_realtime_scheduler_records_lateness():
+    t = {"v": 0.0}
+
+    def sleep(dt):
+        t["v"] += dt + 0.001  # every sleep overshoots by 1 ms
+
+    metrics = RtMetrics(interval_s=0, now_fn=lambda: t["v"])
+    sched = RealtimeScheduler(sender=_Sink(), sleep_fn=sleep, now_fn=lambda: t["v"], metrics=metrics)
+    sched.run(
+        [(0, mido.Message("note_on", note=60)), (480, mido.Message("note_off", note=60))],
+        bpm=120, ticks_per_beat=480,
+    )
+    hist = metrics.lateness["scheduler"]
+    assert hist.count == 2
+    assert metrics.max_sleep_overshoot_s == pytest.approx(0.001)
+
+
+def test_clock_master_records_catchup_overrun():
+    sent = []
+    metrics = RtMetrics(interval_s=0)
+    clock = MidiClockMaster(sent.append, emit_start_stop=False, max_catchup_ticks=3, metrics=metrics)
+    clock.start(120.0)
+    clock._next_tick_t = time.monotonic() - 0.5  # far behind
+
+    assert clock.tick() == 3
+    assert metrics.lateness["clock"].count == 3
+    assert metrics.lateness["clock"].min_s > 0.4
+    assert metrics.overruns == {"clock": 1}
+    assert metrics.drops["clock_skipped"] >= 20
+
+
+def test_rt_play_cli_metrics_flags(monkeypatch):
+    from zt_band import cli as zcli
+
+    captured = {}
+
+    def fake_rt_play_cycle(*, events, spec, backend="mido", late_drop=None, panic=True):
+        captured["spec"] = spec
+        raise SystemExit(0)
+
+    monkeypatch.setattr(zcli, "rt_play_cycle", fake_rt_play_cycle)
+
+    with pytest.raises(SystemExit):
+        zcli.main([
+            "rt-play", "--midi-out", "DummyOut", "--no-click",
+            "--metrics-out", "m.json", "--metrics-interval", "2.5",
+        ])
+    assert captured["spec"].metrics_out == "m.json"
+    assert captured["spec"].metrics_interval_s == 2.5
+
+
+def test_rt_play_cycle_writes_metrics_json(tmp_path, capsys):
+    from zt_band.realtime import rt_play_cycle
+
+    path = tmp_path / "metrics.json"
+    spec = RtSpec(midi_out="dummy", bpm=960.0, metrics_out=str(path), metrics_interval_s=0)
+    rt_play_cycle(events=[(0, 0x90, 60, 100), (2, 0x80, 60, 0)], spec=spec, max_cycles=1, backend="dummy", panic=False)
+
+    data = json.loads(path.read_text())
+    assert data["lateness"]["output"]["count"] >= 2
+    assert data["lateness"]["loop"]["count"] >= 2
+    assert "metrics: " in capsys.readouterr().out
@@ -2,6 +2,8 @@
 Tests for rt-play --playlist feature.
 """
 
+import sys
+
 import pytest
 
 from zt_band import cli as zcli
@@ -232,3 +234,81 @@ style: ballad_basic
     )
 
     assert calls[0]["bpm"] == 95
+
+
+def test_rt_playlist_gapless_single_port_and_timeline(monkeypatch, tmp_path):
+    """Gapless mode plays items back to back on one sender, section CCs included."""
+    playlist_file = tmp_path / "test.ztplay"
+    playlist_file.write_text("""
+id: test
+title: "Test"
+items:
+  - name: "First"
+    file: "prog1.ztprog"
+    repeats: 2
+  - name: "Second"
+    file: "prog2.ztprog"
+    repeats: 1
+""")
+    (tmp_path / "prog1.ztprog").write_text("""
+name: prog1
+tempo: 960
+chords: [Dm7, G7]
+style: swing_basic
+""")
+    (tmp_path / "prog2.ztprog").write_text("""
+name: prog2
+tempo: 480
+chords: [Cmaj7]
+style: swing_basic
+""")
+
+    from zt_band import rt_playlist, senders
+
+    def no_rt_play_cycle(**_kwargs):
+        raise AssertionError("gapless mode must not call rt_play_cycle")
+
+    opened = []
+    threaded = []
+
+    def fake_create_sender(backend="mido", port_name=None):
+        opened.append(senders.DummySender())
+        return opened[-1]
+
+    class RecordingThreadedSender(senders.ThreadedSender):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            threaded.append(self)
+
+    probes = []
+
+    class RecordingProbe(rt_playlist.EvidenceWindowProbe):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            probes.append(self)
+
+    monkeypatch.setattr(rt_playlist, "rt_play_cycle", no_rt_play_cycle)
+    monkeypatch.setattr(senders, "create_sender", fake_create_sender)
+    monkeypatch.setattr(senders, "ThreadedSender", RecordingThreadedSender)
+    monkeypatch.setattr(rt_playlist, "EvidenceWindowProbe", RecordingProbe)
+    monkeypatch.setattr(sys, "argv", ["zt-band", "--intent-source", "analyzer", "--profile-store-dir", str(tmp_path)])
+    monkeypatch.delenv("SG_GROOVE_SERVICE_URL", raising=False)
+
+    rt_playlist.rt_play_playlist(
+        playlist_file=str(playlist_file),
+        midi_out="DummyOut",
+        click=False,
+        bar_cc_enabled=True,
+        gapless=True,
+    )
+
+    assert len(opened) == 1  # one port for the whole playlist
+    assert len(threaded) == 1
+    section = [r for r in threaded[0].records if r.data[:2] == bytes((0xBF, 22))]
+    assert [r.data[2] for r in section] == [0, 1]
+    # Item 2 is due exactly where item 1's 2 cycles (2 bars each at 960 BPM) end
+    assert section[1].due - section[0].due == pytest.approx(2 * 2 * 4 * 60.0 / 960.0, abs=1e-9)
+    # Onsets are quantized against each item's tempo (enables tempo.bpm_estimate)
+    assert len(probes[0]) > 0 and probes[0].reference_bpm == 480.0
+    # Panic cleanup after the last item
+    assert any(m.type == "control_change" and m.control == 123 for m in opened[0].sent)
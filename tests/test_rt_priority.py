@@ -0,0 +1,140 @@
+"""
+Tests for rt_priority.py -- opt-in soft-realtime process setup.
+"""
+import gc
+import os
+
+import pytest
+
+from zt_band import rt_priority
+from zt_band.rt_priority import RealtimeSetup
+
+
+def _deny(*_args, **_kwargs):
+    raise PermissionError(1, "Operation not permitted")
+
+
+@pytest.fixture
+def denied(monkeypatch):
+    """Unprivileged process: every priority/affinity/mlock request refused."""
+    monkeypatch.setattr(os, "sched_setscheduler", _deny, raising=False)
+    monkeypatch.setattr(os, "setpriority", _deny, raising=False)
+    monkeypatch.setattr(os, "sched_setaffinity", _deny, raising=False)
+    monkeypatch.setattr(rt_priority, "_libc", lambda: None)
+
+
+def test_degrades_gracefully_and_reports(denied):
+    gc_was_enabled = gc.isenabled()
+    setup = RealtimeSetup(cpu=0).apply()
+    try:
+        steps = {step: ok for step, ok, _ in setup.results}
+        assert steps["sched"] is False
+        assert steps["mlock"] is False
+        assert steps.get("nice") is not True
+        assert steps.get("affinity") is not True
+        # GC freeze needs no privileges
+        assert steps["gc"] is True
+        assert not gc.isenabled()
+        assert gc.get_freeze_count() > 0
+        lines = setup.report_lines()
+        assert any("skipped" in line and "permission denied" in line for line in lines)
+    finally:
+        setup.restore()
+    assert gc.isenabled() == gc_was_enabled
+    assert gc.get_freeze_count() == 0
+
+
+def test_restore_undoes_what_succeeded(monkeypatch):
+    if not hasattr(os, "sched_setscheduler"):
+        pytest.skip("no sched_setscheduler on this platform")
+    calls = []
+    monkeypatch.setattr(os, "sched_getscheduler", lambda pid: os.SCHED_OTHER)
+    monkeypatch.setattr(os, "sched_getparam", lambda pid: os.sched_param(0))
+    monkeypatch.setattr(os, "sched_setscheduler", lambda pid, policy, param: calls.append(("sched", policy)))
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 2, 3})
+    monkeypatch.setattr(os, "sched_setaffinity", lambda pid, cpus: calls.append(("affinity", set(cpus))))
+
+    setup = RealtimeSetup(cpu=2, lock_memory=False, freeze_gc=False).apply()
+    assert [step for step, ok, _ in setup.results if ok] == ["sched", "affinity"]
+    setup.restore()
+    assert calls == [
+        ("sched", os.SCHED_FIFO),
+        ("affinity", {2}),
+        ("affinity", {0, 1, 2, 3}),
+        ("sched", os.SCHED_OTHER),
+    ]
+    setup.restore()  # idempotent
+    assert len(calls) == 4
+
+
+def test_rt_play_cycle_applies_and_restores(denied, capsys):
+    from zt_band.realtime import RtSpec, rt_play_cycle
+
+    spec = RtSpec(midi_out="dummy", bpm=960.0, realtime_priority=True)
+    rt_play_cycle(events=[(0, 0x90, 60, 100), (2, 0x80, 60, 0)], spec=spec, max_cycles=1, backend="dummy", panic=False)
+    out = capsys.readouterr().out
+    assert "Realtime setup:" in out and "sched: skipped" in out
+    assert gc.isenabled()
+
+
+def test_cli_realtime_priority_flags(monkeypatch):
+    from zt_band import cli as zcli
+
+    captured = {}
+
+    def fake_rt_play_cycle(*, events, spec, backend="mido", late_drop=None, panic=True):
+        captured["rt"] = spec
+        raise SystemExit(0)
+
+    def fake_practice(spec):
+        captured["practice"] = spec
+
+    monkeypatch.setattr(zcli, "rt_play_cycle", fake_rt_play_cycle)
+    monkeypatch.setattr(zcli, "practice_lock_to_clave", fake_practice)
+
+    with pytest.raises(SystemExit):
+        zcli.main(["rt-play", "--midi-out", "DummyOut", "--no-click", "--realtime-priority", "--rt-cpu", "3"])
+    assert captured["rt"].realtime_priority is True
+    assert captured["rt"].rt_cpu == 3
+
+    zcli.main(["practice", "--midi-in", "In", "--midi-out", "Out", "--realtime-priority"])
+    assert captured["practice"].realtime_priority is True
+    assert captured["practice"].rt_cpu is None
+
+
+def test_mlock_current_pages_only(monkeypatch):
+    flags = []
+
+    class FakeLibc:
+        def mlockall(self, f):
+            flags.append(f)
+            return 0
+
+        def munlockall(self):
+            flags.append("unlock")
+
+    monkeypatch.setattr(rt_priority, "_libc", FakeLibc)
+    setup = RealtimeSetup(freeze_gc=False)
+    setup._apply_mlock()
+    setup.restore()
+    assert flags == [rt_priority._MCL_CURRENT, "unlock"]  # never MCL_FUTURE
+
+
+def test_release_current_thread_reverts_caller_only(monkeypatch):
+    if not hasattr(os, "sched_setscheduler"):
+        pytest.skip("no sched_setscheduler on this platform")
+    calls = []
+    monkeypatch.setattr(os, "sched_getscheduler", lambda pid: os.SCHED_OTHER)
+    monkeypatch.setattr(os, "sched_getparam", lambda pid: os.sched_param(0))
+    monkeypatch.setattr(os, "sched_setscheduler", lambda pid, policy, param: calls.append(("sched", policy)))
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1})
+    monkeypatch.setattr(os, "sched_setaffinity", lambda pid, cpus: calls.append(("affinity", set(cpus))))
+
+    setup = RealtimeSetup(cpu=1, lock_memory=False).apply()
+    try:
+        setup.release_current_thread()
+        assert calls[2:] == [("affinity", {0, 1}), ("sched", os.SCHED_OTHER)]
+        assert not gc.isenabled()  # process-wide steps stay until restore()
+    finally:
+        setup.restore()
+    assert gc.isenabled()
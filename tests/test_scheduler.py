@@ -6,6 +6,7 @@ Verifies:
 - Event normalization (sorting)
 - CollectingScheduler behavior
 - NoteEvent -> TickEvent bridge
+- TempoMap / TempoMapScheduler (tempo maps, batching, live tempo)
 """
 from __future__ import annotations
 
@@ -232,3 +233,118 @@ class TestRealtimeScheduler:
         assert len(sent) == 2
         assert sent[0].type == "note_on"
         assert sent[1].type == "note_off"
+
+
+class _FakeClock:
+    """Clock that only advances when slept on (plus a tiny cost per read)."""
+
+    def __init__(self) -> None:
+        self.t = 0.0
+        self.sleeps: list[float] = []
+
+    def now(self) -> float:
+        self.t += 1e-6
+        return self.t
+
+    def sleep(self, dt: float) -> None:
+        self.sleeps.append(dt)
+        self.t += dt
+
+
+class TestTempoMap:
+    """Test piecewise tempo map conversion."""
+
+    def test_constant_map_matches_ticks_to_seconds(self):
+        from zt_band.scheduler import TempoMap, ticks_to_seconds
+
+        tm = TempoMap.constant(97.0)
+        ticks = [0, 1, 240, 480, 12345]
+        assert tm.event_times(ticks, 480) == pytest.approx([ticks_to_seconds(t, 97.0, 480) for t in ticks])
+
+    def test_piecewise_map(self):
+        """120 BPM for 2 beats, then 60 BPM."""
+        from zt_band.scheduler import TempoMap
+
+        tm = TempoMap(((0, 120.0), (960, 60.0)))
+        assert tm.seconds_at(960, 480) == pytest.approx(1.0)
+        assert tm.seconds_at(1440, 480) == pytest.approx(2.0)
+        assert tm.bpm_at(959) == 120.0 and tm.bpm_at(960) == 60.0
+        ticks = [0, 480, 960, 1200, 1440]
+        assert tm.event_times(ticks, 480) == pytest.approx([tm.seconds_at(t, 480) for t in ticks])
+
+    def test_rejects_bad_maps(self):
+        from zt_band.scheduler import TempoMap
+
+        with pytest.raises(ValueError):
+            TempoMap(((10, 120.0),))
+        with pytest.raises(ValueError):
+            TempoMap(((0, 120.0), (0, 90.0)))
+        with pytest.raises(ValueError):
+            TempoMap(((0, 0.0),))
+
+
+class TestTempoMapScheduler:
+    """Test TempoMapScheduler with a fake clock."""
+
+    def _sender(self, clock, sent):
+        class Sender:
+            def send(self, msg):
+                sent.append((clock.t, msg))
+
+        return Sender()
+
+    def test_follows_tempo_map_and_batches_same_tick(self):
+        from zt_band.scheduler import TempoMap, TempoMapScheduler
+
+        clock = _FakeClock()
+        sent: list = []
+        sched = TempoMapScheduler(
+            sender=self._sender(clock, sent),
+            tempo_map=TempoMap(((0, 120.0), (960, 60.0))),
+            sleep_fn=clock.sleep,
+            now_fn=clock.now,
+        )
+        chord = [mido.Message("note_on", note=n, velocity=80) for n in (60, 64, 67)]
+        events = [(1440, mido.Message("note_off", note=60))] + [(960, m) for m in chord]
+        sched.run(events, bpm=120.0, ticks_per_beat=480)
+
+        assert [m.type for _, m in sent] == ["note_on"] * 3 + ["note_off"]
+        assert sent[0][0] == pytest.approx(1.0, abs=1e-4)
+        assert sent[3][0] == pytest.approx(2.0, abs=1e-4)
+        # One sleep per distinct due time
+        assert len(clock.sleeps) == 2
+
+    def test_live_tempo_change_reanchors_remaining_events(self):
+        from zt_band.midi.midi_clock import TempoSmoother
+        from zt_band.scheduler import TempoMapScheduler
+
+        clock = _FakeClock()
+        sent: list = []
+        base = self._sender(clock, sent)
+        sched = TempoMapScheduler(
+            sender=base,
+            smoother=TempoSmoother(tau_s=0.0, max_slew_bpm_per_s=1e9),
+            sleep_fn=clock.sleep,
+            now_fn=clock.now,
+        )
+
+        class Sender:
+            def send(self, msg):
+                base.send(msg)
+                if len(sent) == 2:
+                    sched.set_bpm(240.0)  # double time after beat 1
+
+        sched.sender = Sender()
+        events = [(i * 480, mido.Message("note_on", note=60 + i)) for i in range(4)]
+        sched.run(events, bpm=120.0, ticks_per_beat=480)
+
+        times = [t for t, _ in sent]
+        assert times[1] == pytest.approx(0.5, abs=1e-4)
+        assert times[2] - times[1] == pytest.approx(0.25, abs=1e-4)
+        assert times[3] - times[2] == pytest.approx(0.25, abs=1e-4)
+
+    def test_set_bpm_without_smoother_raises(self):
+        from zt_band.scheduler import TempoMapScheduler
+
+        with pytest.raises(RuntimeError):
+            TempoMapScheduler(sender=None).set_bpm(100.0)
@@ -0,0 +1,81 @@
+"""
+Tests for smf_writer.py — direct SMF encoder must match the mido writer byte-for-byte.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from zt_band.engine import generate_accompaniment
+from zt_band.event_buffer import EventBuffer
+from zt_band.midi_out import NoteEvent, write_midi_file
+from zt_band.smf_writer import encode_smf, encode_vlq
+
+
+def _write_both(tmp_path: Path, comp, bass, **kwargs) -> tuple[bytes, bytes]:
+    slow = tmp_path / "mido.mid"
+    fast = tmp_path / "fast.mid"
+    write_midi_file(comp, bass, outfile=str(slow), writer="mido", **kwargs)
+    write_midi_file(comp, bass, outfile=str(fast), writer="fast", **kwargs)
+    return slow.read_bytes(), fast.read_bytes()
+
+
+@pytest.mark.parametrize("value,expected", [
+    (0, b"\x00"),
+    (0x7F, b"\x7f"),
+    (0x80, b"\x81\x00"),
+    (0x3FFF, b"\xff\x7f"),
+    (0x200000, b"\x81\x80\x80\x00"),
+])
+def test_encode_vlq(value, expected):
+    out = bytearray()
+    encode_vlq(value, out)
+    assert bytes(out) == expected
+
+
+@pytest.mark.parametrize("style", ["swing_basic", "bossa_basic", "samba_brazil_full"])
+@pytest.mark.parametrize("meter,tempo", [((4, 4), 120), ((3, 4), 97), ((6, 8), 181)])
+def test_fast_writer_matches_mido_bytes(tmp_path, style, meter, tempo):
+    comp, bass = generate_accompaniment(
+        ["Cmaj7", "A7", "Dm7", "G7"], style_name=style, bars_per_chord=2, meter=meter,
+        syncopation_bucket="heavy",
+    )
+    slow, fast = _write_both(tmp_path, comp, bass, tempo_bpm=tempo, meter=meter)
+    assert slow == fast
+
+
+def test_same_tick_rehit_and_channels_match(tmp_path):
+    comp = [
+        NoteEvent(0.0, 0.5, 60, 90, 0),
+        NoteEvent(0.5, 0.5, 60, 90, 0),
+        NoteEvent(0.5, 0.0, 62, 90, 0),  # skipped (zero duration)
+        NoteEvent(1.0, 0.0001, 64, 70, 3),  # rounds to a 1-tick note
+    ]
+    bass = [NoteEvent(200.0, 1.0, 36, 80, 1)]  # multi-byte delta
+    slow, fast = _write_both(tmp_path, comp, bass, tempo_bpm=133)
+    assert slow == fast
+
+
+def test_engine_fast_writer_accepts_buffers(tmp_path):
+    out_a = tmp_path / "a.mid"
+    out_b = tmp_path / "b.mid"
+    generate_accompaniment(["Dm7", "G7"], outfile=str(out_a))
+    generate_accompaniment(["Dm7", "G7"], outfile=str(out_b), midi_writer="fast")
+    assert out_a.read_bytes() == out_b.read_bytes()
+
+
+def test_stuck_note_detected():
+    comp = EventBuffer.from_events([NoteEvent(0.0, 1.0, 60, 0, 0)])
+    with pytest.raises(ValueError, match="Stuck notes"):
+        encode_smf(comp, EventBuffer())
+
+
+def test_tempo_range_enforced():
+    with pytest.raises(ValueError, match="tempo_bpm out of reasonable range"):
+        encode_smf([], [], tempo_bpm=0)
+
+
+def test_unknown_writer_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown MIDI writer"):
+        write_midi_file([], [], outfile=str(tmp_path / "x.mid"), writer="nope")
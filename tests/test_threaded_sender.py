@@ -0,0 +1,137 @@
+"""
+Tests for the threaded MIDI output stage (senders.ThreadedSender).
+"""
+import threading
+import time
+
+import mido
+
+from zt_band.senders import DummySender, SendRecord, ThreadedSender
+
+
+def _on(note, vel=100):
+    return mido.Message("note_on", note=note, velocity=vel)
+
+
+class _GatedSender:
+    """send() blocks until the gate opens, like a stuck port write; records the thread it ran on."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.msgs = []
+        self.threads = set()
+
+    def send(self, msg):
+        self.gate.wait(5.0)
+        self.threads.add(threading.current_thread().name)
+        self.msgs.append(msg)
+
+    def close(self):
+        pass
+
+
+class _FakeClock:
+    """Advances 1ms per reading, so due times pass without wall-clock bounds."""
+
+    def __init__(self):
+        self.t = 100.0
+
+    def now(self):
+        self.t += 0.001
+        return self.t
+
+
+def test_writes_at_due_time_in_order():
+    clock = _FakeClock()
+    inner = DummySender(now_fn=clock.now)
+    out = ThreadedSender(inner, spin_s=1.0, now_fn=clock.now)  # spin only: no real sleeps
+    t0 = 100.02
+    dues = [t0, t0 + 0.01, t0 + 0.01, t0 + 0.03]
+    for i, due in enumerate(dues):
+        out.send_at(due, _on(60 + i))
+    out.stop()
+
+    # send_raw fast path on the inner DummySender; output-thread records mirror it.
+    assert [r.data for r in inner.records] == [bytes(_on(60 + i).bytes()) for i in range(4)]
+    assert [r.due for r in out.records] == dues
+    for r in out.records:
+        assert r.lateness_s >= 0.0  # never early
+
+
+def test_slow_port_does_not_block_producer():
+    gated = _GatedSender()
+    out = ThreadedSender(gated)
+    for i in range(5):
+        out.send(_on(60 + i))
+    # The port has not written anything yet, but the producer already returned
+    assert gated.msgs == []
+    assert out.pending() >= 4
+    gated.gate.set()
+    out.flush()
+
+    assert [m.note for m in gated.msgs] == [60, 61, 62, 63, 64]
+    assert gated.threads == {"zt-midi-out"}
+    out.close()
+
+
+def test_stop_without_drain_discards_pending():
+    inner = DummySender()
+    out = ThreadedSender(inner)
+    far = time.monotonic() + 60.0
+    out.send_at(far, _on(60))
+    out.send_at(far, _on(61))
+    start = time.monotonic()
+    out.stop(drain=False)
+
+    assert time.monotonic() - start < 1.0
+    assert inner.records == []
+    assert out.discarded == 2
+
+
+def test_stop_hands_port_back_only_when_thread_exited():
+    # Drain that outlives the timeout: the rest is discarded, thread exits.
+    inner = DummySender()
+    out = ThreadedSender(inner)
+    out.send_at(time.monotonic() + 60.0, _on(60))
+    assert out.stop(timeout=0.05) is True
+    assert inner.records == [] and out.discarded == 1
+
+    # Write stuck in the port: stop() reports it and close() leaves the port alone.
+    gated = _GatedSender()
+    gated.closed = False
+    gated.close = lambda: setattr(gated, "closed", True)
+    out = ThreadedSender(gated)
+    out.send(_on(60))
+    assert out.stop(timeout=0.05) is False
+    out.close()
+    assert gated.closed is False
+    gated.gate.set()
+    assert out.stop() is True
+
+
+def test_port_errors_do_not_kill_output_thread():
+    class _Flaky(DummySender):
+        def send_raw(self, data):
+            if data[1] == 61:
+                raise OSError("port gone")
+            super().send_raw(data)
+
+    inner = _Flaky()
+    out = ThreadedSender(inner)
+    for n in (60, 61, 62):
+        out.send(_on(n))
+    out.stop()
+    assert [r.data[1] for r in inner.records] == [60, 62]
+    assert out.errors == 1
+
+
+def test_dummy_sender_send_at_records_due_and_clock():
+    clock = iter([5.0, 6.0])
+    d = DummySender(now_fn=lambda: next(clock))
+    d.send_at(4.5, _on(60))
+    d.send_raw(b"\x80\x3c\x00")
+    assert d.records == [
+        SendRecord(4.5, 5.0, bytes(_on(60).bytes())),
+        SendRecord(6.0, 6.0, b"\x80\x3c\x00"),
+    ]
+    assert d.records[0].lateness_s == 0.5
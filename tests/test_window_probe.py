@@ -0,0 +1,145 @@
+"""
+Tests for window_probe.py -- onset ring buffer and windowed features.
+"""
+import math
+
+import mido
+import pytest
+
+from zt_band.clave import ClaveGrid
+from zt_band.groove.groove_layer_bridge import _map_window_features_to_analyzer_inputs
+from zt_band.groove.window_probe import EvidenceWindowProbe
+from zt_band.realtime import LateDropPolicy, RtSpec, _build_cycle_timeline, _run_event_loop
+
+
+def _stats(xs):
+    m = sum(xs) / len(xs)
+    return m, math.sqrt(sum((x - m) ** 2 for x in xs) / len(xs))
+
+
+def test_features_match_brute_force():
+    probe = EvidenceWindowProbe(capacity=64)
+    onsets = [(10.0 + 0.25 * i, 60 + (i * 7) % 50, ((i * 13) % 11) - 5.0) for i in range(40)]
+    for t, vel, off in onsets:
+        probe.record_onset(t, vel, off)
+
+    now = onsets[-1][0] + 0.1
+    f = probe.snapshot(horizon_ms=2000, now_s=now).features
+    inside = [o for o in onsets if o[0] >= now - 2.0]
+    mean_off, sd_off = _stats([o[2] for o in inside])
+    mean_vel, sd_vel = _stats([o[1] for o in inside])
+
+    assert f["events"]["count"] == len(inside) == 8
+    assert f["timing"]["mean_offset_ms"] == pytest.approx(mean_off, abs=1e-3)
+    assert f["timing"]["stddev_ms"] == pytest.approx(sd_off, abs=1e-3)
+    assert f["dynamics"]["velocity_mean"] == pytest.approx(mean_vel, abs=1e-2)
+    assert f["dynamics"]["velocity_stddev"] == pytest.approx(sd_vel, abs=1e-2)
+    assert f["events"]["onset_density_hz"] == pytest.approx(4.0)
+    assert f["events"]["recent_iois_ms"] == [250.0] * 7
+    assert f["events"]["recent_note_onsets_ms"][-1] == pytest.approx(-100.0)
+
+
+def test_ring_wraps_and_horizon_limits_to_buffer():
+    probe = EvidenceWindowProbe(capacity=8)
+    for i in range(30):
+        probe.record_onset(float(i), 100, float(i))
+    assert len(probe) == 8
+
+    # Horizon reaches back past the oldest buffered onset: only 8 are left
+    f = probe.snapshot(horizon_ms=100_000, now_s=29.0).features
+    assert f["events"]["count"] == 8
+    assert f["timing"]["mean_offset_ms"] == pytest.approx(sum(range(22, 30)) / 8)
+    assert len(f["events"]["recent_note_onsets_ms"]) == 8
+
+    f = probe.snapshot(horizon_ms=2500, now_s=29.0).features
+    assert f["events"]["count"] == 3
+
+
+def test_empty_window_and_direction():
+    probe = EvidenceWindowProbe(now_fn=lambda: 100.0)
+    assert probe.snapshot(horizon_ms=2000).features == {}
+
+    probe.record_onset(50.0, 90, 12.0)
+    assert probe.snapshot(horizon_ms=2000).features == {}  # too old
+
+    probe.record_onset(99.5, 90, -8.0)
+    probe.record_onset(99.8, 90, -6.0)
+    f = probe.snapshot(horizon_ms=2000).features
+    assert f["timing"]["direction"] == "ahead"
+    assert "tempo" not in f  # fewer than 3 onsets
+
+
+def test_drift_slope_and_bpm_estimate():
+    probe = EvidenceWindowProbe()
+    probe.set_reference_bpm(120.0)
+    # Player falls behind by 10ms every second
+    for i in range(9):
+        probe.record_onset(5.0 + 0.5 * i, 100, 5.0 * i)
+    f = probe.snapshot(horizon_ms=10_000, now_s=9.0).features
+    assert f["timing"]["direction"] == "behind"
+    assert f["tempo"]["drift_slope"] == pytest.approx(10.0)
+    assert f["tempo"]["bpm_estimate"] == pytest.approx(120.0 / 1.01, abs=0.01)
+
+
+def test_long_session_keeps_slope_precision():
+    # Many ring wraps over a long session: sums are re-based on each wrap, so
+    # a short dense window's slope still matches a direct computation.
+    probe = EvidenceWindowProbe(capacity=64)
+    onsets = [(0.01 * i, 2.0 * ((i * 7) % 5) + 0.5 * (i % 40)) for i in range(100_000)]
+    for t, off in onsets:
+        probe.record_onset(t, 100, off)
+
+    inside = onsets[-11:]
+    mt = sum(t for t, _ in inside) / len(inside)
+    mo = sum(o for _, o in inside) / len(inside)
+    slope = sum((t - mt) * (o - mo) for t, o in inside) / sum((t - mt) ** 2 for t, _ in inside)
+    f = probe.snapshot(horizon_ms=105, now_s=onsets[-1][0]).features
+    assert f["events"]["count"] == 11
+    assert f["tempo"]["drift_slope"] == pytest.approx(slope, abs=1e-4)
+
+
+def test_bridge_forwards_dynamics_and_density():
+    probe = EvidenceWindowProbe()
+    for i in range(4):
+        probe.record_onset(1.0 + 0.5 * i, 80, 0.0)
+    inputs = _map_window_features_to_analyzer_inputs(probe.snapshot(horizon_ms=2000, now_s=3.0))
+    assert inputs["features"]["dynamics"]["velocity_mean"] == pytest.approx(80.0)
+    assert inputs["features"]["events"]["count"] == 4
+    assert inputs["features"]["events"]["onset_density_hz"] == pytest.approx(2.0)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def now(self):
+        self.t += 0.000005
+        return self.t
+
+    def sleep(self, dt):
+        self.t += dt
+
+
+class _QueuedSink:
+    def send_at(self, due, msg):
+        pass
+
+
+def test_event_loop_records_band_onsets():
+    probe = EvidenceWindowProbe()
+    spec = RtSpec(midi_out="x", bpm=120, click=False, evidence_probe=probe)
+    grid = ClaveGrid(bpm=spec.bpm, grid=spec.grid, clave=spec.clave)
+    events = [
+        (0, mido.Message("note_on", note=36, velocity=100)),
+        (2, mido.Message("note_on", note=38, velocity=0)),  # note-off by velocity
+        (4, mido.Message("note_off", note=36, velocity=0)),
+    ]
+    timeline = _build_cycle_timeline(events, [], grid, spec)
+    clock = _FakeClock()
+    _run_event_loop(
+        _QueuedSink(), timeline=timeline, grid=grid, spec=spec, max_cycles=3,
+        policy=LateDropPolicy(), now_fn=clock.now, sleep_fn=clock.sleep,
+    )
+    assert len(probe) == 3
+    f = probe.snapshot(horizon_ms=60_000, now_s=clock.t).features
+    assert f["dynamics"]["velocity_mean"] == pytest.approx(100.0)
@@ -0,0 +1,66 @@
+from shared.zone_tritone import (
+    classify_transitions,
+    gravity_chain,
+    intervals_of,
+    is_half_step,
+    is_same_zone,
+    is_tritone_pair,
+    is_whole_step,
+    tritone_axes_of,
+    tritone_axis,
+    zone_name,
+    zones_of,
+)
+from shared.zone_tritone.tables import GRAVITY_TARGET, INTERVAL_CLASS, TRANSITION
+
+PCS = range(-24, 36)  # include negatives / values above 11
+
+
+def test_pair_lookups_match_arithmetic():
+    for a in PCS:
+        for b in PCS:
+            d = (b - a) % 12
+            assert is_half_step(a, b) == (d in (1, 11))
+            assert is_whole_step(a, b) == (d in (2, 10))
+            assert is_tritone_pair(a, b) == (d == 6)
+            assert is_same_zone(a, b) == (a % 2 == b % 2)
+
+
+def test_per_pc_lookups_match_arithmetic():
+    for pc in PCS:
+        assert tritone_axis(pc) == tuple(sorted((pc % 12, (pc + 6) % 12)))
+        assert zone_name(pc) == ("Zone 1" if pc % 2 == 0 else "Zone 2")
+
+
+def test_gravity_chain_matches_iteration():
+    for root in range(12):
+        for steps in (-1, 0, 1, 11, 12, 13, 40):
+            r = root
+            expected = [r]
+            for _ in range(steps):
+                r = (r - 7) % 12
+                expected.append(r)
+            assert gravity_chain(root, steps) == expected
+
+
+def test_interval_class_is_symmetric():
+    for a in range(12):
+        for b in range(12):
+            assert INTERVAL_CLASS[a][b] == INTERVAL_CLASS[b][a] <= 6
+
+
+def test_bulk_variants():
+    roots = [2, 7, 0, 9, 14, -11]  # D G C A D Db (unreduced)
+    assert zones_of(roots) == [0, 1, 0, 1, 0, 1]
+    assert tritone_axes_of(roots)[1] == (1, 7)
+    assert intervals_of(roots) == [5, 5, 9, 5, 11]
+    assert intervals_of([5]) == []
+
+    trans = classify_transitions(roots)
+    assert len(trans) == 5
+    g_to_c = trans[1]
+    assert (g_to_c.from_root, g_to_c.to_root, g_to_c.interval) == (7, 0, 5)
+    assert g_to_c.asc_fourth and g_to_c.gravity_target and not g_to_c.desc_fourth
+    assert trans[4].half_step and not trans[4].same_zone
+    assert trans[0] is TRANSITION[2][7]
+    assert all(t.gravity_target == (GRAVITY_TARGET[t.from_root] == t.to_root) for t in trans)